@@ -21,11 +21,21 @@ from maasservicelayer.exceptions.constants import (
 
 logger = structlog.get_logger()
 
+# HTTP methods that are not expected to modify data.
+READ_ONLY_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
 
 class TransactionMiddleware(BaseHTTPMiddleware):
     """Run a request in a transaction, handling commit/rollback.
 
     This makes the database connection available as `request.state.context.get_connection()`.
+
+    Requests with a read-only method run with the READ COMMITTED isolation
+    level instead of the REPEATABLE READ default of the engine.
+
+    The time spent waiting for a connection from the pool is stored in
+    `request.state.connection_wait`, and the time it was checked out in
+    `request.state.connection_checkout`.
     """
 
     def __init__(self, app: ASGIApp, db: Database):
@@ -33,10 +43,16 @@ class TransactionMiddleware(BaseHTTPMiddleware):
         self.db = db
 
     @asynccontextmanager
-    async def get_connection(self) -> AsyncIterator[AsyncConnection]:
+    async def get_connection(
+        self, read_only: bool = False
+    ) -> AsyncIterator[AsyncConnection]:
         """Return the connection in a transaction context manager."""
         try:
             async with self.db.engine.connect() as conn:
+                if read_only:
+                    await conn.execution_options(
+                        isolation_level=self.db.READ_ONLY_ISOLATION_LEVEL
+                    )
                 async with conn.begin():
                     yield conn
         # Foreign key exceptions are raised only when the transaction is committed, so we have to capture them here.
@@ -55,7 +71,14 @@ class TransactionMiddleware(BaseHTTPMiddleware):
         request: Request,
         call_next: Callable[[Request], Awaitable[Response]],
     ) -> Response:
-        async with self.get_connection() as conn:
+        start = time.perf_counter()
+        async with self.get_connection(
+            read_only=request.method in READ_ONLY_METHODS
+        ) as conn:
+            request.state.connection_checkout = time.perf_counter()
+            request.state.connection_wait = (
+                request.state.connection_checkout - start
+            )
             request.state.context.set_connection(conn)
             response = await call_next(request)
 
@@ -81,6 +104,9 @@ class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
 
     It requires the database connection to be available as
     `request.state.context.get_connection()`.
+
+    Besides the number and latency of queries, it reports how long the request
+    waited for a connection from the pool and how long it held it.
     """
 
     def __init__(self, app: ASGIApp, db: Database):
@@ -92,7 +118,12 @@ class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
         request: Request,
         call_next: Callable[[Request], Awaitable[Response]],
     ) -> Response:
-        query_metrics = {"latency": 0.0, "count": 0}
+        query_metrics = {
+            "latency": 0.0,
+            "count": 0,
+            "pool_wait": getattr(request.state, "connection_wait", 0.0),
+            "pool_checkout": 0.0,
+        }
         request.state.query_metrics = query_metrics
 
         def before(*args: Any) -> None:
@@ -113,4 +144,6 @@ class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
         finally:
             event.remove(conn, "before_cursor_execute", before)
             event.remove(conn, "after_cursor_execute", after)
+            if checkout := getattr(request.state, "connection_checkout", None):
+                query_metrics["pool_checkout"] = time.perf_counter() - checkout
         return response
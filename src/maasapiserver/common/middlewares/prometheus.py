@@ -6,6 +6,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.routing import Match
 from starlette.types import ASGIApp
 
+from maasservicelayer.services import CacheForServices
 from provisioningserver.prometheus.utils import (
     create_metrics,
     MetricDefinition,
@@ -18,12 +19,16 @@ from provisioningserver.utils.ipaddr import get_machine_default_gateway_ip
 class PrometheusMiddleware(BaseHTTPMiddleware):
     """Collect Prometheus metrics for the call.
 
-    This requires the DatabaseMetricsMiddleware to be configured.
+    This requires the DatabaseMetricsMiddleware to be configured, and to be
+    executed after this one so that its metrics are complete when the
+    response is returned.
     """
 
-    def __init__(self, app: ASGIApp):
+    def __init__(
+        self, app: ASGIApp, services_cache: CacheForServices | None = None
+    ):
         super().__init__(app)
-        self.metrics = _get_metrics()
+        self.metrics = _get_metrics(services_cache)
 
     async def dispatch(
         self,
@@ -72,6 +77,19 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
                 request.state.query_metrics["latency"],
                 labels=labels,
             )
+        if pool_checkout := request.state.query_metrics["pool_checkout"]:
+            self.metrics.update(
+                "maas_apiserver_request_pool_wait",
+                "observe",
+                request.state.query_metrics["pool_wait"],
+                labels=labels,
+            )
+            self.metrics.update(
+                "maas_apiserver_request_pool_checkout",
+                "observe",
+                pool_checkout,
+                labels=labels,
+            )
 
         return response
 
@@ -83,7 +101,9 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
         return request.url.path
 
 
-def _get_metrics() -> PrometheusMetrics:
+def _get_metrics(
+    services_cache: CacheForServices | None = None,
+) -> PrometheusMetrics:
     http_labels = ("handler", "method", "status")
     definitions = (
         MetricDefinition(
@@ -112,9 +132,55 @@ def _get_metrics() -> PrometheusMetrics:
             labels=http_labels,
             buckets=(0.001, 0.005, 0.01, 0.1, 0.25, 0.5, 1.0),
         ),
+        MetricDefinition(
+            "Histogram",
+            "maas_apiserver_request_pool_wait",
+            "API server - time spent waiting for a database connection from the pool in seconds",
+            labels=http_labels,
+            buckets=(0.001, 0.005, 0.01, 0.1, 0.25, 0.5, 1.0, 5.0),
+        ),
+        MetricDefinition(
+            "Histogram",
+            "maas_apiserver_request_pool_checkout",
+            "API server - time a database connection was checked out from the pool in seconds",
+            labels=http_labels,
+            buckets=(0.001, 0.005, 0.01, 0.1, 0.25, 0.5, 1.0, 5.0),
+        ),
+        MetricDefinition(
+            "Gauge",
+            "maas_apiserver_service_cache_hits",
+            "API server - number of hits of the service caches",
+            labels=("cache",),
+        ),
+        MetricDefinition(
+            "Gauge",
+            "maas_apiserver_service_cache_misses",
+            "API server - number of misses of the service caches",
+            labels=("cache",),
+        ),
     )
+
+    def update_service_cache_metrics(metrics: PrometheusMetrics) -> None:
+        if services_cache is None:
+            return
+        for name, ttl_cache in services_cache.ttl_caches():
+            labels = {"cache": name}
+            metrics.update(
+                "maas_apiserver_service_cache_hits",
+                "set",
+                value=ttl_cache.hits,
+                labels=labels,
+            )
+            metrics.update(
+                "maas_apiserver_service_cache_misses",
+                "set",
+                value=ttl_cache.misses,
+                labels=labels,
+            )
+
     return create_metrics(
         definitions,
+        update_handlers=[update_service_cache_metrics],
         registry=CollectorRegistry(),
         extra_labels={
             "host": get_machine_default_gateway_ip(),
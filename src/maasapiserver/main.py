@@ -32,6 +32,7 @@ from maasapiserver.settings import (
 from maasapiserver.v2.api.handlers import APIv2
 from maasapiserver.v3.api.internal.handlers import APIv3Internal
 from maasapiserver.v3.api.public.handlers import APIv3
+from maasapiserver.v3.listeners.cache import ServiceCacheInvalidationListener
 from maasapiserver.v3.listeners.vault import VaultMigrationPostgresListener
 from maasapiserver.v3.middlewares.auth import (
     AuthenticationProvidersCache,
@@ -46,7 +47,11 @@ from maasservicelayer.db import Database
 from maasservicelayer.db.listeners import PostgresListenersTaskFactory
 from maasservicelayer.db.locks import StartupLock
 from maasservicelayer.logging.configure import configure_logging
-from maasservicelayer.services import CacheForServices
+from maasservicelayer.services import (
+    CacheForServices,
+    ConfigurationsService,
+    SecretsService,
+)
 from provisioningserver.certificates import get_maas_cluster_cert_paths
 
 logger = structlog.getLogger()
@@ -105,8 +110,8 @@ async def prepare_app(
 
     # The order here is important: the exception middleware must be the first one being executed (i.e. it must be the last
     # middleware added here)
-    app.add_middleware(PrometheusMiddleware)
     app.add_middleware(DatabaseMetricsMiddleware, db=db)
+    app.add_middleware(PrometheusMiddleware, services_cache=services_cache)
 
     if add_authentication_middleware:
         app.add_middleware(
@@ -136,7 +141,27 @@ async def prepare_app(
         partial(
             PostgresListenersTaskFactory.create,
             db_engine=db.engine,
-            listeners=[VaultMigrationPostgresListener()],
+            listeners=[
+                VaultMigrationPostgresListener(),
+                ServiceCacheInvalidationListener(
+                    "config_update",
+                    services_cache,
+                    ConfigurationsService.__name__,
+                    "configurations",
+                ),
+                ServiceCacheInvalidationListener(
+                    "secret_update",
+                    services_cache,
+                    SecretsService.__name__,
+                    "secrets",
+                ),
+                ServiceCacheInvalidationListener(
+                    "secret_delete",
+                    services_cache,
+                    SecretsService.__name__,
+                    "secrets",
+                ),
+            ],
         ),
     )
     app.add_event_handler("shutdown", services_cache.close)
@@ -83,6 +83,11 @@ async def _get_default_db_config(
         username=database_user,
         password=database_pass,
         port=config.database_port,
+        pool_size=config.database_pool_size,
+        pool_max_overflow=config.database_pool_max_overflow,
+        pool_timeout=config.database_pool_timeout,
+        pool_pre_ping=config.database_pool_pre_ping,
+        statement_cache_size=config.database_statement_cache_size,
     )
 
 
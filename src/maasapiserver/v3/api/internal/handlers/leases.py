@@ -8,8 +8,6 @@ from maasapiserver.v3.api import services
 from maasapiserver.v3.api.internal.models.requests.leases import (
     LeaseInfoRequest,
 )
-from maascommon.enums.ipaddress import IpAddressFamily
-from maasservicelayer.models.leases import Lease
 from maasservicelayer.services import ServiceCollectionV3
 
 
@@ -28,14 +26,25 @@ class LeasesHandler(Handler):
         lease_info_request: LeaseInfoRequest,
         services: ServiceCollectionV3 = Depends(services),
     ) -> Response:
-        await services.leases.store_lease_info(
-            Lease(
-                action=lease_info_request.action,
-                ip_family=IpAddressFamily(lease_info_request.ip_family),
-                hostname=lease_info_request.hostname,
-                mac=lease_info_request.mac,
-                ip=lease_info_request.ip,
-                timestamp_epoch=lease_info_request.timestamp,
-                lease_time_seconds=lease_info_request.lease_time,
-            )
+        await services.leases.store_lease_info(lease_info_request.to_model())
+
+    @handler(
+        path="/leases/batch",
+        methods=["POST"],
+        responses={
+            204: {},
+        },
+        status_code=204,
+    )
+    async def store_leases_info(
+        self,
+        response: Response,
+        lease_info_requests: list[LeaseInfoRequest],
+        services: ServiceCollectionV3 = Depends(services),
+    ) -> Response:
+        await services.leases.store_leases_info(
+            [
+                lease_info_request.to_model()
+                for lease_info_request in lease_info_requests
+            ]
         )
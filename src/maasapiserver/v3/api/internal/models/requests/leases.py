@@ -6,7 +6,8 @@ import re
 
 from pydantic import BaseModel, IPvAnyAddress, validator
 
-from maascommon.enums.ipaddress import LeaseAction
+from maascommon.enums.ipaddress import IpAddressFamily, LeaseAction
+from maasservicelayer.models.leases import Lease
 
 
 class LeaseInfoRequest(BaseModel):
@@ -45,3 +46,14 @@ class LeaseInfoRequest(BaseModel):
             raise ValueError(f"Invalid MAC address length {normalized_mac}.")
 
         return normalized_mac
+
+    def to_model(self) -> Lease:
+        return Lease(
+            action=self.action,
+            ip_family=IpAddressFamily(self.ip_family),
+            hostname=self.hostname,
+            mac=self.mac,
+            ip=self.ip,
+            timestamp_epoch=self.timestamp,
+            lease_time_seconds=self.lease_time,
+        )
@@ -52,9 +52,10 @@ class FabricsHandler(Handler):
         token_pagination_params: TokenPaginationParams = Depends(),
         services: ServiceCollectionV3 = Depends(services),
     ) -> Response:
-        fabrics = await services.fabrics.list(
+        fabrics = await services.fabrics.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
+            columns=["id", "name", "description", "class_type"],
         )
         return FabricsListResponse(
             items=[
@@ -62,7 +63,7 @@ class FabricsHandler(Handler):
                     fabric=fabric,
                     self_base_hyperlink=f"{V3_API_PREFIX}/fabrics",
                 )
-                for fabric in fabrics.items
+                async for fabric in fabrics
             ],
             next=(
                 f"{V3_API_PREFIX}/fabrics?"
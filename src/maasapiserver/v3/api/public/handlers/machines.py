@@ -113,10 +113,27 @@ class MachinesHandler(Handler):
                 )
         query = QuerySpec(where=where_clause)
 
-        machines = await services.machines.list(
+        machines = await services.machines.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
             query=query,
+            columns=[
+                "id",
+                "system_id",
+                "description",
+                "owner",
+                "cpu_speed",
+                "memory",
+                "osystem",
+                "architecture",
+                "distro_series",
+                "hwe_kernel",
+                "locked",
+                "cpu_count",
+                "status",
+                "power_type",
+                "fqdn",
+            ],
         )
         return MachinesListResponse(
             items=[
@@ -124,7 +141,7 @@ class MachinesHandler(Handler):
                     machine=machine,
                     self_base_hyperlink=f"{V3_API_PREFIX}/machines",
                 )
-                for machine in machines.items
+                async for machine in machines
             ],
             next=(
                 f"{V3_API_PREFIX}/machines?"
@@ -90,10 +90,11 @@ class ResourcePoolHandler(Handler):
                     )
                 )
             )
-        resource_pools = await services.resource_pools.list(
+        resource_pools = await services.resource_pools.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
             query=query,
+            columns=["id", "name", "description", "created", "updated"],
         )
         return ResourcePoolsListResponse(
             items=[
@@ -101,7 +102,7 @@ class ResourcePoolHandler(Handler):
                     resource_pool=resource_pools,
                     self_base_hyperlink=f"{V3_API_PREFIX}/resource_pools",
                 )
-                for resource_pools in resource_pools.items
+                async for resource_pools in resource_pools
             ],
             next=(
                 f"{V3_API_PREFIX}/resource_pools?"
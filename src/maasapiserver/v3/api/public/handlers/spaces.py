@@ -47,16 +47,17 @@ class SpacesHandler(Handler):
         token_pagination_params: TokenPaginationParams = Depends(),
         services: ServiceCollectionV3 = Depends(services),
     ) -> Response:
-        spaces = await services.spaces.list(
+        spaces = await services.spaces.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
+            columns=["id", "name", "description"],
         )
         return SpacesListResponse(
             items=[
                 SpaceResponse.from_model(
                     space=space, self_base_hyperlink=f"{V3_API_PREFIX}/spaces"
                 )
-                for space in spaces.items
+                async for space in spaces
             ],
             next=(
                 f"{V3_API_PREFIX}/spaces?"
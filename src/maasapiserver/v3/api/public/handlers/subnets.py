@@ -59,10 +59,24 @@ class SubnetsHandler(Handler):
                 ]
             )
         )
-        subnets = await services.subnets.list(
+        subnets = await services.subnets.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
             query=query,
+            columns=[
+                "id",
+                "name",
+                "description",
+                "cidr",
+                "rdns_mode",
+                "gateway_ip",
+                "dns_servers",
+                "allow_dns",
+                "allow_proxy",
+                "active_discovery",
+                "managed",
+                "disabled_boot_architectures",
+            ],
         )
         return SubnetsListResponse(
             items=[
@@ -70,7 +84,7 @@ class SubnetsHandler(Handler):
                     subnet=subnet,
                     self_base_hyperlink=f"{V3_API_PREFIX}/fabrics/{fabric_id}/vlans/{vlan_id}/subnets",
                 )
-                for subnet in subnets.items
+                async for subnet in subnets
             ],
             next=(
                 f"{V3_API_PREFIX}/fabrics/{fabric_id}/vlans/{vlan_id}/subnets?"
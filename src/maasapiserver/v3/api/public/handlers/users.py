@@ -117,9 +117,22 @@ class UsersHandler(Handler):
         token_pagination_params: TokenPaginationParams = Depends(),
         services: ServiceCollectionV3 = Depends(services),
     ) -> UsersListResponse:
-        users = await services.users.list(
+        users = await services.users.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
+            columns=[
+                "id",
+                "username",
+                "password",
+                "is_superuser",
+                "first_name",
+                "last_name",
+                "is_staff",
+                "is_active",
+                "date_joined",
+                "email",
+                "last_login",
+            ],
         )
         return UsersListResponse(
             items=[
@@ -127,7 +140,7 @@ class UsersHandler(Handler):
                     user=user,
                     self_base_hyperlink=f"{V3_API_PREFIX}/users",
                 )
-                for user in users.items
+                async for user in users
             ],
             next=(
                 f"{V3_API_PREFIX}/users?"
@@ -62,26 +62,26 @@ class ZonesHandler(Handler):
         filters: ZonesFiltersParams = Depends(),
         services: ServiceCollectionV3 = Depends(services),
     ) -> Response:
-        zones = await services.zones.list(
+        zones = await services.zones.list_stream(
             token=token_pagination_params.token,
             size=token_pagination_params.size,
             query=QuerySpec(where=filters.to_clause()),
+            columns=["id", "name", "description"],
         )
+        # The next token is only known once all the zones have been streamed.
+        items = [
+            ZoneResponse.from_model(
+                zone=zone, self_base_hyperlink=f"{V3_API_PREFIX}/zones"
+            )
+            async for zone in zones
+        ]
         next_link = None
         if zones.next_token:
             next_link = f"{V3_API_PREFIX}/zones?{TokenPaginationParams.to_href_format(zones.next_token, token_pagination_params.size)}"
             if query_filters := filters.to_href_format():
                 next_link += f"&{query_filters}"
 
-        return ZonesListResponse(
-            items=[
-                ZoneResponse.from_model(
-                    zone=zone, self_base_hyperlink=f"{V3_API_PREFIX}/zones"
-                )
-                for zone in zones.items
-            ],
-            next=next_link,
-        )
+        return ZonesListResponse(items=items, next=next_link)
 
     @handler(
         path="/zones",
@@ -1,7 +1,9 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from datetime import datetime
 from typing import Optional
+from urllib.parse import quote
 
 from fastapi import Query
 from pydantic import BaseModel, Field
@@ -16,21 +18,52 @@ class EventsFiltersParams(BaseModel):
     system_ids: Optional[list[str]] = Field(
         Query(default=None, title="Filter by system id", alias="system_id")
     )
+    created_after: Optional[datetime] = Field(
+        Query(
+            default=None,
+            title="Only events created at or after this time",
+        )
+    )
+    created_before: Optional[datetime] = Field(
+        Query(
+            default=None,
+            title="Only events created before this time",
+        )
+    )
 
     def to_clause(self) -> Optional[Clause]:
+        clauses = []
         if self.system_ids:
-            return EventsClauseFactory.with_system_ids(
-                system_ids=self.system_ids
+            clauses.append(
+                EventsClauseFactory.with_system_ids(system_ids=self.system_ids)
+            )
+        if self.created_after:
+            clauses.append(
+                EventsClauseFactory.with_created_after(self.created_after)
+            )
+        if self.created_before:
+            clauses.append(
+                EventsClauseFactory.with_created_before(self.created_before)
             )
-        return None
+        if not clauses:
+            return None
+        return EventsClauseFactory.and_clauses(clauses)
 
     def to_href_format(self) -> str:
+        tokens = []
         if self.system_ids:
-            tokens = [
+            tokens.extend(
                 f"system_id={system_id}" for system_id in self.system_ids
-            ]
-            return "&".join(tokens)
-        return ""
+            )
+        if self.created_after:
+            tokens.append(
+                f"created_after={quote(self.created_after.isoformat())}"
+            )
+        if self.created_before:
+            tokens.append(
+                f"created_before={quote(self.created_before.isoformat())}"
+            )
+        return "&".join(tokens)
 
 
 class EventRequest(NamedBaseModel):
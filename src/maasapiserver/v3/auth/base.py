@@ -111,10 +111,11 @@ def check_permissions(
             # Initialize an empty object. The permissions will be populated if the handler has requested some.
             authenticated_user.rbac_permissions = RBACPermissionsPools()
             if rbac_permissions:
-                rbac_client = await services.external_auth.get_rbac_client()
-                pool_responses = await rbac_client.get_resource_pool_ids(
-                    user=authenticated_user.username,
-                    permissions=rbac_permissions,
+                pool_responses = (
+                    await services.external_auth.get_rbac_resource_pool_ids(
+                        user=authenticated_user.username,
+                        permissions=rbac_permissions,
+                    )
                 )
                 all_resource_pools = set()
                 # if any of the response has the access_all property, we have to fetch all the resource pools ids
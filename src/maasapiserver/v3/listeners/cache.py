@@ -0,0 +1,43 @@
+#  Copyright 2024 Canonical Ltd.  This software is licensed under the
+#  GNU Affero General Public License version 3 (see the file LICENSE).
+
+from asyncpg import Connection
+import structlog
+
+from maasservicelayer.db.listeners import PostgresListener
+from maasservicelayer.services import CacheForServices
+
+logger = structlog.getLogger(__name__)
+
+
+class ServiceCacheInvalidationListener(PostgresListener):
+    """Invalidate an entry of a service TTLCache when a notification is received.
+
+    The payload of the notification is used as the argument of the cached call,
+    i.e. the entry for `get(payload)` is invalidated.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        services_cache: CacheForServices,
+        service_name: str,
+        attr: str,
+    ):
+        super().__init__(channel)
+        self.services_cache = services_cache
+        self.service_name = service_name
+        self.attr = attr
+
+    def handler(
+        self, connection: Connection, pid: int, channel: str, payload: str
+    ):
+        logger.debug(
+            f"Invalidating {self.service_name}.{self.attr} cache for '{payload}'."
+        )
+        if payload:
+            self.services_cache.invalidate(
+                self.service_name, self.attr, payload
+            )
+        else:
+            self.services_cache.invalidate(self.service_name, self.attr)
@@ -7,6 +7,10 @@ from lxml import etree
 
 # Workflows names
 TAG_EVALUATION_WORKFLOW_NAME = "tag-evaluation"
+TAG_EVALUATION_MANY_WORKFLOW_NAME = "tag-evaluation-many"
+
+# Signal adding tags to a running multi-tag evaluation workflow.
+TAG_EVALUATION_MANY_SIGNAL_NAME = "evaluate-tags"
 
 """Based on a study on the performance of the tag evaluation query, the time
 estimated for comparing a XPath expression over ten of thousands of nodes can be
@@ -30,3 +34,16 @@ class TagEvaluationParam:
         # it will raise an error. The validation aims to avoid potential SQL
         # injection attacks.
         etree.XPath(self.tag_definition)
+
+
+@dataclass(frozen=True)
+class TagEvaluationManyParam:
+    """
+    Parameters required by the multi-tag evaluation workflow.
+
+    The batch size of the tags themselves is ignored, the nodes are processed
+    in batches of `batch_size` for all the tags at once.
+    """
+
+    tags: list[TagEvaluationParam]
+    batch_size: int = TAG_EVALUATION_BATCH_SIZE
@@ -373,6 +373,43 @@ def get_allocated_composed_machine(
     return machine, storage, interfaces
 
 
+def set_allocation_constraints(machine, storage, interfaces, verbose=False):
+    """Set the constraints matched by an allocated machine on it.
+
+    :param storage: The storage constraint map, as returned by
+        `nodes_by_storage`.
+    :param interfaces: The interface label map, as returned by
+        `nodes_by_interface`.
+    """
+    machine.constraint_map = storage.get(machine.id, {})
+    machine.constraints_by_type = {}
+    # Need to get the interface constraints map into the proper format
+    # to return it here.
+    # Backward compatibility: provide the storage constraints in both
+    # formats.
+    if len(machine.constraint_map) > 0:
+        machine.constraints_by_type["storage"] = {}
+        new_storage = machine.constraints_by_type["storage"]
+        # Convert this to the "new style" constraints map format.
+        for storage_key in machine.constraint_map:
+            # Each key in the storage map is actually a value which
+            # contains the ID of the matching storage device.
+            # Convert this to a label: list-of-matches format, to
+            # match how the constraints will be done going forward.
+            new_key = machine.constraint_map[storage_key]
+            matches = new_storage.get(new_key, [])
+            matches.append(storage_key)
+            new_storage[new_key] = matches
+    if len(interfaces) > 0:
+        machine.constraints_by_type["interfaces"] = {
+            label: interfaces.get(label, {}).get(machine.id)
+            for label in interfaces
+        }
+    if verbose:
+        machine.constraints_by_type["verbose_storage"] = storage
+        machine.constraints_by_type["verbose_interfaces"] = interfaces
+
+
 class MachineHandler(NodeHandler, WorkloadAnnotationsMixin, PowerMixin):
     """
     Manage an individual machine.
@@ -2636,35 +2673,132 @@ class MachinesHandler(NodesHandler, PowersMixin):
                     bridge_stp=options.bridge_stp,
                     bridge_fd=options.bridge_fd,
                 )
-            machine.constraint_map = storage.get(machine.id, {})
-            machine.constraints_by_type = {}
-            # Need to get the interface constraints map into the proper format
-            # to return it here.
-            # Backward compatibility: provide the storage constraints in both
-            # formats.
-            if len(machine.constraint_map) > 0:
-                machine.constraints_by_type["storage"] = {}
-                new_storage = machine.constraints_by_type["storage"]
-                # Convert this to the "new style" constraints map format.
-                for storage_key in machine.constraint_map:
-                    # Each key in the storage map is actually a value which
-                    # contains the ID of the matching storage device.
-                    # Convert this to a label: list-of-matches format, to
-                    # match how the constraints will be done going forward.
-                    new_key = machine.constraint_map[storage_key]
-                    matches = new_storage.get(new_key, [])
-                    matches.append(storage_key)
-                    new_storage[new_key] = matches
-            if len(interfaces) > 0:
-                machine.constraints_by_type["interfaces"] = {
-                    label: interfaces.get(label, {}).get(machine.id)
-                    for label in interfaces
-                }
-            if verbose:
-                machine.constraints_by_type["verbose_storage"] = storage
-                machine.constraints_by_type["verbose_interfaces"] = interfaces
+            set_allocation_constraints(machine, storage, interfaces, verbose)
             return machine
 
+    @operation(idempotent=False)
+    def allocate_batch(self, request):
+        """@description-title Allocate several machines
+        @description Allocates a number of available machines matching the
+        given constraints, all in one transaction. Either all the requested
+        machines are allocated, or none of them are.
+
+        The same constraints as for the ``allocate`` operation are accepted,
+        such as "arch", "cpu_count", "mem", "tags", "zone", "pool", "subnets",
+        "storage", "interfaces" or "devices". They are combined using 'AND'
+        semantics and every machine allocated must match them.
+
+        Machines that are being modified by another request at the same time
+        are skipped, rather than waited for. No machines are composed in pods
+        to make up for missing machines.
+
+        @param (int) "count" [required=true] The number of machines to
+        allocate.
+
+        @param (string) "agent_name" [required=false] An optional agent name to
+        attach to the acquired machines.
+
+        @param (string) "comment" [required=false] Comment for the event log.
+
+        @param (boolean) "bridge_all" [required=false] Optionally create a
+        bridge interface for every configured interface on the machines. The
+        created bridges will be removed once the machines are released.
+        (Default: False)
+
+        @param (boolean) "bridge_stp" [required=false] Optionally turn spanning
+        tree protocol on or off for the bridges created on every configured
+        interface.  (Default: off)
+
+        @param (int) "bridge_fd" [required=false] Optionally adjust the forward
+        delay to time seconds.  (Default: 15)
+
+        @param (boolean) "dry_run" [required=false] Optional boolean to
+        indicate that the machines should not actually be acquired. Defaults
+        to False.
+
+        @param (boolean) "verbose" [required=false] Optional boolean to
+        indicate that the user would like additional verbosity in the
+        constraints_by_type field of each machine.
+
+        @success (http-status-code) "200" 200
+        @success (json) "success-json" A JSON object containing a list of the
+        newly allocated machine objects.
+        @success-example "success-json" [exkey=machines-placeholder]
+        placeholder text
+
+        @error (http-status-code) "409" 409
+        @error (content) "no-match" Fewer than ``count`` machines matching the
+        given constraints could be found.
+        """
+        count = get_mandatory_param(
+            request.POST, "count", validator=validators.Int(min=1)
+        )
+        form = AcquireNodeForm(data=request.data)
+        input_constraints = [
+            param
+            for param in request.data.lists()
+            if param[0] not in ("op", "count")
+        ]
+        maaslog.info(
+            "Request from user %s to acquire %d machines with constraints: %s",
+            request.user.username,
+            count,
+            str(input_constraints),
+        )
+        options = get_allocation_options(request)
+        verbose = get_optional_param(
+            request.POST, "verbose", default=False, validator=StringBool
+        )
+        dry_run = get_optional_param(
+            request.POST, "dry_run", default=False, validator=StringBool
+        )
+
+        if not form.is_valid():
+            raise MAASAPIValidationError(form.errors)
+
+        with locks.node_acquire:
+            machines = (
+                self.base_model.objects.get_available_machines_for_acquisition(
+                    request.user
+                )
+            )
+            machines, storage, interfaces = form.filter_nodes(machines)
+            machines = form.lock_nodes(machines, count)
+            if len(machines) < count:
+                constraints = form.describe_constraints()
+                if constraints == "":
+                    message = "Only %d of %d machines available." % (
+                        len(machines),
+                        count,
+                    )
+                else:
+                    message = (
+                        "Only %d of %d machines available match constraints: "
+                        '%s (resolved to "%s")'
+                        % (
+                            len(machines),
+                            count,
+                            str(input_constraints),
+                            constraints,
+                        )
+                    )
+                raise NodesNotAvailable(message)
+            for machine in machines:
+                if not dry_run:
+                    machine.acquire(
+                        request.user,
+                        agent_name=options.agent_name,
+                        comment=options.comment,
+                        bridge_all=options.bridge_all,
+                        bridge_type=options.bridge_type,
+                        bridge_stp=options.bridge_stp,
+                        bridge_fd=options.bridge_fd,
+                    )
+                set_allocation_constraints(
+                    machine, storage, interfaces, verbose
+                )
+            return machines
+
     def _get_chassis_param(self, request):
         power_type_names = [
             pt["name"] for pt in get_all_power_types() if pt["can_probe"]
@@ -2078,6 +2078,97 @@ class TestMachinesAPI(APITestCase.ForUser):
         self.assertIn(str(machine.id), verbose_interfaces["needed"])
         self.assertIn(iface.id, verbose_interfaces["needed"][str(machine.id)])
 
+    def test_POST_allocate_batch_allocates_count_machines(self):
+        machines = [
+            factory.make_Node(
+                status=NODE_STATUS.READY, owner=None, with_boot_disk=True
+            )
+            for _ in range(3)
+        ]
+        response = self.client.post(
+            self.machines_url, {"op": "allocate_batch", "count": 2}
+        )
+        self.assertEqual(http.client.OK, response.status_code)
+        parsed_result = json.loads(
+            response.content.decode(settings.DEFAULT_CHARSET)
+        )
+        self.assertEqual(2, len(parsed_result))
+        allocated = Machine.objects.filter(
+            system_id__in=[machine["system_id"] for machine in parsed_result]
+        )
+        for machine in allocated:
+            self.assertEqual(NODE_STATUS.ALLOCATED, machine.status)
+            self.assertEqual(self.user, machine.owner)
+        self.assertEqual(
+            1,
+            Machine.objects.filter(
+                id__in=[machine.id for machine in machines],
+                status=NODE_STATUS.READY,
+            ).count(),
+        )
+
+    def test_POST_allocate_batch_allocates_machines_by_tags(self):
+        tag = factory.make_Tag("fast")
+        tagged = []
+        for _ in range(2):
+            machine = factory.make_Node(
+                status=NODE_STATUS.READY, owner=None, with_boot_disk=True
+            )
+            machine.tags.add(tag)
+            tagged.append(machine.system_id)
+        factory.make_Node(
+            status=NODE_STATUS.READY, owner=None, with_boot_disk=True
+        )
+        response = self.client.post(
+            self.machines_url,
+            {"op": "allocate_batch", "count": 2, "tags": ["fast"]},
+        )
+        self.assertEqual(http.client.OK, response.status_code)
+        parsed_result = json.loads(
+            response.content.decode(settings.DEFAULT_CHARSET)
+        )
+        self.assertCountEqual(
+            tagged, [machine["system_id"] for machine in parsed_result]
+        )
+
+    def test_POST_allocate_batch_allocates_nothing_if_not_enough(self):
+        machine = factory.make_Node(
+            status=NODE_STATUS.READY, owner=None, with_boot_disk=True
+        )
+        response = self.client.post(
+            self.machines_url, {"op": "allocate_batch", "count": 2}
+        )
+        self.assertEqual(http.client.CONFLICT, response.status_code)
+        self.assertEqual(
+            "Only 1 of 2 machines available.",
+            response.content.decode(settings.DEFAULT_CHARSET),
+        )
+        self.assertEqual(NODE_STATUS.READY, reload_object(machine).status)
+
+    def test_POST_allocate_batch_dry_run_does_not_allocate(self):
+        machine = factory.make_Node(
+            status=NODE_STATUS.READY, owner=None, with_boot_disk=True
+        )
+        response = self.client.post(
+            self.machines_url,
+            {"op": "allocate_batch", "count": 1, "dry_run": "true"},
+        )
+        self.assertEqual(http.client.OK, response.status_code)
+        parsed_result = json.loads(
+            response.content.decode(settings.DEFAULT_CHARSET)
+        )
+        self.assertEqual(
+            [machine.system_id],
+            [machine["system_id"] for machine in parsed_result],
+        )
+        self.assertEqual(NODE_STATUS.READY, reload_object(machine).status)
+
+    def test_POST_allocate_batch_requires_count(self):
+        response = self.client.post(
+            self.machines_url, {"op": "allocate_batch"}
+        )
+        self.assertEqual(http.client.BAD_REQUEST, response.status_code)
+
     def test_POST_allocate_fails_without_all_tags(self):
         # Asking for particular tags does not acquire if no machine has all
         # tags.
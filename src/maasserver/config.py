@@ -104,6 +104,32 @@ class RegionConfiguration(Configuration, metaclass=RegionConfigurationMeta):
         "Number of keeaplives that can be lost before connection is reset.",
         Int(if_missing=2),
     )
+    database_pool_size = ConfigurationOption(
+        "database_pool_size",
+        "The number of persistent connections kept by the API server pool.",
+        Int(if_missing=3, accept_python=False, min=1),
+    )
+    database_pool_max_overflow = ConfigurationOption(
+        "database_pool_max_overflow",
+        "The number of connections the API server pool can open on top of "
+        "database_pool_size under load.",
+        Int(if_missing=10, accept_python=False, min=0),
+    )
+    database_pool_timeout = ConfigurationOption(
+        "database_pool_timeout",
+        "Time (in seconds) to wait for a connection from the API server pool.",
+        Int(if_missing=30, accept_python=False, min=1),
+    )
+    database_pool_pre_ping = ConfigurationOption(
+        "database_pool_pre_ping",
+        "Whether API server connections are checked before being used.",
+        OneWayStringBool(if_missing=False),
+    )
+    database_statement_cache_size = ConfigurationOption(
+        "database_statement_cache_size",
+        "The number of prepared statements cached per API server connection.",
+        Int(if_missing=100, accept_python=False, min=0),
+    )
 
     # Vault options.
     vault_url = ConfigurationOption(
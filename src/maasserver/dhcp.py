@@ -5,12 +5,16 @@
 
 import base64
 from collections import defaultdict, namedtuple
+from copy import deepcopy
 from itertools import groupby
 from operator import itemgetter
+import threading
 from typing import Iterable, Optional, Union
 
 from django.conf import settings
-from django.db.models import Q
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import Count, Max, Q, TextField, Value
+from django.db.models.functions import Cast, Concat, MD5
 from netaddr import IPAddress, IPNetwork
 from twisted.internet.defer import inlineCallbacks
 
@@ -23,6 +27,7 @@ from maasserver.enum import (
     INTERFACE_TYPE,
     IPADDRESS_TYPE,
     IPRANGE_TYPE,
+    NODE_TYPE,
     SERVICE_STATUS,
 )
 from maasserver.exceptions import UnresolvableHost
@@ -30,6 +35,7 @@ from maasserver.models import (
     Config,
     DHCPSnippet,
     Domain,
+    IPRange,
     RackController,
     ReservedIP,
     Service,
@@ -624,6 +630,86 @@ def get_default_dns_servers(rack_controller, subnet, use_rack_proxy=True):
     return dns_servers
 
 
+class DHCPConfigFragmentCache:
+    """Cache of the fragments of the DHCP configuration.
+
+    Each fragment is stored along with the dependencies it was computed
+    from: a hashable summary of the rows it was built from. A fragment is
+    only computed again when its dependencies change, so a change to one
+    VLAN only regenerates the fragments of that VLAN.
+    """
+
+    def __init__(self):
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, dependencies, compute):
+        """Return the fragment for `key`.
+
+        :param dependencies: The current dependencies of the fragment.
+        :param compute: Callable computing the fragment when the cached one
+            is missing or out of date.
+        :return: A copy of the fragment, which the caller can modify.
+        """
+        with self._lock:
+            cached = self._fragments.get(key)
+        if cached is not None and cached[0] == dependencies:
+            return deepcopy(cached[1])
+        fragment = compute()
+        with self._lock:
+            self._fragments[key] = (dependencies, fragment)
+        return deepcopy(fragment)
+
+    def clear(self):
+        """Forget all the cached fragments."""
+        with self._lock:
+            self._fragments.clear()
+
+
+dhcp_config_fragments = DHCPConfigFragmentCache()
+
+
+def _make_aggregate_dependencies(queryset, *fields):
+    """Summarise the rows of `queryset` as dependencies of a fragment.
+
+    The count catches deleted rows, the maximums catch added and modified
+    ones.
+    """
+    aggregates = {"count": Count("id")}
+    for field in fields:
+        aggregates[f"max_{field}"] = Max(field)
+    return tuple(sorted(queryset.aggregate(**aggregates).items()))
+
+
+def _make_content_dependencies(queryset, *fields):
+    """Summarise the values of `fields` in the rows of `queryset`.
+
+    Unlike `_make_aggregate_dependencies`, this catches rows changed with
+    `QuerySet.update()`, which doesn't bump their `updated` field.
+    """
+    values = [Value("|")] * (len(fields) * 2 - 1)
+    values[::2] = [Cast(field, TextField()) for field in fields]
+    return queryset.aggregate(
+        digest=MD5(StringAgg(Concat(*values), delimiter=",", ordering=fields))
+    )["digest"]
+
+
+def _make_snippets_dependencies(dhcp_snippets):
+    """Summarise `dhcp_snippets` as dependencies of a fragment."""
+    return tuple(
+        (
+            dhcp_snippet.id,
+            dhcp_snippet.name,
+            dhcp_snippet.description,
+            dhcp_snippet.value_id,
+            dhcp_snippet.node_id,
+            dhcp_snippet.subnet_id,
+            dhcp_snippet.iprange_id,
+        )
+        for dhcp_snippet in dhcp_snippets
+    )
+
+
 def get_dhcp_configure_for(
     ip_version: int,
     rack_controller,
@@ -634,8 +720,15 @@ def get_dhcp_configure_for(
     search_list=None,
     dhcp_snippets: Iterable = None,
     use_rack_proxy=True,
+    fragments: Optional[DHCPConfigFragmentCache] = None,
 ):
-    """Get the DHCP configuration for `ip_version`."""
+    """Get the DHCP configuration for `ip_version`.
+
+    :param fragments: The cache of configuration fragments to use; defaults
+        to the one shared by the region.
+    """
+    if fragments is None:
+        fragments = dhcp_config_fragments
     # Select the best interface for this VLAN. This is an interface that
     # at least has an IP address.
     interfaces = get_interfaces_with_ip_on_vlan(
@@ -667,17 +760,22 @@ def get_dhcp_configure_for(
         if dhcp_snippet.node is not None
     ]
 
-    # Generate the shared network configurations.
-    subnet_configs = []
-    for subnet in subnets:
-        maas_dns_servers = get_default_dns_servers(
+    # The DNS servers depend on how the MAAS URL resolves, which isn't
+    # tracked in the database, so they are always computed and form part of
+    # the dependencies of the shared network fragment instead.
+    maas_dns_servers = {
+        subnet.id: get_default_dns_servers(
             rack_controller, subnet, use_rack_proxy
         )
-        subnet_configs.append(
+        for subnet in subnets
+    }
+
+    def make_subnet_configs():
+        subnet_configs = [
             make_subnet_config(
                 rack_controller,
                 subnet,
-                maas_dns_servers,
+                maas_dns_servers[subnet.id],
                 ntp_servers,
                 domain,
                 search_list,
@@ -685,13 +783,78 @@ def get_dhcp_configure_for(
                 subnets_dhcp_snippets,
                 peer_rack,
             )
-        )
+            for subnet in subnets
+        ]
+        return sorted(subnet_configs, key=itemgetter("subnet"))
+
+    # Generate the shared network configurations.
+    subnet_configs = fragments.get(
+        ("subnets", rack_controller.id, vlan.id, ip_version),
+        (
+            vlan.updated,
+            peer_name,
+            None if peer_rack is None else peer_rack.id,
+            tuple(
+                (subnet.id, subnet.updated, tuple(maas_dns_servers[subnet.id]))
+                for subnet in subnets
+            ),
+            _make_snippets_dependencies(subnets_dhcp_snippets),
+            _make_aggregate_dependencies(
+                IPRange.objects.filter(subnet__in=subnets), "id", "updated"
+            ),
+            _make_aggregate_dependencies(
+                StaticIPAddress.objects.filter(
+                    interface__node_config__node__node_type__in=(
+                        NODE_TYPE.RACK_CONTROLLER,
+                        NODE_TYPE.REGION_CONTROLLER,
+                        NODE_TYPE.REGION_AND_RACK_CONTROLLER,
+                    )
+                ),
+                "id",
+                "updated",
+                "interface__updated",
+                "interface__node_config__node__updated",
+            ),
+            repr(ntp_servers),
+            domain.name,
+            None if search_list is None else tuple(search_list),
+        ),
+        make_subnet_configs,
+    )
 
-    # Generate the hosts for all subnets.
-    hosts = make_hosts_for_subnets(subnets, nodes_dhcp_snippets)
+    # Generate the hosts for all subnets. They don't depend on the rack
+    # controller, so both racks of a VLAN share them.
+    hosts = fragments.get(
+        ("hosts", vlan.id, ip_version),
+        (
+            tuple(subnet.id for subnet in subnets),
+            _make_snippets_dependencies(nodes_dhcp_snippets),
+            _make_aggregate_dependencies(
+                StaticIPAddress.objects.filter(subnet__in=subnets),
+                "id",
+                "updated",
+                "interface__updated",
+                "interface__parents__updated",
+                "interface__node_config__node__updated",
+            ),
+            # Claiming and releasing addresses update them in bulk.
+            _make_content_dependencies(
+                StaticIPAddress.objects.filter(subnet__in=subnets),
+                "id",
+                "ip",
+                "alloc_type",
+                "temp_expires_on",
+                "interface__id",
+            ),
+            _make_aggregate_dependencies(
+                ReservedIP.objects.filter(subnet__in=subnets), "id", "updated"
+            ),
+        ),
+        lambda: make_hosts_for_subnets(subnets, nodes_dhcp_snippets),
+    )
     return (
         peer_config,
-        sorted(subnet_configs, key=itemgetter("subnet")),
+        subnet_configs,
         hosts,
         None if interface is None else interface.name,
     )
@@ -731,6 +894,11 @@ def get_dhcp_configuration(rack_controller, test_dhcp_snippet=None):
         # disabled snippet
         if not replaced_snippet:
             dhcp_snippets.append(test_dhcp_snippet)
+        # The snippet being tested isn't saved, so the cached fragments
+        # can't tell it apart from the saved one.
+        fragments = DHCPConfigFragmentCache()
+    else:
+        fragments = dhcp_config_fragments
     global_dhcp_snippets = [
         make_dhcp_snippet(dhcp_snippet)
         for dhcp_snippet in dhcp_snippets
@@ -778,6 +946,7 @@ def get_dhcp_configuration(rack_controller, test_dhcp_snippet=None):
                 search_list=search_list,
                 dhcp_snippets=dhcp_snippets,
                 use_rack_proxy=use_rack_proxy,
+                fragments=fragments,
             )
             failover_peer, subnets, hosts, interface = config
             if failover_peer is not None:
@@ -804,6 +973,7 @@ def get_dhcp_configuration(rack_controller, test_dhcp_snippet=None):
                 search_list=search_list,
                 dhcp_snippets=dhcp_snippets,
                 use_rack_proxy=use_rack_proxy,
+                fragments=fragments,
             )
             failover_peer, subnets, hosts, interface = config
             if failover_peer is not None:
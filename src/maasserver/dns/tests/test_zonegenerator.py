@@ -18,6 +18,7 @@ from maasserver.dns.zonegenerator import (
     get_dns_server_addresses,
     get_hostname_dnsdata_mapping,
     get_hostname_ip_mapping,
+    HostnameIPMappingIndex,
     InternalDomain,
     InternalDomainResourse,
     InternalDomainResourseRecord,
@@ -228,6 +229,40 @@ class TestLazyDict(TestCase):
         self.assertEqual({key1: key1, key2: key2}, value_dict)
 
 
+class TestHostnameIPMappingIndex(TestCase):
+    """Tests for `HostnameIPMappingIndex`."""
+
+    def test_filter_network_returns_addresses_in_network(self):
+        mapping = {
+            "host1": HostnameIPMapping("abc", 30, {"10.0.0.1", "10.0.1.1"}),
+            "host2": HostnameIPMapping(None, 60, {"10.0.1.2", "2001:db8::1"}),
+            "host3": HostnameIPMapping(None, 30, {"10.0.2.1"}),
+        }
+        index = HostnameIPMappingIndex(mapping)
+        self.assertEqual(
+            {
+                "host1": HostnameIPMapping("abc", 30, {"10.0.1.1"}),
+                "host2": HostnameIPMapping(None, 60, {"10.0.1.2"}),
+            },
+            index.filter_network(IPNetwork("10.0.1.0/24")),
+        )
+        self.assertEqual(
+            {"host2": HostnameIPMapping(None, 60, {"2001:db8::1"})},
+            index.filter_network(IPNetwork("2001:db8::/64")),
+        )
+        self.assertEqual({}, index.filter_network(IPNetwork("10.1.0.0/16")))
+
+    def test_filter_network_does_not_share_mappings(self):
+        mapping = {"host": HostnameIPMapping(None, 30, {"10.0.0.1"})}
+        index = HostnameIPMappingIndex(mapping)
+        filtered = index.filter_network(IPNetwork("10.0.0.0/24"))
+        filtered["host"].ips.add("10.0.0.2")
+        self.assertEqual(
+            {"host": HostnameIPMapping(None, 30, {"10.0.0.1"})},
+            index.filter_network(IPNetwork("10.0.0.0/24")),
+        )
+
+
 class TestGetHostnameMapping(MAASServerTestCase):
     """Test for `get_hostname_ip_mapping`."""
 
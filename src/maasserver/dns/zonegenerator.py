@@ -4,6 +4,7 @@
 """DNS zone generator."""
 
 
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from collections.abc import Iterable, Sequence
 from itertools import chain
@@ -195,6 +196,54 @@ def get_dns_search_paths():
     }
 
 
+class HostnameIPMappingIndex:
+    """Index of a hostname to IP mapping, sorted by address.
+
+    Finding the records within a network is a binary search on the sorted
+    addresses, rather than a scan of the whole mapping, which matters when a
+    large subnet is split into many reverse zones.
+    """
+
+    def __init__(self, mapping: dict[str, HostnameIPMapping]):
+        self._mapping = mapping
+        entries = sorted(
+            (
+                (
+                    ((address := IPAddress(ip)).version, address.value),
+                    ip,
+                    hostname,
+                )
+                for hostname, info in mapping.items()
+                for ip in info.ips
+            ),
+            key=lambda entry: entry[0],
+        )
+        self._keys = [key for key, _, _ in entries]
+        self._entries = [(ip, hostname) for _, ip, hostname in entries]
+
+    def filter_network(
+        self, network: IPNetwork
+    ) -> dict[str, HostnameIPMapping]:
+        """Return the mapping restricted to the addresses in `network`."""
+        start = bisect_left(self._keys, (network.version, network.first))
+        end = bisect_right(self._keys, (network.version, network.last))
+        ips_in_net = defaultdict(set)
+        for ip, hostname in self._entries[start:end]:
+            ips_in_net[hostname].add(ip)
+        net_mappings = {}
+        for hostname, ips in ips_in_net.items():
+            info = self._mapping[hostname]
+            net_mappings[hostname] = HostnameIPMapping(
+                info.system_id,
+                info.ttl,
+                ips,
+                info.node_type,
+                info.dnsresource_id,
+                info.user_id,
+            )
+        return net_mappings
+
+
 class ZoneGenerator:
     """Generate zones describing those relating to the given domains and
     subnets.
@@ -427,26 +476,6 @@ class ZoneGenerator:
                 break
         return new_networks
 
-    @staticmethod
-    def _filter_mapping_for_network(
-        network: IPNetwork, mappings: dict[str, HostnameIPMapping]
-    ):
-        net_mappings = {}
-        for k, v in mappings.items():
-            if ips_in_net := set(
-                ip for ip in v.ips if IPAddress(ip) in network
-            ):
-                net_mappings[k] = HostnameIPMapping(
-                    v.system_id,
-                    v.ttl,
-                    ips_in_net,
-                    v.node_type,
-                    v.dnsresource_id,
-                    v.user_id,
-                )
-
-        return net_mappings
-
     @staticmethod
     def _generate_glue_nets(subnets: list[Subnet]):
         # Generate the list of parent networks for rfc2317 glue.  Note that we
@@ -553,6 +582,7 @@ class ZoneGenerator:
         # just do it once and be happy.  LP#1600259
         if len(subnets):
             mappings["reverse"] = mappings[Subnet.objects.first()]
+            reverse_index = HostnameIPMappingIndex(mappings["reverse"])
 
         # For each of the zones that we are generating (one or more per
         # subnet), compile the zone from:
@@ -591,9 +621,7 @@ class ZoneGenerator:
                 # entries for the subnet when we actually generate the zonefile.
                 # If we get here, then we have subnets, so we noticed that above
                 # and created mappings['reverse'].  LP#1600259
-                mapping = ZoneGenerator._filter_mapping_for_network(
-                    network, mappings["reverse"]
-                )
+                mapping = reverse_index.filter_network(network)
 
                 glue = ZoneGenerator._find_glue_nets(network, rfc2317_glue)
                 domain_updates = [
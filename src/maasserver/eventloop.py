@@ -162,6 +162,14 @@ def make_ActiveDiscoveryService(postgresListener):
     return ActiveDiscoveryService(reactor, postgresListener)
 
 
+def make_BootConfigCacheService(postgresListener):
+    from maasserver.regiondservices.boot_config_cache import (
+        BootConfigCacheService,
+    )
+
+    return BootConfigCacheService(postgresListener)
+
+
 def make_ReverseDNSService(postgresListener):
     from maasserver.regiondservices.reverse_dns import ReverseDNSService
 
@@ -256,6 +264,14 @@ def make_VaultSecretsCleanupService():
     return VaultSecretsCleanupService(reactor)
 
 
+def make_EventPartitionsService():
+    from maasserver.regiondservices.event_partitions import (
+        EventPartitionsService,
+    )
+
+    return EventPartitionsService(reactor)
+
+
 class MAASServices(MultiService):
     def __init__(self, eventloop):
         self.eventloop = eventloop
@@ -392,6 +408,11 @@ class RegionEventLoop:
             "factory": make_ActiveDiscoveryService,
             "requires": ["postgres-listener-worker"],
         },
+        "boot-config-cache": {
+            "only_on_master": False,
+            "factory": make_BootConfigCacheService,
+            "requires": ["postgres-listener-worker"],
+        },
         "reverse-dns": {
             "only_on_master": True,
             "factory": make_ReverseDNSService,
@@ -449,6 +470,11 @@ class RegionEventLoop:
             "factory": make_VaultSecretsCleanupService,
             "requires": [],
         },
+        "event-partitions": {
+            "only_on_master": True,
+            "factory": make_EventPartitionsService,
+            "requires": [],
+        },
         "temporal": {
             "only_on_master": True,
             "factory": make_TemporalService,
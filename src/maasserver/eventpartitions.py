@@ -0,0 +1,160 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""
+Event table partitions
+
+The event table is partitioned by range on its `created` column. Partitions
+always cover the whole timeline without gaps, so that any event can be
+inserted:
+
+- the oldest partition starts at MINVALUE; it's the pre-partitioning table
+  (`maasserver_event_legacy`) until that expires, then `maasserver_event_old`;
+- one partition per month, named `maasserver_event_pYYYYMM`;
+- `maasserver_event_future` runs from the end of the last month to MAXVALUE.
+
+Months are added by splitting the future partition, and expired events are
+removed by dropping whole partitions.
+"""
+
+from collections import namedtuple
+from contextlib import closing
+from datetime import datetime, timezone
+
+from django.db import connection
+
+EVENT_TABLE = "maasserver_event"
+OLD_PARTITION = "maasserver_event_old"
+FUTURE_PARTITION = "maasserver_event_future"
+
+# The number of months after the current one to create partitions for.
+EVENT_PARTITION_MONTHS_AHEAD = 2
+
+# `start` and `end` are None for the MINVALUE and MAXVALUE bounds.
+EventPartition = namedtuple("EventPartition", ("name", "start", "end"))
+
+
+def month_start(when, months=0):
+    """Return the start of the month of `when`, in UTC, plus `months`."""
+    when = when.astimezone(timezone.utc)
+    month = when.year * 12 + when.month - 1 + months
+    return datetime(month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def get_event_partitions():
+    """Return the partitions of the event table, ordered by time."""
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(
+            """\
+            SELECT
+              child.relname,
+              substring(
+                pg_get_expr(child.relpartbound, child.oid)
+                FROM 'FROM \\(''([^'']+)''\\)'
+              )::timestamptz,
+              substring(
+                pg_get_expr(child.relpartbound, child.oid)
+                FROM 'TO \\(''([^'']+)''\\)'
+              )::timestamptz
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [EVENT_TABLE],
+        )
+        partitions = [EventPartition(*row) for row in cursor.fetchall()]
+    return sorted(
+        partitions,
+        key=lambda partition: (partition.start is not None, partition.start),
+    )
+
+
+def ensure_event_partitions(now, months_ahead=EVENT_PARTITION_MONTHS_AHEAD):
+    """Create monthly partitions up to `months_ahead` months after `now`.
+
+    The future partition is detached, and the missing months and a new
+    future partition after them are attached in its place. Events that were
+    already in the future partition are copied into the new partitions
+    before they're attached, so that the triggers on the event table don't
+    fire (and notify) again for them.
+
+    :return: The names of the partitions created.
+    """
+    [*_, future] = get_event_partitions()
+    end = month_start(now, months_ahead + 1)
+    if future.start >= end:
+        return []
+
+    partitions = []
+    start = future.start
+    while start < end:
+        next_start = month_start(start, 1)
+        partitions.append(
+            EventPartition(f"{EVENT_TABLE}_p{start:%Y%m}", start, next_start)
+        )
+        start = next_start
+    partitions.append(EventPartition(FUTURE_PARTITION, end, None))
+
+    detached = f"{FUTURE_PARTITION}_detached"
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(
+            f"ALTER TABLE {EVENT_TABLE} DETACH PARTITION {future.name}; "
+            f"ALTER TABLE {future.name} RENAME TO {detached}"
+        )
+        for partition in partitions:
+            cursor.execute(
+                f"CREATE TABLE {partition.name} "
+                f"(LIKE {EVENT_TABLE} INCLUDING DEFAULTS, PRIMARY KEY (id))"
+            )
+            if partition.end is None:
+                cursor.execute(
+                    f"INSERT INTO {partition.name} "
+                    f"SELECT * FROM {detached} WHERE created >= %s; "
+                    f"ALTER TABLE {EVENT_TABLE} ATTACH PARTITION "
+                    f"{partition.name} FOR VALUES FROM (%s) TO (MAXVALUE)",
+                    [partition.start, partition.start],
+                )
+            else:
+                cursor.execute(
+                    f"INSERT INTO {partition.name} "
+                    f"SELECT * FROM {detached} "
+                    "WHERE created >= %s AND created < %s; "
+                    f"ALTER TABLE {EVENT_TABLE} ATTACH PARTITION "
+                    f"{partition.name} FOR VALUES FROM (%s) TO (%s)",
+                    [
+                        partition.start,
+                        partition.end,
+                        partition.start,
+                        partition.end,
+                    ],
+                )
+        cursor.execute(f"DROP TABLE {detached}")
+    return [partition.name for partition in partitions[:-1]]
+
+
+def drop_expired_event_partitions(cutoff):
+    """Drop the partitions holding only events created before `cutoff`.
+
+    The dropped partitions are replaced by an empty one starting at
+    MINVALUE, so that events older than the retention period can still be
+    recorded until the next time partitions are dropped.
+
+    :return: The names of the partitions dropped.
+    """
+    expired = [
+        partition
+        for partition in get_event_partitions()
+        if partition.end is not None and partition.end <= cutoff
+    ]
+    if not expired:
+        return []
+
+    with closing(connection.cursor()) as cursor:
+        for partition in expired:
+            cursor.execute(f"DROP TABLE {partition.name}")
+        cursor.execute(
+            f"CREATE TABLE {OLD_PARTITION} PARTITION OF {EVENT_TABLE} "
+            "(PRIMARY KEY (id)) FOR VALUES FROM (MINVALUE) TO (%s)",
+            [expired[-1].end],
+        )
+    return [partition.name for partition in expired]
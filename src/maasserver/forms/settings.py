@@ -812,6 +812,20 @@ CONFIG_ITEMS = {
             "min_value": 1,
         },
     },
+    "event_retention_days": {
+        "default": 0,
+        "form": forms.IntegerField,
+        "form_kwargs": {
+            "required": False,
+            "label": "Number of days events are kept for (default: 0).",
+            "min_value": 0,
+            "help_text": (
+                "Events, including audit events, are removed a month at a "
+                "time once all of them are older than this. Set to 0 to "
+                "keep all events."
+            ),
+        },
+    },
     "subnet_ip_exhaustion_threshold_count": {
         "default": 16,
         "form": forms.IntegerField,
@@ -908,6 +922,23 @@ CONFIG_ITEMS = {
             ),
         },
     },
+    "prometheus_stats_max_age": {
+        "default": 60,
+        "form": forms.IntegerField,
+        "form_kwargs": {
+            "label": (
+                "Maximum age of the stats served by the Prometheus metrics "
+                "endpoint (default: 60 seconds)."
+            ),
+            "required": False,
+            "min_value": 0,
+            "help_text": (
+                "Stats older than this are refreshed in the background, "
+                "while scrapes get the current values. Set to 0 to compute "
+                "the stats on every scrape."
+            ),
+        },
+    },
     "promtail_enabled": {
         "default": False,
         "form": forms.BooleanField,
@@ -4,7 +4,7 @@
 """Listens for NOTIFY events from the postgres database."""
 
 
-from collections import defaultdict, deque
+from collections import defaultdict
 from contextlib import contextmanager
 from errno import ENOENT
 import json
@@ -27,6 +27,7 @@ from twisted.logger import Logger
 from twisted.python.failure import Failure
 from zope.interface import implementer
 
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.utils.enum import map_enum
 from provisioningserver.utils.events import EventGroup
 from provisioningserver.utils.twisted import callOut, suppress, synchronous
@@ -78,13 +79,27 @@ class PostgresListenerService(Service):
     HANDLE_NOTIFY_DELAY = 0.5
     CHANNEL_REGISTRAR_DELAY = 0.5
 
+    # Maximum number of handlers running at the same time when handling
+    # notifications. The notifications of a channel are always passed to
+    # each of its handlers in the order they were received.
+    HANDLER_CONCURRENCY = 8
+
     def __init__(self, alias="default"):
         self.alias = alias
         self.listeners = defaultdict(list)
         self.autoReconnect = False
         self.connection = None
         self.connectionFileno = None
-        self.notifications = deque()
+        self.clock = reactor
+        # Pending notifications, in the order they were received, mapped to
+        # the time they were first received. Duplicates are dropped.
+        self.notifications = {}
+        # Handlers called once with all the pending notifications of their
+        # channel, rather than once for each notification.
+        self.batchHandlers = defaultdict(list)
+        # Seconds that the notifications of a channel are left to accumulate
+        # before being handled.
+        self.windows = {}
         self.notifier = task.LoopingCall(self.handleNotifies)
         self.notifierDone = None
         self.connecting = None
@@ -179,11 +194,17 @@ class PostgresListenerService(Service):
         finally:
             self.connectionFileno = None
 
-    def register(self, channel, handler):
+    def register(self, channel, handler, batch=False, window=None):
         """Register listening for notifications from a channel.
 
         When a notification is received for that `channel` the `handler` will
         be called with the action and object id.
+
+        :param batch: Call `handler` once with a list of `(action, object id)`
+            tuples for all the pending notifications of the channel instead.
+        :param window: Seconds to let the notifications of the channel
+            accumulate before handling them. Duplicate notifications received
+            meanwhile are handled once.
         """
         if self.shutting_down:
             raise PostgresListenerRegistrationError(
@@ -191,6 +212,11 @@ class PostgresListenerService(Service):
             )
         self.log.debug(f"Register on {channel} with handler {handler}")
         handlers = self.listeners[channel]
+        if self.isSystemChannel(channel) and (batch or window):
+            # System messages are passed to the handler as they arrive.
+            raise PostgresListenerRegistrationError(
+                "System channel '%s' cannot be batched." % channel
+            )
         if self.isSystemChannel(channel) and len(handlers) > 0:
             # A system can only be registered once. This is because the
             # message is passed directly to the handler and the `doRead`
@@ -202,6 +228,12 @@ class PostgresListenerService(Service):
             )
         else:
             handlers.append(handler)
+            if batch:
+                self.batchHandlers[channel].append(handler)
+            if window:
+                self.windows[channel] = max(
+                    window, self.windows.get(channel, 0)
+                )
         self.runChannelRegistrar()
 
     def unregister(self, channel, handler):
@@ -224,6 +256,8 @@ class PostgresListenerService(Service):
         handlers = self.listeners[channel]
         if handler in handlers:
             handlers.remove(handler)
+            if handler in self.batchHandlers.get(channel, ()):
+                self.batchHandlers[channel].remove(handler)
         else:
             raise PostgresListenerUnregistrationError(
                 "Handler is not registered on that channel '%s'." % channel
@@ -231,6 +265,8 @@ class PostgresListenerService(Service):
         if len(handlers) == 0:
             # Channels have already been registered. Unregister the channel.
             del self.listeners[channel]
+            self.batchHandlers.pop(channel, None)
+            self.windows.pop(channel, None)
         self.runChannelRegistrar()
 
     @synchronous
@@ -445,12 +481,12 @@ class PostgresListenerService(Service):
             return succeed(None)
 
     def runHandleNotify(self, delay=0, clock=reactor):
-        """Defer later the `handleNotify`."""
+        """Defer later the `handleNotifies`."""
         if not self.notifier.running:
             self.notifierDone = self.notifier.start(delay, now=False)
 
     def cancelHandleNotify(self):
-        """Cancel the deferred `handleNotify` call."""
+        """Cancel the deferred `handleNotifies` call."""
         if self.notifier.running:
             self.notifier.stop()
             return self.notifierDone
@@ -458,46 +494,91 @@ class PostgresListenerService(Service):
             return succeed(None)
 
     def handleNotifies(self, clock=reactor):
-        """Process all notify message in the notifications set."""
+        """Process the notify messages in the notifications queue.
 
-        def gen_notifications(notifications):
-            while notifications:
-                yield notifications.popleft()
+        The notifications are grouped by channel. The notifications of a
+        channel with a coalescing window are left in the queue until the
+        oldest of them is old enough. At most `HANDLER_CONCURRENCY` handlers
+        run at the same time.
+        """
+        if not self.notifications:
+            return succeed(None)
+        now = self.clock.seconds()
+        notifications, self.notifications = self.notifications, {}
+        ready, held = defaultdict(list), set()
+        for notification, received in notifications.items():
+            try:
+                channel, action = self.convertChannel(notification[0])
+            except PostgresListenerNotifyError:
+                # Log the error and continue processing the remaining
+                # notifications.
+                self.log.failure(
+                    "Failed to convert channel {channel!r}.",
+                    channel=notification[0],
+                )
+                continue
+            if channel not in ready and (
+                channel in held
+                or now - received < self.windows.get(channel, 0)
+            ):
+                # Notifications are queued in the order they were received,
+                # so the first one of a channel is the oldest.
+                held.add(channel)
+                self.notifications[notification] = received
+            else:
+                ready[channel].append((action, notification[1], received))
+        PROMETHEUS_METRICS.update(
+            "maas_listener_notification_queue_length",
+            "set",
+            value=len(self.notifications),
+        )
 
-        return task.coiterate(
-            self.handleNotify(notification, clock=clock)
-            for notification in gen_notifications(self.notifications)
+        calls = (
+            self.runHandler(channel, handler, channel_notifications)
+            for channel, channel_notifications in ready.items()
+            for handler in list(self.listeners.get(channel, ()))
+        )
+        return defer.DeferredList(
+            [
+                task.coiterate(calls)
+                for _ in range(min(len(ready), self.HANDLER_CONCURRENCY))
+            ]
         )
 
-    def handleNotify(self, notification, clock=reactor):
-        """Process a notify message in the notifications set."""
-        channel, payload = notification
-        try:
-            channel, action = self.convertChannel(channel)
-        except PostgresListenerNotifyError:
-            # Log the error and continue processing the remaining
-            # notifications.
-            self.log.failure(
-                "Failed to convert channel {channel!r}.", channel=channel
-            )
+    @defer.inlineCallbacks
+    def runHandler(self, channel, handler, notifications):
+        """Pass `notifications` of `channel` to `handler`, in order.
+
+        :param notifications: A list of `(action, payload, received)` tuples.
+        """
+        if handler in self.batchHandlers.get(channel, ()):
+            payloads = [
+                (action, payload) for action, payload, _ in notifications
+            ]
+            calls = [(notifications, (payloads,))]
         else:
-            defers = []
-            handlers = self.listeners[channel]
-            # XXX: There could be an arbitrary number of listeners. Should we
-            # limit concurrency here? Perhaps even do one at a time.
-            for handler in handlers:
-                d = defer.maybeDeferred(handler, action, payload)
-                d.addErrback(
-                    lambda failure: self.log.failure(
-                        "Failure while handling notification to {channel!r}: "
-                        "{payload!r}",
-                        failure,
-                        channel=channel,
-                        payload=payload,
-                    )
+            calls = [
+                ([notification], notification[:2])
+                for notification in notifications
+            ]
+        for batch, args in calls:
+            now = self.clock.seconds()
+            for _, _, received in batch:
+                PROMETHEUS_METRICS.update(
+                    "maas_listener_notification_latency",
+                    "observe",
+                    value=now - received,
+                    labels={"channel": channel},
+                )
+            try:
+                yield defer.maybeDeferred(handler, *args)
+            except Exception:
+                self.log.failure(
+                    "Failure while handling notification to {channel!r}: "
+                    "{payload!r}",
+                    channel=channel,
+                    payload=[payload for _, payload, _ in batch],
                 )
-                defers.append(d)
-            return defer.DeferredList(defers)
 
     def _process_notifies(self):
         """Add each notify to to the notifications set.
@@ -509,6 +590,7 @@ class PostgresListenerService(Service):
 
         """
         notifies = self.connection.connection.notifies
+        now = self.clock.seconds()
         for notify in notifies:
             if self.isSystemChannel(notify.channel):
                 # System level message; pass it to the registered
@@ -531,11 +613,15 @@ class PostgresListenerService(Service):
                 # Place non-system messages into the queue to be
                 # processed.
                 notification = (notify.channel, notify.payload)
-                if notification not in self.notifications:
-                    self.notifications.append(notification)
+                self.notifications.setdefault(notification, now)
         # Delete the contents of the connection's notifies list so
         # that we don't process them a second time.
         del notifies[:]
+        PROMETHEUS_METRICS.update(
+            "maas_listener_notification_queue_length",
+            "set",
+            value=len(self.notifications),
+        )
 
     @contextmanager
     def listen(self, channel, handler):
@@ -6,6 +6,7 @@
 __all__ = [
     "address_allocation",
     "dns",
+    "event_partitions",
     "eventloop",
     "import_images",
     "node_acquire",
@@ -51,3 +52,6 @@ try_active_discovery = DatabaseLock(10).TRY
 
 # Lock to sync information to RBAC.
 rbac_sync = DatabaseLock(11)
+
+# Lock around creating and dropping partitions of the event table.
+event_partitions = DatabaseXactLock(12)
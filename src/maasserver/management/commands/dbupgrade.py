@@ -65,7 +65,10 @@ class Command(BaseCommand):
                     pg_class.relname LIKE 'maasserver_%' OR
                     pg_class.relname LIKE 'metadataserver_%' OR
                     pg_class.relname LIKE 'auth_%') AND
-                    NOT pg_trigger.tgisinternal
+                    NOT pg_trigger.tgisinternal AND
+                    -- Triggers on partitions are cloned from the partitioned
+                    -- table, and dropped along with it.
+                    NOT pg_class.relispartition
                 ORDER BY tgname::text;
                 """
                 )
@@ -108,8 +108,15 @@ class TestConfigurationSet(MAASTestCase):
             "database_keepalive_count",
             "database_keepalive_interval",
             "database_keepalive_idle",
+            "database_pool_max_overflow",
+            "database_statement_cache_size",
         ):
             value = random.randint(0, 60)
+        elif self.option in (
+            "database_pool_size",
+            "database_pool_timeout",
+        ):
+            value = random.randint(1, 60)
         elif self.option == "num_workers":
             value = random.randint(1, 16)
         elif self.option in [
@@ -117,6 +124,7 @@ class TestConfigurationSet(MAASTestCase):
             "debug_queries",
             "debug_http",
             "database_keepalive",
+            "database_pool_pre_ping",
         ]:
             value = random.choice([True, False])
         else:
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("maasserver", "0336_remove_bmc_name_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubnetFreeRange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_ip", models.GenericIPAddressField(editable=False)),
+                ("end_ip", models.GenericIPAddressField(editable=False)),
+                (
+                    "subnet",
+                    models.ForeignKey(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="maasserver.subnet",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("subnet", "start_ip")},
+            },
+        ),
+    ]
@@ -0,0 +1,178 @@
+from django.db import migrations
+
+# Turn maasserver_event into a table partitioned by range on `created`.
+#
+# The existing table is kept as it is, and attached as the partition for
+# everything up to the end of the current month (or of the month of the
+# latest event), so no rows are copied. Its indexes are renamed so that the
+# partitioned table can use the original names; they are attached to the
+# partitioned indexes rather than rebuilt. A partition up to MAXVALUE takes
+# everything after that, until the event partitions service splits monthly
+# partitions off it.
+#
+# Attaching the existing table checks that all its rows are within the
+# partition's bounds. To avoid scanning it while it's locked, a CHECK
+# constraint matching the bounds is added and validated (which only takes a
+# lock that allows writes) in transactions of their own first; attaching can
+# then rely on the constraint, which is dropped afterwards.
+#
+# Partitioned tables can't have a primary key that doesn't include the
+# partition key, so each partition has its own primary key on `id` instead.
+LEGACY_BOUND_CONSTRAINT = "maasserver_event_legacy_bound"
+
+PARTITION_EVENT_TABLE = [
+    """\
+DROP TRIGGER IF EXISTS event_event_create_notify ON maasserver_event
+""",
+    """\
+DROP TRIGGER IF EXISTS event_event_machine_update_notify ON maasserver_event
+""",
+    """\
+ALTER TABLE maasserver_event RENAME TO maasserver_event_legacy
+""",
+    """\
+ALTER TABLE maasserver_event_legacy ALTER COLUMN id DROP DEFAULT
+""",
+    """\
+ALTER INDEX IF EXISTS maasserver_event_node_id_dd4495a7
+    RENAME TO maasserver_event_legacy_node_id_idx
+""",
+    """\
+ALTER INDEX IF EXISTS maasserver_event_type_id_702a532f
+    RENAME TO maasserver_event_legacy_type_id_idx
+""",
+    """\
+ALTER INDEX IF EXISTS maasserver_event_node_id_id_a62e1358_idx
+    RENAME TO maasserver_event_legacy_node_id_id_idx
+""",
+    """\
+ALTER INDEX IF EXISTS maasserver__node_id_e4a8dd_idx
+    RENAME TO maasserver_event_legacy_node_id_created_id_idx
+""",
+    """\
+ALTER INDEX IF EXISTS maasserver_event__created
+    RENAME TO maasserver_event_legacy_created_idx
+""",
+    """\
+CREATE TABLE maasserver_event (
+    id bigint NOT NULL DEFAULT nextval('maasserver_event_id_seq'),
+    created timestamp with time zone NOT NULL,
+    updated timestamp with time zone NOT NULL,
+    action text NOT NULL,
+    description text NOT NULL,
+    node_id bigint,
+    type_id bigint NOT NULL,
+    node_hostname character varying(255) NOT NULL,
+    username character varying(150) NOT NULL,
+    ip_address inet,
+    user_agent text NOT NULL,
+    endpoint integer NOT NULL,
+    node_system_id character varying(41),
+    user_id integer,
+    CONSTRAINT maasserver_event_node_id_dd4495a7_fk
+        FOREIGN KEY (node_id) REFERENCES maasserver_node(id)
+        DEFERRABLE INITIALLY DEFERRED,
+    CONSTRAINT maasserver_event_type_id_702a532f_fk
+        FOREIGN KEY (type_id) REFERENCES maasserver_eventtype(id)
+        DEFERRABLE INITIALLY DEFERRED
+) PARTITION BY RANGE (created)
+""",
+    """\
+ALTER SEQUENCE maasserver_event_id_seq OWNED BY maasserver_event.id
+""",
+    """\
+CREATE INDEX maasserver_event_node_id_dd4495a7
+    ON maasserver_event (node_id)
+""",
+    """\
+CREATE INDEX maasserver_event_type_id_702a532f
+    ON maasserver_event (type_id)
+""",
+    """\
+CREATE INDEX maasserver_event_node_id_id_a62e1358_idx
+    ON maasserver_event (node_id, id)
+""",
+    """\
+CREATE INDEX maasserver__node_id_e4a8dd_idx
+    ON maasserver_event (node_id, created DESC, id DESC)
+""",
+    """\
+CREATE INDEX maasserver_event__created
+    ON maasserver_event (created)
+""",
+]
+
+
+def get_legacy_bound(cursor, table):
+    """Return the end of the partition for the existing events.
+
+    That's the end of the current month, or of the month of the latest
+    event if that's later. It can only grow over time, so the CHECK
+    constraint added with an earlier bound still implies the later one.
+    """
+    cursor.execute(
+        f"""\
+        SELECT (
+            greatest(
+                date_trunc('month', now() AT TIME ZONE 'UTC'),
+                date_trunc('month', max(created) AT TIME ZONE 'UTC')
+            ) + interval '1 month'
+        ) AT TIME ZONE 'UTC'
+        FROM {table}
+        """
+    )
+    [bound] = cursor.fetchone()
+    return bound
+
+
+def add_legacy_bound_constraint(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        bound = get_legacy_bound(cursor, "maasserver_event")
+        cursor.execute(
+            f"ALTER TABLE maasserver_event "
+            f"ADD CONSTRAINT {LEGACY_BOUND_CONSTRAINT} "
+            "CHECK (created < %s) NOT VALID",
+            [bound],
+        )
+
+
+def partition_event_table(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for statement in PARTITION_EVENT_TABLE:
+            cursor.execute(statement)
+        bound = get_legacy_bound(cursor, "maasserver_event_legacy")
+        cursor.execute(
+            "ALTER TABLE maasserver_event "
+            "ATTACH PARTITION maasserver_event_legacy "
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            [bound],
+        )
+        cursor.execute(
+            "ALTER TABLE maasserver_event_legacy "
+            f"DROP CONSTRAINT {LEGACY_BOUND_CONSTRAINT}"
+        )
+        cursor.execute(
+            "CREATE TABLE maasserver_event_future "
+            "PARTITION OF maasserver_event (PRIMARY KEY (id)) "
+            "FOR VALUES FROM (%s) TO (MAXVALUE)",
+            [bound],
+        )
+
+
+class Migration(migrations.Migration):
+    # Each operation runs in a transaction of its own, so that validating
+    # the constraint doesn't hold the locks taken by the other operations.
+    atomic = False
+
+    dependencies = [
+        ("maasserver", "0337_subnetfreerange"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_legacy_bound_constraint, atomic=True),
+        migrations.RunSQL(
+            "ALTER TABLE maasserver_event "
+            f"VALIDATE CONSTRAINT {LEGACY_BOUND_CONSTRAINT}"
+        ),
+        migrations.RunPython(partition_event_table, atomic=True),
+    ]
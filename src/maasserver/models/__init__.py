@@ -90,6 +90,7 @@ __all__ = [
     "StaticIPAddress",
     "StaticRoute",
     "Subnet",
+    "SubnetFreeRange",
     "Tag",
     "Template",
     "UnknownInterface",
@@ -211,6 +212,7 @@ from maasserver.models.sslkey import SSLKey
 from maasserver.models.staticipaddress import StaticIPAddress
 from maasserver.models.staticroute import StaticRoute
 from maasserver.models.subnet import Subnet
+from maasserver.models.subnetfreerange import SubnetFreeRange
 from maasserver.models.tag import Tag
 from maasserver.models.template import Template
 from maasserver.models.user import create_user
@@ -116,6 +116,8 @@ def get_default_config():
         "max_node_testing_results": 10,
         "max_node_installation_results": 3,
         "max_node_release_results": 3,
+        # Events.
+        "event_retention_days": 0,
         # Notifications.
         "subnet_ip_exhaustion_threshold_count": 16,
         "release_notifications": True,
@@ -126,6 +128,7 @@ def get_default_config():
         "prometheus_enabled": False,
         "prometheus_push_gateway": None,
         "prometheus_push_interval": 60,
+        "prometheus_stats_max_age": 60,
         # Loki Promtail
         "promtail_enabled": False,
         "promtail_port": 5238,
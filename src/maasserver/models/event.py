@@ -22,7 +22,7 @@ from maasserver.enum import ENDPOINT, ENDPOINT_CHOICES
 from maasserver.models.cleansave import CleanSave
 from maasserver.models.eventtype import EventType
 from maasserver.models.node import Node
-from maasserver.models.timestampedmodel import TimestampedModel
+from maasserver.models.timestampedmodel import now, TimestampedModel
 from maasserver.utils.dns import validate_hostname
 from provisioningserver.events import EVENT_DETAILS
 from provisioningserver.logger import get_maas_logger
@@ -34,7 +34,7 @@ maaslog = get_maas_logger("models.event")
 class EventManager(Manager):
     """A utility to manage the collection of Events."""
 
-    def register_event_and_event_type(
+    def make_event_and_event_type(
         self,
         type_name,
         type_description="",
@@ -48,7 +48,11 @@ class EventManager(Manager):
         user_agent="",
         created=None,
     ):
-        """Register EventType if it does not exist, then register the Event."""
+        """Register EventType if it does not exist, then return an unsaved
+        Event.
+
+        Events made this way can be saved together with `bulk_create_events`.
+        """
         if isinstance(system_id, Node):
             node = system_id
         else:
@@ -72,7 +76,7 @@ class EventManager(Manager):
         event_type = EventType.objects.register(
             type_name, type_description, type_level
         )
-        return Event.objects.create(
+        return Event(
             type=event_type,
             node=node,
             node_system_id=node_system_id,
@@ -87,6 +91,49 @@ class EventManager(Manager):
             created=created,
         )
 
+    def register_event_and_event_type(
+        self,
+        type_name,
+        type_description="",
+        type_level=logging.INFO,
+        event_action="",
+        event_description="",
+        system_id=None,
+        user=None,
+        ip_address=None,
+        endpoint=ENDPOINT.API,
+        user_agent="",
+        created=None,
+    ):
+        """Register EventType if it does not exist, then register the Event."""
+        event = self.make_event_and_event_type(
+            type_name,
+            type_description=type_description,
+            type_level=type_level,
+            event_action=event_action,
+            event_description=event_description,
+            system_id=system_id,
+            user=user,
+            ip_address=ip_address,
+            endpoint=endpoint,
+            user_agent=user_agent,
+            created=created,
+        )
+        event.save(force_insert=True)
+        return event
+
+    def bulk_create_events(self, events):
+        """Save unsaved events in a single query.
+
+        `created` and `updated` are set as `TimestampedModel.save` would.
+        """
+        timestamp = now()
+        for event in events:
+            if event.created is None:
+                event.created = timestamp
+            event.updated = event.created
+        return self.bulk_create(events)
+
     def create_node_event(
         self,
         system_id,
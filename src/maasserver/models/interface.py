@@ -10,7 +10,7 @@ __all__ = [
     "UnknownInterface",
 ]
 
-from collections import OrderedDict
+from collections import defaultdict, OrderedDict
 import threading
 from zlib import crc32
 
@@ -77,6 +77,73 @@ def get_subnet_family(subnet):
         return None
 
 
+def claim_free_auto_ips(
+    claims, temp_expires_after=None, exclude_addresses=None
+) -> list[StaticIPAddress]:
+    """Claim IP addresses for many AUTO IP addresses at once.
+
+    The AUTO IP addresses are grouped by subnet, and the addresses of each
+    subnet are assigned from its free-range index with a single claim. The
+    AUTO IP addresses the index can't provide are claimed one at a time.
+
+    :param claims: (interface, AUTO IP address) tuples.
+    :param temp_expires_after: See `Interface.claim_auto_ips`.
+    :param exclude_addresses: A set of addresses which MUST NOT be used.
+    :return: The claimed AUTO IP addresses.
+    """
+    # Circular imports.
+    from maasserver.models import Subnet
+
+    exclude_addresses = set(exclude_addresses or ())
+    temp_expires_on = None
+    if temp_expires_after is not None:
+        temp_expires_on = timezone.now() + temp_expires_after
+
+    # AUTO IP addresses without a subnet fail in `_claim_auto_ip`.
+    unassigned = [
+        (interface, auto_ip)
+        for interface, auto_ip in claims
+        if auto_ip.subnet_id is None
+    ]
+    claims_by_subnet = defaultdict(list)
+    for interface, auto_ip in claims:
+        if auto_ip.subnet_id is not None:
+            claims_by_subnet[auto_ip.subnet_id].append((interface, auto_ip))
+    subnets = Subnet.objects.in_bulk(claims_by_subnet.keys())
+
+    assigned_addresses = []
+    for subnet_id, subnet_claims in claims_by_subnet.items():
+        subnet = subnets[subnet_id]
+        for _, auto_ip in subnet_claims:
+            auto_ip.subnet = subnet
+        left = StaticIPAddress.objects.assign_free_addresses(
+            subnet,
+            [auto_ip for _, auto_ip in subnet_claims],
+            exclude_addresses=exclude_addresses,
+            temp_expires_on=temp_expires_on,
+        )
+        assigned = len(subnet_claims) - len(left)
+        unassigned.extend(subnet_claims[assigned:])
+        for interface, auto_ip in subnet_claims[:assigned]:
+            exclude_addresses.add(str(auto_ip.ip))
+            assigned_addresses.append(auto_ip)
+            if temp_expires_after is None:
+                maaslog.info(
+                    f"Allocated automatic IP address {auto_ip.ip} for "
+                    f"{interface.get_log_string()}."
+                )
+
+    for interface, auto_ip in unassigned:
+        auto_ip = interface._claim_auto_ip(
+            auto_ip,
+            temp_expires_after=temp_expires_after,
+            exclude_addresses=exclude_addresses,
+        )
+        exclude_addresses.add(str(auto_ip.ip))
+        assigned_addresses.append(auto_ip)
+    return assigned_addresses
+
+
 class InterfaceQueriesMixin(MAASQueriesMixin):
     def get_specifiers_q(self, specifiers, separator=":", **kwargs):
         """Returns a Q object for objects matching the given specifiers.
@@ -1349,7 +1416,41 @@ class Interface(CleanSave, TimestampedModel):
             exclude_addresses = set()
         else:
             exclude_addresses = set(exclude_addresses)
+        (
+            assigned_addresses,
+            auto_ips,
+            reserved_addresses,
+        ) = self._claim_reserved_auto_ip(
+            temp_expires_after=temp_expires_after,
+            exclude_addresses=exclude_addresses,
+        )
+        exclude_addresses.update(str(ip.ip) for ip in assigned_addresses)
+        assigned_addresses.extend(
+            claim_free_auto_ips(
+                [(self, auto_ip) for auto_ip in auto_ips],
+                temp_expires_after=temp_expires_after,
+                exclude_addresses=exclude_addresses | reserved_addresses,
+            )
+        )
+        return assigned_addresses
+
+    def _claim_reserved_auto_ip(
+        self, temp_expires_after=None, exclude_addresses=None
+    ):
+        """Claim the reserved IP for the mac address of the interface, if
+        there is one, for the AUTO IP address on its subnet.
+
+        :param temp_expires_after: See `claim_auto_ips`.
+        :param exclude_addresses: Addresses in use by other hosts.
+        :return: A tuple of the claimed AUTO IP addresses, the AUTO IP
+            addresses left to claim, and the reserved IPs that must not be
+            claimed for them.
+        """
+        if exclude_addresses is None:
+            exclude_addresses = set()
         assigned_addresses = []
+        auto_ips = []
+        reserved_addresses = set()
         reservedip = (
             ReservedIP.objects.filter(mac_address=self.mac_address)
             .select_related("subnet")
@@ -1357,7 +1458,7 @@ class Interface(CleanSave, TimestampedModel):
         )
         if not reservedip:
             # We have to exclude all the reserved IPs in the vlan so that they are not going to be allocated to other interfaces.
-            exclude_addresses = exclude_addresses.union(
+            reserved_addresses.update(
                 ReservedIP.objects.filter(
                     subnet__in=[
                         ip_address.subnet
@@ -1386,29 +1487,24 @@ class Interface(CleanSave, TimestampedModel):
                     maaslog.info(
                         f"Using the reserved ip {reservedip.ip} as AUTOIP for the mac {self.mac_address}"
                     )
-                    assigned_ip = self._claim_auto_ip(
-                        auto_ip,
-                        temp_expires_after=temp_expires_after,
-                        requested_address=reservedip.ip,
-                        # Allow the static IP to be within the reserved range.
-                        restrict_ip_to_unreserved_ranges=False,
+                    assigned_addresses.append(
+                        self._claim_auto_ip(
+                            auto_ip,
+                            temp_expires_after=temp_expires_after,
+                            requested_address=reservedip.ip,
+                            # Allow the static IP to be within the reserved range.
+                            restrict_ip_to_unreserved_ranges=False,
+                        )
                     )
                     reserved_ip_assigned = True
                 else:
-                    assigned_ip = self._claim_auto_ip(
-                        auto_ip,
-                        temp_expires_after=temp_expires_after,
-                        exclude_addresses=exclude_addresses,
-                    )
-                if assigned_ip is not None:
-                    assigned_addresses.append(assigned_ip)
-                    exclude_addresses.add(str(assigned_ip.ip))
+                    auto_ips.append(auto_ip)
 
         if reserved_ip_assigned is False:
             raise StaticIPAddressUnavailable(
                 f"This interface {self.mac_address} has a reserved ip {reservedip.ip} but it does not have a link to that subnet"
             )
-        return assigned_addresses
+        return assigned_addresses, auto_ips, reserved_addresses
 
     def _claim_auto_ip(
         self,
@@ -119,7 +119,11 @@ from maasserver.models.defaultresource import DefaultResource
 from maasserver.models.domain import Domain
 from maasserver.models.filesystem import Filesystem
 from maasserver.models.filesystemgroup import FilesystemGroup
-from maasserver.models.interface import Interface, InterfaceRelationship
+from maasserver.models.interface import (
+    claim_free_auto_ips,
+    Interface,
+    InterfaceRelationship,
+)
 from maasserver.models.licensekey import LicenseKey
 from maasserver.models.notification import Notification
 from maasserver.models.numa import NUMANode, NUMANodeHugepages
@@ -152,6 +156,7 @@ from maasserver.rpc import (
     getClientFor,
     getClientFromIdentifiers,
 )
+from maasserver.sequence import Sequence
 from maasserver.server_address import get_maas_facing_server_addresses
 from maasserver.storage_layouts import (
     get_storage_layout_for_node,
@@ -238,6 +243,11 @@ KNOWN_BIOS_BOOT_METHODS = frozenset(
 # Default `bios_boot_method`. See `KNOWN_BIOS_BOOT_METHOD` above for usage.
 DEFAULT_BIOS_BOOT_METHOD = "pxe"
 
+# Version of the configuration of the external services run by rack
+# controllers. It is incremented by the 'sys_rack_config' triggers, and the
+# rack controllers fetch their configuration when it changes.
+rack_config_version = Sequence("maasserver_rack_config_version_seq")
+
 # Return type from `get_effective_power_info`.
 PowerInfo = namedtuple(
     "PowerInfo",
@@ -4677,11 +4687,18 @@ class Node(CleanSave, TimestampedModel):
     def claim_auto_ips(
         self, exclude_addresses=None, temp_expires_after=None
     ) -> set[StaticIPAddress]:
-        """Assign IP addresses to all interface links set to AUTO."""
+        """Assign IP addresses to all interface links set to AUTO.
+
+        The reserved IPs of the interfaces are claimed first. The other AUTO
+        IP addresses of all the interfaces are then claimed together, so
+        that the addresses of each subnet are claimed at once.
+        """
         exclude_addresses = (
             exclude_addresses.copy() if exclude_addresses else set()
         )
         allocated_ips = set()
+        claims = []
+        reserved_addresses = set()
         # Query for the interfaces again here; if we use the cached
         # interface_set, we could skip a newly-created bridge if it was created
         # at deployment time.
@@ -4689,7 +4706,11 @@ class Node(CleanSave, TimestampedModel):
             node_config=self.current_config
         ):
             maaslog.debug(f"Claiming IP for {self.system_id}:{interface.name}")
-            claimed_ips = interface.claim_auto_ips(
+            (
+                claimed_ips,
+                auto_ips,
+                interface_reserved_addresses,
+            ) = interface._claim_reserved_auto_ip(
                 temp_expires_after=temp_expires_after,
                 exclude_addresses=exclude_addresses,
             )
@@ -4700,6 +4721,16 @@ class Node(CleanSave, TimestampedModel):
                 )
                 exclude_addresses.add(str(ip.ip))
                 allocated_ips.add(ip)
+            claims.extend((interface, auto_ip) for auto_ip in auto_ips)
+            reserved_addresses.update(interface_reserved_addresses)
+
+        for ip in claim_free_auto_ips(
+            claims,
+            temp_expires_after=temp_expires_after,
+            exclude_addresses=exclude_addresses | reserved_addresses,
+        ):
+            maaslog.debug(f"Claimed IP for {self.system_id}: {ip.ip}")
+            allocated_ips.add(ip)
         return allocated_ips
 
     @inlineCallbacks
@@ -24,6 +24,7 @@ from provisioningserver.refresh.node_info_scripts import (
 
 __all__ = [
     "get_probed_details",
+    "get_probed_details_versions",
     "get_single_probed_details",
     "script_output_nsmap",
 ]
@@ -104,3 +105,47 @@ def get_probed_details(nodes: list[Node]) -> dict[str, dict[str, bytes]]:
             stdout_decoded = base64.b64decode(stdout)
             ret[system_id][namespace] = stdout_decoded
     return ret
+
+
+def get_probed_details_versions(nodes: list[Node]) -> dict[str, tuple]:
+    """Return the version of the details of the nodes in the given list.
+
+    The version of a node's details changes whenever one of the script
+    results returned by `get_probed_details` is replaced or updated, but
+    it's much cheaper to fetch than the details themselves.
+
+    :return: A ``{system_id: version, ...}`` map, where versions are
+        hashable and comparable for equality.
+    """
+    node_ids = {node.id: node for node in nodes}
+    versions = {node.system_id: [] for node in nodes}
+    with connection.cursor() as cursor:
+        sql_query = """
+            SELECT
+              script_set.node_id, script_result.id, script_result.updated
+            FROM
+              maasserver_scriptresult AS script_result,
+              maasserver_scriptset AS script_set,
+              maasserver_node AS node
+            WHERE
+              script_set.node_id IN %s AND
+              script_set.id = script_result.script_set_id AND
+              script_result.status = %s AND
+              script_result.script_name IN %s AND
+              script_set.id = node.current_commissioning_script_set_id
+            ORDER BY script_result.id;
+        """
+        cursor.execute(
+            sql_query,
+            [
+                tuple(node_ids),
+                SCRIPT_STATUS.PASSED,
+                tuple(script_output_nsmap),
+            ],
+        )
+        for node_id, script_result_id, updated in cursor.fetchall():
+            system_id = node_ids[node_id].system_id
+            versions[system_id].append((script_result_id, updated))
+    return {
+        system_id: tuple(version) for system_id, version in versions.items()
+    }
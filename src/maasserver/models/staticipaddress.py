@@ -32,6 +32,7 @@ from django.db.models import (
     UniqueConstraint,
     Value,
 )
+from django.utils import timezone
 from netaddr import IPAddress
 
 from maasserver import locks
@@ -50,6 +51,7 @@ from maasserver.models.cleansave import CleanSave
 from maasserver.models.config import Config
 from maasserver.models.domain import Domain
 from maasserver.models.subnet import Subnet
+from maasserver.models.subnetfreerange import SubnetFreeRange
 from maasserver.models.timestampedmodel import TimestampedModel
 from maasserver.utils import orm
 from maasserver.utils.dns import (
@@ -216,6 +218,46 @@ class FreeIPAddress:
             cls.pool.pop(str(subnet), None)
 
 
+# Claim free addresses of a subnet from its free-range index. Like
+# `Subnet.get_next_ip_for_allocation`, the smallest ranges are used first.
+# Ranges locked by concurrent allocations are skipped, and the ranges
+# addresses are taken from stay locked until the end of the transaction.
+CLAIM_FREE_ADDRESSES_QUERY = """
+    WITH free_ranges AS (
+        SELECT start_ip, end_ip - start_ip + 1 AS size
+        FROM maasserver_subnetfreerange
+        WHERE subnet_id = %(subnet_id)s
+        ORDER BY end_ip - start_ip, start_ip
+        LIMIT %(wanted)s
+        FOR UPDATE SKIP LOCKED
+    ), ranked_ranges AS (
+        SELECT
+            start_ip,
+            size,
+            (sum(size) OVER (ORDER BY size, start_ip) - size)::bigint
+                AS skipped
+        FROM free_ranges
+    ), candidates AS (
+        SELECT start_ip + offset_ AS ip, skipped + offset_ AS position
+        FROM
+            ranked_ranges,
+            generate_series(0, LEAST(size, %(wanted)s - skipped) - 1)
+                AS offset_
+        WHERE skipped < %(wanted)s
+    )
+    SELECT host(candidates.ip)
+    FROM candidates
+    WHERE NOT candidates.ip = ANY(%(exclude)s::inet[])
+        AND NOT EXISTS (
+            SELECT 1
+            FROM maasserver_staticipaddress
+            WHERE maasserver_staticipaddress.ip = candidates.ip
+        )
+    ORDER BY position
+    LIMIT %(count)s
+"""
+
+
 class StaticIPAddressManager(Manager):
     """A utility to manage collections of IPAddresses."""
 
@@ -381,6 +423,17 @@ class StaticIPAddressManager(Manager):
                 )
 
         if requested_address is None:
+            if SubnetFreeRange.objects.is_indexed(subnet):
+                addresses = self._claim_free_addresses(
+                    subnet, 1, exclude_addresses
+                )
+                if addresses:
+                    return self._attempt_allocation_of_free_address(
+                        IPAddress(addresses[0]),
+                        alloc_type,
+                        user=user,
+                        subnet=subnet,
+                    )
             with FreeIPAddress(subnet, exclude_addresses) as free_address:
                 ip = self._attempt_allocation_of_free_address(
                     free_address,
@@ -410,6 +463,102 @@ class StaticIPAddressManager(Manager):
                 requested_address, alloc_type, user=user, subnet=subnet
             )
 
+    def assign_free_addresses(
+        self,
+        subnet,
+        ip_addresses,
+        exclude_addresses=None,
+        temp_expires_on=None,
+    ) -> list[StaticIPAddress]:
+        """Assign free addresses of `subnet` to `ip_addresses`.
+
+        The addresses are claimed from the free-range index of the subnet with
+        a single query, and assigned with a single update, so the
+        StaticIPAddresses keep their IDs.
+
+        :param subnet: The subnet from which to assign the addresses.
+        :param ip_addresses: StaticIPAddresses without an address.
+        :param exclude_addresses: A list of addresses which MUST NOT be used.
+        :param temp_expires_on: If set, the assignments are temporary until
+            then.
+        :return: The StaticIPAddresses that couldn't be assigned an address,
+            either because the subnet isn't indexed or the index ran short.
+        """
+        ip_addresses = list(ip_addresses)
+        if not SubnetFreeRange.objects.is_indexed(subnet):
+            return ip_addresses
+        addresses = self._claim_free_addresses(
+            subnet, len(ip_addresses), exclude_addresses
+        )
+        assigned = ip_addresses[: len(addresses)]
+        if assigned:
+            now = timezone.now()
+            fields = ["ip", "updated"]
+            if temp_expires_on is not None:
+                fields.append("temp_expires_on")
+            for ip, address in zip(assigned, addresses):
+                ip.ip = address
+                ip.updated = now
+                if temp_expires_on is not None:
+                    ip.temp_expires_on = temp_expires_on
+            self._save_free_addresses(
+                lambda: self.bulk_update(assigned, fields)
+            )
+            # The update doesn't send post_save, which would check the
+            # utilization of the subnet for each address.
+            subnet.update_allocation_notification()
+        return ip_addresses[len(addresses) :]
+
+    def _claim_free_addresses(
+        self, subnet, count, exclude_addresses=None
+    ) -> list[str]:
+        """Claim up to `count` free addresses from the free-range index of
+        `subnet`.
+
+        The index is built when the subnet doesn't have any free range yet.
+        The ranges the addresses are taken from are locked until the end of
+        the transaction, so concurrent allocations don't claim them too.
+        """
+        exclude_addresses = sorted(
+            {str(address) for address in exclude_addresses or ()}
+        )
+        params = {
+            "subnet_id": subnet.id,
+            "count": count,
+            "wanted": count + len(exclude_addresses),
+            "exclude": exclude_addresses,
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_FREE_ADDRESSES_QUERY, params)
+            addresses = [address for address, in cursor.fetchall()]
+            if (
+                len(addresses) < count
+                and not SubnetFreeRange.objects.filter(subnet=subnet).exists()
+            ):
+                self._save_free_addresses(
+                    lambda: SubnetFreeRange.objects.rebuild(subnet)
+                )
+                cursor.execute(CLAIM_FREE_ADDRESSES_QUERY, params)
+                addresses = [address for address, in cursor.fetchall()]
+        return addresses
+
+    def _save_free_addresses(self, save):
+        """Save claimed free addresses, or free ranges, by calling `save`.
+
+        The free-range index is only a hint, so in rare cases an address may
+        be taken already, or the index of the subnet may have been built by a
+        concurrent transaction. As with `_attempt_allocation_of_free_address`,
+        a retry is requested with the `address_allocation` lock.
+        """
+        try:
+            with orm.savepoint():
+                save()
+        except IntegrityError as error:
+            if orm.is_unique_violation(error):
+                orm.request_transaction_retry(locks.address_allocation)
+            else:
+                raise
+
     def _get_special_mappings(self, domain, raw_ttl=False):
         """Get the special mappings, possibly limited to a single Domain.
 
@@ -0,0 +1,82 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Index of the free IP address ranges of subnets."""
+
+from django.db.models import (
+    CASCADE,
+    ForeignKey,
+    GenericIPAddressField,
+    Manager,
+    Model,
+)
+from netaddr import IPAddress
+
+# Free ranges are stored in chunks of at most this many addresses, so that
+# concurrent allocations on a subnet can each lock a different chunk.
+FREE_RANGE_CHUNK_SIZE = 64
+
+
+class SubnetFreeRangeManager(Manager):
+    """Manager for `SubnetFreeRange` records."""
+
+    def is_indexed(self, subnet) -> bool:
+        """Whether the free ranges of `subnet` are indexed.
+
+        Only IPv4 subnets are indexed; the addresses of IPv6 subnets are far
+        from being exhausted.
+        """
+        return subnet.get_ipnetwork().version == 4
+
+    def rebuild(self, subnet):
+        """Rebuild the free ranges of `subnet` from its current usage.
+
+        Addresses seen as neighbours are not considered free.
+        """
+        self.filter(subnet=subnet).delete()
+        free_ranges = subnet.get_ipranges_not_in_use(with_neighbours=True)
+        self.bulk_create(
+            SubnetFreeRange(
+                subnet=subnet,
+                start_ip=str(IPAddress(first)),
+                end_ip=str(
+                    IPAddress(
+                        min(first + FREE_RANGE_CHUNK_SIZE, free_range.last + 1)
+                        - 1
+                    )
+                ),
+            )
+            for free_range in free_ranges
+            for first in range(
+                free_range.first, free_range.last + 1, FREE_RANGE_CHUNK_SIZE
+            )
+        )
+
+
+class SubnetFreeRange(Model):
+    """A range of addresses of a subnet that is free for allocation.
+
+    The ranges of a subnet are built from `Subnet.get_ipranges_not_in_use`
+    when addresses are allocated from it. Triggers then remove the addresses
+    that get used by static IP addresses or neighbours, add back released
+    addresses as ranges of their own, and drop all the ranges of a subnet
+    when the subnet, its IP ranges or static routes change, so that they get
+    built again.
+
+    As the index is only a hint, allocations still check that the addresses
+    are not in use.
+    """
+
+    class Meta:
+        unique_together = ("subnet", "start_ip")
+
+    objects = SubnetFreeRangeManager()
+
+    subnet = ForeignKey("Subnet", editable=False, on_delete=CASCADE)
+
+    start_ip = GenericIPAddressField(editable=False)
+
+    end_ip = GenericIPAddressField(editable=False)
+
+    def __str__(self):
+        return f"{self.start_ip}-{self.end_ip}"
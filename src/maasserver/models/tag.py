@@ -7,14 +7,17 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db.models import CharField, TextField
 from lxml import etree
-from temporalio.common import WorkflowIDReusePolicy
 from twisted.internet import reactor
 
-from maascommon.workflows.tag import TAG_EVALUATION_WORKFLOW_NAME
+from maascommon.workflows.tag import (
+    TAG_EVALUATION_MANY_SIGNAL_NAME,
+    TAG_EVALUATION_MANY_WORKFLOW_NAME,
+    TagEvaluationManyParam,
+    TagEvaluationParam,
+)
 from maasserver.models.cleansave import CleanSave
 from maasserver.models.timestampedmodel import TimestampedModel
 from maasserver.workflow import start_workflow
-from maastemporalworker.workflow.tag_evaluation import TagEvaluationParam
 from provisioningserver.logger import get_maas_logger
 
 maaslog = get_maas_logger("tag")
@@ -111,14 +114,20 @@ class Tag(CleanSave, TimestampedModel):
         maaslog.info(
             "Tag (id=%d) is being evaluated against all nodes.", self.id
         )
-        param = TagEvaluationParam(self.id, self.definition)
+        param = TagEvaluationManyParam(
+            [TagEvaluationParam(self.id, self.definition)]
+        )
 
+        # Signal the tag to the running evaluation, if any, so that tags
+        # changed together are evaluated together instead of cancelling each
+        # other's evaluation.
         start_workflow(
-            workflow_name=TAG_EVALUATION_WORKFLOW_NAME,
-            workflow_id="tag-evaluation",
+            workflow_name=TAG_EVALUATION_MANY_WORKFLOW_NAME,
+            workflow_id=TAG_EVALUATION_MANY_WORKFLOW_NAME,
             task_queue="region",
-            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
             param=param,
+            start_signal=TAG_EVALUATION_MANY_SIGNAL_NAME,
+            start_signal_args=[param],
         )
 
     def _populate_nodes_now(self):
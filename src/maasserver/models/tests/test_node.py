@@ -58,6 +58,11 @@ from maasserver.exceptions import (
     PowerProblem,
     StaticIPAddressExhaustion,
 )
+from maasserver.models import (
+    Bcache,
+    BMC,
+)
+from maasserver.models import bmc as bmc_module
 from maasserver.models import (
     BMCRoutableRackControllerRelationship,
     BridgeInterface,
@@ -73,6 +78,7 @@ from maasserver.models import (
     Neighbour,
     Node,
 )
+from maasserver.models import node as node_module
 from maasserver.models import (
     NodeDevice,
     NodeUserData,
@@ -93,9 +99,6 @@ from maasserver.models import (
     VLAN,
     VolumeGroup,
 )
-from maasserver.models import Bcache, BMC
-from maasserver.models import bmc as bmc_module
-from maasserver.models import node as node_module
 from maasserver.models.config import NetworkDiscoveryConfig
 import maasserver.models.interface as interface_module
 from maasserver.models.node import (
@@ -7770,13 +7773,47 @@ class TestNodeNetworking(MAASTransactionServerTestCase):
                 assigned_ips.add(str(auto_ip.ip))
         self.assertEqual(6, len(assigned_ips))
 
+    def test_claim_auto_ips_claims_addresses_of_a_subnet_at_once(self):
+        node = factory.make_Node()
+        vlan = factory.make_VLAN()
+        interfaces = [
+            factory.make_Interface(
+                INTERFACE_TYPE.PHYSICAL, node=node, vlan=vlan
+            )
+            for _ in range(3)
+        ]
+        subnet = factory.make_Subnet(vlan=vlan, version=4, host_bits=8)
+        for interface in interfaces:
+            factory.make_StaticIPAddress(
+                alloc_type=IPADDRESS_TYPE.AUTO,
+                ip="",
+                subnet=subnet,
+                interface=interface,
+            )
+        assign_free_addresses = StaticIPAddress.objects.assign_free_addresses
+        mock_assign_free_addresses = self.patch(
+            StaticIPAddress.objects, "assign_free_addresses"
+        )
+        mock_assign_free_addresses.side_effect = assign_free_addresses
+        claimed_ips = node.claim_auto_ips()
+        mock_assign_free_addresses.assert_called_once()
+        self.assertEqual(3, len({str(ip.ip) for ip in claimed_ips}))
+        for interface in interfaces:
+            [auto_ip] = interface.ip_addresses.filter(
+                alloc_type=IPADDRESS_TYPE.AUTO
+            )
+            self.assertIsNotNone(auto_ip.ip)
+
     def test_claim_auto_ips_calls_claim_auto_ips_on_all_interfaces(self):
         node = factory.make_Node()
         interfaces = [
             factory.make_Interface(INTERFACE_TYPE.PHYSICAL, node=node)
             for _ in range(3)
         ]
-        mock_claim_auto_ips = self.patch_autospec(Interface, "claim_auto_ips")
+        mock_claim_auto_ips = self.patch_autospec(
+            Interface, "_claim_reserved_auto_ip"
+        )
+        mock_claim_auto_ips.return_value = ([], [], set())
         node.claim_auto_ips()
         # Since the interfaces are not ordered, which they dont need to be
         # we extract the passed interface to each call.
@@ -7791,7 +7828,10 @@ class TestNodeNetworking(MAASTransactionServerTestCase):
             factory.make_Interface(INTERFACE_TYPE.PHYSICAL, node=node)
             for _ in range(2)
         ]
-        mock_claim_auto_ips = self.patch_autospec(Interface, "claim_auto_ips")
+        mock_claim_auto_ips = self.patch_autospec(
+            Interface, "_claim_reserved_auto_ip"
+        )
+        mock_claim_auto_ips.return_value = ([], [], set())
         node = (
             Node.objects.filter(id=node.id)
             .prefetch_related("current_config__interface_set")
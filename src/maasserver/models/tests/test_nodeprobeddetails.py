@@ -6,6 +6,7 @@
 
 from maasserver.models.nodeprobeddetails import (
     get_probed_details,
+    get_probed_details_versions,
     get_single_probed_details,
     script_output_nsmap,
 )
@@ -101,3 +102,31 @@ class TestNodeDetail(MAASServerTestCase):
             # returned by get_probed_details.
             self.make_script_set_and_results(node, "new")
         self.assertDictEqual(expected, get_probed_details(nodes))
+
+    def test_get_probed_details_versions(self):
+        nodes = [factory.make_Node() for _ in range(2)]
+        script_set, script_results = self.make_script_set_and_results(nodes[0])
+        nodes[0].current_commissioning_script_set = script_set
+        nodes[0].save()
+        versions = get_probed_details_versions(nodes)
+        self.assertEqual(
+            {
+                nodes[0].system_id: tuple(
+                    (result.id, result.updated) for result in script_results
+                ),
+                nodes[1].system_id: (),
+            },
+            versions,
+        )
+
+    def test_get_probed_details_versions_changes_with_results(self):
+        node = factory.make_Node()
+        script_set, script_results = self.make_script_set_and_results(node)
+        node.current_commissioning_script_set = script_set
+        node.save()
+        version = get_probed_details_versions([node])[node.system_id]
+        script_results[0].stdout = b"<lshw-new/>"
+        script_results[0].save()
+        self.assertNotEqual(
+            version, get_probed_details_versions([node])[node.system_id]
+        )
@@ -1,6 +1,7 @@
 # Copyright 2014-2016 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
+from datetime import timedelta
 from random import randint, shuffle
 import threading
 from unittest import TestCase
@@ -34,6 +35,7 @@ from maasserver.models.staticipaddress import (
     StaticIPAddress,
 )
 from maasserver.models.subnet import Subnet
+from maasserver.models.subnetfreerange import SubnetFreeRange
 from maasserver.testing.factory import factory
 from maasserver.testing.testcase import (
     MAASServerTestCase,
@@ -318,6 +320,84 @@ class TestStaticIPAddressManager(MAASServerTestCase):
         )
         self.assertEqual("10.0.0.101", ipaddress.ip)
 
+    def test_allocate_new_claims_address_from_free_ranges(self):
+        subnet = factory.make_Subnet(
+            cidr="10.0.0.0/24", gateway_ip="10.0.0.1", dns_servers=[]
+        )
+        factory.make_IPRange(subnet, "10.0.0.101", "10.0.0.254")
+        factory.make_IPRange(subnet, "10.0.0.2", "10.0.0.97")
+        subnet = reload_object(subnet)
+        ipaddress = StaticIPAddress.objects.allocate_new(subnet)
+        self.assertEqual("10.0.0.98", ipaddress.ip)
+        self.assertEqual(
+            [("10.0.0.99", "10.0.0.100")],
+            list(
+                SubnetFreeRange.objects.filter(subnet=subnet).values_list(
+                    "start_ip", "end_ip"
+                )
+            ),
+        )
+
+    def test_assign_free_addresses_keeps_ip_ids(self):
+        subnet = factory.make_managed_Subnet(ipv6=False)
+        auto_ips = [
+            factory.make_StaticIPAddress(
+                ip="", alloc_type=IPADDRESS_TYPE.AUTO, subnet=subnet
+            )
+            for _ in range(3)
+        ]
+        unassigned = StaticIPAddress.objects.assign_free_addresses(
+            subnet, auto_ips
+        )
+        self.assertEqual([], unassigned)
+        addresses = {reload_object(ip).ip for ip in auto_ips}
+        self.assertEqual(3, len(addresses))
+        self.assertNotIn(None, addresses)
+
+    def test_assign_free_addresses_excludes_addresses(self):
+        subnet = factory.make_Subnet(
+            cidr="10.0.0.0/24", gateway_ip="10.0.0.1", dns_servers=[]
+        )
+        factory.make_IPRange(subnet, "10.0.0.10", "10.0.0.254")
+        subnet = reload_object(subnet)
+        auto_ips = [
+            factory.make_StaticIPAddress(
+                ip="", alloc_type=IPADDRESS_TYPE.AUTO, subnet=subnet
+            )
+            for _ in range(3)
+        ]
+        StaticIPAddress.objects.assign_free_addresses(
+            subnet, auto_ips, exclude_addresses=["10.0.0.3", "10.0.0.5"]
+        )
+        self.assertEqual(
+            ["10.0.0.2", "10.0.0.4", "10.0.0.6"],
+            [reload_object(ip).ip for ip in auto_ips],
+        )
+
+    def test_assign_free_addresses_sets_temp_expires_on(self):
+        subnet = factory.make_managed_Subnet(ipv6=False)
+        auto_ip = factory.make_StaticIPAddress(
+            ip="", alloc_type=IPADDRESS_TYPE.AUTO, subnet=subnet
+        )
+        temp_expires_on = timezone.now() + timedelta(minutes=5)
+        StaticIPAddress.objects.assign_free_addresses(
+            subnet, [auto_ip], temp_expires_on=temp_expires_on
+        )
+        self.assertEqual(
+            temp_expires_on, reload_object(auto_ip).temp_expires_on
+        )
+
+    def test_assign_free_addresses_skips_IPv6_subnets(self):
+        subnet = factory.make_managed_Subnet(ipv6=True)
+        auto_ip = factory.make_StaticIPAddress(
+            ip="", alloc_type=IPADDRESS_TYPE.AUTO, subnet=subnet
+        )
+        unassigned = StaticIPAddress.objects.assign_free_addresses(
+            subnet, [auto_ip]
+        )
+        self.assertEqual([auto_ip], unassigned)
+        self.assertIsNone(reload_object(auto_ip).ip)
+
 
 class TestStaticIPAddressManagerTransactional(MAASTransactionServerTestCase):
     """Transactional tests for `StaticIPAddressManager."""
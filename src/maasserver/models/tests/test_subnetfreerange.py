@@ -0,0 +1,228 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Tests for SubnetFreeRange models."""
+
+from netaddr import IPAddress, IPRange, IPSet
+
+from maasserver.enum import IPADDRESS_TYPE, IPRANGE_TYPE
+from maasserver.models.subnetfreerange import (
+    FREE_RANGE_CHUNK_SIZE,
+    SubnetFreeRange,
+)
+from maasserver.testing.factory import factory
+from maasserver.testing.testcase import MAASServerTestCase
+from maasserver.utils.orm import reload_object
+
+
+class TestSubnetFreeRange(MAASServerTestCase):
+    """Test `SubnetFreeRange`."""
+
+    def make_indexed_Subnet(self):
+        subnet = factory.make_Subnet(
+            cidr="10.0.0.0/24", gateway_ip="10.0.0.1", dns_servers=[]
+        )
+        SubnetFreeRange.objects.rebuild(subnet)
+        return subnet
+
+    def get_free_addresses(self, subnet):
+        free_addresses = IPSet()
+        for free_range in SubnetFreeRange.objects.filter(subnet=subnet):
+            free_addresses.add(IPRange(free_range.start_ip, free_range.end_ip))
+        return free_addresses
+
+    def test_is_indexed_for_ipv4_subnets(self):
+        subnet = factory.make_Subnet(version=4)
+        self.assertTrue(SubnetFreeRange.objects.is_indexed(subnet))
+
+    def test_is_not_indexed_for_ipv6_subnets(self):
+        subnet = factory.make_Subnet(version=6)
+        self.assertFalse(SubnetFreeRange.objects.is_indexed(subnet))
+
+    def test_rebuild_indexes_addresses_not_in_use(self):
+        subnet = factory.make_Subnet(
+            cidr="10.0.0.0/24", gateway_ip="10.0.0.1", dns_servers=[]
+        )
+        factory.make_IPRange(subnet, "10.0.0.100", "10.0.0.149")
+        factory.make_StaticIPAddress("10.0.0.20", subnet=subnet)
+        subnet = reload_object(subnet)
+        SubnetFreeRange.objects.rebuild(subnet)
+        expected = IPSet()
+        for free_range in subnet.get_ipranges_not_in_use(with_neighbours=True):
+            expected.add(IPRange(free_range.first, free_range.last))
+        self.assertEqual(expected, self.get_free_addresses(subnet))
+
+    def test_rebuild_splits_ranges_in_chunks(self):
+        subnet = self.make_indexed_Subnet()
+        for free_range in SubnetFreeRange.objects.filter(subnet=subnet):
+            size = IPAddress(free_range.end_ip) - IPAddress(
+                free_range.start_ip
+            )
+            self.assertLess(size, FREE_RANGE_CHUNK_SIZE)
+        self.assertGreater(
+            SubnetFreeRange.objects.filter(subnet=subnet).count(), 1
+        )
+
+    def test_rebuild_replaces_existing_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        SubnetFreeRange.objects.rebuild(subnet)
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_new_static_ip_is_removed_from_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        factory.make_StaticIPAddress(
+            "10.0.0.30", alloc_type=IPADDRESS_TYPE.STICKY, subnet=subnet
+        )
+        free_addresses.remove("10.0.0.30")
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_assigned_static_ip_is_removed_from_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        ip = factory.make_StaticIPAddress(
+            "", alloc_type=IPADDRESS_TYPE.AUTO, subnet=subnet
+        )
+        ip.ip = "10.0.0.30"
+        ip.save()
+        free_addresses.remove("10.0.0.30")
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_new_neighbour_is_removed_from_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        factory.make_Neighbour(ip="10.0.0.30")
+        free_addresses.remove("10.0.0.30")
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_released_static_ip_is_added_to_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        ip = factory.make_StaticIPAddress(
+            "10.0.0.30", alloc_type=IPADDRESS_TYPE.AUTO, subnet=subnet
+        )
+        ip.ip = None
+        ip.save()
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+        self.assertTrue(
+            SubnetFreeRange.objects.filter(
+                subnet=subnet, start_ip="10.0.0.30", end_ip="10.0.0.30"
+            ).exists()
+        )
+
+    def test_deleted_static_ip_is_added_to_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        ip = factory.make_StaticIPAddress(
+            "10.0.0.30", alloc_type=IPADDRESS_TYPE.STICKY, subnet=subnet
+        )
+        ip.delete()
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_deleted_neighbour_is_added_to_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        neighbour = factory.make_Neighbour(ip="10.0.0.30")
+        neighbour.delete()
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_released_ip_still_in_use_is_not_added_to_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        ip = factory.make_StaticIPAddress(
+            "10.0.0.30", alloc_type=IPADDRESS_TYPE.STICKY, subnet=subnet
+        )
+        factory.make_Neighbour(ip="10.0.0.30")
+        free_addresses = self.get_free_addresses(subnet)
+        ip.delete()
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_released_dynamic_ip_keeps_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        factory.make_IPRange(
+            subnet, "10.0.0.100", "10.0.0.149", alloc_type=IPRANGE_TYPE.DYNAMIC
+        )
+        SubnetFreeRange.objects.rebuild(subnet)
+        free_ranges = list(
+            SubnetFreeRange.objects.filter(subnet=subnet).values_list(
+                "id", "start_ip", "end_ip"
+            )
+        )
+        ip = factory.make_StaticIPAddress(
+            "10.0.0.120", alloc_type=IPADDRESS_TYPE.DISCOVERED, subnet=subnet
+        )
+        ip.delete()
+        self.assertCountEqual(
+            free_ranges,
+            SubnetFreeRange.objects.filter(subnet=subnet).values_list(
+                "id", "start_ip", "end_ip"
+            ),
+        )
+
+    def test_released_gateway_is_not_added_to_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        free_addresses = self.get_free_addresses(subnet)
+        neighbour = factory.make_Neighbour(ip="10.0.0.1")
+        neighbour.delete()
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_released_ip_outside_reserved_ranges_of_unmanaged_subnet(self):
+        subnet = factory.make_Subnet(
+            cidr="10.0.0.0/24",
+            gateway_ip="10.0.0.1",
+            dns_servers=[],
+            managed=False,
+        )
+        factory.make_IPRange(
+            subnet,
+            "10.0.0.100",
+            "10.0.0.149",
+            alloc_type=IPRANGE_TYPE.RESERVED,
+        )
+        SubnetFreeRange.objects.rebuild(subnet)
+        free_addresses = self.get_free_addresses(subnet)
+        for address in ("10.0.0.30", "10.0.0.120"):
+            factory.make_StaticIPAddress(
+                address, alloc_type=IPADDRESS_TYPE.STICKY, subnet=subnet
+            ).delete()
+        self.assertEqual(free_addresses, self.get_free_addresses(subnet))
+
+    def test_released_ip_is_not_added_to_subnet_without_free_ranges(self):
+        subnet = factory.make_Subnet(
+            cidr="10.0.0.0/24", gateway_ip="10.0.0.1", dns_servers=[]
+        )
+        ip = factory.make_StaticIPAddress(
+            "10.0.0.30", alloc_type=IPADDRESS_TYPE.STICKY, subnet=subnet
+        )
+        ip.delete()
+        self.assertFalse(
+            SubnetFreeRange.objects.filter(subnet=subnet).exists()
+        )
+
+    def test_new_iprange_drops_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        factory.make_IPRange(subnet, "10.0.0.100", "10.0.0.149")
+        self.assertFalse(
+            SubnetFreeRange.objects.filter(subnet=subnet).exists()
+        )
+
+    def test_new_static_route_drops_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        factory.make_StaticRoute(source=subnet, gateway_ip="10.0.0.254")
+        self.assertFalse(
+            SubnetFreeRange.objects.filter(subnet=subnet).exists()
+        )
+
+    def test_subnet_gateway_change_drops_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        subnet.gateway_ip = "10.0.0.254"
+        subnet.save()
+        self.assertFalse(
+            SubnetFreeRange.objects.filter(subnet=subnet).exists()
+        )
+
+    def test_subnet_other_change_keeps_free_ranges(self):
+        subnet = self.make_indexed_Subnet()
+        subnet.name = factory.make_name("subnet")
+        subnet.save()
+        self.assertTrue(SubnetFreeRange.objects.filter(subnet=subnet).exists())
@@ -153,6 +153,7 @@ IGNORED_FIELDS = {
     "verbose",
     "op",
     "agent_name",
+    "count",
 }
 
 
@@ -357,6 +358,9 @@ def nodes_by_storage(storage, node_ids=None):
     The first constraint always refers to the block device that has the lowest
     id. The remaining constraints can match any device of that node
 
+    If `node_ids` is given, either as a list or as a queryset of node IDs, only
+    the devices of those nodes are considered. Passing a queryset keeps the
+    candidate nodes in the database, as a subquery.
     """
     constraints = get_storage_constraints_from_string(storage)
     # Return early if no constraints were given
@@ -364,12 +368,12 @@ def nodes_by_storage(storage, node_ids=None):
         return None
     matches = defaultdict(dict)
     root_device = True  # The 1st constraint refers to the node's 1st device
-    if node_ids:
-        node_config_ids = Node.objects.filter(id__in=node_ids).values_list(
-            "current_config_id", flat=True
+    if node_ids is not None:
+        node_config_ids = Node.objects.filter(id__in=node_ids).values(
+            "current_config_id"
         )
     else:
-        node_config_ids = []
+        node_config_ids = None
     for constraint_name, size, tags in constraints:
         if root_device:
             # This branch of the if is only used on first iteration.
@@ -391,7 +395,7 @@ def nodes_by_storage(storage, node_ids=None):
                     filesystems = filesystems.filter(
                         partition__tags__contains=part_tags
                     )
-                if node_config_ids:
+                if node_config_ids is not None:
                     filesystems = filesystems.filter(
                         Q(
                             **{
@@ -420,7 +424,7 @@ def nodes_by_storage(storage, node_ids=None):
                             }
                         )
                     )
-                if node_config_ids:
+                if node_config_ids is not None:
                     filesystems = filesystems.filter(
                         Q(block_device__node_config_id__in=node_config_ids)
                         | Q(
@@ -467,7 +471,7 @@ def nodes_by_storage(storage, node_ids=None):
                 matched_devices = matched_devices.filter(
                     tags__contains=part_tags
                 )
-            if node_config_ids:
+            if node_config_ids is not None:
                 matched_devices = matched_devices.filter(
                     partition_table__block_device__node_config_id__in=node_config_ids
                 )
@@ -484,7 +488,7 @@ def nodes_by_storage(storage, node_ids=None):
             )
             if tags is not None:
                 matched_devices = matched_devices.filter(tags__contains=tags)
-            if node_config_ids:
+            if node_config_ids is not None:
                 matched_devices = matched_devices.filter(
                     node_config_id__in=node_config_ids
                 )
@@ -1291,7 +1295,14 @@ class FilterNodeForm(forms.Form):
         compatible_interfaces = {}
         interfaces_label_map = self.cleaned_data.get("interfaces")
         if interfaces_label_map is not None:
-            result = nodes_by_interface(interfaces_label_map)
+            # Only match the interfaces of the candidate nodes, rather than
+            # the ones of every node in the inventory.
+            result = nodes_by_interface(
+                interfaces_label_map,
+                include_filter={
+                    "node_config__node_id__in": filtered_nodes.values("id")
+                },
+            )
             if result.node_ids is not None:
                 filtered_nodes = filtered_nodes.filter(id__in=result.node_ids)
                 compatible_interfaces = result.label_map
@@ -1301,7 +1312,9 @@ class FilterNodeForm(forms.Form):
         compatible_nodes = {}  # Maps node/storage to named storage constraints
         storage = self.cleaned_data.get("storage")
         if storage:
-            compatible_nodes = nodes_by_storage(storage)
+            compatible_nodes = nodes_by_storage(
+                storage, node_ids=filtered_nodes.values("id")
+            )
             node_ids = list(compatible_nodes)
             if node_ids is not None:
                 filtered_nodes = filtered_nodes.filter(id__in=node_ids)
@@ -1358,6 +1371,23 @@ class AcquireNodeForm(FilterNodeForm):
         )
         return filtered_nodes.order_by("cost")
 
+    def lock_nodes(self, filtered_nodes, count):
+        """Lock and return up to `count` of the cheapest filtered nodes.
+
+        The rows of the returned nodes are locked until the end of the
+        transaction. Nodes whose rows are already locked by another
+        transaction are skipped rather than waited for.
+
+        :param filtered_nodes: The nodes returned by `filter_nodes`.
+        :param count: The maximum number of nodes to return.
+        :return: A list of nodes, cheapest first.
+        """
+        nodes = filtered_nodes.model.objects.filter(
+            id__in=filtered_nodes.values("id")
+        )
+        nodes = self.reorder_nodes_by_cost(nodes)
+        return list(nodes.select_for_update(skip_locked=True)[:count])
+
 
 class ReadNodesForm(FilterNodeForm):
     id = UnconstrainedMultipleChoiceField(
@@ -7,11 +7,14 @@ from __future__ import annotations
 
 __all__ = [
     "populate_tag_for_multiple_nodes",
+    "populate_tags_for_multiple_nodes",
     "populate_tags_for_single_node",
+    "probed_details_cache",
 ]
 
-from functools import partial
-from typing import TYPE_CHECKING
+from collections import defaultdict, OrderedDict
+import threading
+from typing import Iterable, TYPE_CHECKING
 
 from django.db.models.query import QuerySet
 from lxml import etree
@@ -20,7 +23,7 @@ from maasserver import logger
 from maasserver.models.node import Node
 from maasserver.models.nodeprobeddetails import (
     get_probed_details,
-    get_single_probed_details,
+    get_probed_details_versions,
     script_output_nsmap,
 )
 from provisioningserver.logger import get_maas_logger, LegacyLogger
@@ -29,7 +32,6 @@ from provisioningserver.tags import (
     gen_batches,
     merge_details,
 )
-from provisioningserver.utils import classify
 from provisioningserver.utils.twisted import synchronous
 from provisioningserver.utils.xpath import try_match_xpath
 
@@ -47,6 +49,154 @@ tag_nsmap = {
 }
 
 
+# The probed details of a node are a few hundred kB of XML, and the parsed
+# document takes a few times that in memory. This bounds the size of the XML
+# from which the cached documents were parsed.
+DEFAULT_PROBED_DETAILS_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class ProbedDetailsCache:
+    """LRU cache of the merged probed details documents of nodes.
+
+    Documents are stored with the version of the details they were built
+    from (see `get_probed_details_versions`), so that a document is only
+    returned while the node's commissioning results are unchanged.
+
+    The cache is bounded by the total size of the XML the documents were
+    parsed from.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_PROBED_DETAILS_CACHE_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self._docs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def get(self, system_id: str, version: tuple) -> etree._ElementTree:
+        """Return the cached document for `system_id` at `version`.
+
+        :return: The document, or `None` if it's not cached.
+        """
+        with self._lock:
+            entry = self._docs.get(system_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._docs.move_to_end(system_id)
+            return entry[1]
+
+    def set(
+        self,
+        system_id: str,
+        version: tuple,
+        doc: etree._ElementTree,
+        size: int,
+    ):
+        """Cache `doc` for `system_id` at `version`.
+
+        :param size: The size of the details `doc` was built from.
+        """
+        with self._lock:
+            self._pop(system_id)
+            if size > self.max_size:
+                return
+            self._docs[system_id] = (version, doc, size)
+            self.size += size
+            while self.size > self.max_size:
+                self._pop(next(iter(self._docs)))
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self.size = 0
+
+    def _pop(self, system_id):
+        entry = self._docs.pop(system_id, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+
+probed_details_cache = ProbedDetailsCache()
+
+
+def get_probed_details_documents(
+    nodes: list[Node],
+) -> dict[Node, etree._ElementTree]:
+    """Return the merged probed details document of each node.
+
+    Documents are taken from `probed_details_cache` when the node's details
+    haven't changed; only the details of the other nodes are fetched and
+    parsed.
+    """
+    versions = get_probed_details_versions(nodes)
+    docs, missing = {}, []
+    for node in nodes:
+        doc = probed_details_cache.get(
+            node.system_id, versions[node.system_id]
+        )
+        if doc is None:
+            missing.append(node)
+        else:
+            docs[node] = doc
+    if len(missing) > 0:
+        probed_details = get_probed_details(missing)
+        for node in missing:
+            details = probed_details[node.system_id]
+            docs[node] = doc = merge_details(details)
+            probed_details_cache.set(
+                node.system_id,
+                versions[node.system_id],
+                doc,
+                sum(len(detail) for detail in details.values() if detail),
+            )
+    return docs
+
+
+def compile_tag_definitions(
+    tags: Iterable[Tag], skip_invalid: bool = False
+) -> list[tuple[Tag, etree.XPath]]:
+    """Compile the definition of the defined tags in `tags`.
+
+    :param skip_invalid: Log and skip the tags whose definition can't be
+        compiled, instead of raising `etree.XPathError`.
+    """
+    compiled = []
+    for tag in tags:
+        if not tag.is_defined:
+            continue
+        try:
+            xpath = etree.XPath(tag.definition, namespaces=tag_nsmap)
+        except etree.XPathError as error:
+            if not skip_invalid:
+                raise
+            maaslog.warning(
+                "Invalid expression '%s': %s", tag.definition, str(error)
+            )
+        else:
+            compiled.append((tag, xpath))
+    return compiled
+
+
+def match_tags(
+    xpaths: list[tuple[Tag, etree.XPath]],
+    doc: etree._ElementTree,
+    logger=maaslog,
+) -> tuple[list[Tag], list[Tag]]:
+    """Evaluate all the compiled tag expressions against `doc`.
+
+    :return: The tags that match and the tags that don't.
+    """
+    matching, nonmatching = [], []
+    for tag, xpath in xpaths:
+        if try_match_xpath(xpath, doc, logger=logger):
+            matching.append(tag)
+        else:
+            nonmatching.append(tag)
+    return matching, nonmatching
+
+
 @synchronous
 def populate_tags_for_single_node(tags, node):
     """Reevaluate all tags for a single node.
@@ -57,13 +207,10 @@ def populate_tags_for_single_node(tags, node):
     nodes need reevaluating locally, i.e. when there are no rack controllers
     connected.
     """
-    probed_details = get_single_probed_details(node)
-    probed_details_doc = merge_details(probed_details)
-    # Same document, many queries: use XPathEvaluator.
-    evaluator = etree.XPathEvaluator(probed_details_doc, namespaces=tag_nsmap)
-    evaluator = partial(try_match_xpath, doc=evaluator, logger=logger)
-    tags_defined = ((tag, tag.definition) for tag in tags if tag.is_defined)
-    tags_matching, tags_nonmatching = classify(evaluator, tags_defined)
+    doc = get_probed_details_documents([node])[node]
+    tags_matching, tags_nonmatching = match_tags(
+        compile_tag_definitions(tags, skip_invalid=True), doc, logger=logger
+    )
     node.tags.remove(*tags_nonmatching)
     node.tags.add(*tags_matching)
 
@@ -79,18 +226,35 @@ def populate_tag_for_multiple_nodes(
     to which to farm-out work. Use this only when many nodes need reevaluating
     locally, i.e. when there are no rack controllers connected.
     """
-    # Same expression, multiple documents: compile expression with XPath.
-    xpath = etree.XPath(tag.definition, namespaces=tag_nsmap)
+    populate_tags_for_multiple_nodes([tag], nodes, batch_size=batch_size)
+
+
+@synchronous
+def populate_tags_for_multiple_nodes(
+    tags: Iterable[Tag],
+    nodes: QuerySet[Node],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """Reevaluate many tags for multiple nodes.
+
+    Each tag expression is compiled once, and each node's details document
+    is built once (or taken from `probed_details_cache`) and evaluated
+    against all the expressions.
+    """
+    xpaths = compile_tag_definitions(tags)
+    if len(xpaths) == 0:
+        return
     # The XML details documents can be large so work in batches.
     for batch in gen_batches(nodes, batch_size):
-        probed_details = get_probed_details(batch)
-        probed_details_docs_by_node = {
-            node: merge_details(probed_details[node.system_id])
-            for node in batch
-        }
-        nodes_matching, nodes_nonmatching = classify(
-            partial(try_match_xpath, xpath, logger=maaslog),
-            probed_details_docs_by_node.items(),
-        )
-        tag.node_set.remove(*nodes_nonmatching)
-        tag.node_set.add(*nodes_matching)
+        nodes_matching = defaultdict(list)
+        nodes_nonmatching = defaultdict(list)
+        docs = get_probed_details_documents(batch)
+        for node, doc in docs.items():
+            tags_matching, tags_nonmatching = match_tags(xpaths, doc)
+            for tag in tags_matching:
+                nodes_matching[tag].append(node)
+            for tag in tags_nonmatching:
+                nodes_nonmatching[tag].append(node)
+        for tag, _ in xpaths:
+            tag.node_set.remove(*nodes_nonmatching[tag])
+            tag.node_set.add(*nodes_matching[tag])
@@ -5,6 +5,8 @@
 
 
 from datetime import timedelta
+import threading
+import time
 
 from django.db.models import F, Max, Q, Window
 from django.http import HttpResponse, HttpResponseNotFound
@@ -33,6 +35,7 @@ from provisioningserver.prometheus.utils import (
     MetricDefinition,
     PrometheusMetrics,
 )
+from provisioningserver.utils.twisted import asynchronous
 
 log = LegacyLogger()
 
@@ -163,11 +166,62 @@ STATS_DEFINITIONS = [
     ),
 ]
 
+
+class StatsSnapshot:
+    """Update handler serving the stats metrics from a snapshot.
+
+    Computing the stats runs many queries over whole tables, so it's not
+    done on every scrape. The first scrape computes the metrics; later ones
+    get the current values, and the metrics are refreshed in the background
+    when they are older than `max_age` seconds. With a `max_age` of 0 the
+    metrics are computed on every scrape.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.max_age = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._updated = None
+        self._refreshing = False
+
+    def __call__(self, metrics: PrometheusMetrics):
+        now = self._clock()
+        with self._lock:
+            if self._updated is not None:
+                if self._refreshing or now - self._updated < self.max_age:
+                    return
+                if self.max_age > 0:
+                    self._refreshing = True
+                    self._refresh(metrics)
+                    return
+        update_prometheus_stats(metrics)
+        self._updated = now
+
+    @asynchronous
+    def _refresh(self, metrics: PrometheusMetrics):
+        """Refresh the metrics in a database thread."""
+
+        def refreshed(_):
+            self._updated = self._clock()
+
+        def done(_):
+            self._refreshing = False
+
+        d = deferToDatabase(transactional(update_prometheus_stats), metrics)
+        d.addCallback(refreshed)
+        d.addErrback(log.err, "Failure refreshing Prometheus stats")
+        d.addBoth(done)
+        return d
+
+
 _METRICS = {}
+_SNAPSHOT = StatsSnapshot()
 
 
 def prometheus_stats_handler(request):
-    configs = Config.objects.get_configs(["prometheus_enabled", "uuid"])
+    configs = Config.objects.get_configs(
+        ["prometheus_enabled", "prometheus_stats_max_age", "uuid"]
+    )
     if not configs["prometheus_enabled"]:
         return HttpResponseNotFound()
 
@@ -176,9 +230,10 @@ def prometheus_stats_handler(request):
         _METRICS = create_metrics(
             STATS_DEFINITIONS,
             extra_labels={"maas_id": configs["uuid"]},
-            update_handlers=[update_prometheus_stats],
+            update_handlers=[_SNAPSHOT],
             registry=prometheus_client.CollectorRegistry(),
         )
+    _SNAPSHOT.max_age = configs["prometheus_stats_max_age"]
 
     return HttpResponse(
         content=_METRICS.generate_latest(), content_type="text/plain"
@@ -231,17 +286,16 @@ def update_prometheus_stats(metrics: PrometheusMetrics) -> PrometheusMetrics:
         SERVICE_STATUS.DEAD: 3,
         SERVICE_STATUS.OFF: 4,
     }
-    for rack_controller in RackController.objects.all():
-        for service in Service.objects.filter(node=rack_controller).all():
-            metrics.update(
-                "maas_service_availability",
-                "set",
-                value=service_status_to_int_mapping[service.status],
-                labels={
-                    "system_id": rack_controller.system_id,
-                    "service": service.name,
-                },
-            )
+    services = Service.objects.filter(
+        node__in=RackController.objects.all()
+    ).values_list("node__system_id", "name", "status")
+    for system_id, name, status in services:
+        metrics.update(
+            "maas_service_availability",
+            "set",
+            value=service_status_to_int_mapping[status],
+            labels={"system_id": system_id, "service": name},
+        )
 
     # Gather the time in seconds of the last successful deployment from all
     # machines in MAAS. Metric specifications:
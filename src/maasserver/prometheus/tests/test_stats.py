@@ -12,7 +12,7 @@ import prometheus_client
 from twisted.application.internet import TimerService
 from twisted.internet.defer import fail
 
-from maasserver.enum import IPADDRESS_TYPE, IPRANGE_TYPE
+from maasserver.enum import IPADDRESS_TYPE, IPRANGE_TYPE, SERVICE_STATUS
 from maasserver.models import Config
 from maasserver.prometheus import stats
 from maasserver.prometheus.stats import (
@@ -27,7 +27,7 @@ from maasserver.testing.testcase import (
 )
 from maastesting import get_testing_timeout
 from maastesting.testcase import MAASTestCase
-from maastesting.twisted import extract_result
+from maastesting.twisted import extract_result, TwistedLoggerFixture
 from provisioningserver.events import EVENT_TYPES
 from provisioningserver.prometheus.utils import create_metrics
 from provisioningserver.utils.twisted import asynchronous
@@ -350,6 +350,87 @@ class TestPrometheus(MAASServerTestCase):
             output,
         )
 
+    def test_service_availability_metric(self):
+        rack = factory.make_RackController()
+        service = factory.make_Service(rack)
+        service.status = SERVICE_STATUS.RUNNING
+        service.save()
+        region_service = factory.make_Service(factory.make_RegionController())
+        metrics = create_metrics(
+            STATS_DEFINITIONS, registry=prometheus_client.CollectorRegistry()
+        )
+        update_prometheus_stats(metrics)
+        output = metrics.generate_latest().decode("ascii")
+        self.assertIn(
+            "maas_service_availability"
+            f'{{service="{service.name}",system_id="{rack.system_id}"}} 1.0',
+            output,
+        )
+        self.assertNotIn(f'service="{region_service.name}"', output)
+
+
+class TestStatsSnapshot(MAASTestCase):
+    def setUp(self):
+        super().setUp()
+        self.update = self.patch(stats, "update_prometheus_stats")
+        self.now = 1000.0
+        self.snapshot = stats.StatsSnapshot(clock=lambda: self.now)
+        self.refresh = self.patch(self.snapshot, "_refresh")
+        self.metrics = mock.sentinel.metrics
+
+    def test_first_update_computes_stats(self):
+        self.snapshot.max_age = 60
+        self.snapshot(self.metrics)
+        self.update.assert_called_once_with(self.metrics)
+        self.refresh.assert_not_called()
+
+    def test_fresh_snapshot_is_served(self):
+        self.snapshot.max_age = 60
+        self.snapshot(self.metrics)
+        self.now += 59
+        self.snapshot(self.metrics)
+        self.update.assert_called_once_with(self.metrics)
+        self.refresh.assert_not_called()
+
+    def test_stale_snapshot_is_refreshed_in_background(self):
+        self.snapshot.max_age = 60
+        self.snapshot(self.metrics)
+        self.now += 60
+        self.snapshot(self.metrics)
+        self.snapshot(self.metrics)
+        self.update.assert_called_once_with(self.metrics)
+        self.refresh.assert_called_once_with(self.metrics)
+
+    def test_zero_max_age_computes_stats_on_every_update(self):
+        self.snapshot(self.metrics)
+        self.snapshot(self.metrics)
+        self.assertEqual(2, self.update.call_count)
+        self.refresh.assert_not_called()
+
+
+class TestStatsSnapshotRefresh(MAASTransactionServerTestCase):
+    """Tests for the async parts of `StatsSnapshot`."""
+
+    def test_refresh_updates_stats(self):
+        update = self.patch(stats, "update_prometheus_stats")
+        snapshot = stats.StatsSnapshot(clock=lambda: 1000.0)
+        snapshot._refreshing = True
+        snapshot._refresh(mock.sentinel.metrics).wait(TIMEOUT)
+        update.assert_called_once_with(mock.sentinel.metrics)
+        self.assertEqual(1000.0, snapshot._updated)
+        self.assertFalse(snapshot._refreshing)
+
+    def test_refresh_logs_failures(self):
+        update = self.patch(stats, "update_prometheus_stats")
+        update.side_effect = factory.make_exception()
+        snapshot = stats.StatsSnapshot()
+        snapshot._refreshing = True
+        with TwistedLoggerFixture() as logger:
+            snapshot._refresh(mock.sentinel.metrics).wait(TIMEOUT)
+        self.assertIn("Failure refreshing Prometheus stats", logger.output)
+        self.assertIsNone(snapshot._updated)
+        self.assertFalse(snapshot._refreshing)
+
 
 class TestPrometheusService(MAASTestCase):
     """Tests for `ImportPrometheusService`."""
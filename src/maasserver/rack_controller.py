@@ -30,6 +30,15 @@ DHCP:
     for messages on 'sys_dhcp_{id}' channel and set that rack controller as
     needing an update. Any time a message is received on this queue that rack
     controller is marked as needing an update.
+
+External services:
+    Each regiond process listens for messages on channel 'sys_rack_config'.
+    The message is the new version of the configuration of the external
+    services (NTP, DNS, proxy and syslog) run by the rack controllers. Any
+    time a message is received, the rack controllers watched by this process
+    are told about the new version, so they fetch their configuration right
+    away. A rack controller is also told about the current version when it
+    starts to be watched.
 """
 
 
@@ -43,10 +52,12 @@ from twisted.internet.task import LoopingCall
 
 from maasserver import dhcp
 from maasserver.listener import PostgresListenerUnregistrationError
-from maasserver.models.node import RackController
+from maasserver.models.node import rack_config_version, RackController
+from maasserver.rpc import getClientFor
 from maasserver.utils.orm import transactional
 from maasserver.utils.threads import deferToDatabase
 from provisioningserver.logger import LegacyLogger
+from provisioningserver.rpc.cluster import ExternalServicesConfigurationChanged
 from provisioningserver.rpc.exceptions import NoConnectionsAvailable
 from provisioningserver.utils.twisted import asynchronous, callOut, FOREVER
 
@@ -78,6 +89,8 @@ class RackControllerService(Service):
         self.processingDone = None
         self.watching = set()
         self.needsDHCPUpdate = set()
+        self.needsConfigPush = set()
+        self.configVersion = None
         self.ipcWorker = ipcWorker
         self.postgresListener = postgresListener
 
@@ -92,6 +105,9 @@ class RackControllerService(Service):
             self.postgresListener.register(
                 "sys_core_%d" % self.processId, self.coreHandler
             )
+            self.postgresListener.register(
+                "sys_rack_config", self.rackConfigHandler
+            )
             return self.postgresListener.channelRegistrarDone
 
         @transactional
@@ -147,6 +163,13 @@ class RackControllerService(Service):
             except PostgresListenerUnregistrationError:
                 # Error is acceptable as it might not have been called yet.
                 pass
+            try:
+                self.postgresListener.unregister(
+                    "sys_rack_config", self.rackConfigHandler
+                )
+            except PostgresListenerUnregistrationError:
+                # Error is acceptable as it might not have been called yet.
+                pass
 
             # Unregister all DHCP handling.
             for rack_id in self.watching:
@@ -160,6 +183,7 @@ class RackControllerService(Service):
 
             self.watching = set()
             self.needsDHCPUpdate = set()
+            self.needsConfigPush = set()
             self.starting = None
             if self.processing.running:
                 self.processing.stop()
@@ -197,6 +221,7 @@ class RackControllerService(Service):
                     rack_id=rack_id,
                 )
             self.needsDHCPUpdate.discard(rack_id)
+            self.needsConfigPush.discard(rack_id)
             self.watching.discard(rack_id)
         elif action == "watch":
             if rack_id not in self.watching:
@@ -212,6 +237,7 @@ class RackControllerService(Service):
                 )
             self.watching.add(rack_id)
             self.needsDHCPUpdate.add(rack_id)
+            self.needsConfigPush.add(rack_id)
             self.startProcessing()
         else:
             raise ValueError("Unknown action: %s." % action)
@@ -254,6 +280,17 @@ class RackControllerService(Service):
                 rack_id=rack_id,
             )
 
+    def rackConfigHandler(self, channel, message):
+        """Called when the `sys_rack_config` message is received."""
+        version = int(message)
+        if self.configVersion is not None and version <= self.configVersion:
+            # Already pushed a newer version.
+            return
+        self.configVersion = version
+        self.needsConfigPush.update(self.watching)
+        if len(self.needsConfigPush) > 0:
+            self.startProcessing()
+
     def startProcessing(self):
         """Start the process looping call."""
         if not self.processing.running:
@@ -266,9 +303,19 @@ class RackControllerService(Service):
         if not self.running:
             # We're shutting down.
             self.processing.stop()
-        elif len(self.needsDHCPUpdate) == 0:
+        elif len(self.needsDHCPUpdate) == 0 and len(self.needsConfigPush) == 0:
             # Nothing more to do.
             self.processing.stop()
+        elif len(self.needsDHCPUpdate) == 0:
+            rack_id = self.needsConfigPush.pop()
+            d = maybeDeferred(self.processConfigPush, rack_id)
+            d.addErrback(lambda f: f.trap(NoConnectionsAvailable))
+            d.addErrback(
+                log.err,
+                "Failed notifying rack controller 'id:%d' of configuration "
+                "changes." % rack_id,
+            )
+            return d
         else:
 
             def _retryOnFailure(failure, rack_id):
@@ -317,3 +364,38 @@ class RackControllerService(Service):
         d.addCallback(dhcp.configure_dhcp)
         d.addErrback(unwatch_if_does_not_exist)
         return d
+
+    def processConfigPush(self, rack_id):
+        """Tell the rack controller about the configuration version."""
+
+        @transactional
+        def get_system_id_and_version():
+            system_id = RackController.objects.filter(id=rack_id).values_list(
+                "system_id", flat=True
+            )
+            version = self.configVersion
+            if version is None:
+                version = rack_config_version.current()
+            return system_id.first(), version
+
+        def push(result):
+            system_id, version = result
+            if system_id is None:
+                # The rack controller was deleted.
+                return None
+            d = getClientFor(system_id)
+            d.addCallback(
+                lambda client: client(
+                    ExternalServicesConfigurationChanged, version=version
+                )
+            )
+            return d
+
+        log.debug(
+            "[pid:{pid()}] pushing configuration version to rack: {rack_id}",
+            pid=os.getpid,
+            rack_id=rack_id,
+        )
+        d = deferToDatabase(get_system_id_and_version)
+        d.addCallback(push)
+        return d
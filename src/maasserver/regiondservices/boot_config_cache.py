@@ -0,0 +1,53 @@
+# Copyright 2024 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Boot configuration cache service."""
+
+
+from twisted.application.service import Service
+
+from maasserver.listener import PostgresListenerService
+from maasserver.rpc.boot import _GET_BOOT_CONFIG_KEYS, boot_config_cache
+
+
+class BootConfigCacheService(Service):
+    """Service to keep the boot configuration cache of a worker up to date.
+
+    The cache is enabled while the service is running, since it relies on
+    the database notifications to be invalidated.
+    """
+
+    def __init__(self, postgresListener: PostgresListenerService = None):
+        super().__init__()
+        self.listener = postgresListener
+        self.handlers = {
+            "config": self.consumeConfigEvent,
+            "bootresource": self.consumeBootResourceEvent,
+            "machine": self.consumeMachineEvent,
+        }
+
+    def startService(self):
+        super().startService()
+        if self.listener is not None:
+            for channel, handler in self.handlers.items():
+                self.listener.register(channel, handler)
+            boot_config_cache.clear()
+            boot_config_cache.enabled = True
+
+    def stopService(self):
+        if self.listener is not None:
+            boot_config_cache.enabled = False
+            boot_config_cache.clear()
+            for channel, handler in self.handlers.items():
+                self.listener.unregister(channel, handler)
+        return super().stopService()
+
+    def consumeConfigEvent(self, action: str, name: str):
+        if name in _GET_BOOT_CONFIG_KEYS:
+            boot_config_cache.clear_configs()
+
+    def consumeBootResourceEvent(self, action: str, obj_id: str):
+        boot_config_cache.clear_boot_resources()
+
+    def consumeMachineEvent(self, action: str, system_id: str):
+        boot_config_cache.clear_machine(system_id)
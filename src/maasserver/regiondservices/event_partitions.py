@@ -0,0 +1,61 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Service to maintain the partitions of the event table."""
+
+from datetime import timedelta
+
+from django.utils import timezone
+from twisted.internet.defer import inlineCallbacks
+
+from maasserver import locks
+from maasserver.eventpartitions import (
+    drop_expired_event_partitions,
+    ensure_event_partitions,
+)
+from maasserver.models import Config
+from maasserver.utils.orm import transactional
+from maasserver.utils.threads import deferToDatabase
+from provisioningserver.logger import LegacyLogger
+from provisioningserver.utils.services import SingleInstanceService
+from provisioningserver.utils.twisted import synchronous
+
+log = LegacyLogger()
+
+
+class EventPartitionsService(SingleInstanceService):
+    """Service to periodically maintain the event table partitions.
+
+    Partitions for the next months are created ahead of time, and, when
+    `event_retention_days` is set, the partitions holding only events older
+    than that are dropped.
+    """
+
+    LOCK_NAME = SERVICE_NAME = "event-partitions"
+    INTERVAL = timedelta(hours=1)
+
+    @inlineCallbacks
+    def do_action(self):
+        yield deferToDatabase(self._run)
+
+    @synchronous
+    @transactional
+    def _run(self):
+        now = timezone.now()
+        retention_days = Config.objects.get_config("event_retention_days")
+        with locks.event_partitions:
+            created = ensure_event_partitions(now)
+            dropped = []
+            if retention_days:
+                dropped = drop_expired_event_partitions(
+                    now - timedelta(days=retention_days)
+                )
+        if created:
+            log.info(
+                "Created event partitions: {names}", names=", ".join(created)
+            )
+        if dropped:
+            log.info(
+                "Dropped expired event partitions: {names}",
+                names=", ".join(dropped),
+            )
@@ -0,0 +1,71 @@
+# Copyright 2024 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Tests for the boot configuration cache service."""
+
+
+from unittest.mock import call, Mock
+
+from maasserver.regiondservices import (
+    boot_config_cache as boot_config_cache_module,
+)
+from maasserver.regiondservices.boot_config_cache import (
+    BootConfigCacheService,
+)
+from maasserver.rpc.boot import BootConfigCache
+from maastesting.testcase import MAASTestCase
+
+
+class TestBootConfigCacheService(MAASTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = BootConfigCache()
+        self.patch(boot_config_cache_module, "boot_config_cache", self.cache)
+
+    def test_enables_cache_while_running(self):
+        listener = Mock()
+        service = BootConfigCacheService(listener)
+        service.startService()
+        self.assertTrue(self.cache.enabled)
+        listener.register.assert_has_calls(
+            [
+                call("config", service.consumeConfigEvent),
+                call("bootresource", service.consumeBootResourceEvent),
+                call("machine", service.consumeMachineEvent),
+            ]
+        )
+        service.stopService()
+        self.assertFalse(self.cache.enabled)
+        listener.unregister.assert_has_calls(
+            [
+                call("config", service.consumeConfigEvent),
+                call("bootresource", service.consumeBootResourceEvent),
+                call("machine", service.consumeMachineEvent),
+            ]
+        )
+
+    def test_does_not_enable_cache_without_listener(self):
+        service = BootConfigCacheService()
+        service.startService()
+        self.addCleanup(service.stopService)
+        self.assertFalse(self.cache.enabled)
+
+    def test_clears_configs_on_boot_config_change(self):
+        clear_configs = self.patch(self.cache, "clear_configs")
+        service = BootConfigCacheService()
+        service.consumeConfigEvent("update", "maas_name")
+        clear_configs.assert_not_called()
+        service.consumeConfigEvent("update", "kernel_opts")
+        clear_configs.assert_called_once_with()
+
+    def test_clears_boot_resources_on_boot_resource_change(self):
+        clear_boot_resources = self.patch(self.cache, "clear_boot_resources")
+        service = BootConfigCacheService()
+        service.consumeBootResourceEvent("update", "1")
+        clear_boot_resources.assert_called_once_with()
+
+    def test_clears_machine_on_machine_change(self):
+        clear_machine = self.patch(self.cache, "clear_machine")
+        service = BootConfigCacheService()
+        service.consumeMachineEvent("update", "abcdef")
+        clear_machine.assert_called_once_with("abcdef")
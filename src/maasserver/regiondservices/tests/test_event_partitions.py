@@ -0,0 +1,43 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from datetime import timedelta
+
+from django.utils import timezone
+from twisted.internet import reactor
+
+from maasserver.models import Config
+from maasserver.regiondservices import event_partitions
+from maasserver.regiondservices.event_partitions import (
+    EventPartitionsService,
+)
+from maasserver.testing.testcase import MAASServerTestCase
+
+
+class TestEventPartitionsService(MAASServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = EventPartitionsService(reactor)
+        self.now = timezone.now()
+        self.patch(event_partitions.timezone, "now").return_value = self.now
+        self.mock_ensure = self.patch(
+            event_partitions, "ensure_event_partitions"
+        )
+        self.mock_ensure.return_value = []
+        self.mock_drop = self.patch(
+            event_partitions, "drop_expired_event_partitions"
+        )
+        self.mock_drop.return_value = []
+
+    def test_creates_partitions(self):
+        self.service._run()
+        self.mock_ensure.assert_called_once_with(self.now)
+
+    def test_keeps_all_events_by_default(self):
+        self.service._run()
+        self.mock_drop.assert_not_called()
+
+    def test_drops_expired_partitions(self):
+        Config.objects.set_config("event_retention_days", 90)
+        self.service._run()
+        self.mock_drop.assert_called_once_with(self.now - timedelta(days=90))
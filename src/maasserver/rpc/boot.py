@@ -6,6 +6,8 @@
 
 import re
 import shlex
+import threading
+import time
 
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db.models import Q
@@ -108,6 +110,152 @@ def event_log_pxe_request(machine, purpose):
     )
 
 
+class BootConfigCache:
+    """Cache of the boot configuration shared by booting machines.
+
+    When many machines boot at once, most of them boot the same images with
+    the same global configuration. The configuration, the files of each boot
+    resource and the boot image selected for each machine are kept here, so
+    that they aren't queried again for every boot request.
+
+    The cache is only used while `enabled`, which `BootConfigCacheService`
+    sets once it listens for the changes that invalidate it. Entries also
+    expire after `ttl` seconds, since a boot resource set becoming complete
+    isn't notified.
+    """
+
+    ttl = 60
+
+    def __init__(self, clock=time.monotonic):
+        self.enabled = False
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._configs = {}
+        self._files = {}
+        self._machines = {}
+
+    def clear(self):
+        """Forget everything."""
+        with self._lock:
+            self._generation += 1
+            self._configs.clear()
+            self._files.clear()
+            self._machines.clear()
+
+    def clear_configs(self):
+        """Forget the configuration, and everything computed from it."""
+        with self._lock:
+            self._generation += 1
+            self._configs.clear()
+            self._machines.clear()
+
+    def clear_boot_resources(self):
+        """Forget the boot resources, and everything computed from them."""
+        with self._lock:
+            self._generation += 1
+            self._files.clear()
+            self._machines.clear()
+
+    def clear_machine(self, system_id: str):
+        """Forget the boot image selected for the machine."""
+        with self._lock:
+            self._generation += 1
+            self._machines.pop(system_id, None)
+
+    def _cached(self, store, key, version, compute, cacheable=None):
+        """Return the value cached for `key` at `version`, or compute it.
+
+        The computed value is only stored if it's `cacheable`, and if the
+        cache wasn't invalidated while it was being computed.
+        """
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            entry = store.get(key)
+            generation = self._generation
+        now = self.clock()
+        if entry is not None and entry[0] == version and entry[1] > now:
+            return entry[2]
+        value = compute()
+        if cacheable is None or cacheable(value):
+            with self._lock:
+                if generation == self._generation:
+                    store[key] = (version, now + self.ttl, value)
+        return value
+
+    def get_configs(self) -> dict:
+        """Return the configuration needed to compute boot configurations."""
+        configs = self._cached(
+            self._configs,
+            None,
+            None,
+            lambda: Config.objects.get_configs(_GET_BOOT_CONFIG_KEYS),
+        )
+        return configs.copy()
+
+    def get_files_map(
+        self, osystem: str, oseries: str, arch: str, subarch: str
+    ) -> dict[str, str]:
+        """Return the files of the latest complete set of a boot resource.
+
+        Missing boot resources aren't cached, so that they're used as soon as
+        they're imported.
+        """
+        files_map = self._cached(
+            self._files,
+            (osystem, oseries, arch, subarch),
+            None,
+            lambda: _fetch_files_map(osystem, oseries, arch, subarch),
+            cacheable=bool,
+        )
+        return files_map.copy()
+
+    def get_boot_config_for_machine(
+        self, machine: Node, configs: dict[str, str], purpose: str
+    ) -> tuple[tuple[str, str, str, str, str], str | None]:
+        """Return the boot image and kernel parameters for the machine.
+
+        :return: A tuple of the result of `get_boot_config_for_machine` and
+            of the kernel parameters of the machine's kernel.
+        """
+
+        def compute():
+            return (
+                get_boot_config_for_machine(machine, configs, purpose),
+                BootResource.objects.get_kparams_for_node(
+                    machine,
+                    default_osystem=configs["default_osystem"],
+                    default_distro_series=configs["default_distro_series"],
+                ),
+            )
+
+        # The machine's fields the result depends on. The configuration and
+        # boot resources are cleared separately.
+        version = (
+            purpose,
+            machine.architecture,
+            machine.osystem,
+            machine.distro_series,
+            machine.hwe_kernel,
+            machine.min_hwe_kernel,
+            machine.status,
+            machine.previous_status,
+            machine.ephemeral_deploy,
+        )
+        return self._cached(
+            self._machines,
+            machine.system_id,
+            version,
+            compute,
+            # Don't hold on to a failed kernel lookup.
+            cacheable=lambda result: result[0][2] != "no-such-kernel",
+        )
+
+
+boot_config_cache = BootConfigCache()
+
+
 def _get_files_map(
     osystem: str,
     oseries: str,
@@ -115,7 +263,17 @@ def _get_files_map(
     subarch: str,
     exclude: list[str] | None = None,
 ) -> dict[str, str]:
-    exclude = exclude or []
+    files_map = boot_config_cache.get_files_map(
+        osystem, oseries, arch, subarch
+    )
+    for filetype in exclude or []:
+        files_map.pop(filetype, None)
+    return files_map
+
+
+def _fetch_files_map(
+    osystem: str, oseries: str, arch: str, subarch: str
+) -> dict[str, str]:
     try:
         name = f"{osystem}/{oseries}" if osystem != "custom" else oseries
         boot_resource = BootResource.objects.get(
@@ -136,7 +294,6 @@ def _get_files_map(
                 ]
             )
             for bfile in bset.files.all()
-            if bfile.filetype not in exclude
         }
     except ObjectDoesNotExist:
         return {}
@@ -494,7 +651,7 @@ def get_config(
         raise BootConfigNoResponse()
 
     # Get all required configuration objects in a single query.
-    configs = Config.objects.get_configs(_GET_BOOT_CONFIG_KEYS)
+    configs = boot_config_cache.get_configs()
 
     # Compute the syslog server.
     log_host, log_port = (
@@ -655,12 +812,17 @@ def get_config(
             event_log_pxe_request(machine, purpose)
 
         (
-            boot_osystem,
-            boot_series,
-            subarch,
-            final_osystem,
-            final_series,
-        ) = get_boot_config_for_machine(machine, configs, purpose)
+            (
+                boot_osystem,
+                boot_series,
+                subarch,
+                final_osystem,
+                final_series,
+            ),
+            kparams,
+        ) = boot_config_cache.get_boot_config_for_machine(
+            machine, configs, purpose
+        )
 
         extra_kernel_opts = machine.get_effective_kernel_options(
             default_kernel_opts=configs["kernel_opts"]
@@ -676,11 +838,6 @@ def get_config(
 
         extra_kernel_opts.strip()
 
-        kparams = BootResource.objects.get_kparams_for_node(
-            machine,
-            default_osystem=configs["default_osystem"],
-            default_distro_series=configs["default_distro_series"],
-        )
         extra_kernel_opts = merge_kparams_with_extra(
             kparams, extra_kernel_opts
         )
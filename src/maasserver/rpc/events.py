@@ -130,3 +130,85 @@ def send_event_ip_address(ip_address, type_name, description, timestamp):
             description=description,
             created=timestamp,
         )
+
+
+@synchronous
+@transactional
+def send_events(events):
+    """Send a batch of events.
+
+    Event types and nodes are resolved for the whole batch at once, and the
+    events are saved together. Events of an unknown type, or for a node that
+    isn't known yet, are dropped as the single event calls do.
+
+    for :py:class:`~provisioningserver.rpc.region.SendEvents`.
+    """
+    type_names = {event["type_name"] for event in events}
+    event_types = {
+        event_type.name: event_type
+        for event_type in EventType.objects.filter(name__in=type_names)
+    }
+    system_ids = {
+        event["system_id"] for event in events if event.get("system_id")
+    }
+    mac_addresses = {
+        event["mac_address"] for event in events if event.get("mac_address")
+    }
+    ip_addresses = {
+        event["ip_address"] for event in events if event.get("ip_address")
+    }
+    nodes_by_system_id = dict(
+        Node.objects.filter(system_id__in=system_ids).values_list(
+            "system_id", "id"
+        )
+    )
+    nodes_by_mac_address = dict(
+        Interface.objects.filter(
+            type=INTERFACE_TYPE.PHYSICAL, mac_address__in=mac_addresses
+        ).values_list("mac_address", "node_config__node_id")
+    )
+    nodes_by_ip_address = {}
+    for ip_address, node_id in (
+        Node.objects.filter(
+            current_config__interface__ip_addresses__ip__in=ip_addresses
+        )
+        .order_by("id")
+        .values_list("current_config__interface__ip_addresses__ip", "id")
+    ):
+        nodes_by_ip_address.setdefault(ip_address, node_id)
+
+    new_events = []
+    for event in events:
+        type_name = event["type_name"]
+        event_type = event_types.get(type_name)
+        if event_type is None:
+            log.debug(
+                "Event '{type}: {description}' sent with unknown type.",
+                type=type_name,
+                description=event["description"],
+            )
+            continue
+        if event.get("system_id"):
+            node_id = nodes_by_system_id.get(event["system_id"])
+        elif event.get("mac_address"):
+            node_id = nodes_by_mac_address.get(event["mac_address"])
+        else:
+            node_id = nodes_by_ip_address.get(event.get("ip_address"))
+        if node_id is None:
+            # See `send_event`: the rack may well send events for nodes that
+            # are still enlisting.
+            log.debug(
+                "Event '{type}: {description}' sent for non-existent node.",
+                type=type_name,
+                description=event["description"],
+            )
+            continue
+        new_events.append(
+            Event(
+                node_id=node_id,
+                type=event_type,
+                description=event["description"],
+                created=event["timestamp"],
+            )
+        )
+    Event.objects.bulk_create_events(new_events)
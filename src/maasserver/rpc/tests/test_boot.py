@@ -31,15 +31,17 @@ from maasserver.preseed import compose_enlistment_preseed_url
 from maasserver.rpc import boot as boot_module
 from maasserver.rpc.boot import (
     _GET_BOOT_CONFIG_KEYS,
+    boot_config_cache,
+    BootConfigCache,
     event_log_pxe_request,
     get_boot_config_for_machine,
     get_boot_filenames,
 )
+from maasserver.rpc.boot import get_config as orig_get_config
 from maasserver.rpc.boot import (
     get_node_from_mac_or_hardware_uuid,
     merge_kparams_with_extra,
 )
-from maasserver.rpc.boot import get_config as orig_get_config
 from maasserver.testing.architecture import make_usable_architecture
 from maasserver.testing.config import RegionConfigurationFixture
 from maasserver.testing.factory import factory
@@ -2404,3 +2406,151 @@ class TestGetNodeFromMacOrHardwareUUID(MAASServerTestCase):
             hardware_uuid=node.hardware_uuid
         )
         self.assertEqual(node, result)
+
+
+class TestBootConfigCache(MAASServerTestCase):
+    def make_cache(self):
+        self.now = 0
+        cache = BootConfigCache(clock=lambda: self.now)
+        cache.enabled = True
+        return cache
+
+    def test_disabled_cache_always_queries(self):
+        cache = BootConfigCache()
+        Config.objects.set_config("kernel_opts", "foo")
+        self.assertEqual("foo", cache.get_configs()["kernel_opts"])
+        Config.objects.set_config("kernel_opts", "bar")
+        self.assertEqual("bar", cache.get_configs()["kernel_opts"])
+
+    def test_caches_configs_until_cleared(self):
+        cache = self.make_cache()
+        Config.objects.set_config("kernel_opts", "foo")
+        self.assertEqual("foo", cache.get_configs()["kernel_opts"])
+        Config.objects.set_config("kernel_opts", "bar")
+        self.assertEqual("foo", cache.get_configs()["kernel_opts"])
+        cache.clear_configs()
+        self.assertEqual("bar", cache.get_configs()["kernel_opts"])
+
+    def test_entries_expire(self):
+        cache = self.make_cache()
+        Config.objects.set_config("kernel_opts", "foo")
+        cache.get_configs()
+        Config.objects.set_config("kernel_opts", "bar")
+        self.now += cache.ttl
+        self.assertEqual("bar", cache.get_configs()["kernel_opts"])
+
+    def test_does_not_store_values_computed_while_cleared(self):
+        cache = self.make_cache()
+        Config.objects.set_config("kernel_opts", "foo")
+        get_configs = self.patch(Config.objects, "get_configs")
+
+        def clear_while_querying(names):
+            cache.clear()
+            return {"kernel_opts": "foo"}
+
+        get_configs.side_effect = clear_while_querying
+        cache.get_configs()
+        cache.get_configs()
+        self.assertEqual(2, get_configs.call_count)
+
+    def test_caches_files_map(self):
+        cache = self.make_cache()
+        factory.make_RegionController()
+        release = factory.make_default_ubuntu_release_bootable()
+        arch, subarch = release.architecture.split("/")
+        osystem, series = release.name.split("/")
+        files_map = cache.get_files_map(osystem, series, arch, subarch)
+        self.assertIn(BOOT_RESOURCE_FILE_TYPE.BOOT_KERNEL, files_map)
+        # The caller can't alter the cached map.
+        files_map.clear()
+        release.delete()
+        self.assertIn(
+            BOOT_RESOURCE_FILE_TYPE.BOOT_KERNEL,
+            cache.get_files_map(osystem, series, arch, subarch),
+        )
+        cache.clear_boot_resources()
+        self.assertEqual(
+            {}, cache.get_files_map(osystem, series, arch, subarch)
+        )
+
+    def test_does_not_cache_missing_files_map(self):
+        cache = self.make_cache()
+        factory.make_RegionController()
+        self.assertEqual(
+            {}, cache.get_files_map("ubuntu", "noble", "amd64", "ga-24.04")
+        )
+        release = factory.make_default_ubuntu_release_bootable()
+        arch, subarch = release.architecture.split("/")
+        osystem, series = release.name.split("/")
+        self.assertNotEqual(
+            {}, cache.get_files_map(osystem, series, arch, subarch)
+        )
+
+    def test_caches_boot_config_for_machine_per_machine_state(self):
+        cache = self.make_cache()
+        machine = factory.make_Machine(status=NODE_STATUS.DEPLOYING)
+        get_boot_config = self.patch_autospec(
+            boot_module, "get_boot_config_for_machine"
+        )
+        get_boot_config.return_value = (
+            "ubuntu",
+            "noble",
+            "generic",
+            "ubuntu",
+            "noble",
+        )
+        configs = cache.get_configs()
+        cache.get_boot_config_for_machine(machine, configs, "xinstall")
+        cache.get_boot_config_for_machine(machine, configs, "xinstall")
+        self.assertEqual(1, get_boot_config.call_count)
+        cache.get_boot_config_for_machine(machine, configs, "commissioning")
+        self.assertEqual(2, get_boot_config.call_count)
+        machine.status = NODE_STATUS.DEPLOYED
+        cache.get_boot_config_for_machine(machine, configs, "commissioning")
+        self.assertEqual(3, get_boot_config.call_count)
+        cache.clear_machine(machine.system_id)
+        cache.get_boot_config_for_machine(machine, configs, "commissioning")
+        self.assertEqual(4, get_boot_config.call_count)
+
+    def test_does_not_cache_missing_kernel(self):
+        cache = self.make_cache()
+        machine = factory.make_Machine(status=NODE_STATUS.DEPLOYING)
+        get_boot_config = self.patch_autospec(
+            boot_module, "get_boot_config_for_machine"
+        )
+        get_boot_config.return_value = (
+            "ubuntu",
+            "noble",
+            "no-such-kernel",
+            "ubuntu",
+            "noble",
+        )
+        configs = cache.get_configs()
+        cache.get_boot_config_for_machine(machine, configs, "xinstall")
+        cache.get_boot_config_for_machine(machine, configs, "xinstall")
+        self.assertEqual(2, get_boot_config.call_count)
+
+    def test_get_config_uses_cache(self):
+        self.addCleanup(boot_config_cache.clear)
+        factory.make_RegionController()
+        rack_controller = factory.make_RackController()
+        local_ip = factory.make_ip_address()
+        remote_ip = factory.make_ip_address()
+        architecture = make_usable_architecture(self)
+        node = factory.make_Node_with_Interface_on_Subnet(
+            architecture="%s/generic" % architecture.split("/")[0],
+            status=NODE_STATUS.DEPLOYING,
+        )
+        mac = node.get_boot_interface().mac_address
+        self.patch_autospec(boot_module, "event_log_pxe_request")
+        args = (rack_controller.system_id, local_ip, remote_ip)
+
+        uncached_count, expected = count_queries(
+            orig_get_config, *args, mac=mac
+        )
+        self.patch(boot_config_cache, "enabled", True)
+        orig_get_config(*args, mac=mac)
+        count, config = count_queries(orig_get_config, *args, mac=mac)
+
+        self.assertEqual(expected, config)
+        self.assertLess(count, uncached_count)
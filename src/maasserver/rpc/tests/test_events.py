@@ -2,6 +2,7 @@
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 
+from datetime import timedelta
 import logging
 
 from django.utils import timezone
@@ -12,6 +13,7 @@ from maasserver.models.eventtype import EventType
 from maasserver.rpc import events
 from maasserver.testing.factory import factory
 from maasserver.testing.testcase import MAASServerTestCase
+from maastesting.djangotestcase import count_queries
 from provisioningserver.rpc.exceptions import NoSuchEventType
 
 
@@ -179,3 +181,76 @@ class TestSendEventIPAddress(MAASServerTestCase):
             description=description,
             created=timestamp,
         )
+
+
+class TestSendEvents(MAASServerTestCase):
+    def make_event(self, event_type, **node):
+        return dict(
+            type_name=event_type.name,
+            description=factory.make_name("description"),
+            timestamp=timezone.now(),
+            **node,
+        )
+
+    def test_creates_events_for_nodes(self):
+        event_type = factory.make_EventType()
+        node = factory.make_Node(interface=True)
+        interface = node.get_boot_interface()
+        ip = factory.make_StaticIPAddress(interface=interface)
+        batch = [
+            self.make_event(event_type, system_id=node.system_id),
+            self.make_event(event_type, mac_address=interface.mac_address),
+            self.make_event(event_type, ip_address=ip.ip),
+        ]
+        events.send_events(batch)
+        self.assertCountEqual(
+            [
+                (node.id, event_type.id, event["description"])
+                for event in batch
+            ],
+            Event.objects.filter(type=event_type).values_list(
+                "node_id", "type_id", "description"
+            ),
+        )
+
+    def test_uses_event_timestamps(self):
+        event_type = factory.make_EventType()
+        node = factory.make_Node()
+        event = self.make_event(event_type, system_id=node.system_id)
+        event["timestamp"] -= timedelta(minutes=5)
+        events.send_events([event])
+        self.assertEqual(
+            event["timestamp"], Event.objects.get(type=event_type).created
+        )
+
+    def test_skips_events_without_type_or_node(self):
+        event_type = factory.make_EventType()
+        node = factory.make_Node()
+        event = self.make_event(event_type, system_id=node.system_id)
+        unknown_type = self.make_event(event_type, system_id=node.system_id)
+        unknown_type["type_name"] = factory.make_name("type")
+        unknown_node = self.make_event(
+            event_type, system_id=factory.make_name("system_id")
+        )
+        events.send_events([unknown_type, event, unknown_node])
+        self.assertEqual(
+            [event["description"]],
+            list(
+                Event.objects.filter(type=event_type).values_list(
+                    "description", flat=True
+                )
+            ),
+        )
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        event_type = factory.make_EventType()
+
+        def count_batch_queries(size):
+            batch = [
+                self.make_event(event_type, system_id=node.system_id)
+                for node in (factory.make_Node() for _ in range(size))
+            ]
+            count, _ = count_queries(events.send_events, batch)
+            return count
+
+        self.assertEqual(count_batch_queries(1), count_batch_queries(10))
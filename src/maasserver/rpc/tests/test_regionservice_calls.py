@@ -58,6 +58,7 @@ from provisioningserver.rpc.region import (
     RequestRackRefresh,
     SendEvent,
     SendEventMACAddress,
+    SendEvents,
     UpdateLease,
     UpdateLeases,
     UpdateNodePowerState,
@@ -836,6 +837,70 @@ class TestRegionProtocol_SendEventMACAddress(MAASTransactionServerTestCase):
         )
 
 
+class TestRegionProtocol_SendEvents(MAASTransactionServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.useFixture(RegionEventLoopFixture("database-tasks"))
+
+    def test_send_events_is_registered(self):
+        protocol = Region()
+        responder = protocol.locateResponder(SendEvents.commandName)
+        self.assertIsNotNone(responder)
+
+    @transactional
+    def create_event_type(self):
+        return factory.make_EventType().name
+
+    @transactional
+    def create_node(self):
+        node = factory.make_Node(interface=True)
+        return node.system_id, str(node.get_boot_interface().mac_address)
+
+    @transactional
+    def get_events(self, type_name):
+        return list(
+            Event.objects.filter(type__name=type_name).values_list(
+                "node__system_id", "description", "created"
+            )
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_send_events_stores_events(self):
+        type_name = yield deferToDatabase(self.create_event_type)
+        system_id, mac_address = yield deferToDatabase(self.create_node)
+        timestamp = timezone.now() - timedelta(seconds=randint(99, 99999))
+        batch = [
+            {
+                "type_name": type_name,
+                "description": factory.make_name("description"),
+                "timestamp": timestamp,
+                "system_id": system_id,
+            },
+            {
+                "type_name": type_name,
+                "description": factory.make_name("description"),
+                "timestamp": timestamp,
+                "mac_address": mac_address,
+            },
+        ]
+
+        yield eventloop.start()
+        try:
+            response = yield call_responder(
+                Region(), SendEvents, {"events": batch}
+            )
+        finally:
+            yield eventloop.reset()
+
+        self.assertEqual({}, response)
+        stored = yield deferToDatabase(self.get_events, type_name)
+        self.assertCountEqual(
+            [(system_id, event["description"], timestamp) for event in batch],
+            stored,
+        )
+
+
 class TestRegionProtocol_UpdateServices(MAASTransactionServerTestCase):
     def setUp(self):
         super().setUp()
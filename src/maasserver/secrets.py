@@ -2,6 +2,7 @@ from typing import Any, Literal, NamedTuple, Optional
 
 from django.db.models import Model
 
+from maasserver.listener import notify_action
 from maasserver.models import BMC, Node, RootKey, Secret, VaultSecret
 from maasserver.vault import (
     get_region_vault_client_if_enabled,
@@ -95,6 +96,9 @@ class SecretManager:
             Secret.objects.update_or_create(
                 path=path, defaults={"value": value}
             )
+        if obj is None:
+            # Let the API server drop its cached copy of global secrets.
+            notify_action("secret", "update", path)
 
     def set_simple_secret(
         self, name: str, value: Any, obj: Optional[Model] = None
@@ -111,6 +115,8 @@ class SecretManager:
             VaultSecret.objects.filter(path=path).update(deleted=True)
         else:
             Secret.objects.filter(path=path).delete()
+        if obj is None:
+            notify_action("secret", "delete", path)
 
     def delete_all_object_secrets(self, obj: Model):
         """Delete all known secrets for an object."""
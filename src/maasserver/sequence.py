@@ -36,7 +36,7 @@ class Sequence:
         maxvalue: int = None,
         start: int = None,
         cycle: bool = True,
-        owner: str = None
+        owner: str = None,
     ):
         """Initialise a new `Sequence`.
 
@@ -114,6 +114,27 @@ class Sequence:
             else:
                 raise
 
+    def current(self):
+        """Return the last value of this sequence, without incrementing it.
+
+        This will create the sequence if it does not exist, for the same
+        reasons as `__next__`.
+
+        :return: The sequence value.
+        :rtype: int
+        """
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT last_value FROM {self.name}")
+                    return cursor.fetchone()[0]
+        except utils.ProgrammingError as error:
+            if is_postgres_error(error, UNDEFINED_TABLE):
+                self.create_if_not_exists()
+                return self.current()
+            else:
+                raise
+
     def set_value(self, next_value):
         """Restart the sequence at a specific value.
 
@@ -82,6 +82,11 @@ class TestRegionConfigurationDatabaseOptions(MAASTestCase):
         "database_keepalive_idle": 15,
         "database_keepalive_interval": 15,
         "database_keepalive_count": 2,
+        "database_pool_size": 3,
+        "database_pool_max_overflow": 10,
+        "database_pool_timeout": 30,
+        "database_pool_pre_ping": False,
+        "database_statement_cache_size": 100,
     }
 
     scenarios = tuple(
@@ -97,7 +102,7 @@ class TestRegionConfigurationDatabaseOptions(MAASTestCase):
         config = RegionConfiguration({})
         if isinstance(getattr(config, self.option), str):
             example_value = factory.make_name(self.option)
-        elif self.option == "database_keepalive":
+        elif self.option in ("database_keepalive", "database_pool_pre_ping"):
             example_value = random.choice([True, False])
         else:
             example_value = factory.pick_port()
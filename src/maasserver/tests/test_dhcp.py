@@ -3,7 +3,7 @@
 import base64
 from operator import itemgetter
 import random
-from unittest.mock import ANY
+from unittest.mock import ANY, Mock
 
 from django.utils import timezone
 from netaddr import IPAddress, IPNetwork
@@ -18,7 +18,13 @@ from maasserver import server_address as server_address_module
 import maasserver.dhcp as dhcp_module
 from maasserver.dhcp import _get_dhcp_rackcontrollers, get_default_dns_servers
 from maasserver.enum import INTERFACE_TYPE, IPADDRESS_TYPE, SERVICE_STATUS
-from maasserver.models import Config, DHCPSnippet, Domain, Service
+from maasserver.models import (
+    Config,
+    DHCPSnippet,
+    Domain,
+    Service,
+    StaticIPAddress,
+)
 from maasserver.rpc import getClientFor
 from maasserver.rpc.testing.fixtures import MockLiveRegionToClusterRPCFixture
 from maasserver.secrets import SecretManager
@@ -2609,6 +2615,168 @@ class TestGetDHCPConfigureFor(MAASServerTestCase):
         self.assertEqual(primary_interface.name, observed_interface)
 
 
+class TestDHCPConfigFragmentCache(MAASServerTestCase):
+    """Tests for `DHCPConfigFragmentCache`."""
+
+    def test_get_computes_fragment_once(self):
+        fragments = dhcp.DHCPConfigFragmentCache()
+        compute = Mock(return_value={"hosts": []})
+        fragments.get("key", (1,), compute)
+        self.assertEqual({"hosts": []}, fragments.get("key", (1,), compute))
+        compute.assert_called_once_with()
+
+    def test_get_recomputes_fragment_when_dependencies_change(self):
+        fragments = dhcp.DHCPConfigFragmentCache()
+        compute = Mock(side_effect=[["old"], ["new"]])
+        fragments.get("key", (1,), compute)
+        self.assertEqual(["new"], fragments.get("key", (2,), compute))
+
+    def test_get_returns_copies(self):
+        fragments = dhcp.DHCPConfigFragmentCache()
+        fragments.get("key", (1,), lambda: [{"ip": "10.0.0.1"}])[0]["ip"] = ""
+        self.assertEqual(
+            [{"ip": "10.0.0.1"}], fragments.get("key", (1,), Mock())
+        )
+
+    def test_clear_forgets_fragments(self):
+        fragments = dhcp.DHCPConfigFragmentCache()
+        compute = Mock(return_value=[])
+        fragments.get("key", (1,), compute)
+        fragments.clear()
+        fragments.get("key", (1,), compute)
+        self.assertEqual(2, compute.call_count)
+
+
+class TestGetDHCPConfigureForFragments(MAASServerTestCase):
+    """Tests for the fragments cached by `get_dhcp_configure_for`."""
+
+    def setUp(self):
+        super().setUp()
+        self.make_subnet_config = self.patch(
+            dhcp,
+            "make_subnet_config",
+            Mock(wraps=dhcp.make_subnet_config),
+        )
+        self.make_hosts_for_subnets = self.patch(
+            dhcp,
+            "make_hosts_for_subnets",
+            Mock(wraps=dhcp.make_hosts_for_subnets),
+        )
+        self.fragments = dhcp.DHCPConfigFragmentCache()
+        self.rack = factory.make_RackController()
+        self.vlan = factory.make_VLAN(dhcp_on=True, primary_rack=self.rack)
+        self.subnet = factory.make_ipv4_Subnet_with_IPRanges(vlan=self.vlan)
+        interface = factory.make_Interface(
+            INTERFACE_TYPE.PHYSICAL, node=self.rack, vlan=self.vlan
+        )
+        factory.make_StaticIPAddress(
+            alloc_type=IPADDRESS_TYPE.AUTO,
+            subnet=self.subnet,
+            interface=interface,
+        )
+
+    def get_config(self):
+        return dhcp.get_dhcp_configure_for(
+            4,
+            self.rack,
+            self.vlan,
+            [self.subnet],
+            [factory.make_name("ntp")],
+            Domain.objects.get_default_domain(),
+            fragments=self.fragments,
+        )
+
+    def test_reuses_fragments_when_nothing_changed(self):
+        first = self.get_config()
+        second = self.get_config()
+        self.assertEqual(first, second)
+        self.make_subnet_config.assert_called_once()
+        self.make_hosts_for_subnets.assert_called_once()
+
+    def test_static_ip_change_only_recomputes_hosts(self):
+        self.get_config()
+        ip = factory.make_StaticIPAddress(
+            alloc_type=IPADDRESS_TYPE.STICKY,
+            subnet=self.subnet,
+            interface=factory.make_Interface(vlan=self.vlan),
+        )
+        _, _, hosts, _ = self.get_config()
+        self.assertIn(str(ip.ip), [host["ip"] for host in hosts])
+        self.make_subnet_config.assert_called_once()
+        self.assertEqual(2, self.make_hosts_for_subnets.call_count)
+
+    def test_bulk_claimed_ip_recomputes_hosts(self):
+        ip = factory.make_StaticIPAddress(
+            alloc_type=IPADDRESS_TYPE.AUTO,
+            subnet=self.subnet,
+            interface=factory.make_Interface(vlan=self.vlan),
+            temp_expires_on=timezone.now(),
+        )
+        _, _, hosts, _ = self.get_config()
+        self.assertNotIn(str(ip.ip), [host["ip"] for host in hosts])
+        StaticIPAddress.objects.filter(id=ip.id).update(temp_expires_on=None)
+        _, _, hosts, _ = self.get_config()
+        self.assertIn(str(ip.ip), [host["ip"] for host in hosts])
+
+    def test_bulk_released_ip_recomputes_hosts(self):
+        ip = factory.make_StaticIPAddress(
+            alloc_type=IPADDRESS_TYPE.STICKY,
+            subnet=self.subnet,
+            interface=factory.make_Interface(vlan=self.vlan),
+        )
+        _, _, hosts, _ = self.get_config()
+        self.assertIn(str(ip.ip), [host["ip"] for host in hosts])
+        StaticIPAddress.objects.filter(id=ip.id).update(ip=None)
+        _, _, hosts, _ = self.get_config()
+        self.assertNotIn(str(ip.ip), [host["ip"] for host in hosts])
+
+    def test_reserved_ip_change_recomputes_hosts(self):
+        self.get_config()
+        reserved_ip = factory.make_ReservedIP(
+            factory.pick_ip_in_network(
+                IPNetwork(self.subnet.cidr),
+                but_not=factory._get_exclude_list(self.subnet),
+            ),
+            self.subnet,
+        )
+        _, _, hosts, _ = self.get_config()
+        self.assertIn(reserved_ip.ip, [host["ip"] for host in hosts])
+
+    def test_subnet_change_recomputes_subnet_configs(self):
+        self.get_config()
+        self.subnet.gateway_ip = None
+        self.subnet.save()
+        _, [subnet_config], _, _ = self.get_config()
+        self.assertEqual("", subnet_config["router_ip"])
+        self.assertEqual(2, self.make_subnet_config.call_count)
+        self.make_hosts_for_subnets.assert_called_once()
+
+    def test_iprange_change_recomputes_subnet_configs(self):
+        self.get_config()
+        for iprange in self.subnet.get_dynamic_ranges():
+            iprange.delete()
+        _, [subnet_config], _, _ = self.get_config()
+        self.assertEqual([], subnet_config["pools"])
+
+    def test_snippet_change_recomputes_fragments(self):
+        self.get_config()
+        snippet = factory.make_DHCPSnippet(subnet=self.subnet, enabled=True)
+        _, [subnet_config], _, _ = dhcp.get_dhcp_configure_for(
+            4,
+            self.rack,
+            self.vlan,
+            [self.subnet],
+            [factory.make_name("ntp")],
+            Domain.objects.get_default_domain(),
+            dhcp_snippets=[snippet],
+            fragments=self.fragments,
+        )
+        self.assertEqual(
+            [snippet.name],
+            [item["name"] for item in subnet_config["dhcp_snippets"]],
+        )
+
+
 class TestGetDHCPConfiguration(MAASServerTestCase):
     """Tests for `get_dhcp_configuration`."""
 
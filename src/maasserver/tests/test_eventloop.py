@@ -31,6 +31,9 @@ from maasserver.regiondservices import ntp, service_monitor_service, syslog
 from maasserver.regiondservices.certificate_expiration_check import (
     CertificateExpirationCheckService,
 )
+from maasserver.regiondservices.event_partitions import (
+    EventPartitionsService,
+)
 from maasserver.regiondservices.vault_secrets_cleanup import (
     VaultSecretsCleanupService,
 )
@@ -667,6 +670,14 @@ class TestFactories(MAASServerTestCase):
             eventloop.make_VaultSecretsCleanupService,
         )
 
+    def test_make_EventPartitionsService(self):
+        service = eventloop.make_EventPartitionsService()
+        self.assertIsInstance(service, EventPartitionsService)
+        self.assertIs(
+            eventloop.loop.factories["event-partitions"]["factory"],
+            eventloop.make_EventPartitionsService,
+        )
+
 
 class TestDisablingDatabaseConnections(MAASServerTestCase):
     @wait_for_reactor
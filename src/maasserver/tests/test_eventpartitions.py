@@ -0,0 +1,155 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from datetime import datetime, timedelta, timezone
+
+from django.utils import timezone as django_timezone
+from twisted.internet.defer import inlineCallbacks
+
+from maasserver.eventpartitions import (
+    drop_expired_event_partitions,
+    ensure_event_partitions,
+    EVENT_TABLE,
+    FUTURE_PARTITION,
+    get_event_partitions,
+    month_start,
+    OLD_PARTITION,
+)
+from maasserver.models import Event
+from maasserver.testing.factory import factory
+from maasserver.testing.testcase import (
+    MAASServerTestCase,
+    MAASTransactionServerTestCase,
+)
+from maasserver.triggers.testing import TransactionalHelpersMixin
+from maasserver.utils.orm import transactional
+from maasserver.utils.threads import deferToDatabase
+from maastesting.crochet import wait_for
+from maastesting.testcase import MAASTestCase
+from provisioningserver.utils.twisted import DeferredValue
+
+wait_for_reactor = wait_for()
+
+
+class TestMonthStart(MAASTestCase):
+    def test_start_of_month(self):
+        self.assertEqual(
+            datetime(2026, 3, 1, tzinfo=timezone.utc),
+            month_start(datetime(2026, 3, 17, 12, 30, tzinfo=timezone.utc)),
+        )
+
+    def test_uses_utc(self):
+        when = datetime(2026, 4, 1, 1, 0, tzinfo=timezone(timedelta(hours=2)))
+        self.assertEqual(
+            datetime(2026, 3, 1, tzinfo=timezone.utc), month_start(when)
+        )
+
+    def test_adds_months_across_years(self):
+        when = datetime(2026, 11, 5, tzinfo=timezone.utc)
+        self.assertEqual(
+            datetime(2027, 2, 1, tzinfo=timezone.utc), month_start(when, 3)
+        )
+        self.assertEqual(
+            datetime(2025, 12, 1, tzinfo=timezone.utc), month_start(when, -11)
+        )
+
+
+class TestEventPartitions(MAASServerTestCase):
+    def assertContiguous(self, partitions):
+        self.assertIsNone(partitions[0].start)
+        self.assertIsNone(partitions[-1].end)
+        for previous, partition in zip(partitions, partitions[1:]):
+            self.assertEqual(previous.end, partition.start)
+
+    def test_get_event_partitions_covers_all_times(self):
+        partitions = get_event_partitions()
+        self.assertContiguous(partitions)
+        self.assertEqual(FUTURE_PARTITION, partitions[-1].name)
+
+    def test_ensure_creates_monthly_partitions(self):
+        now = django_timezone.now() + timedelta(days=400)
+        created = ensure_event_partitions(now, months_ahead=1)
+        self.assertIn(f"{EVENT_TABLE}_p{month_start(now):%Y%m}", created)
+        self.assertIn(f"{EVENT_TABLE}_p{month_start(now, 1):%Y%m}", created)
+        partitions = get_event_partitions()
+        self.assertContiguous(partitions)
+        self.assertEqual(month_start(now, 2), partitions[-1].start)
+
+    def test_ensure_is_idempotent(self):
+        now = django_timezone.now()
+        ensure_event_partitions(now)
+        self.assertEqual([], ensure_event_partitions(now))
+
+    def test_ensure_keeps_events_in_future_partition(self):
+        now = django_timezone.now() + timedelta(days=400)
+        event = factory.make_Event()
+        Event.objects.filter(id=event.id).update(created=now)
+        ensure_event_partitions(now)
+        self.assertEqual(now, Event.objects.get(id=event.id).created)
+
+    def test_drop_expired_drops_old_partitions(self):
+        now = django_timezone.now() + timedelta(days=400)
+        created = ensure_event_partitions(now, months_ahead=0)
+        event = factory.make_Event()
+        dropped = drop_expired_event_partitions(month_start(now))
+        self.assertIn(created[0], dropped)
+        self.assertNotIn(created[-1], dropped)
+        self.assertFalse(Event.objects.filter(id=event.id).exists())
+        partitions = get_event_partitions()
+        self.assertContiguous(partitions)
+        self.assertEqual(OLD_PARTITION, partitions[0].name)
+        self.assertEqual(month_start(now), partitions[0].end)
+
+    def test_drop_expired_keeps_recent_partitions(self):
+        partitions = get_event_partitions()
+        self.assertEqual(
+            [],
+            drop_expired_event_partitions(
+                datetime(1970, 1, 1, tzinfo=timezone.utc)
+            ),
+        )
+        self.assertEqual(partitions, get_event_partitions())
+
+
+class TestEventPartitionsNotifications(
+    MAASTransactionServerTestCase, TransactionalHelpersMixin
+):
+    @transactional
+    def create_event_at(self, created):
+        # Moving the event to another partition notifies its creation again,
+        # but identical notifications in a transaction are sent only once.
+        event = factory.make_Event()
+        Event.objects.filter(id=event.id).update(created=created)
+        return event
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_ensure_does_not_notify_for_moved_events(self):
+        now = django_timezone.now() + timedelta(days=400)
+        notifications = []
+        dvs = [DeferredValue(), DeferredValue()]
+
+        def handler(*args):
+            notifications.append(args)
+            for dv in dvs:
+                if not dv.isSet:
+                    dv.set(args)
+                    break
+
+        listener = self.make_listener_without_delay()
+        listener.register("event", handler)
+        yield listener.startService()
+        try:
+            moved = yield deferToDatabase(self.create_event_at, now)
+            yield dvs[0].get(timeout=2)
+            yield deferToDatabase(transactional(ensure_event_partitions), now)
+            # Notifications are delivered in commit order, so any for the
+            # moved event would arrive before the one for this event.
+            marker = yield deferToDatabase(self.create_event)
+            yield dvs[1].get(timeout=2)
+            self.assertEqual(
+                [("create", str(moved.id)), ("create", str(marker.id))],
+                notifications,
+            )
+        finally:
+            yield listener.stopService()
@@ -20,6 +20,7 @@ from twisted.internet.defer import (
     inlineCallbacks,
     returnValue,
 )
+from twisted.internet.task import Clock, deferLater
 from twisted.logger import LogLevel
 from twisted.python.failure import Failure
 
@@ -514,11 +515,157 @@ class TestPostgresListenerService(MAASServerTestCase):
         # Add the notifications twice, so it can test that duplicates are
         # accumulated together.
         connection.connection.notifies = notifications + notifications
-        self.patch(listener, "handleNotify")
 
         listener.doRead()
         self.assertCountEqual(listener.notifications, set(notifications))
 
+    def test_doRead_keeps_notifications_in_order_received(self):
+        listener = PostgresListenerService()
+        listener.clock = Clock()
+        notifications = [
+            FakeNotify(channel="machine_update", payload=str(i))
+            for i in range(3)
+        ]
+        connection = self.patch(listener, "connection")
+        connection.connection.poll.return_value = None
+        connection.connection.notifies = notifications[:2]
+        listener.doRead()
+        listener.clock.advance(1)
+        connection.connection.notifies = notifications[::-1]
+        listener.doRead()
+        self.assertEqual(
+            {
+                ("machine_update", "0"): 0,
+                ("machine_update", "1"): 0,
+                ("machine_update", "2"): 1,
+            },
+            listener.notifications,
+        )
+        self.assertEqual(
+            [("machine_update", str(i)) for i in range(3)],
+            list(listener.notifications),
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_handleNotifies_calls_handlers_in_order(self):
+        listener = PostgresListenerService()
+        calls = []
+        listener.register("machine", lambda *args: calls.append(args))
+        listener.notifications = {
+            ("machine_create", "1"): 0,
+            ("machine_update", "2"): 0,
+            ("machine_delete", "1"): 0,
+        }
+        yield listener.handleNotifies()
+        self.assertEqual(
+            [("create", "1"), ("update", "2"), ("delete", "1")], calls
+        )
+        self.assertEqual({}, listener.notifications)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_handleNotifies_calls_batch_handlers_once(self):
+        listener = PostgresListenerService()
+        calls = []
+        listener.register(
+            "machine", lambda *args: calls.append(args), batch=True
+        )
+        listener.notifications = {
+            ("machine_create", "1"): 0,
+            ("machine_update", "2"): 0,
+        }
+        yield listener.handleNotifies()
+        self.assertEqual([([("create", "1"), ("update", "2")],)], calls)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_handleNotifies_holds_back_channel_within_window(self):
+        listener = PostgresListenerService()
+        listener.clock = Clock()
+        machine_calls, node_calls = [], []
+        listener.register(
+            "machine", lambda *args: machine_calls.append(args), window=5
+        )
+        listener.register("node", lambda *args: node_calls.append(args))
+        listener.notifications = {
+            ("machine_update", "1"): 0,
+            ("node_update", "2"): 0,
+        }
+        listener.clock.advance(1)
+        yield listener.handleNotifies()
+        self.assertEqual([], machine_calls)
+        self.assertEqual([("update", "2")], node_calls)
+        self.assertEqual({("machine_update", "1"): 0}, listener.notifications)
+        listener.clock.advance(4)
+        yield listener.handleNotifies()
+        self.assertEqual([("update", "1")], machine_calls)
+        self.assertEqual({}, listener.notifications)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_handleNotifies_limits_handler_concurrency(self):
+        listener = PostgresListenerService()
+        listener.HANDLER_CONCURRENCY = 2
+        running = []
+        waiting = [Deferred() for _ in range(3)]
+
+        def handler(action, payload):
+            running.append(payload)
+            return waiting[int(payload)]
+
+        for channel in ("machine", "node", "device"):
+            listener.register(channel, handler)
+        listener.notifications = {
+            ("machine_update", "0"): 0,
+            ("node_update", "1"): 0,
+            ("device_update", "2"): 0,
+        }
+        d = listener.handleNotifies()
+        # Let the cooperator start the handlers.
+        while len(running) < 2:
+            yield deferLater(reactor, 0, lambda: None)
+        self.assertEqual(["0", "1"], running)
+        waiting[0].callback(None)
+        while len(running) < 3:
+            yield deferLater(reactor, 0, lambda: None)
+        self.assertEqual(["0", "1", "2"], running)
+        waiting[1].callback(None)
+        waiting[2].callback(None)
+        yield d
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_handleNotifies_logs_handler_failures(self):
+        listener = PostgresListenerService()
+        calls = []
+
+        def handler(action, payload):
+            calls.append(payload)
+            if payload == "1":
+                raise ZeroDivisionError()
+
+        listener.register("machine", handler)
+        listener.notifications = {
+            ("machine_update", "1"): 0,
+            ("machine_update", "2"): 0,
+        }
+        with TwistedLoggerFixture() as logger:
+            yield listener.handleNotifies()
+        self.assertEqual(["1", "2"], calls)
+        self.assertIn(
+            "Failure while handling notification to 'machine': ['1']",
+            logger.output,
+        )
+
+    def test_register_raises_error_if_system_channel_batched(self):
+        listener = PostgresListenerService()
+        with self.assertRaisesRegex(
+            PostgresListenerRegistrationError,
+            r"System channel 'sys_test' cannot be batched\.",
+        ):
+            listener.register("sys_test", lambda *args: None, batch=True)
+
     @wait_for_reactor
     @inlineCallbacks
     def test_listener_ignores_ENOENT_when_removing_itself_from_reactor(self):
@@ -818,6 +818,39 @@ class TestFilterNodeForm(MAASServerTestCase, FilterConstraintsMixin):
         factory.make_PhysicalBlockDevice(node=node2, bootable=True)
         self.assertConstrainedNodes([node1], {"storage": "0"})
 
+    def test_storage_only_matches_devices_of_candidate_nodes(self):
+        nodes = []
+        for zone in (factory.make_Zone(), factory.make_Zone()):
+            node = factory.make_Node(zone=zone, with_boot_disk=False)
+            block_device = factory.make_PhysicalBlockDevice(node=node)
+            factory.make_Filesystem(mount_point="/", block_device=block_device)
+            nodes.append(node)
+        form = FilterNodeForm(
+            data={"storage": "0", "zone": nodes[0].zone.name}
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        filtered_nodes, storage, _ = form.filter_nodes(Machine.objects)
+        self.assertEqual([nodes[0]], list(filtered_nodes))
+        self.assertEqual([nodes[0].id], list(storage))
+
+    def test_interfaces_only_match_interfaces_of_candidate_nodes(self):
+        fabric = factory.make_Fabric()
+        zone = factory.make_Zone()
+        node = factory.make_Node_with_Interface_on_Subnet(
+            fabric=fabric, zone=zone
+        )
+        factory.make_Node_with_Interface_on_Subnet(fabric=fabric)
+        form = FilterNodeForm(
+            data={
+                "interfaces": f"label:fabric={fabric.name}",
+                "zone": zone.name,
+            }
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        filtered_nodes, _, interfaces = form.filter_nodes(Machine.objects)
+        self.assertEqual([node], list(filtered_nodes))
+        self.assertEqual([node.id], list(interfaces["label"]))
+
     def test_storage_matches_disk_with_root_mount_on_partition(self):
         node1 = factory.make_Node(with_boot_disk=False)
         factory.make_PhysicalBlockDevice(
@@ -2337,6 +2370,23 @@ class TestAcquireNodeFormOrdersResults(MAASServerTestCase):
         filtered_nodes, _, _ = form.filter_nodes(Machine.objects.all())
         self.assertEqual(sorted_nodes, list(filtered_nodes))
 
+    def test_lock_nodes_returns_cheapest_nodes(self):
+        nodes = [
+            factory.make_Node(
+                status=NODE_STATUS.READY,
+                cpu_count=random.randint(5, 32),
+                memory=random.randint(1024, 256 * 1024),
+            )
+            for _ in range(4)
+        ]
+        sorted_nodes = sorted(
+            nodes, key=lambda n: n.cpu_count + n.memory / 1024
+        )
+        form = AcquireNodeForm(data={"cpu_count": 4})
+        self.assertTrue(form.is_valid(), form.errors)
+        filtered_nodes, _, _ = form.filter_nodes(Machine.objects.all())
+        self.assertEqual(sorted_nodes[:2], form.lock_nodes(filtered_nodes, 2))
+
 
 class TestReadNodesForm(MAASServerTestCase, FilterConstraintsMixin):
     form_class = ReadNodesForm
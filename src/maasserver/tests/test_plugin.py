@@ -114,6 +114,7 @@ class TestRegionWorkerServiceMaker(TestServiceMaker):
         expected_services = {
             "database-tasks",
             "postgres-listener-worker",
+            "boot-config-cache",
             "rack-controller",
             "rpc",
             "status-worker",
@@ -148,6 +149,7 @@ class TestRegionWorkerServiceMaker(TestServiceMaker):
         expected_services = {
             "database-tasks",
             "postgres-listener-worker",
+            "boot-config-cache",
             "rack-controller",
             "rpc",
             "status-worker",
@@ -252,6 +254,7 @@ class TestRegionMasterServiceMaker(TestServiceMaker):
             "workers",
             "ipc-master",
             "vault-secrets-cleanup",
+            "event-partitions",
             "temporal",
             "temporal-worker",
         }
@@ -351,6 +354,7 @@ class TestRegionAllInOneServiceMaker(TestServiceMaker):
             # Worker services.
             "database-tasks",
             "postgres-listener-worker",
+            "boot-config-cache",
             "rack-controller",
             "rpc",
             "service-monitor",
@@ -375,6 +379,7 @@ class TestRegionAllInOneServiceMaker(TestServiceMaker):
             "reverse-dns",
             "reverse-proxy",
             "vault-secrets-cleanup",
+            "event-partitions",
             "certificate-expiration-check",
             "ntp",
             "syslog",
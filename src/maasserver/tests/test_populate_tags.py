@@ -2,8 +2,9 @@
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 
-from unittest.mock import create_autospec
+from unittest.mock import create_autospec, sentinel
 
+from lxml import etree
 from twisted.internet.base import DelayedCall
 from twisted.internet.task import Clock
 
@@ -12,15 +13,20 @@ from maasserver.models import Node, Tag
 from maasserver.models import tag as tag_module
 from maasserver.populate_tags import (
     populate_tag_for_multiple_nodes,
+    populate_tags_for_multiple_nodes,
     populate_tags_for_single_node,
+    probed_details_cache,
+    ProbedDetailsCache,
 )
 from maasserver.testing.factory import factory
 from maasserver.testing.testcase import (
     MAASServerTestCase,
     MAASTransactionServerTestCase,
 )
+from maastesting.testcase import MAASTestCase
 from maastesting.twisted import always_succeed_with
 from metadataserver.enum import RESULT_TYPE, SCRIPT_STATUS
+from provisioningserver import tags as tags_module
 from provisioningserver.refresh.node_info_scripts import (
     LLDP_OUTPUT_NAME,
     LSHW_OUTPUT_NAME,
@@ -100,7 +106,53 @@ class TestPopulateTagsInRegion(MAASTransactionServerTestCase):
         self.assertEqual(call.kw, {})
 
 
+class TestProbedDetailsCache(MAASTestCase):
+    def test_get_returns_document_for_version(self):
+        cache = ProbedDetailsCache()
+        cache.set("abc", (1,), sentinel.doc, 10)
+        self.assertIs(sentinel.doc, cache.get("abc", (1,)))
+        self.assertIsNone(cache.get("abc", (2,)))
+        self.assertIsNone(cache.get("def", (1,)))
+
+    def test_set_replaces_previous_version(self):
+        cache = ProbedDetailsCache()
+        cache.set("abc", (1,), sentinel.old, 10)
+        cache.set("abc", (2,), sentinel.new, 20)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(20, cache.size)
+        self.assertIs(sentinel.new, cache.get("abc", (2,)))
+
+    def test_evicts_least_recently_used(self):
+        cache = ProbedDetailsCache(max_size=30)
+        cache.set("a", (), sentinel.a, 10)
+        cache.set("b", (), sentinel.b, 10)
+        cache.set("c", (), sentinel.c, 10)
+        cache.get("a", ())
+        cache.set("d", (), sentinel.d, 10)
+        self.assertIsNone(cache.get("b", ()))
+        self.assertIs(sentinel.a, cache.get("a", ()))
+        self.assertEqual(30, cache.size)
+
+    def test_does_not_cache_documents_larger_than_cache(self):
+        cache = ProbedDetailsCache(max_size=10)
+        cache.set("a", (), sentinel.a, 5)
+        cache.set("b", (), sentinel.b, 20)
+        self.assertIsNone(cache.get("b", ()))
+        self.assertIs(sentinel.a, cache.get("a", ()))
+
+    def test_clear(self):
+        cache = ProbedDetailsCache()
+        cache.set("a", (), sentinel.a, 5)
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
+
 class TestPopulateTagsForSingleNode(MAASServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(probed_details_cache.clear)
+
     def test_updates_node_with_all_applicable_tags(self):
         node = factory.make_Node()
         make_lshw_result(node, b"<foo/>")
@@ -139,8 +191,29 @@ class TestPopulateTagsForSingleNode(MAASServerTestCase):
             ["foo"], [tag.name for tag in node.tags.all()]
         )
 
+    def test_reuses_document_until_details_change(self):
+        node = factory.make_Node()
+        lshw = make_lshw_result(node, b"<foo/>")
+        tags = [factory.make_Tag("foo", "/foo", populate=False)]
+        merge_details = self.patch_autospec(
+            populate_tags_module, "merge_details"
+        )
+        merge_details.side_effect = tags_module.merge_details
+        populate_tags_for_single_node(tags, node)
+        populate_tags_for_single_node(tags, node)
+        self.assertEqual(1, merge_details.call_count)
+        lshw.stdout = b"<bar/>"
+        lshw.save()
+        populate_tags_for_single_node(tags, node)
+        self.assertEqual(2, merge_details.call_count)
+        self.assertEqual([], list(node.tags.all()))
+
 
 class TestPopulateTagForMultipleNodes(MAASServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(probed_details_cache.clear)
+
     def test_updates_nodes_with_tag(self):
         nodes = [factory.make_Node() for _ in range(5)]
         for node in nodes[0:2]:
@@ -151,3 +224,57 @@ class TestPopulateTagForMultipleNodes(MAASServerTestCase):
             [node.hostname for node in nodes[0:2]],
             [node.hostname for node in Node.objects.filter(tags__name="bar")],
         )
+
+
+class TestPopulateTagsForMultipleNodes(MAASServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(probed_details_cache.clear)
+
+    def test_updates_nodes_with_tags(self):
+        nodes = [factory.make_Node() for _ in range(4)]
+        for node in nodes[0:2]:
+            make_lldp_result(node, b"<bar/>")
+        for node in nodes[1:3]:
+            make_lshw_result(node, b"<foo/>")
+        tags = [
+            factory.make_Tag("bar", "//lldp:bar", populate=False),
+            factory.make_Tag("foo", "/foo", populate=False),
+        ]
+        populate_tags_for_multiple_nodes(tags, nodes, batch_size=3)
+        self.assertCountEqual(
+            [node.hostname for node in nodes[0:2]],
+            [node.hostname for node in Node.objects.filter(tags__name="bar")],
+        )
+        self.assertCountEqual(
+            [node.hostname for node in nodes[1:3]],
+            [node.hostname for node in Node.objects.filter(tags__name="foo")],
+        )
+
+    def test_raises_for_invalid_definition(self):
+        node = factory.make_Node()
+        make_lshw_result(node, b"<foo/>")
+        tags = [
+            factory.make_Tag("foo", "/foo", populate=False),
+            Tag(name="invalid", definition="//["),
+        ]
+        self.assertRaises(
+            etree.XPathError, populate_tags_for_multiple_nodes, tags, [node]
+        )
+        self.assertSequenceEqual([], list(node.tags.all()))
+
+    def test_parses_details_once_per_node(self):
+        nodes = [factory.make_Node() for _ in range(3)]
+        for node in nodes:
+            make_lshw_result(node, b"<foo/>")
+        tags = [
+            factory.make_Tag("foo", "/foo", populate=False),
+            factory.make_Tag("list", "/list", populate=False),
+        ]
+        merge_details = self.patch_autospec(
+            populate_tags_module, "merge_details"
+        )
+        merge_details.side_effect = tags_module.merge_details
+        populate_tags_for_multiple_nodes(tags, nodes)
+        populate_tag_for_multiple_nodes(tags[0], nodes)
+        self.assertEqual(3, merge_details.call_count)
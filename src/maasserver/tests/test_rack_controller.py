@@ -5,7 +5,7 @@
 
 
 import random
-from unittest.mock import call, create_autospec, sentinel
+from unittest.mock import call, create_autospec, Mock, sentinel
 
 from twisted.internet import reactor
 from twisted.internet.defer import Deferred, fail, inlineCallbacks, succeed
@@ -20,6 +20,7 @@ from maasserver.triggers.testing import TransactionalHelpersMixin
 from maasserver.utils.orm import transactional
 from maasserver.utils.threads import deferToDatabase
 from maastesting.crochet import wait_for
+from provisioningserver.rpc.cluster import ExternalServicesConfigurationChanged
 
 wait_for_reactor = wait_for()
 
@@ -67,6 +68,9 @@ class TestRackControllerService(
         self.assertIn(sys_channel, listener.listeners)
         self.assertIn(sys_channel, listener.registeredChannels)
         self.assertIn(service.coreHandler, listener.listeners[sys_channel])
+        self.assertIn(
+            service.rackConfigHandler, listener.listeners["sys_rack_config"]
+        )
         self.assertEqual(regionProcessId, service.processId)
         yield listener.stopService()
 
@@ -247,6 +251,39 @@ class TestRackControllerService(
         self.assertEqual({rack_id}, service.needsDHCPUpdate)
         mock_startProcessing.assert_called_once_with()
 
+    def test_coreHandler_watch_pushes_configuration_version(self):
+        processId = random.randint(0, 100)
+        rack_id = random.randint(0, 100)
+        listener = self.make_listener_without_delay()
+        service = RackControllerService(sentinel.ipcWorker, listener)
+        service.processId = processId
+        self.patch(service, "startProcessing")
+        service.coreHandler(f"sys_core_{processId}", "watch_%d" % rack_id)
+        self.assertEqual({rack_id}, service.needsConfigPush)
+        service.coreHandler(f"sys_core_{processId}", "unwatch_%d" % rack_id)
+        self.assertEqual(set(), service.needsConfigPush)
+
+    def test_rackConfigHandler_pushes_to_watched_racks(self):
+        rack_ids = {random.randint(0, 100) for _ in range(3)}
+        service = RackControllerService(sentinel.ipcWorker, sentinel.listener)
+        service.watching = set(rack_ids)
+        mock_startProcessing = self.patch(service, "startProcessing")
+        service.rackConfigHandler("sys_rack_config", "5")
+        self.assertEqual(5, service.configVersion)
+        self.assertEqual(rack_ids, service.needsConfigPush)
+        mock_startProcessing.assert_called_once_with()
+
+    def test_rackConfigHandler_ignores_older_versions(self):
+        rack_id = random.randint(0, 100)
+        service = RackControllerService(sentinel.ipcWorker, sentinel.listener)
+        service.watching = {rack_id}
+        service.configVersion = 5
+        mock_startProcessing = self.patch(service, "startProcessing")
+        service.rackConfigHandler("sys_rack_config", "4")
+        self.assertEqual(5, service.configVersion)
+        self.assertEqual(set(), service.needsConfigPush)
+        mock_startProcessing.assert_not_called()
+
     def test_coreHandler_raises_ValueError_for_unknown_action(self):
         processId = random.randint(0, 100)
         rack_id = random.randint(0, 100)
@@ -359,6 +396,62 @@ class TestRackControllerService(
             yield service.processingDone
         mock_processDHCP.assert_has_calls([call(rack_id), call(rack_id)])
 
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_process_calls_processConfigPush_after_processDHCP(self):
+        rack_id = random.randint(0, 100)
+        service = RackControllerService(sentinel.ipcWorker, sentinel.listener)
+        service.watching = {rack_id}
+        service.needsDHCPUpdate = {rack_id}
+        service.needsConfigPush = {rack_id}
+        service.running = True
+        calls = []
+        self.patch(service, "processDHCP").side_effect = (
+            lambda rack_id: calls.append(("dhcp", rack_id))
+        )
+        self.patch(service, "processConfigPush").side_effect = (
+            lambda rack_id: calls.append(("config", rack_id))
+        )
+        service.startProcessing()
+        yield service.processingDone
+        self.assertEqual([("dhcp", rack_id), ("config", rack_id)], calls)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_processConfigPush_notifies_rack_controller(self):
+        rack = yield deferToDatabase(
+            transactional(factory.make_RackController)
+        )
+        service = RackControllerService(sentinel.ipcWorker, sentinel.listener)
+        service.configVersion = 7
+        client = Mock(return_value=succeed({}))
+        mock_getClientFor = self.patch(rack_controller, "getClientFor")
+        mock_getClientFor.return_value = succeed(client)
+        yield service.processConfigPush(rack.id)
+        mock_getClientFor.assert_called_once_with(rack.system_id)
+        client.assert_called_once_with(
+            ExternalServicesConfigurationChanged, version=7
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_processConfigPush_uses_current_version(self):
+        rack = yield deferToDatabase(
+            transactional(factory.make_RackController)
+        )
+        version = yield deferToDatabase(
+            transactional(rack_controller.rack_config_version.current)
+        )
+        service = RackControllerService(sentinel.ipcWorker, sentinel.listener)
+        client = Mock(return_value=succeed({}))
+        self.patch(rack_controller, "getClientFor").return_value = succeed(
+            client
+        )
+        yield service.processConfigPush(rack.id)
+        client.assert_called_once_with(
+            ExternalServicesConfigurationChanged, version=version
+        )
+
     @wait_for_reactor
     @inlineCallbacks
     def test_processDHCP_calls_configure_dhcp(self):
@@ -121,6 +121,21 @@ class TestSequence(MAASServerTestCase):
         seq.create_if_not_exists()
         self.assertSequenceEqual(list(range(1, 11)), list(islice(seq, 10)))
 
+    def test_current_returns_last_value(self):
+        name = factory.make_name("seq", sep="")
+        seq = Sequence(name)
+        seq.create_if_not_exists()
+        next(seq)
+        next(seq)
+        self.assertEqual(2, seq.current())
+        self.assertEqual(3, next(seq))
+
+    def test_current_creates_sequence(self):
+        name = factory.make_name("seq", sep="")
+        seq = Sequence(name, start=5)
+        self.assertEqual(5, seq.current())
+        self.assertEqual(5, next(seq))
+
     def test_set_value_sets_value(self):
         name = factory.make_name("seq", sep="")
         seq = Sequence(name)
@@ -63,6 +63,7 @@ from maasserver.testing.testcase import (
     MAASTransactionServerTestCase,
 )
 from maastesting import get_testing_timeout
+from maastesting.djangotestcase import count_queries
 from maastesting.fixtures import TempDirectory
 from maastesting.testcase import MAASTestCase
 from maastesting.twisted import extract_result
@@ -1164,6 +1165,27 @@ class TestGetSubnetsUtilisationStats(MAASServerTestCase):
             },
         )
 
+    def test_stats_static_routes(self):
+        subnet = factory.make_Subnet(cidr="1.2.0.0/16", gateway_ip="1.2.0.254")
+        factory.make_StaticRoute(source=subnet, gateway_ip="1.2.0.253")
+        self.assertEqual(
+            stats.get_subnets_utilisation_stats()["1.2.0.0/16"]["unavailable"],
+            2,
+        )
+
+    def test_stats_query_count_does_not_depend_on_subnets(self):
+        def make_subnet():
+            subnet = factory.make_Subnet(version=4)
+            factory.make_StaticIPAddress(subnet=subnet)
+            factory.make_StaticRoute(source=subnet)
+
+        make_subnet()
+        queries_one, _ = count_queries(stats.get_subnets_utilisation_stats)
+        for _ in range(3):
+            make_subnet()
+        queries_many, _ = count_queries(stats.get_subnets_utilisation_stats)
+        self.assertEqual(queries_one, queries_many)
+
 
 class TestGetBMCStats(MAASServerTestCase):
     def test_get_bmc_stats_no_bmcs(self):
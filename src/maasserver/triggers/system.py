@@ -14,6 +14,7 @@ from textwrap import dedent
 
 from maasserver.enum import NODE_TYPE
 from maasserver.models.dnspublication import zone_serial
+from maasserver.models.node import rack_config_version
 from maasserver.triggers import register_procedure, register_trigger
 from maasserver.utils.orm import transactional
 
@@ -2494,6 +2495,140 @@ def render_sys_proxy_procedure(proc_name, on_delete=False):
     )
 
 
+def render_sys_rack_config_procedure(proc_name, on_delete=False):
+    """Render a database procedure with name `proc_name` that notifies that
+    the configuration of the external services of the rack controllers
+    changed.
+
+    The payload of the notification is the new version of the configuration.
+
+    :param proc_name: Name of the procedure.
+    :param on_delete: True when procedure will be used as a delete trigger.
+    """
+    entry = "OLD" if on_delete else "NEW"
+    return dedent(
+        f"""\
+        CREATE OR REPLACE FUNCTION {proc_name}() RETURNS trigger AS $$
+        BEGIN
+          PERFORM pg_notify(
+            'sys_rack_config',
+            CAST(nextval('{rack_config_version.name}') AS text));
+          RETURN {entry};
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def render_sys_free_range_ip_procedure(proc_name):
+    """Render a database procedure with name `proc_name` that keeps the free
+    ranges of the subnets up to date with the addresses used by a table.
+
+    A new address is removed from the free range it is in. A released address
+    is added back as a range of its own to the subnets that have their free
+    ranges built, if it would be free when building them again: it must not
+    be used by another row, be in a dynamic range, be the network, broadcast,
+    gateway or DNS server address, nor be outside the reserved ranges of an
+    unmanaged subnet. Other addresses, like DISCOVERED addresses coming and
+    going in dynamic ranges, don't change the free ranges.
+
+    :param proc_name: Name of the procedure.
+    """
+    return dedent(
+        f"""\
+        CREATE OR REPLACE FUNCTION {proc_name}() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP <> 'INSERT' AND OLD.ip IS NOT NULL
+              AND family(OLD.ip) = 4 THEN
+            INSERT INTO maasserver_subnetfreerange (subnet_id, start_ip, end_ip)
+            SELECT subnet.id, OLD.ip, OLD.ip
+            FROM maasserver_subnet AS subnet
+            WHERE subnet.cidr >>= OLD.ip
+              AND (
+                masklen(subnet.cidr) >= 31
+                OR OLD.ip NOT IN (
+                  host(network(subnet.cidr))::inet,
+                  host(broadcast(subnet.cidr))::inet))
+              AND subnet.gateway_ip IS DISTINCT FROM OLD.ip
+              AND host(OLD.ip) <> ALL(COALESCE(subnet.dns_servers, '{{}}'))
+              AND EXISTS (
+                SELECT 1 FROM maasserver_subnetfreerange
+                WHERE subnet_id = subnet.id)
+              AND NOT EXISTS (
+                SELECT 1 FROM maasserver_subnetfreerange
+                WHERE subnet_id = subnet.id
+                  AND start_ip <= OLD.ip AND end_ip >= OLD.ip)
+              AND NOT EXISTS (
+                SELECT 1 FROM maasserver_staticroute
+                WHERE source_id = subnet.id AND gateway_ip = OLD.ip)
+              AND NOT EXISTS (
+                SELECT 1 FROM maasserver_iprange
+                WHERE subnet_id = subnet.id
+                  AND start_ip <= OLD.ip AND end_ip >= OLD.ip
+                  AND (type = 'dynamic' OR subnet.managed))
+              AND (
+                subnet.managed
+                OR EXISTS (
+                  SELECT 1 FROM maasserver_iprange
+                  WHERE subnet_id = subnet.id AND type = 'reserved'
+                    AND start_ip <= OLD.ip AND end_ip >= OLD.ip))
+              AND NOT EXISTS (
+                SELECT 1 FROM maasserver_staticipaddress
+                WHERE ip = OLD.ip)
+              AND NOT EXISTS (
+                SELECT 1 FROM maasserver_neighbour
+                WHERE ip = OLD.ip)
+            ON CONFLICT DO NOTHING;
+          END IF;
+          IF TG_OP <> 'DELETE' AND NEW.ip IS NOT NULL
+              AND family(NEW.ip) = 4 THEN
+            WITH claimed AS (
+              DELETE FROM maasserver_subnetfreerange
+              WHERE subnet_id IN (
+                  SELECT id FROM maasserver_subnet WHERE cidr >>= NEW.ip)
+                AND start_ip <= NEW.ip AND end_ip >= NEW.ip
+              RETURNING subnet_id, start_ip, end_ip)
+            INSERT INTO maasserver_subnetfreerange (subnet_id, start_ip, end_ip)
+            SELECT subnet_id, start_ip, NEW.ip - 1
+            FROM claimed WHERE start_ip < NEW.ip
+            UNION ALL
+            SELECT subnet_id, NEW.ip + 1, end_ip
+            FROM claimed WHERE end_ip > NEW.ip;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def render_sys_free_range_invalidate_procedure(proc_name, column):
+    """Render a database procedure with name `proc_name` that drops the free
+    ranges of the subnet referenced by `column`, so that they are built
+    again.
+
+    :param proc_name: Name of the procedure.
+    :param column: Name of the column holding the subnet ID.
+    """
+    return dedent(
+        f"""\
+        CREATE OR REPLACE FUNCTION {proc_name}() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP <> 'INSERT' THEN
+            DELETE FROM maasserver_subnetfreerange
+            WHERE subnet_id = OLD.{column};
+          END IF;
+          IF TG_OP <> 'DELETE' THEN
+            DELETE FROM maasserver_subnetfreerange
+            WHERE subnet_id = NEW.{column};
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
 @transactional
 def register_system_triggers():
     """Register all system triggers into the database."""
@@ -2730,6 +2865,116 @@ def register_system_triggers():
         "maasserver_config", "sys_proxy_config_use_peer_proxy_update", "update"
     )
 
+    # Rack controller external services
+    # The version is used in the 'sys_rack_config' triggers. Ensure that it
+    # exists before creating the triggers.
+    rack_config_version.create_if_not_exists()
+
+    # - Config
+    register_procedure(
+        render_sys_rack_config_procedure("sys_rack_config_config_insert")
+    )
+    register_trigger(
+        "maasserver_config", "sys_rack_config_config_insert", "insert"
+    )
+    register_procedure(
+        render_sys_rack_config_procedure("sys_rack_config_config_update")
+    )
+    register_trigger(
+        "maasserver_config", "sys_rack_config_config_update", "update"
+    )
+    register_procedure(
+        render_sys_rack_config_procedure(
+            "sys_rack_config_config_delete", on_delete=True
+        )
+    )
+    register_trigger(
+        "maasserver_config", "sys_rack_config_config_delete", "delete"
+    )
+
+    # - Subnet (DNS trusted networks and proxy allowed networks)
+    register_procedure(
+        render_sys_rack_config_procedure("sys_rack_config_subnet_insert")
+    )
+    register_trigger(
+        "maasserver_subnet", "sys_rack_config_subnet_insert", "insert"
+    )
+    register_procedure(
+        render_sys_rack_config_procedure("sys_rack_config_subnet_update")
+    )
+    register_trigger(
+        "maasserver_subnet",
+        "sys_rack_config_subnet_update",
+        "update",
+        fields=["cidr", "allow_dns", "allow_proxy"],
+    )
+    register_procedure(
+        render_sys_rack_config_procedure(
+            "sys_rack_config_subnet_delete", on_delete=True
+        )
+    )
+    register_trigger(
+        "maasserver_subnet", "sys_rack_config_subnet_delete", "delete"
+    )
+
+    # - Node (controller type)
+    register_procedure(
+        render_sys_rack_config_procedure("sys_rack_config_node_update")
+    )
+    register_trigger(
+        "maasserver_node",
+        "sys_rack_config_node_update",
+        "update",
+        fields=["node_type"],
+    )
+
+    # Subnet free ranges
+
+    # - StaticIPAddress and Neighbour
+    for table in ("staticipaddress", "neighbour"):
+        for event in ("insert", "update", "delete"):
+            proc_name = f"sys_free_range_{table}_{event}"
+            register_procedure(render_sys_free_range_ip_procedure(proc_name))
+            register_trigger(
+                f"maasserver_{table}",
+                proc_name,
+                event,
+                fields=["ip"] if event == "update" else None,
+            )
+
+    # - IPRange, StaticRoute and Subnet
+    for table, column, events, fields in (
+        (
+            "iprange",
+            "subnet_id",
+            ("insert", "update", "delete"),
+            ["subnet_id", "type", "start_ip", "end_ip"],
+        ),
+        (
+            "staticroute",
+            "source_id",
+            ("insert", "update", "delete"),
+            ["source_id", "gateway_ip"],
+        ),
+        (
+            "subnet",
+            "id",
+            ("update",),
+            ["cidr", "gateway_ip", "dns_servers", "managed"],
+        ),
+    ):
+        for event in events:
+            proc_name = f"sys_free_range_{table}_{event}"
+            register_procedure(
+                render_sys_free_range_invalidate_procedure(proc_name, column)
+            )
+            register_trigger(
+                f"maasserver_{table}",
+                proc_name,
+                event,
+                fields=fields if event == "update" else None,
+            )
+
     # - RBACSync
     register_procedure(RBAC_SYNC)
     register_trigger("maasserver_rbacsync", "sys_rbac_sync", "insert")
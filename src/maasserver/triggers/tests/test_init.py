@@ -104,6 +104,13 @@ class TestTriggersUsed(MAASServerTestCase):
         "node_sys_dns_updates_maasserver_node_insert",
         "node_sys_dns_updates_maasserver_node_update",
         "node_sys_dns_updates_maasserver_node_delete",
+        "config_sys_rack_config_config_delete",
+        "config_sys_rack_config_config_insert",
+        "config_sys_rack_config_config_update",
+        "node_sys_rack_config_node_update",
+        "subnet_sys_rack_config_subnet_delete",
+        "subnet_sys_rack_config_subnet_insert",
+        "subnet_sys_rack_config_subnet_update",
         "rbacsync_sys_rbac_sync",
         "regionrackrpcconnection_sys_core_rpc_delete",
         "regionrackrpcconnection_sys_core_rpc_insert",
@@ -127,6 +134,19 @@ class TestTriggersUsed(MAASServerTestCase):
         "subnet_sys_proxy_subnet_insert",
         "subnet_sys_proxy_subnet_update",
         "vlan_sys_dhcp_vlan_update",
+        "staticipaddress_sys_free_range_staticipaddress_insert",
+        "staticipaddress_sys_free_range_staticipaddress_update",
+        "staticipaddress_sys_free_range_staticipaddress_delete",
+        "neighbour_sys_free_range_neighbour_insert",
+        "neighbour_sys_free_range_neighbour_update",
+        "neighbour_sys_free_range_neighbour_delete",
+        "iprange_sys_free_range_iprange_insert",
+        "iprange_sys_free_range_iprange_update",
+        "iprange_sys_free_range_iprange_delete",
+        "staticroute_sys_free_range_staticroute_insert",
+        "staticroute_sys_free_range_staticroute_update",
+        "staticroute_sys_free_range_staticroute_delete",
+        "subnet_sys_free_range_subnet_update",
     }
 
     triggers_websocket = {
@@ -140,6 +160,12 @@ class TestTriggersUsed(MAASServerTestCase):
         "bmc_pod_delete_notify",
         "bmc_pod_insert_notify",
         "bmc_pod_update_notify",
+        "bootresource_bootresource_create_notify",
+        "bootresource_bootresource_delete_notify",
+        "bootresource_bootresource_update_notify",
+        "bootresourceset_bootresourceset_link_notify",
+        "bootresourceset_bootresourceset_unlink_notify",
+        "bootresourceset_bootresourceset_update_notify",
         "cacheset_nd_cacheset_link_notify",
         "cacheset_nd_cacheset_unlink_notify",
         "cacheset_nd_cacheset_update_notify",
@@ -23,7 +23,13 @@ from maasserver.enum import (
     NODE_TYPE_CHOICES,
 )
 from maasserver.listener import PostgresListenerService
-from maasserver.models import ControllerInfo, Node, OwnerData, VMCluster
+from maasserver.models import (
+    BootResource,
+    ControllerInfo,
+    Node,
+    OwnerData,
+    VMCluster,
+)
 from maasserver.models.blockdevice import MIN_BLOCK_DEVICE_SIZE
 from maasserver.models.partition import MIN_PARTITION_SIZE
 from maasserver.storage_layouts import MIN_BOOT_PARTITION_SIZE
@@ -806,6 +812,52 @@ class TestTagListener(
             yield listener.stopService()
 
 
+class TestBootResourceListener(
+    MAASTransactionServerTestCase, TransactionalHelpersMixin
+):
+    """End-to-end test of both the listeners code and the boot resource
+    triggers code."""
+
+    @transactional
+    def create_boot_resource(self):
+        return factory.make_BootResource()
+
+    @transactional
+    def create_boot_resource_set(self, resource_id):
+        return factory.make_BootResourceSet(
+            BootResource.objects.get(id=resource_id)
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_calls_handler_on_create_notification(self):
+        listener = self.make_listener_without_delay()
+        dv = DeferredValue()
+        listener.register("bootresource", lambda *args: dv.set(args))
+        yield listener.startService()
+        try:
+            resource = yield deferToDatabase(self.create_boot_resource)
+            yield dv.get(timeout=2)
+            self.assertEqual(("create", str(resource.id)), dv.value)
+        finally:
+            yield listener.stopService()
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_calls_handler_with_update_on_set_create(self):
+        listener = self.make_listener_without_delay()
+        dv = DeferredValue()
+        listener.register("bootresource", lambda *args: dv.set(args))
+        resource = yield deferToDatabase(self.create_boot_resource)
+        yield listener.startService()
+        try:
+            yield deferToDatabase(self.create_boot_resource_set, resource.id)
+            yield dv.get(timeout=2)
+            self.assertEqual(("update", str(resource.id)), dv.value)
+        finally:
+            yield listener.stopService()
+
+
 class TestNodeTagListener(
     MAASTransactionServerTestCase, TransactionalHelpersMixin
 ):
@@ -2294,6 +2294,50 @@ def register_websocket_triggers():
         "maasserver_tag", "tag_update_machine_device_notify", "update"
     )
 
+    # BootResource table
+    register_procedure(
+        render_notification_procedure(
+            "bootresource_create_notify", "bootresource_create", "NEW.id"
+        )
+    )
+    register_procedure(
+        render_notification_procedure(
+            "bootresource_update_notify", "bootresource_update", "NEW.id"
+        )
+    )
+    register_procedure(
+        render_notification_procedure(
+            "bootresource_delete_notify", "bootresource_delete", "OLD.id"
+        )
+    )
+    register_triggers("maasserver_bootresource", "bootresource")
+
+    # BootResourceSet table, update to the boot resource.
+    register_procedure(
+        render_notification_procedure(
+            "bootresourceset_link_notify",
+            "bootresource_update",
+            "NEW.resource_id",
+        )
+    )
+    register_procedure(
+        render_notification_procedure(
+            "bootresourceset_update_notify",
+            "bootresource_update",
+            "NEW.resource_id",
+        )
+    )
+    register_procedure(
+        render_notification_procedure(
+            "bootresourceset_unlink_notify",
+            "bootresource_update",
+            "OLD.resource_id",
+        )
+    )
+    register_triggers(
+        "maasserver_bootresourceset", "bootresourceset", events=EVENTS_LUU
+    )
+
     # User table
     register_procedure(
         render_notification_procedure(
@@ -116,6 +116,9 @@ class HandlerOptions:
     form = None
     form_requires_request = True
     listen_channels = []
+    # Seconds to let the notifications of `listen_channels` accumulate in
+    # the listener, for channels that see bursts of notifications.
+    listen_window = None
     batch_key = "id"
     create_permission = None
     view_permission = None
@@ -191,6 +194,12 @@ class Handler(metaclass=HandlerMetaclass):
 
     """
 
+    # Set by `WebSocketFactory.processNotifies` while fanning out a
+    # notification. It is shared by the handlers of every client with the
+    # same `get_notify_memo_key`, so lookups made through
+    # `memoize_for_notify` only happen once for all of them.
+    notify_memo = None
+
     def __init__(self, user: User, cache: dict, request, session_id=""):
         self.user = user
         self.cache = cache
@@ -337,6 +346,34 @@ class Handler(metaclass=HandlerMetaclass):
         """
         return obj
 
+    def get_notify_memo_key(self):
+        """Return the key of the memo shared while fanning out notifications.
+
+        Handlers returning the same key must load and dehydrate objects the
+        same way. By default the memo is only shared by the clients of the
+        same user.
+        """
+        return self.user.id
+
+    def memoize_for_notify(self, key, func, *args, **kwargs):
+        """Return `func(*args, **kwargs)`, sharing it through `notify_memo`.
+
+        Handler errors are memoized too, and raised again on each call.
+        """
+        if self.notify_memo is None:
+            return func(*args, **kwargs)
+        try:
+            result, error = self.notify_memo[key]
+        except KeyError:
+            try:
+                result, error = func(*args, **kwargs), None
+            except HandlerError as e:
+                result, error = None, e
+            self.notify_memo[key] = result, error
+        if error is not None:
+            raise error
+        return result
+
     def _get_object(self, params: dict, permission=None):
         """Get object by using the `pk` in `params`."""
         if self._meta.pk not in params:
@@ -344,6 +381,11 @@ class Handler(metaclass=HandlerMetaclass):
                 {self._meta.pk: ["This field is required"]}
             )
         pk = params[self._meta.pk]
+        return self.memoize_for_notify(
+            ("object", pk, permission), self._load_object, pk, permission
+        )
+
+    def _load_object(self, pk, permission=None):
         try:
             obj = self.get_queryset(for_list=False).get(**{self._meta.pk: pk})
         except self._meta.object_class.DoesNotExist:
@@ -865,7 +907,9 @@ class Handler(metaclass=HandlerMetaclass):
             else:
                 return None
 
-        self.user.refresh_from_db()
+        if self.notify_memo is None:
+            # Otherwise the user was refreshed once for the whole batch.
+            self.user.refresh_from_db()
         try:
             obj = self.listen(channel, action, pk)
         except HandlerDoesNotExistError:
@@ -910,7 +954,7 @@ class Handler(metaclass=HandlerMetaclass):
             return (
                 self._meta.handler_name,
                 action,
-                self.full_dehydrate(obj, for_list=False),
+                self.dehydrate_for_notify(obj, for_list=False),
             )
         else:
             # Not active so only send the data like it was comming from
@@ -918,9 +962,18 @@ class Handler(metaclass=HandlerMetaclass):
             return (
                 self._meta.handler_name,
                 action,
-                self.full_dehydrate(obj, for_list=True),
+                self.dehydrate_for_notify(obj, for_list=True),
             )
 
+    def dehydrate_for_notify(self, obj, for_list=False):
+        """Dehydrate `obj` for a notification, once per user and batch."""
+        return self.memoize_for_notify(
+            ("dehydrate", getattr(obj, self._meta.pk), for_list),
+            self.full_dehydrate,
+            obj,
+            for_list=for_list,
+        )
+
     def listen(self, channel, action, pk):
         """Called when the handler listens for events on channels with
         `Meta.listen_channels`.
@@ -123,6 +123,7 @@ class ControllerHandler(NodeHandler):
             "vault_configured",
         ]
         listen_channels = ["controller"]
+        listen_window = 0.5
         create_permission = NodePermission.admin
         view_permission = NodePermission.view
         edit_permission = NodePermission.admin
@@ -29,6 +29,7 @@ class EventHandler(TimestampedModelHandler):
         allowed_methods = ["list", "clear"]
         exclude = ["node"]
         listen_channels = ["event"]
+        listen_window = 0.5
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -115,5 +116,5 @@ class EventHandler(TimestampedModelHandler):
         return (
             self._meta.handler_name,
             action,
-            self.full_dehydrate(obj, for_list=True),
+            self.dehydrate_for_notify(obj, for_list=True),
         )
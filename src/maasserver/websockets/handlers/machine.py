@@ -325,6 +325,7 @@ class MachineHandler(NodeHandler):
             "commissioning_status",
         ] + exclude
         listen_channels = ["machine"]
+        listen_window = 0.5
         create_permission = NodePermission.admin
         view_permission = NodePermission.view
         edit_permission = NodePermission.admin
@@ -75,6 +75,7 @@ from maasserver.node_constraint_filter_forms import (
     STATIC_FILTER_FIELDS,
 )
 from maasserver.permissions import NodePermission
+from maasserver.rbac import rbac
 from maasserver.storage_layouts import get_applied_storage_layout_for_node
 from maasserver.third_party_drivers import get_third_party_driver
 from maasserver.utils.converters import human_readable_bytes, XMLToYAML
@@ -177,6 +178,47 @@ class NodeHandler(TimestampedModelHandler):
         self._script_results = {}
         self._script_results_for_list = {}
 
+    def get_notify_memo_key(self):
+        """Share the notify memo between users with the same permissions.
+
+        Which nodes a user can see and edit depends on who owns them, unless
+        the user can administer every node. Only those users are keyed by
+        their permissions, the others keep a memo of their own.
+        """
+        if not rbac.is_enabled():
+            if self.user.is_superuser:
+                return (True, frozenset())
+            return super().get_notify_memo_key()
+        pools = rbac.get_resource_pool_ids(
+            self.user.username,
+            "view",
+            "view-all",
+            "deploy-machines",
+            "admin-machines",
+        )
+        all_pools = ResourcePool.objects.values_list("id", flat=True)
+        if not set(all_pools).issubset(pools["admin-machines"]):
+            return super().get_notify_memo_key()
+        grants = frozenset(
+            (permission, frozenset(pool_ids))
+            for permission, pool_ids in pools.items()
+        )
+        return (self.user.is_superuser, grants)
+
+    def dehydrate_for_notify(self, obj, for_list=False):
+        # Some actions are only offered to the owner of the node.
+        return self.memoize_for_notify(
+            (
+                "dehydrate",
+                obj.system_id,
+                for_list,
+                obj.owner_id == self.user.id,
+            ),
+            self.full_dehydrate,
+            obj,
+            for_list=for_list,
+        )
+
     def update(self, params):
         data = super().update(params)
         if "tags" in params:
@@ -700,8 +742,16 @@ class NodeHandler(TimestampedModelHandler):
         if not for_list:
             self._cache_script_results(nodes)
 
+    def _load_script_results(self, node):
+        self._cache_script_results([node])
+        return self._script_results.get(node.id, {})
+
     def on_listen_for_active_pk(self, action, pk, obj):
-        self._cache_script_results([obj])
+        # Handlers sharing the notify memo may not share the dehydration of
+        # `obj`, so each one gets the loaded script results.
+        self._script_results[obj.id] = self.memoize_for_notify(
+            ("script_results", obj.id), self._load_script_results, obj
+        )
         return super().on_listen_for_active_pk(action, pk, obj)
 
     def dehydrate_blockdevice(self, blockdevice, obj):
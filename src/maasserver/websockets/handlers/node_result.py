@@ -41,6 +41,7 @@ class NodeResultHandler(TimestampedModelHandler):
             "list",
         ]
         listen_channels = ["scriptresult"]
+        listen_window = 0.5
         exclude = ["script_set", "script_name", "output", "stdout", "stderr"]
         list_fields = [
             "id",
@@ -292,5 +293,5 @@ class NodeResultHandler(TimestampedModelHandler):
         return (
             self._meta.handler_name,
             action,
-            self.full_dehydrate(obj, for_list=True),
+            self.dehydrate_for_notify(obj, for_list=True),
         )
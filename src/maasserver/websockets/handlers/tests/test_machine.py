@@ -699,6 +699,45 @@ class TestMachineHandler(MAASServerTestCase):
             cached_content, handler._script_results[cached_node.id]
         )
 
+    def test_on_listen_gives_script_results_to_handlers_sharing_memo(self):
+        owner = factory.make_admin()
+        node = factory.make_Machine(owner=owner)
+        script_result = factory.make_ScriptResult(
+            status=SCRIPT_STATUS.PASSED,
+            script_set=factory.make_ScriptSet(node=node),
+        )
+        handlers = [
+            MachineHandler(owner, {}, None),
+            MachineHandler(factory.make_admin(), {}, None),
+        ]
+        self.assertEqual(*[h.get_notify_memo_key() for h in handlers])
+        notify_memo = {}
+        dehydrated_script_results = []
+
+        def full_dehydrate(handler, obj, for_list=False):
+            dehydrated_script_results.append(
+                handler._script_results.get(obj.id)
+            )
+            return {}
+
+        self.patch(MachineHandler, "full_dehydrate", full_dehydrate)
+        for handler in handlers:
+            handler.notify_memo = notify_memo
+            handler.cache["loaded_pks"].add(node.system_id)
+            handler.cache["active_pk"] = node.system_id
+            handler.on_listen("machine", "update", node.system_id)
+        self.assertEqual(2, len(dehydrated_script_results))
+        for script_results in dehydrated_script_results:
+            self.assertEqual(
+                [script_result.id],
+                [
+                    result.id
+                    for result in script_results[
+                        script_result.script.hardware_type
+                    ]
+                ],
+            )
+
     def test_get_refresh_script_result_cache_clears_aborted(self):
         # Regression test for LP:1731350
         owner = factory.make_User()
@@ -4,11 +4,12 @@
 """The MAAS WebSockets protocol."""
 
 
-from collections import deque
+from collections import defaultdict, deque
 from contextlib import ExitStack
 from functools import partial
 from http.cookies import SimpleCookie
 import json
+import time
 from typing import Optional
 from urllib.parse import parse_qs, urlparse
 
@@ -17,13 +18,22 @@ from django.contrib.auth import BACKEND_SESSION_KEY, load_backend, SESSION_KEY
 from django.core.exceptions import ValidationError
 from django.http import HttpRequest
 from django.utils import timezone
-from twisted.internet.defer import fail, inlineCallbacks, returnValue, succeed
+from twisted.internet import reactor
+from twisted.internet.defer import (
+    Deferred,
+    fail,
+    inlineCallbacks,
+    returnValue,
+    succeed,
+)
 from twisted.internet.protocol import Factory, Protocol
 from twisted.internet.task import LoopingCall
+from twisted.python.failure import Failure
 from twisted.python.modules import getModule
 from twisted.web.server import NOT_DONE_YET
 
 from maasserver.eventloop import services
+from maasserver.rbac import rbac
 from maasserver.utils.orm import transactional
 from maasserver.utils.threads import deferToDatabase
 from maasserver.websockets import handlers
@@ -34,6 +44,10 @@ from provisioningserver.utils.url import splithost
 
 log = LegacyLogger()
 
+# Seconds for which the RBAC permissions of a connection are assumed to be
+# unchanged when fanning out notifications.
+RBAC_NOTIFY_PERMISSIONS_LIFETIME = 60
+
 
 class MSG_TYPE:
     # Request made from client.
@@ -82,6 +96,10 @@ class WebSocketProtocol(Protocol):
         self.request = None
         self.cache = {}
         self.sequence_number = 0
+        # The notify memo keys of the handlers, see `getNotifyMemoKey`. They
+        # are kept until the permissions of the user change.
+        self.notify_memo_keys = {}
+        self.notify_permissions = None
 
     @inlineCallbacks
     def connectionMade(self):
@@ -367,6 +385,43 @@ class WebSocketProtocol(Protocol):
             json.dumps(notify_msg, default=self._json_encode).encode("ascii")
         )
 
+    def checkNotifyPermissions(self):
+        """Forget the notify memo keys if the user's permissions changed.
+
+        RBAC doesn't tell about changes to its grants, so with RBAC the keys
+        are also forgotten every `RBAC_NOTIFY_PERMISSIONS_LIFETIME` seconds.
+        """
+        rbac_epoch = None
+        if rbac.is_enabled():
+            rbac_epoch = int(
+                time.monotonic() // RBAC_NOTIFY_PERMISSIONS_LIFETIME
+            )
+        permissions = (self.user.is_superuser, self.user.is_active, rbac_epoch)
+        if permissions != self.notify_permissions:
+            self.notify_permissions = permissions
+            self.notify_memo_keys.clear()
+
+    def getNotifyMemoKey(self, handler_class, handler):
+        """Return the notify memo key of `handler`, once per connection.
+
+        If the key can't be computed, `self` is returned so the client
+        doesn't share its memo, and it is tried again on the next batch.
+        """
+        try:
+            return self.notify_memo_keys[handler_class]
+        except KeyError:
+            pass
+        try:
+            key = handler.get_notify_memo_key()
+        except Exception:
+            log.err(
+                None,
+                f"Failed to get notify memo key for {self.user.username}.",
+            )
+            return self
+        self.notify_memo_keys[handler_class] = key
+        return key
+
     def buildHandler(self, handler_class):
         """Return an initialised instance of `handler_class`."""
         handler_name = handler_class._meta.handler_name
@@ -377,15 +432,33 @@ class WebSocketProtocol(Protocol):
         )
 
 
+def coalesce_notify_action(previous, action):
+    """Return the action to send for an object notified twice in a batch.
+
+    The latest action wins, except that an update following a create is
+    still a create for clients that have not seen the object yet.
+    """
+    if previous == "create" and action == "update":
+        return "create"
+    return action
+
+
 class WebSocketFactory(Factory):
     """Factory for WebSocketProtocol."""
 
     protocol = WebSocketProtocol
 
-    def __init__(self, listener):
+    # Seconds to wait for further notifications before fanning out a batch.
+    notify_window = 0.05
+
+    def __init__(self, listener, clock=reactor):
         self.handlers = {}
         self.clients = []
         self.listener = listener
+        self.clock = clock
+        self._pending_notifies = {}
+        self._notify_waiters = []
+        self._notify_flush = None
         self.session_checker = LoopingCall(self._check_sessions)
         self.session_checker_done = None
         self.cacheHandlers()
@@ -439,21 +512,117 @@ class WebSocketFactory(Factory):
         for handler in self.handlers.values():
             for channel in handler._meta.listen_channels:
                 self.listener.register(
-                    channel, partial(self.onNotify, handler, channel)
+                    channel,
+                    partial(self.queueNotifies, handler, channel),
+                    batch=True,
+                    window=handler._meta.listen_window,
                 )
 
-    @inlineCallbacks
+    def queueNotifies(self, handler_class, channel, notifies):
+        """Queue a batch of `(action, obj_id)` notifications without making
+        the listener wait for them."""
+        d = self.onNotifies(handler_class, channel, notifies)
+        d.addErrback(
+            log.err,
+            f"Failed to process {len(notifies)} notification(s) on "
+            f"'{channel}'.",
+        )
+
     def onNotify(self, handler_class, channel, action, obj_id):
-        for client in self.clients:
-            handler = client.buildHandler(handler_class)
-            data = yield deferToDatabase(
-                self.processNotify, handler, channel, action, obj_id
+        """Queue a notification to be fanned out to every client.
+
+        :return: a `Deferred` that fires once the batch containing this
+            notification has been sent to the clients.
+        """
+        return self.onNotifies(handler_class, channel, [(action, obj_id)])
+
+    def onNotifies(self, handler_class, channel, notifies):
+        """Queue `(action, obj_id)` notifications to be fanned out to every
+        client.
+
+        Notifications for the same object arriving within `notify_window`
+        are coalesced into one, and the whole batch is evaluated for all
+        clients in a single transaction.
+
+        :return: a `Deferred` that fires once the batch containing these
+            notifications has been sent to the clients.
+        """
+        for action, obj_id in notifies:
+            key = (handler_class, channel, obj_id)
+            self._pending_notifies[key] = coalesce_notify_action(
+                self._pending_notifies.get(key), action
+            )
+        d = Deferred()
+        self._notify_waiters.append(d)
+        if self._notify_flush is None:
+            self._notify_flush = self.clock.callLater(
+                self.notify_window, self._flushNotifies
             )
-            if data is not None:
-                (name, client_action, data) = data
-                client.sendNotify(name, client_action, data)
+        return d
+
+    @inlineCallbacks
+    def _flushNotifies(self):
+        notifies, self._pending_notifies = self._pending_notifies, {}
+        waiters, self._notify_waiters = self._notify_waiters, []
+        # Take a copy, as clients can come and go while in the database.
+        clients = list(self.clients)
+        try:
+            if len(clients) > 0:
+                messages = yield deferToDatabase(
+                    self.processNotifies, clients, list(notifies.items())
+                )
+                for client, (name, client_action, data) in messages:
+                    if client in self.clients:
+                        client.sendNotify(name, client_action, data)
+        except Exception:
+            failure = Failure()
+            for d in waiters:
+                d.errback(failure)
+        else:
+            for d in waiters:
+                d.callback(None)
+        finally:
+            # Only one batch is processed at a time so that clients see
+            # notifications for an object in the order they happened.
+            if len(self._pending_notifies) > 0:
+                self._notify_flush = self.clock.callLater(
+                    self.notify_window, self._flushNotifies
+                )
+            else:
+                self._notify_flush = None
 
     @transactional
+    def processNotifies(self, clients, notifies):
+        """Evaluate `notifies` for every client in `clients`.
+
+        The handlers of clients with the same permissions share a memo for
+        each notification (see `Handler.get_notify_memo_key`), so an object
+        is loaded and dehydrated once per set of permissions instead of once
+        per client.
+
+        :return: a list of `(client, (name, action, data))` to send.
+        """
+        # Which pools exist is part of the permissions of RBAC users.
+        pools_changed = any(
+            channel == "resourcepool" for (_, channel, _), _ in notifies
+        )
+        for client in clients:
+            client.user.refresh_from_db()
+            if pools_changed:
+                client.notify_memo_keys.clear()
+            client.checkNotifyPermissions()
+        messages = []
+        for (handler_class, channel, obj_id), action in notifies:
+            memos = defaultdict(dict)
+            for client in clients:
+                handler = client.buildHandler(handler_class)
+                memo_key = client.getNotifyMemoKey(handler_class, handler)
+                handler.notify_memo = memos[memo_key]
+                data = self.processNotify(handler, channel, action, obj_id)
+                if data is not None:
+                    messages.append((client, data))
+        return messages
+
     def processNotify(self, handler, channel, action, obj_id):
         return handler.on_listen(channel, action, obj_id)
 
@@ -1011,6 +1011,38 @@ class TestHandler(MAASServerTestCase, FakeNodesHandlerMixin):
         )
         mock_dehydrate.assert_called_once_with(node, for_list=False)
 
+    def test_on_listen_shares_object_and_data_through_notify_memo(self):
+        node = factory.make_Node()
+        handler = self.make_nodes_handler()
+        handler.notify_memo = {}
+        handler.cache["loaded_pks"].add(node.system_id)
+        mock_dehydrate = self.patch(handler, "full_dehydrate")
+        mock_dehydrate.return_value = sentinel.data
+        handler.on_listen(sentinel.channel, "update", node.system_id)
+        mock_load_object = self.patch(handler, "_load_object")
+        self.assertEqual(
+            handler.on_listen(sentinel.channel, "update", node.system_id),
+            (handler._meta.handler_name, "update", sentinel.data),
+        )
+        mock_dehydrate.assert_called_once_with(node, for_list=True)
+        mock_load_object.assert_not_called()
+
+    def test_memoize_for_notify_reraises_handler_errors(self):
+        handler = self.make_nodes_handler()
+        handler.notify_memo = {}
+        self.assertRaises(
+            HandlerDoesNotExistError,
+            handler.get_object,
+            {"system_id": "missing"},
+        )
+        mock_load_object = self.patch(handler, "_load_object")
+        self.assertRaises(
+            HandlerDoesNotExistError,
+            handler.get_object,
+            {"system_id": "missing"},
+        )
+        mock_load_object.assert_not_called()
+
     def test_listen_calls_get_object_with_pk_on_other_actions(self):
         handler = self.make_nodes_handler()
         mock_get_object = self.patch(handler, "get_object")
@@ -12,7 +12,12 @@ from django.core.exceptions import ValidationError
 from django.http import HttpRequest
 from django.utils import timezone
 from twisted.internet import defer
-from twisted.internet.defer import fail, inlineCallbacks, succeed
+from twisted.internet.defer import (
+    DeferredList,
+    fail,
+    inlineCallbacks,
+    succeed,
+)
 from twisted.web.server import NOT_DONE_YET
 
 from apiclient.utils import ascii_url
@@ -26,6 +31,7 @@ from maasserver.websockets import protocol as protocol_module
 from maasserver.websockets.base import Handler
 from maasserver.websockets.handlers import DeviceHandler, MachineHandler
 from maasserver.websockets.protocol import (
+    coalesce_notify_action,
     MSG_TYPE,
     RESPONSE_TYPE,
     WebSocketFactory,
@@ -358,6 +364,44 @@ class TestWebSocketProtocol(MAASTransactionServerTestCase):
         )
         mock_processMessages.assert_called_once_with()
 
+    def test_getNotifyMemoKey_computes_key_once_per_connection(self):
+        protocol = WebSocketProtocol()
+        protocol.user = maas_factory.make_User()
+        handler = MagicMock()
+        handler.get_notify_memo_key.return_value = sentinel.key
+        for _ in range(2):
+            self.assertIs(
+                sentinel.key,
+                protocol.getNotifyMemoKey(sentinel.handler_class, handler),
+            )
+        handler.get_notify_memo_key.assert_called_once_with()
+
+    def test_getNotifyMemoKey_does_not_share_memo_on_error(self):
+        protocol = WebSocketProtocol()
+        protocol.user = maas_factory.make_User()
+        handler = MagicMock()
+        handler.get_notify_memo_key.side_effect = (
+            maastesting_factory.make_exception()
+        )
+        with TwistedLoggerFixture() as logger:
+            key = protocol.getNotifyMemoKey(sentinel.handler_class, handler)
+        self.assertIs(protocol, key)
+        self.assertEqual({}, protocol.notify_memo_keys)
+        self.assertIn("Failed to get notify memo key", logger.output)
+
+    def test_checkNotifyPermissions_forgets_keys_when_permissions_change(self):
+        protocol = WebSocketProtocol()
+        protocol.user = maas_factory.make_User()
+        protocol.checkNotifyPermissions()
+        protocol.notify_memo_keys[sentinel.handler_class] = sentinel.key
+        protocol.checkNotifyPermissions()
+        self.assertEqual(
+            {sentinel.handler_class: sentinel.key}, protocol.notify_memo_keys
+        )
+        protocol.user.is_superuser = True
+        protocol.checkNotifyPermissions()
+        self.assertEqual({}, protocol.notify_memo_keys)
+
     def test_processMessages_does_nothing_if_no_user(self):
         protocol = WebSocketProtocol()
         protocol.messages = deque(
@@ -855,6 +899,14 @@ class TestWebSocketFactory(MAASTestCase, MakeProtocolFactoryMixin):
         factory = self.make_factory()
         self.assertEqual(ALL_NOTIFIERS, factory.listener.listeners.keys())
 
+    def test_registerNotifiers_sets_window_of_busy_channels(self):
+        factory = self.make_factory()
+        self.assertEqual(
+            MachineHandler._meta.listen_window,
+            factory.listener.windows["machine"],
+        )
+        self.assertNotIn("zone", factory.listener.windows)
+
 
 class TestWebSocketFactoryTransactional(
     MAASTransactionServerTestCase, MakeProtocolFactoryMixin
@@ -930,6 +982,142 @@ class TestWebSocketFactoryTransactional(
         )
         mock_sendNotify.assert_called_with(name, action, data)
 
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_onNotify_coalesces_notifications_for_the_same_object(self):
+        user = yield deferToDatabase(self.make_user)
+        _, factory = self.make_protocol_with_factory(user=user)
+        mock_class = MagicMock()
+        mock_class.return_value.on_listen.return_value = None
+        yield DeferredList(
+            [
+                factory.onNotify(
+                    mock_class, sentinel.channel, "create", sentinel.obj_id
+                ),
+                factory.onNotify(
+                    mock_class, sentinel.channel, "update", sentinel.obj_id
+                ),
+            ]
+        )
+        mock_class.return_value.on_listen.assert_called_once_with(
+            sentinel.channel, "create", sentinel.obj_id
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_queueNotifies_processes_batch_at_once(self):
+        user = yield deferToDatabase(self.make_user)
+        _, factory = self.make_protocol_with_factory(user=user)
+        mock_processNotifies = self.patch(factory, "processNotifies")
+        mock_processNotifies.return_value = []
+        factory.queueNotifies(
+            sentinel.handler,
+            sentinel.channel,
+            [
+                ("create", sentinel.obj1),
+                ("update", sentinel.obj1),
+                ("delete", sentinel.obj2),
+            ],
+        )
+        yield factory._notify_waiters[0]
+        mock_processNotifies.assert_called_once_with(
+            factory.clients,
+            [
+                (
+                    (sentinel.handler, sentinel.channel, sentinel.obj1),
+                    "create",
+                ),
+                (
+                    (sentinel.handler, sentinel.channel, sentinel.obj2),
+                    "delete",
+                ),
+            ],
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_onNotify_shares_memo_between_clients_of_the_same_user(self):
+        user = yield deferToDatabase(self.make_user)
+        protocol1, factory = self.make_protocol_with_factory(user=user)
+        protocol2 = factory.buildProtocol(None)
+        protocol2.user = user
+        protocol2.session = protocol1.session
+        protocol2.request = protocol1.request
+        factory.clients.append(protocol2)
+        self.addCleanup(factory.clients.remove, protocol2)
+        memos = []
+
+        class FakeHandler:
+            def __init__(self, user, *args):
+                self.user = user
+
+            def get_notify_memo_key(self):
+                return self.user.id
+
+            def on_listen(self, channel, action, obj_id):
+                memos.append(self.notify_memo)
+
+        handler_class = MagicMock(side_effect=FakeHandler)
+        yield factory.onNotify(
+            handler_class, sentinel.channel, "update", sentinel.obj_id
+        )
+        self.assertEqual(2, len(memos))
+        self.assertIs(memos[0], memos[1])
+
+    def make_machine_clients(self, make_user, machine):
+        protocol1, factory = self.make_protocol_with_factory(user=make_user())
+        protocol = factory.buildProtocol(None)
+        protocol.user = make_user()
+        protocol.session = protocol1.session
+        protocol.request = protocol1.request
+        factory.clients.append(protocol)
+        self.addCleanup(factory.clients.remove, protocol)
+        for client in factory.clients:
+            client.cache["machine"] = {"loaded_pks": {machine.system_id}}
+        return factory
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_onNotify_shares_dehydration_between_users_with_same_perms(self):
+        machine = yield deferToDatabase(
+            transactional(maas_factory.make_Machine)
+        )
+        factory = yield deferToDatabase(
+            transactional(self.make_machine_clients),
+            maas_factory.make_admin,
+            machine,
+        )
+        mock_dehydrate = self.patch(MachineHandler, "full_dehydrate")
+        mock_dehydrate.return_value = {}
+        yield factory.onNotify(
+            MachineHandler, "machine", "update", machine.system_id
+        )
+        mock_dehydrate.assert_called_once()
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_onNotify_dehydrates_for_each_user_without_admin_perms(self):
+        machine = yield deferToDatabase(
+            transactional(maas_factory.make_Machine)
+        )
+        factory = yield deferToDatabase(
+            transactional(self.make_machine_clients),
+            maas_factory.make_User,
+            machine,
+        )
+        mock_dehydrate = self.patch(MachineHandler, "full_dehydrate")
+        mock_dehydrate.return_value = {}
+        yield factory.onNotify(
+            MachineHandler, "machine", "update", machine.system_id
+        )
+        self.assertEqual(2, mock_dehydrate.call_count)
+
+    def test_coalesce_notify_action(self):
+        self.assertEqual("create", coalesce_notify_action(None, "create"))
+        self.assertEqual("create", coalesce_notify_action("create", "update"))
+        self.assertEqual("delete", coalesce_notify_action("create", "delete"))
+        self.assertEqual("delete", coalesce_notify_action("update", "delete"))
+
     @wait_for_reactor
     @inlineCallbacks
     def test_updateRackController_calls_onNotify_for_controller_update(self):
@@ -14,6 +14,11 @@ class DatabaseConfig:
     username: str | None = None
     password: str | None = None
     port: int | None = None
+    pool_size: int = 3
+    pool_max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_pre_ping: bool = False
+    statement_cache_size: int = 100
 
     @property
     def dsn(self) -> URL:
@@ -28,12 +33,22 @@ class DatabaseConfig:
 
 
 class Database:
+    # Isolation level used by requests that only read data. They don't need a
+    # consistent snapshot across statements, so they skip the cost of
+    # REPEATABLE READ and can't fail with serialization errors.
+    READ_ONLY_ISOLATION_LEVEL = "READ COMMITTED"
+
     def __init__(self, config: DatabaseConfig, echo: bool = False):
         self.config = config
         self.engine = create_async_engine(
             config.dsn,
             echo=echo,
             isolation_level="REPEATABLE READ",
-            # Limit the connection pool size to 3 for the time being.
-            pool_size=3,
+            pool_size=config.pool_size,
+            max_overflow=config.pool_max_overflow,
+            pool_timeout=config.pool_timeout,
+            pool_pre_ping=config.pool_pre_ping,
+            connect_args={
+                "prepared_statement_cache_size": config.statement_cache_size
+            },
         )
@@ -29,6 +29,14 @@ class Clause:
         return self.condition.compare(other.condition)
 
 
+@dataclass
+class OrderByClause:
+    """A column to order a keyset-paginated list by."""
+
+    column: ColumnElement
+    descending: bool = True
+
+
 @dataclass
 class QuerySpec:
     """
@@ -2,15 +2,29 @@
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 from abc import ABC, abstractmethod
+import base64
 from datetime import datetime
-from operator import eq, le
-from typing import Any, Generic, Type, TypeVar
-
-from sqlalchemy import delete, desc, insert, select, Select, Table, update
+import json
+from operator import eq, ge, gt, le, lt
+from typing import Any, AsyncIterator, Generic, Sequence, Type, TypeVar
+
+from sqlalchemy import (
+    and_,
+    ColumnElement,
+    delete,
+    desc,
+    insert,
+    or_,
+    Row,
+    select,
+    Select,
+    Table,
+    update,
+)
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
 from maasservicelayer.context import Context
-from maasservicelayer.db.filters import Clause, QuerySpec
+from maasservicelayer.db.filters import Clause, OrderByClause, QuerySpec
 from maasservicelayer.exceptions.catalog import (
     AlreadyExistsException,
     BaseExceptionDetail,
@@ -20,7 +34,11 @@ from maasservicelayer.exceptions.constants import (
     UNEXISTING_RESOURCE_VIOLATION_TYPE,
     UNIQUE_CONSTRAINT_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult, MaasBaseModel
+from maasservicelayer.models.base import (
+    ListResult,
+    MaasBaseModel,
+    StreamedListResult,
+)
 
 T = TypeVar("T", bound=MaasBaseModel)
 
@@ -130,6 +148,155 @@ class BaseRepository(ABC, Generic[T]):
             next_token=next_token,
         )
 
+    async def stream(
+        self,
+        token: str | None,
+        size: int,
+        query: QuerySpec | None = None,
+        columns: Sequence[str] | None = None,
+        order_by: Sequence[OrderByClause] | None = None,
+    ) -> StreamedListResult[Row]:
+        """Stream a page of rows from a server-side cursor.
+
+        Unlike `list`, the rows are not turned into models: they are yielded as
+        they are fetched, and they expose the selected columns as attributes.
+
+        Params:
+            token: the token of the page to fetch, as returned in `next_token`.
+            size: the number of rows in the page.
+            query: the query to filter the rows with.
+            columns: the names of the columns of `select_all_statement` to
+                fetch. All of them are fetched if not specified.
+            order_by: the keyset to order the rows by. The `id` column is always
+                added as the last key to make the ordering total. Defaults to
+                `id DESC`, like `list`.
+        Returns:
+            A `StreamedListResult` whose `next_token` is set once all the rows
+            have been consumed.
+        """
+        order_by = self._keyset_order_by(order_by)
+        stmt = self.select_all_statement()
+        if columns is not None:
+            keys = {*columns, *(clause.column.key for clause in order_by)}
+            stmt = stmt.with_only_columns(
+                *(
+                    column
+                    for column in stmt.selected_columns
+                    if column.key in keys
+                ),
+                maintain_column_froms=True,
+            )
+        stmt = stmt.order_by(
+            *(
+                desc(clause.column) if clause.descending else clause.column
+                for clause in order_by
+            )
+        ).limit(size + 1)
+        if query:
+            stmt = query.enrich_stmt(stmt)
+        if token is not None:
+            stmt = stmt.where(self._keyset_condition(order_by, token))
+
+        result = StreamedListResult[Row](items=())
+
+        async def rows() -> AsyncIterator[Row]:
+            streamed = await self.connection.stream(stmt)
+            try:
+                count = 0
+                async for row in streamed:
+                    count += 1
+                    if count > size:  # There is another page
+                        result.next_token = self._encode_keyset_token(
+                            order_by, row
+                        )
+                        break
+                    yield row
+            finally:
+                await streamed.close()
+
+        result.items = rows()
+        return result
+
+    def _keyset_order_by(
+        self, order_by: Sequence[OrderByClause] | None
+    ) -> list[OrderByClause]:
+        id_column = self.get_repository_table().c.id
+        if not order_by:
+            return [OrderByClause(column=id_column)]
+        order_by = list(order_by)
+        if all(clause.column.key != "id" for clause in order_by):
+            order_by.append(
+                OrderByClause(
+                    column=id_column, descending=order_by[-1].descending
+                )
+            )
+        return order_by
+
+    def _encode_keyset_token(
+        self, order_by: list[OrderByClause], row: Row
+    ) -> str:
+        values = [row._mapping[clause.column.key] for clause in order_by]
+        if len(values) == 1:
+            # Same format as the tokens of `list`.
+            return str(values[0])
+        values = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def _decode_keyset_token(
+        self, order_by: list[OrderByClause], token: str
+    ) -> list[Any]:
+        if len(order_by) == 1:
+            values = [token]
+        else:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()))
+        decoded = []
+        for clause, value in zip(order_by, values, strict=True):
+            try:
+                python_type = clause.column.type.python_type
+            except NotImplementedError:
+                decoded.append(value)
+                continue
+            if value is None:
+                decoded.append(value)
+            elif issubclass(python_type, datetime):
+                decoded.append(datetime.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        return decoded
+
+    def _keyset_condition(
+        self, order_by: list[OrderByClause], token: str
+    ) -> ColumnElement:
+        """Return the condition selecting the rows from `token` onwards.
+
+        For keys (a, b, c) this is
+            (a > va) OR (a = va AND b > vb) OR (a = va AND b = vb AND c >= vc)
+        with the comparisons reversed for descending keys.
+        """
+        values = self._decode_keyset_token(order_by, token)
+        conditions = []
+        for i, (clause, value) in enumerate(zip(order_by, values)):
+            last = i == len(order_by) - 1
+            if clause.descending:
+                op = le if last else lt
+            else:
+                op = ge if last else gt
+            conditions.append(
+                and_(
+                    *(
+                        eq(previous.column, previous_value)
+                        for previous, previous_value in zip(
+                            order_by[:i], values[:i]
+                        )
+                    ),
+                    op(clause.column, value),
+                )
+            )
+        return or_(*conditions)
+
     async def update(
         self, query: QuerySpec, resource: CreateOrUpdateResource
     ) -> T:
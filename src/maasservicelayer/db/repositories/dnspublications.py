@@ -54,6 +54,7 @@ class DNSPublicationRepository(BaseRepository[DNSPublication]):
             .filter(
                 DNSPublicationTable.c.serial > serial,
             )
+            .order_by(DNSPublicationTable.c.serial)
         )
 
         result = (await self.connection.execute(stmt)).all()
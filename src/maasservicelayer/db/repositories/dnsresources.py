@@ -1,4 +1,5 @@
-from typing import List, Optional, Type
+from collections import defaultdict
+from typing import List, Optional, Sequence, Type
 
 from sqlalchemy import delete, insert, select, Table
 from sqlalchemy.sql.operators import eq
@@ -24,6 +25,10 @@ class DNSResourceClauseFactory(ClauseFactory):
     def with_name(cls, name: str) -> Clause:
         return Clause(condition=eq(DNSResourceTable.c.name, name))
 
+    @classmethod
+    def with_names(cls, names: Sequence[str]) -> Clause:
+        return Clause(condition=DNSResourceTable.c.name.in_(names))
+
     @classmethod
     def with_domain_id(cls, id: int) -> Clause:
         return Clause(condition=eq(DNSResourceTable.c.domain_id, id))
@@ -76,6 +81,43 @@ class DNSResourceRepository(BaseRepository[DNSResource]):
         result = (await self.connection.execute(stmt)).all()
         return [DNSResource(**row._asdict()) for row in result]
 
+    async def get_dnsresources_in_domain_for_ips(
+        self, domain: Domain, ips: Sequence[StaticIPAddress]
+    ) -> dict[int, List[DNSResource]]:
+        """Like `get_dnsresources_in_domain_for_ip`, for many IPs at once.
+
+        Returns the resources by IP id.
+        """
+        if len(ips) == 0:
+            return {}
+        stmt = (
+            select(
+                DNSResourceIPAddressTable.c.staticipaddress_id,
+                DNSResourceTable,
+            )
+            .select_from(DNSResourceTable)
+            .join(
+                DNSResourceIPAddressTable,
+                DNSResourceIPAddressTable.c.dnsresource_id
+                == DNSResourceTable.c.id,
+            )
+            .filter(
+                DNSResourceTable.c.domain_id == domain.id,
+                DNSResourceIPAddressTable.c.staticipaddress_id.in_(
+                    [ip.id for ip in ips]
+                ),
+            )
+            .order_by(DNSResourceTable.c.id)
+        )
+
+        result = (await self.connection.execute(stmt)).all()
+        resources = defaultdict(list)
+        for row in result:
+            res = row._asdict()
+            ip_id = res.pop("staticipaddress_id")
+            resources[ip_id].append(DNSResource(**res))
+        return resources
+
     async def get_ips_for_dnsresource(
         self,
         dnsrr: DNSResource,
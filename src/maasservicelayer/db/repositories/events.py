@@ -1,11 +1,12 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from datetime import datetime
 from typing import Any, Type
 
 from sqlalchemy import case, Select, select, Table
 from sqlalchemy.sql.expression import func
-from sqlalchemy.sql.operators import eq, ne, or_
+from sqlalchemy.sql.operators import eq, ge, lt, ne, or_
 
 from maasservicelayer.db.filters import Clause, ClauseFactory
 from maasservicelayer.db.repositories.base import BaseRepository
@@ -23,6 +24,14 @@ class EventsClauseFactory(ClauseFactory):
             )
         )
 
+    @classmethod
+    def with_created_after(cls, created_after: datetime) -> Clause:
+        return Clause(condition=ge(EventTable.c.created, created_after))
+
+    @classmethod
+    def with_created_before(cls, created_before: datetime) -> Clause:
+        return Clause(condition=lt(EventTable.c.created, created_before))
+
 
 class EventsRepository(BaseRepository[Event]):
     def get_repository_table(self) -> Table:
@@ -1,9 +1,11 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Any, List
+from collections import defaultdict
+from typing import Any, List, Sequence
 
 from sqlalchemy import desc, insert, select, Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql.expression import func
 from sqlalchemy.sql.operators import eq, le
 
@@ -79,6 +81,42 @@ class InterfaceRepository:
             ]
         ]
 
+    async def get_interfaces_for_macs(
+        self, macs: Sequence[str]
+    ) -> dict[str, List[Interface]]:
+        stmt = self._select_all_statement().filter(
+            InterfaceTable.c.mac_address.in_(macs)
+        )
+
+        result = (await self.connection.execute(stmt)).all()
+        interfaces = defaultdict(list)
+        for row in result:
+            interface = Interface(**build_interface_links(row._asdict()))
+            interfaces[interface.mac_address].append(interface)
+        return interfaces
+
+    async def add_ips(
+        self, links: Sequence[tuple[Interface, StaticIPAddress]]
+    ) -> None:
+        """Link many IPs to interfaces at once, skipping existing links."""
+        if len(links) == 0:
+            return
+        stmt = (
+            pg_insert(InterfaceIPAddressTable)
+            .values(
+                [
+                    {
+                        "interface_id": interface.id,
+                        "staticipaddress_id": ip.id,
+                    }
+                    for interface, ip in links
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+
+        await self.connection.execute(stmt)
+
     async def add_ip(self, interface: Interface, ip: StaticIPAddress) -> None:
         stmt = insert(InterfaceIPAddressTable).values(
             interface_id=interface.id,
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Sequence, Type
 
 import netaddr
 from pydantic import IPvAnyAddress
@@ -64,3 +64,14 @@ class IPRangesRepository(BaseRepository[IPRange]):
                 return iprange
 
         return None
+
+    async def get_ipranges_for_subnets(
+        self, subnet_ids: Sequence[int]
+    ) -> list[IPRange]:
+        stmt = (
+            select(IPRangeTable)
+            .select_from(IPRangeTable)
+            .where(IPRangeTable.c.subnet_id.in_(subnet_ids))
+        )
+        result = (await self.connection.execute(stmt)).all()
+        return [IPRange(**row._asdict()) for row in result]
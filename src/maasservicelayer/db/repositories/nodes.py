@@ -1,7 +1,7 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 from abc import ABC
-from typing import Any, Type, TypeVar
+from typing import Any, Sequence, Type, TypeVar
 
 from sqlalchemy import Select, select, Table, update
 from sqlalchemy.sql.operators import eq
@@ -71,6 +71,21 @@ class AbstractNodesRepository(BaseRepository[T], ABC):
 
         return exists is not None
 
+    async def get_existing_hostnames(
+        self, hostnames: Sequence[str]
+    ) -> set[str]:
+        if len(hostnames) == 0:
+            return set()
+        stmt = (
+            select(NodeTable.c.hostname)
+            .select_from(NodeTable)
+            .filter(NodeTable.c.hostname.in_(hostnames))
+        )
+
+        result = (await self.connection.execute(stmt)).all()
+
+        return {row.hostname for row in result}
+
     def _bmc_select_all_statement(self) -> Select[Any]:
         # TODO: add other fields
         return (
@@ -1,8 +1,9 @@
+from collections import defaultdict
 import datetime
-from typing import List, Optional, Type
+from typing import List, Optional, Sequence, Type
 
 from pydantic import IPvAnyAddress
-from sqlalchemy import and_, func, select, Table
+from sqlalchemy import and_, func, select, Table, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.operators import eq
 
@@ -72,6 +73,10 @@ class StaticIPAddressClauseFactory(ClauseFactory):
     def with_node_type(cls, type: NodeTypeEnum) -> Clause:
         return Clause(condition=eq(NodeTable.c.node_type, type))
 
+    @classmethod
+    def with_ids(cls, ids: Sequence[int]) -> Clause:
+        return Clause(condition=StaticIPAddressTable.c.id.in_(ids))
+
 
 class StaticIPAddressRepository(BaseRepository):
     def get_repository_table(self) -> Table:
@@ -95,6 +100,82 @@ class StaticIPAddressRepository(BaseRepository):
         result = (await self.connection.execute(upsert_stmt)).one()
         return StaticIPAddress(**result._asdict())
 
+    async def create_or_update_many(
+        self, resources: Sequence[CreateOrUpdateResource]
+    ) -> List[StaticIPAddress]:
+        """Upsert many IPs with a single statement.
+
+        The resources must all set the same values, and must not contain the
+        same (ip, alloc_type) twice.
+        """
+        if len(resources) == 0:
+            return []
+        stmt = insert(StaticIPAddressTable).values(
+            [resource.get_values() for resource in resources]
+        )
+        upsert_stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                StaticIPAddressTable.c.ip,
+                StaticIPAddressTable.c.alloc_type,
+            ],
+            set_={key: stmt.excluded[key] for key in resources[0]},
+        ).returning(StaticIPAddressTable)
+
+        result = (await self.connection.execute(upsert_stmt)).all()
+        return [StaticIPAddress(**row._asdict()) for row in result]
+
+    async def update_many(
+        self, query: QuerySpec, resource: CreateOrUpdateResource
+    ) -> List[StaticIPAddress]:
+        stmt = (
+            update(StaticIPAddressTable)
+            .returning(StaticIPAddressTable)
+            .values(**resource.get_values())
+        )
+        stmt = query.enrich_stmt(stmt)
+        result = (await self.connection.execute(stmt)).all()
+        return [StaticIPAddress(**row._asdict()) for row in result]
+
+    async def get_discovered_ips_for_interfaces(
+        self, interfaces: Sequence[Interface]
+    ) -> dict[int, List[StaticIPAddress]]:
+        """Return the discovered IPs linked to `interfaces`, by interface id.
+
+        Discovered IPs without an address are included.
+        """
+        if len(interfaces) == 0:
+            return {}
+        stmt = (
+            select(
+                InterfaceIPAddressTable.c.interface_id,
+                StaticIPAddressTable,
+            )
+            .select_from(StaticIPAddressTable)
+            .join(
+                InterfaceIPAddressTable,
+                InterfaceIPAddressTable.c.staticipaddress_id
+                == StaticIPAddressTable.c.id,
+            )
+            .where(
+                eq(
+                    StaticIPAddressTable.c.alloc_type,
+                    IpAddressType.DISCOVERED.value,
+                ),
+                InterfaceIPAddressTable.c.interface_id.in_(
+                    [interface.id for interface in interfaces]
+                ),
+            )
+            .order_by(StaticIPAddressTable.c.id)
+        )
+
+        result = (await self.connection.execute(stmt)).all()
+        ips = defaultdict(list)
+        for row in result:
+            res = row._asdict()
+            interface_id = res.pop("interface_id")
+            ips[interface_id].append(StaticIPAddress(**res))
+        return ips
+
     async def get_discovered_ips_in_family_for_interfaces(
         self,
         interfaces: List[Interface],
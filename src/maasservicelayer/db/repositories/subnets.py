@@ -2,11 +2,12 @@
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 from operator import eq
-from typing import Type
+from typing import Sequence, Type
 
 from netaddr import IPAddress, IPNetwork
 from pydantic import IPvAnyAddress
-from sqlalchemy import desc, func, join, select, Table
+from sqlalchemy import column, desc, func, Integer, join, select, Table, values
+from sqlalchemy.dialects.postgresql import INET
 
 from maasservicelayer.db.filters import Clause, ClauseFactory
 from maasservicelayer.db.repositories.base import (
@@ -138,3 +139,53 @@ class SubnetsRepository(BaseRepository[Subnet]):
         del res["prefixlen"]
         del res["dhcp_on"]
         return Subnet(**res)
+
+    async def find_best_subnets_for_ips(
+        self, ips: Sequence[IPvAnyAddress]
+    ) -> dict[IPvAnyAddress, Subnet]:
+        """Like `find_best_subnet_for_ip`, for many IPs in a single query.
+
+        IPs without a matching subnet are not in the returned mapping.
+        """
+        if len(ips) == 0:
+            return {}
+        ip_addrs = []
+        for ip in ips:
+            ip_addr = IPAddress(str(ip))
+            if ip_addr.is_ipv4_mapped():
+                ip_addr = ip_addr.ipv4()
+            ip_addrs.append(ip_addr)
+
+        lookup = values(
+            column("idx", Integer), column("ip", INET), name="lookup"
+        ).data([(idx, str(ip_addr)) for idx, ip_addr in enumerate(ip_addrs)])
+        stmt = (
+            select(
+                lookup.c.idx,
+                SubnetTable,
+                func.masklen(SubnetTable.c.cidr).label("prefixlen"),
+                VlanTable.c.dhcp_on,
+            )
+            .select_from(lookup)
+            .join(SubnetTable, SubnetTable.c.cidr.op(">>")(lookup.c.ip))
+            .join(
+                VlanTable,
+                VlanTable.c.id == SubnetTable.c.vlan_id,
+            )
+            .distinct(lookup.c.idx)
+            .order_by(
+                lookup.c.idx,
+                desc(VlanTable.c.dhcp_on),
+                desc("prefixlen"),
+            )
+        )
+
+        result = (await self.connection.execute(stmt)).all()
+        subnets = {}
+        for row in result:
+            res = row._asdict()
+            idx = res.pop("idx")
+            del res["prefixlen"]
+            del res["dhcp_on"]
+            subnets[ips[idx]] = Subnet(**res)
+        return subnets
@@ -5,7 +5,16 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 import hashlib
-from typing import Any, Generic, Optional, Sequence, TypeVar
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Generic,
+    Iterable,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 from pydantic import BaseModel, Field
 
@@ -26,6 +35,31 @@ class ListResult(Generic[T]):
     next_token: Optional[str] = None
 
 
+class StreamedListResult(Generic[T]):
+    """
+    Like `ListResult`, but the items are produced while they are consumed instead of
+    being materialised up front. Iterate it with `async for`: when the items come
+    from a server-side cursor, `next_token` is only known once all of them have
+    been consumed.
+    """
+
+    def __init__(
+        self,
+        items: AsyncIterable[T] | Iterable[T],
+        next_token: Optional[str] = None,
+    ):
+        self.items = items
+        self.next_token = next_token
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        if isinstance(self.items, AsyncIterable):
+            async for item in self.items:
+                yield item
+        else:
+            for item in self.items:
+                yield item
+
+
 class MaasBaseModel(ABC, BaseModel):
     id: int
 
@@ -1,7 +1,7 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Callable
+from typing import Any, Callable, Iterator
 
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.dnspublications import (
@@ -33,7 +33,11 @@ from maasservicelayer.db.repositories.users import UsersRepository
 from maasservicelayer.db.repositories.vlans import VlansRepository
 from maasservicelayer.db.repositories.vmcluster import VmClustersRepository
 from maasservicelayer.db.repositories.zones import ZonesRepository
-from maasservicelayer.services._base import ServiceCache
+from maasservicelayer.services._base import (
+    make_cache_key,
+    ServiceCache,
+    TTLCache,
+)
 from maasservicelayer.services.agents import AgentsService
 from maasservicelayer.services.auth import AuthService
 from maasservicelayer.services.configurations import ConfigurationsService
@@ -81,6 +85,29 @@ class CacheForServices:
         self.cache[name] = fn()
         return self.cache[name]
 
+    def invalidate(self, name: str, attr: str, *args: Any) -> None:
+        """Invalidate an entry of a TTLCache of the service named *name*.
+
+        Params:
+            - name: class name of the service
+            - attr: name of the TTLCache in the ServiceCache
+            - args: the arguments of the cached call. If not specified, the
+                whole TTLCache is cleared.
+        """
+        if name not in self.cache:
+            return
+        ttl_cache = getattr(self.cache[name], attr)
+        if args:
+            ttl_cache.invalidate(make_cache_key(*args))
+        else:
+            ttl_cache.clear()
+
+    def ttl_caches(self) -> Iterator[tuple[str, TTLCache]]:
+        """Return the name and the instance of all the TTLCaches."""
+        for name, cache in self.cache.items():
+            for attr, ttl_cache in cache.ttl_caches():
+                yield f"{name}.{attr}", ttl_cache
+
     async def close(self) -> None:
         """Perform all the shutdown operations for all caches."""
         for cache in self.cache.values():
@@ -122,13 +149,23 @@ class ServiceCollectionV3:
         cache: CacheForServices,
     ) -> "ServiceCollectionV3":
         services = cls()
-        services.configurations = ConfigurationsService(context=context)
+        services.configurations = ConfigurationsService(
+            context=context,
+            cache=cache.get(
+                ConfigurationsService.__name__,
+                ConfigurationsService.build_cache_object,
+            ),
+        )
         services.service_status = ServiceStatusService(
             context=context,
             service_status_repository=ServiceStatusRepository(context),
         )
         services.secrets = await SecretsServiceFactory.produce(
-            context=context, config_service=services.configurations
+            context=context,
+            config_service=services.configurations,
+            cache=cache.get(
+                SecretsService.__name__, SecretsService.build_cache_object
+            ),
         )
         services.temporal = TemporalService(
             context=context,
@@ -2,7 +2,12 @@
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 from abc import ABC
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import wraps
+import inspect
+import time
+from typing import Any, Callable, Hashable, Iterator
 
 from maasservicelayer.context import Context
 from maasservicelayer.exceptions.catalog import (
@@ -14,6 +19,83 @@ from maasservicelayer.exceptions.constants import (
 )
 from maasservicelayer.models.base import MaasBaseModel
 
+MISSING = object()
+
+
+def make_cache_key(*args: Any) -> Hashable:
+    """Return a hashable key for the given arguments.
+
+    Sets, lists and dicts are converted to their immutable counterparts so that
+    they can be used as part of the key.
+    """
+
+    def freeze(value: Any) -> Hashable:
+        match value:
+            case set() | frozenset():
+                return frozenset(freeze(item) for item in value)
+            case list() | tuple():
+                return tuple(freeze(item) for item in value)
+            case dict():
+                return tuple(
+                    sorted((key, freeze(item)) for key, item in value.items())
+                )
+        return value
+
+    return freeze(args)
+
+
+class TTLCache:
+    """A size-bounded cache whose entries expire after `ttl` seconds.
+
+    When the cache is full, the least recently used entry is evicted. The
+    number of hits and misses is tracked so that it can be exported as a
+    metric.
+
+    The cached values are shared between all the users of the cache, so they
+    must not be modified.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for `key`, or `default` if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
 
 @dataclass(slots=True)
 class ServiceCache(ABC):
@@ -21,7 +103,18 @@ class ServiceCache(ABC):
 
     def clear(self):
         for field in list(self.__slots__):
-            self.__setattr__(field, None)
+            value = self.__getattribute__(field)
+            if isinstance(value, TTLCache):
+                value.clear()
+            else:
+                self.__setattr__(field, None)
+
+    def ttl_caches(self) -> Iterator[tuple[str, TTLCache]]:
+        """Return the name and the instance of each TTLCache in the cache."""
+        for field in self.__slots__:
+            value = self.__getattribute__(field)
+            if isinstance(value, TTLCache):
+                yield field, value
 
     async def close(self):
         """Shutdown operations to be performed when destroying the cache."""
@@ -86,3 +179,36 @@ class Service(ABC):
             return wrapped
 
         return inner_decorator
+
+    @staticmethod
+    def from_ttl_cache_or_execute(attr: str):
+        """Decorator to search the result of the method in the TTLCache `attr`.
+
+        Unlike `from_cache_or_execute`, the value is cached per combination of
+        arguments, using `make_cache_key` on the arguments in the order of the
+        method signature (defaults included). The same key can be used to
+        invalidate an entry, e.g. `make_cache_key(name)` for `get(name)`.
+
+        The ServiceCache must define `attr` as a TTLCache.
+        """
+
+        def inner_decorator(fn):
+            signature = inspect.signature(fn)
+
+            @wraps(fn)
+            async def wrapped(self, *args, **kwargs):
+                if self.cache is None:
+                    return await fn(self, *args, **kwargs)
+                bound = signature.bind(self, *args, **kwargs)
+                bound.apply_defaults()
+                key = make_cache_key(*list(bound.arguments.values())[1:])
+                ttl_cache = self.cache.__getattribute__(attr)
+                value = ttl_cache.get(key, MISSING)
+                if value is MISSING:  # Cache miss
+                    value = await fn(self, *args, **kwargs)
+                    ttl_cache.set(key, value)
+                return value
+
+            return wrapped
+
+        return inner_decorator
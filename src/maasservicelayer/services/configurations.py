@@ -1,13 +1,22 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from dataclasses import dataclass, field
 from typing import Any
 
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.configurations import (
     ConfigurationsRepository,
 )
-from maasservicelayer.services._base import Service
+from maasservicelayer.services._base import Service, ServiceCache, TTLCache
+
+
+@dataclass(slots=True)
+class ConfigurationsServiceCache(ServiceCache):
+    # Invalidated by the `config_update` notifications sent by maasserver.
+    configurations: TTLCache = field(
+        default_factory=lambda: TTLCache(maxsize=256, ttl=60)
+    )
 
 
 class ConfigurationsService(Service):
@@ -15,16 +24,22 @@ class ConfigurationsService(Service):
         self,
         context: Context,
         configurations_repository: ConfigurationsRepository | None = None,
+        cache: ConfigurationsServiceCache | None = None,
     ):
-        super().__init__(context)
+        super().__init__(context, cache)
         self.configurations_repository = (
             configurations_repository
             if configurations_repository
             else ConfigurationsRepository(context)
         )
 
+    @staticmethod
+    def build_cache_object() -> ConfigurationsServiceCache:
+        return ConfigurationsServiceCache()
+
     # We inherit this from the django legacy implementation. When we will have moved away, we can refactor the way we store the
     # configurations and provide a proper typing. For the time being, the consumer has to know how to consume the configuration.
+    @Service.from_ttl_cache_or_execute(attr="configurations")
     async def get(self, name: str) -> Any:
         configuration = await self.configurations_repository.get(name)
         if not configuration:
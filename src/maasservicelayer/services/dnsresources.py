@@ -1,7 +1,7 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Optional
+from typing import Optional, Sequence
 
 from maascommon.enums.dns import DnsUpdateAction
 from maascommon.enums.ipaddress import IpAddressType
@@ -42,6 +42,11 @@ class DNSResourcesService(Service):
     async def get_one(self, query: QuerySpec) -> DNSResource | None:
         return await self.dnsresource_repository.get_one(query=query)
 
+    async def get_ips_for_dnsresource(
+        self, dnsrr: DNSResource
+    ) -> list[StaticIPAddress]:
+        return await self.dnsresource_repository.get_ips_for_dnsresource(dnsrr)
+
     def _get_ttl(self, dnsresource: DNSResource, domain: Domain) -> int:
         return (
             dnsresource.address_ttl
@@ -148,38 +153,70 @@ class DNSResourcesService(Service):
         )
 
         for dnsrr in resources:
-            result = await self.dnsresource_repository.get_ips_for_dnsresource(
-                dnsrr, discovered_only=True, matching=ip
-            )
+            await self._release_dynamic_hostname(dnsrr, ip, default_domain)
 
-            ip_ids = [row.id for row in result]
+    async def release_dynamic_hostnames(
+        self, ips: Sequence[StaticIPAddress]
+    ) -> None:
+        """Like `release_dynamic_hostname`, for many IPs at once.
+
+        The resources of all the IPs are looked up with a single query.
+        """
+        ips = [
+            ip
+            for ip in ips
+            if ip.ip is not None
+            and ip.alloc_type == IpAddressType.DISCOVERED.value
+        ]
+        if len(ips) == 0:
+            return
 
-            if ip.id in ip_ids:
-                await self.dnsresource_repository.remove_ip_relation(dnsrr, ip)
+        default_domain = await self.domains_service.get_default_domain()
 
-            remaining_relations = (
-                await self.dnsresource_repository.get_ips_for_dnsresource(
-                    dnsrr
-                )
-            )
-            if len(remaining_relations) == 0:
-                await self.dnsresource_repository.delete_by_id(dnsrr.id)
+        resources = await self.dnsresource_repository.get_dnsresources_in_domain_for_ips(
+            default_domain, ips
+        )
 
-                await self.dnspublications_service.create_for_config_update(
-                    source=f"zone {default_domain.name} removed resource {dnsrr.name}",
-                    action=DnsUpdateAction.DELETE,
-                    label=dnsrr.name,
-                    rtype="AAAA" if ip.ip.version == 6 else "A",
-                )
-            else:
-                await self.dnspublications_service.create_for_config_update(
-                    source=f"ip {ip.ip} unlinked from resource {dnsrr.name} on zone {default_domain.name}",
-                    action=DnsUpdateAction.DELETE,
-                    label=dnsrr.name,
-                    rtype="AAAA" if ip.ip.version == 6 else "A",
-                    ttl=self._get_ttl(dnsrr, default_domain),
-                    answer=str(ip.ip),
-                )
+        for ip in ips:
+            for dnsrr in resources.get(ip.id, []):
+                await self._release_dynamic_hostname(dnsrr, ip, default_domain)
+
+    async def _release_dynamic_hostname(
+        self,
+        dnsrr: DNSResource,
+        ip: StaticIPAddress,
+        default_domain: Domain,
+    ) -> None:
+        result = await self.dnsresource_repository.get_ips_for_dnsresource(
+            dnsrr, discovered_only=True, matching=ip
+        )
+
+        ip_ids = [row.id for row in result]
+
+        if ip.id in ip_ids:
+            await self.dnsresource_repository.remove_ip_relation(dnsrr, ip)
+
+        remaining_relations = (
+            await self.dnsresource_repository.get_ips_for_dnsresource(dnsrr)
+        )
+        if len(remaining_relations) == 0:
+            await self.dnsresource_repository.delete_by_id(dnsrr.id)
+
+            await self.dnspublications_service.create_for_config_update(
+                source=f"zone {default_domain.name} removed resource {dnsrr.name}",
+                action=DnsUpdateAction.DELETE,
+                label=dnsrr.name,
+                rtype="AAAA" if ip.ip.version == 6 else "A",
+            )
+        else:
+            await self.dnspublications_service.create_for_config_update(
+                source=f"ip {ip.ip} unlinked from resource {dnsrr.name} on zone {default_domain.name}",
+                action=DnsUpdateAction.DELETE,
+                label=dnsrr.name,
+                rtype="AAAA" if ip.ip.version == 6 else "A",
+                ttl=self._get_ttl(dnsrr, default_domain),
+                answer=str(ip.ip),
+            )
 
     async def update_dynamic_hostname(
         self, ip: StaticIPAddress, hostname: str
@@ -193,6 +230,49 @@ class DNSResourcesService(Service):
         dnsrr = await self.get_one(
             query=QuerySpec(where=DNSResourceClauseFactory.with_name(hostname))
         )
+        await self._link_dynamic_hostname(ip, hostname, domain, dnsrr)
+
+    async def update_dynamic_hostnames(
+        self, hostnames: Sequence[tuple[StaticIPAddress, str]]
+    ) -> None:
+        """Like `update_dynamic_hostname`, for many IPs at once.
+
+        The IPs are released together, and the existing resources for all the
+        hostnames are looked up with a single query.
+        """
+        if len(hostnames) == 0:
+            return
+        hostnames = [
+            (ip, coerce_to_valid_hostname(hostname))
+            for ip, hostname in hostnames
+        ]
+
+        await self.release_dynamic_hostnames([ip for ip, _ in hostnames])
+
+        domain = await self.domains_service.get_default_domain()
+
+        dnsrrs = {
+            dnsrr.name: dnsrr
+            for dnsrr in await self.dnsresource_repository.get(
+                query=QuerySpec(
+                    where=DNSResourceClauseFactory.with_names(
+                        sorted({hostname for _, hostname in hostnames})
+                    )
+                )
+            )
+        }
+        for ip, hostname in hostnames:
+            dnsrrs[hostname] = await self._link_dynamic_hostname(
+                ip, hostname, domain, dnsrrs.get(hostname)
+            )
+
+    async def _link_dynamic_hostname(
+        self,
+        ip: StaticIPAddress,
+        hostname: str,
+        domain: Domain,
+        dnsrr: DNSResource | None,
+    ) -> DNSResource:
         if not dnsrr:
             now = utcnow()
             resource = (
@@ -227,10 +307,10 @@ class DNSResourcesService(Service):
             )
 
             if len(ips) > len(dynamic_ips):  # has static IPs
-                return
+                return dnsrr
 
             if ip in dynamic_ips:
-                return
+                return dnsrr
 
             await self.dnsresource_repository.link_ip(dnsrr, ip)
             await self.dnspublications_service.create_for_config_update(
@@ -242,3 +322,4 @@ class DNSResourcesService(Service):
                 zone=domain.name,
                 answer=str(ip.ip),
             )
+        return dnsrr
@@ -1,7 +1,7 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
 from functools import lru_cache
 import os
@@ -23,6 +23,9 @@ from maasservicelayer.auth.macaroons.macaroon_client import (
     CandidAsyncClient,
     RbacAsyncClient,
 )
+from maasservicelayer.auth.macaroons.models.responses import (
+    PermissionResourcesMapping,
+)
 from maasservicelayer.auth.macaroons.oven import AsyncOven
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.external_auth import (
@@ -32,6 +35,7 @@ from maasservicelayer.db.repositories.users import (
     UserProfileResourceBuilder,
     UserResourceBuilder,
 )
+from maasservicelayer.enums.rbac import RbacPermission
 from maasservicelayer.exceptions.catalog import (
     BaseExceptionDetail,
     DischargeRequiredException,
@@ -39,7 +43,7 @@ from maasservicelayer.exceptions.catalog import (
 )
 from maasservicelayer.exceptions.constants import INVALID_TOKEN_VIOLATION_TYPE
 from maasservicelayer.models.users import User
-from maasservicelayer.services._base import Service, ServiceCache
+from maasservicelayer.services._base import Service, ServiceCache, TTLCache
 from maasservicelayer.services.secrets import SecretsService
 from maasservicelayer.services.users import UsersService
 from maasservicelayer.utils.date import utcnow
@@ -62,6 +66,11 @@ class ExternalAuthServiceCache(ServiceCache):
     bakery_key: bakery.PrivateKey | None = None
     candid_client: CandidAsyncClient | None = None
     rbac_client: RbacAsyncClient | None = None
+    # RBAC doesn't notify about changes, so keep the permissions only for a
+    # short time.
+    rbac_resource_pool_ids: TTLCache = field(
+        default_factory=lambda: TTLCache(maxsize=1024, ttl=30)
+    )
 
     async def close(self) -> None:
         if self.rbac_client:
@@ -340,3 +349,13 @@ class ExternalAuthService(Service, RootKeyStore):
         # auth_config.url comes with a /auth suffix used for some macaroon internals.
         # We don't want to diverge too much from the structure we have in maasserver, hence we simply remove the suffix here.
         return RbacAsyncClient(auth_config.url.rstrip("/auth"), auth_info)
+
+    @Service.from_ttl_cache_or_execute(attr="rbac_resource_pool_ids")
+    async def get_rbac_resource_pool_ids(
+        self, user: str, permissions: set[RbacPermission]
+    ) -> list[PermissionResourcesMapping]:
+        """Return the resource pools that `user` can access with `permissions`."""
+        rbac_client = await self.get_rbac_client()
+        return await rbac_client.get_resource_pool_ids(
+            user=user, permissions=permissions
+        )
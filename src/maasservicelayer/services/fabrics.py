@@ -1,11 +1,15 @@
 # Copyright 2024 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
+from typing import Sequence
+
+from sqlalchemy import Row
+
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.base import CreateOrUpdateResource
 from maasservicelayer.db.repositories.fabrics import FabricsRepository
 from maasservicelayer.db.repositories.vlans import VlanResourceBuilder
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.fabrics import Fabric
 from maasservicelayer.services._base import Service
 from maasservicelayer.services.vlans import VlansService
@@ -46,5 +50,15 @@ class FabricsService(Service):
     async def list(self, token: str | None, size: int) -> ListResult[Fabric]:
         return await self.fabrics_repository.list(token=token, size=size)
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.fabrics_repository.stream(
+            token=token, size=size, columns=columns
+        )
+
     async def get_by_id(self, id: int) -> Fabric | None:
         return await self.fabrics_repository.get_by_id(id=id)
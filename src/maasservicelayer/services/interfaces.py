@@ -1,7 +1,7 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import List
+from typing import List, Sequence
 
 from maascommon.enums.ipaddress import IpAddressType
 from maascommon.workflows.dhcp import (
@@ -39,6 +39,35 @@ class InterfacesService(Service):
     async def get_interfaces_for_mac(self, mac: str) -> List[Interface]:
         return await self.interface_repository.get_interfaces_for_mac(mac)
 
+    async def get_interfaces_for_macs(
+        self, macs: Sequence[str]
+    ) -> dict[str, List[Interface]]:
+        return await self.interface_repository.get_interfaces_for_macs(macs)
+
+    async def add_ips(
+        self, links: Sequence[tuple[Interface, StaticIPAddress]]
+    ) -> None:
+        await self.interface_repository.add_ips(links)
+        static_ip_addr_ids = sorted(
+            {
+                sip.id
+                for _, sip in links
+                if sip.alloc_type
+                in (
+                    IpAddressType.AUTO,
+                    IpAddressType.STICKY,
+                    IpAddressType.USER_RESERVED,
+                )
+            }
+        )
+        if static_ip_addr_ids:
+            self.temporal_service.register_or_update_workflow_call(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(static_ip_addr_ids=static_ip_addr_ids),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
+
     async def bulk_link_ip(
         self, sip: StaticIPAddress, interfaces: List[Interface]
     ) -> None:
@@ -1,6 +1,8 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from typing import Sequence
+
 from pydantic import IPvAnyAddress
 
 from maascommon.workflows.dhcp import (
@@ -35,6 +37,13 @@ class IPRangesService(Service):
             subnet, ip
         )
 
+    async def get_ipranges_for_subnets(
+        self, subnet_ids: Sequence[int]
+    ) -> list[IPRange]:
+        return await self.ipranges_repository.get_ipranges_for_subnets(
+            subnet_ids
+        )
+
     async def create(self, resource: CreateOrUpdateResource) -> IPRange:
         iprange = await self.ipranges_repository.create(resource)
         self.temporal_service.register_or_update_workflow_call(
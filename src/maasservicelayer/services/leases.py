@@ -1,10 +1,13 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from collections import defaultdict
 from datetime import datetime
+from typing import Sequence
 
-from netaddr import IPNetwork
+from netaddr import IPAddress, IPNetwork, IPRange
 from pydantic import IPvAnyAddress
+import structlog
 
 from maascommon.enums.ipaddress import (
     IpAddressFamily,
@@ -12,7 +15,9 @@ from maascommon.enums.ipaddress import (
     LeaseAction,
 )
 from maasservicelayer.context import Context
+from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.staticipaddress import (
+    StaticIPAddressClauseFactory,
     StaticIPAddressResourceBuilder,
 )
 from maasservicelayer.models.interfaces import Interface
@@ -28,6 +33,8 @@ from maasservicelayer.services.staticipaddress import StaticIPAddressService
 from maasservicelayer.services.subnets import SubnetsService
 from maasservicelayer.utils.date import utcnow
 
+logger = structlog.get_logger()
+
 
 class LeaseUpdateError(Exception):
     pass
@@ -90,6 +97,142 @@ class LeasesService(Service):
             if lease.action != LeaseAction.COMMIT:
                 return
 
+        sip = await self._release_old_family_addresses(
+            lease, subnet_network, interfaces
+        )
+
+        match lease.action:
+            case LeaseAction.COMMIT.value:
+                await self._commit_lease_info(
+                    lease.hostname,
+                    subnet,
+                    lease.ip,
+                    lease.lease_time_seconds,
+                    created,
+                    interfaces,
+                )
+            case LeaseAction.EXPIRY.value:
+                await self._release_lease_info(sip, interfaces, subnet)
+            case LeaseAction.RELEASE.value:
+                await self._release_lease_info(sip, interfaces, subnet)
+
+    async def store_leases_info(self, leases: Sequence[Lease]) -> None:
+        """Store many leases at once, e.g. when a DHCP server replays them.
+
+        Only the last lease for each IP is applied. Applying a lease releases
+        the other discovered IPs of its interfaces in the same family, so
+        only the last lease for each known MAC and family is applied as well.
+        Subnets, dynamic ranges, interfaces and their discovered IPs are
+        looked up for the whole batch at once. The replaced IPs are released
+        before the committed IPs are upserted with a single statement, so the
+        result is the same as storing the leases one by one. Leases that
+        can't be matched to a subnet are logged and skipped, so that they
+        don't prevent the rest of the batch from being stored.
+        """
+        latest = {}
+        for lease in leases:
+            latest.pop(lease.ip, None)
+            latest[lease.ip] = lease
+        leases = list(latest.values())
+        if len(leases) == 0:
+            return
+
+        subnets = await self.subnet_service.find_best_subnets_for_ips(
+            [lease.ip for lease in leases]
+        )
+        ipranges = defaultdict(list)
+        for iprange in await self.iprange_service.get_ipranges_for_subnets(
+            sorted({subnet.id for subnet in subnets.values()})
+        ):
+            ipranges[iprange.subnet_id].append(
+                IPRange(str(iprange.start_ip), str(iprange.end_ip))
+            )
+        interfaces_by_mac = (
+            await self.interface_service.get_interfaces_for_macs(
+                sorted({lease.mac for lease in leases})
+            )
+        )
+
+        applied = {}
+        for lease in leases:
+            subnet = subnets.get(lease.ip)
+            if subnet is None:
+                logger.warning(
+                    f"Skipping lease, no subnet exists for: {lease.ip}"
+                )
+                continue
+            subnet_network = IPNetwork(str(subnet.cidr))
+            if lease.ip_family != subnet_network.version:
+                logger.warning(
+                    f"Skipping lease for {lease.ip}, family for the subnet "
+                    f"does not match. Expected: {lease.ip_family}"
+                )
+                continue
+
+            # We will receive actions on all addresses in the subnet. We only
+            # want to update the addresses in the dynamic range.
+            ip = IPAddress(str(lease.ip))
+            if not any(ip in iprange for iprange in ipranges[subnet.id]):
+                continue
+
+            interfaces = interfaces_by_mac.get(lease.mac, [])
+            if len(interfaces) == 0:
+                if lease.action != LeaseAction.COMMIT:
+                    continue
+                # There's nothing to release, the IP is only stored.
+                key = lease.ip
+            else:
+                key = (lease.mac, subnet_network.version)
+            applied.pop(key, None)
+            applied[key] = (lease, subnet, interfaces)
+
+        discovered = await self.staticipaddress_service.get_discovered_ips_for_interfaces(
+            [
+                interface
+                for _, _, interfaces in applied.values()
+                for interface in interfaces
+            ]
+        )
+        released = {}
+        commits = []
+        releases = []
+        for lease, subnet, interfaces in applied.values():
+            family = IPNetwork(str(subnet.cidr)).version
+            sip = None
+            for interface in interfaces:
+                for address in discovered.get(interface.id, []):
+                    if address.ip is None:
+                        if sip is None and address.subnet_id == subnet.id:
+                            sip = address
+                    elif (
+                        address.ip.version == family and address.ip != lease.ip
+                    ):
+                        released[address.id] = address
+
+            match lease.action:
+                case LeaseAction.COMMIT.value:
+                    commits.append((lease, subnet, interfaces))
+                case LeaseAction.EXPIRY.value:
+                    releases.append((sip, interfaces, subnet))
+                case LeaseAction.RELEASE.value:
+                    releases.append((sip, interfaces, subnet))
+
+        released = list(released.values())
+        await self.dnsresource_service.release_dynamic_hostnames(released)
+        await self.staticipaddress_service.delete_many(released)
+        await self._release_leases_info(releases)
+        await self._commit_leases_info(commits)
+
+    async def _release_old_family_addresses(
+        self,
+        lease: Lease,
+        subnet_network: IPNetwork,
+        interfaces: list[Interface],
+    ) -> StaticIPAddress | None:
+        """Delete the discovered IPs of `interfaces` that `lease` replaces.
+
+        Returns the discovered IP without an address, if there is one.
+        """
         sip = None
         old_family_addresses = await self.staticipaddress_service.get_discovered_ips_in_family_for_interfaces(
             interfaces,
@@ -108,21 +251,101 @@ class LeasesService(Service):
                     await self.staticipaddress_service.delete_by_id(address.id)
                 else:
                     sip = address
+        return sip
 
-        match lease.action:
-            case LeaseAction.COMMIT.value:
-                await self._commit_lease_info(
-                    lease.hostname,
-                    subnet,
-                    lease.ip,
-                    lease.lease_time_seconds,
-                    created,
-                    interfaces,
+    async def _commit_leases_info(
+        self, commits: list[tuple[Lease, Subnet, list[Interface]]]
+    ) -> None:
+        if len(commits) == 0:
+            return
+        sips = await self.staticipaddress_service.create_or_update_many(
+            [
+                StaticIPAddressResourceBuilder()
+                .with_ip(lease.ip)
+                .with_lease_time(lease.lease_time_seconds)
+                .with_alloc_type(IpAddressType.DISCOVERED)
+                .with_subnet_id(subnet.id)
+                .with_created(datetime.fromtimestamp(lease.timestamp_epoch))
+                .with_updated(datetime.fromtimestamp(lease.timestamp_epoch))
+                .build()
+                for lease, subnet, _ in commits
+            ]
+        )
+        sips_by_ip = {IPAddress(str(sip.ip)): sip for sip in sips}
+
+        links = []
+        hostnames = []
+        for lease, _, interfaces in commits:
+            sip = sips_by_ip[IPAddress(str(lease.ip))]
+            links.extend((interface, sip) for interface in interfaces)
+            if _is_valid_hostname(lease.hostname):
+                hostnames.append((sip, lease.hostname))
+        await self.interface_service.add_ips(links)
+
+        if len(hostnames) == 0:
+            return
+        node_hostnames = await self.node_service.get_existing_hostnames(
+            sorted({hostname for _, hostname in hostnames})
+        )
+        await self.dnsresource_service.release_dynamic_hostnames(
+            [sip for sip, hostname in hostnames if hostname in node_hostnames]
+        )
+        await self.dnsresource_service.update_dynamic_hostnames(
+            [
+                (sip, hostname)
+                for sip, hostname in hostnames
+                if hostname not in node_hostnames
+            ]
+        )
+
+    async def _release_leases_info(
+        self,
+        releases: list[tuple[StaticIPAddress | None, list[Interface], Subnet]],
+    ) -> None:
+        if len(releases) == 0:
+            return
+        now = utcnow()
+        links = []
+        existing = set()
+        for sip, interfaces, subnet in releases:
+            if sip is None:
+                sip = await self.staticipaddress_service.create(
+                    StaticIPAddressResourceBuilder()
+                    .with_ip(None)
+                    .with_lease_time(0)
+                    .with_alloc_type(IpAddressType.DISCOVERED)
+                    .with_subnet_id(subnet.id)
+                    .with_created(now)
+                    .with_updated(now)
+                    .build()
                 )
-            case LeaseAction.EXPIRY.value:
-                await self._release_lease_info(sip, interfaces, subnet)
-            case LeaseAction.RELEASE.value:
-                await self._release_lease_info(sip, interfaces, subnet)
+            else:
+                existing.add(sip.id)
+            links.extend((interface, sip) for interface in interfaces)
+
+        if existing:
+            await self.staticipaddress_service.update_many(
+                QuerySpec(
+                    where=StaticIPAddressClauseFactory.with_ids(
+                        sorted(existing)
+                    )
+                ),
+                StaticIPAddressResourceBuilder().with_updated(now).build(),
+            )
+        await self.interface_service.add_ips(links)
+
+    async def _update_dynamic_hostname(
+        self, sip: StaticIPAddress, hostname: str
+    ) -> None:
+        node_with_hostname_exists = await self.node_service.hostname_exists(
+            hostname
+        )
+        if node_with_hostname_exists:
+            await self.dnsresource_service.release_dynamic_hostname(sip)
+        else:
+            await self.dnsresource_service.update_dynamic_hostname(
+                sip, hostname
+            )
 
     async def _commit_lease_info(
         self,
@@ -151,15 +374,7 @@ class LeasesService(Service):
         for interface in interfaces:
             await self.interface_service.add_ip(interface, sip)
         if sip_hostname is not None:
-            node_with_hostname_exists = (
-                await self.node_service.hostname_exists(sip_hostname)
-            )
-            if node_with_hostname_exists:
-                await self.dnsresource_service.release_dynamic_hostname(sip)
-            else:
-                await self.dnsresource_service.update_dynamic_hostname(
-                    sip, sip_hostname
-                )
+            await self._update_dynamic_hostname(sip, sip_hostname)
 
     async def _release_lease_info(
         self, sip: StaticIPAddress, interfaces: list[Interface], subnet: Subnet
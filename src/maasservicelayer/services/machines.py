@@ -1,11 +1,15 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from typing import Sequence
+
+from sqlalchemy import Row
+
 from maascommon.workflows.msm import MachinesCountByStatus
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.machines import MachinesRepository
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.machines import Machine, PciDevice, UsbDevice
 from maasservicelayer.services.nodes import NodesService
 from maasservicelayer.services.secrets import SecretsService
@@ -28,6 +32,17 @@ class MachinesService(NodesService):
             token=token, size=size, query=query
         )
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        query: QuerySpec | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.machines_repository.stream(
+            token=token, size=size, query=query, columns=columns
+        )
+
     async def list_machine_usb_devices(
         self, system_id: str, token: str | None, size: int
     ) -> ListResult[UsbDevice]:
@@ -1,6 +1,8 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from typing import Sequence
+
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.base import CreateOrUpdateResource
@@ -67,3 +69,8 @@ class NodesService(Service):
 
     async def hostname_exists(self, hostname: str) -> bool:
         return await self.nodes_repository.hostname_exists(hostname)
+
+    async def get_existing_hostnames(
+        self, hostnames: Sequence[str]
+    ) -> set[str]:
+        return await self.nodes_repository.get_existing_hostnames(hostnames)
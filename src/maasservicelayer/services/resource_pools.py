@@ -1,7 +1,9 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Optional
+from typing import Optional, Sequence
+
+from sqlalchemy import Row
 
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
@@ -9,7 +11,7 @@ from maasservicelayer.db.repositories.base import CreateOrUpdateResource
 from maasservicelayer.db.repositories.resource_pools import (
     ResourcePoolRepository,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.resource_pools import ResourcePool
 from maasservicelayer.services._base import Service
 
@@ -36,6 +38,17 @@ class ResourcePoolsService(Service):
             token=token, size=size, query=query
         )
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        query: QuerySpec | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.resource_pools_repository.stream(
+            token=token, size=size, query=query, columns=columns
+        )
+
     async def update_by_id(
         self, id: int, resource: CreateOrUpdateResource
     ) -> ResourcePool:
@@ -2,11 +2,17 @@
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 import abc
+from dataclasses import dataclass, field
 from typing import Any
 
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.secrets import SecretsRepository
-from maasservicelayer.services._base import Service
+from maasservicelayer.services._base import (
+    make_cache_key,
+    Service,
+    ServiceCache,
+    TTLCache,
+)
 from maasservicelayer.services.configurations import ConfigurationsService
 from maasservicelayer.vault.api.models.exceptions import VaultNotFoundException
 from maasservicelayer.vault.manager import (
@@ -26,6 +32,16 @@ class SecretNotFound(Exception):
         super().__init__(f"Secret '{path}' not found")
 
 
+@dataclass(slots=True)
+class SecretsServiceCache(ServiceCache):
+    # Only holds global secrets, since maasserver only sends the
+    # `secret_update`/`secret_delete` notifications for those. Also
+    # invalidated by the writes performed through the service.
+    secrets: TTLCache = field(
+        default_factory=lambda: TTLCache(maxsize=256, ttl=60)
+    )
+
+
 class SecretsService(Service, abc.ABC):
     """
     Abstract base class for managing secrets.
@@ -34,6 +50,16 @@ class SecretsService(Service, abc.ABC):
     """
 
     SIMPLE_SECRET_KEY = "secret"
+    GLOBAL_SECRET_PREFIX = "global/"
+
+    def __init__(
+        self, context: Context, cache: SecretsServiceCache | None = None
+    ):
+        super().__init__(context, cache)
+
+    @staticmethod
+    def build_cache_object() -> SecretsServiceCache:
+        return SecretsServiceCache()
 
     @abc.abstractmethod
     async def set_composite_secret(
@@ -52,14 +78,35 @@ class SecretsService(Service, abc.ABC):
         """Delete a secret."""
         pass
 
+    @abc.abstractmethod
+    async def _get_secret(self, path: str) -> Any | None:
+        """Return the value of the secret at `path`, or None if it doesn't exist."""
+        pass
+
+    @Service.from_ttl_cache_or_execute(attr="secrets")
+    async def _get_cached_secret(self, path: str) -> Any | None:
+        return await self._get_secret(path)
+
+    def _forget_secret(self, path: str) -> None:
+        """Drop the cached value of the secret at `path`, if any."""
+        if self.cache is not None:
+            self.cache.secrets.invalidate(make_cache_key(path))
+
     # This abstraction comes from the legacy django application. Keep it until we don't move away and we can refactor the
     # existing secrets to a proper structure.
-    @abc.abstractmethod
     async def get_composite_secret(
         self, path: str, default: Any = UNSET
     ) -> Any:
         """Return the value for a composite secret."""
-        pass
+        if path.startswith(self.GLOBAL_SECRET_PREFIX):
+            secret = await self._get_cached_secret(path)
+        else:
+            secret = await self._get_secret(path)
+        if secret is None:
+            if default is UNSET:
+                raise SecretNotFound(path)
+            return default
+        return secret
 
     async def get_simple_secret(self, path: str, default: Any = UNSET) -> Any:
         """Return the value for a simple secret."""
@@ -79,8 +126,9 @@ class LocalSecretsStorageService(SecretsService):
         self,
         context: Context,
         secrets_repository: SecretsRepository | None = None,
+        cache: SecretsServiceCache | None = None,
     ):
-        super().__init__(context)
+        super().__init__(context, cache)
         self.secrets_repository = (
             secrets_repository
             if secrets_repository
@@ -90,6 +138,7 @@ class LocalSecretsStorageService(SecretsService):
     async def set_composite_secret(
         self, path: str, value: dict[str, Any]
     ) -> None:
+        self._forget_secret(path)
         return await self.secrets_repository.create_or_update(path, value)
 
     async def set_simple_secret(self, path: str, value: Any) -> None:
@@ -98,45 +147,45 @@ class LocalSecretsStorageService(SecretsService):
         )
 
     async def delete(self, path: str) -> None:
+        self._forget_secret(path)
         return await self.secrets_repository.delete(path)
 
-    async def get_composite_secret(
-        self, path: str, default: Any = UNSET
-    ) -> Any:
+    async def _get_secret(self, path: str) -> Any | None:
         secret = await self.secrets_repository.get(path)
         if not secret:
-            if default is UNSET:
-                raise SecretNotFound(path)
-            return default
+            return None
         return secret.value
 
 
 class VaultSecretsService(SecretsService):
-    def __init__(self, context: Context, vault_manager: AsyncVaultManager):
-        super().__init__(context)
+    def __init__(
+        self,
+        context: Context,
+        vault_manager: AsyncVaultManager,
+        cache: SecretsServiceCache | None = None,
+    ):
+        super().__init__(context, cache)
         self.vault_manager = vault_manager
 
     async def set_composite_secret(
         self, path: str, value: dict[str, Any]
     ) -> None:
+        self._forget_secret(path)
         await self.vault_manager.set(path, value)
 
     async def set_simple_secret(self, path: str, value: Any) -> None:
+        self._forget_secret(path)
         await self.vault_manager.set(path, {self.SIMPLE_SECRET_KEY: value})
 
     async def delete(self, path: str) -> None:
+        self._forget_secret(path)
         await self.vault_manager.delete(path)
 
-    async def get_composite_secret(
-        self, path: str, default: Any = UNSET
-    ) -> Any:
+    async def _get_secret(self, path: str) -> Any | None:
         try:
-            secret = await self.vault_manager.get(path)
+            return await self.vault_manager.get(path)
         except VaultNotFoundException:
-            if default is UNSET:
-                raise SecretNotFound(path)
-            return default
-        return secret
+            return None
 
 
 class SecretsServiceFactory:
@@ -152,7 +201,10 @@ class SecretsServiceFactory:
 
     @classmethod
     async def produce(
-        cls, context: Context, config_service: ConfigurationsService
+        cls,
+        context: Context,
+        config_service: ConfigurationsService,
+        cache: SecretsServiceCache | None = None,
     ) -> SecretsService:
         """
         Produce a `SecretService` based on the configuration settings.
@@ -172,9 +224,9 @@ class SecretsServiceFactory:
         if cls.IS_VAULT_ENABLED:
             vault_manager = get_region_vault_manager()
             return VaultSecretsService(
-                context=context, vault_manager=vault_manager
+                context=context, vault_manager=vault_manager, cache=cache
             )
-        return LocalSecretsStorageService(context=context)
+        return LocalSecretsStorageService(context=context, cache=cache)
 
     @classmethod
     def clear(cls) -> None:
@@ -1,9 +1,13 @@
 # Copyright 2024 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
+from typing import Sequence
+
+from sqlalchemy import Row
+
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.spaces import SpacesRepository
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.spaces import Space
 from maasservicelayer.services._base import Service
 
@@ -20,5 +24,15 @@ class SpacesService(Service):
     async def list(self, token: str | None, size: int) -> ListResult[Space]:
         return await self.spaces_repository.list(token=token, size=size)
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.spaces_repository.stream(
+            token=token, size=size, columns=columns
+        )
+
     async def get_by_id(self, id: int) -> Space | None:
         return await self.spaces_repository.get_by_id(id=id)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from maascommon.enums.ipaddress import IpAddressFamily, IpAddressType
 from maascommon.workflows.dhcp import (
@@ -10,6 +10,7 @@ from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.base import CreateOrUpdateResource
 from maasservicelayer.db.repositories.staticipaddress import (
+    StaticIPAddressClauseFactory,
     StaticIPAddressRepository,
 )
 from maasservicelayer.models.interfaces import Interface
@@ -69,6 +70,24 @@ class StaticIPAddressService(Service):
             )
         return ip
 
+    async def create_or_update_many(
+        self, resources: Sequence[CreateOrUpdateResource]
+    ) -> List[StaticIPAddress]:
+        ips = await self.staticipaddress_repository.create_or_update_many(
+            resources
+        )
+        static_ip_addr_ids = [
+            ip.id for ip in ips if ip.alloc_type != IpAddressType.DISCOVERED
+        ]
+        if static_ip_addr_ids:
+            self.temporal_service.register_or_update_workflow_call(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(static_ip_addr_ids=static_ip_addr_ids),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
+        return ips
+
     async def delete_by_id(self, id: int) -> None:
         ip = await self.staticipaddress_repository.get_by_id(id=id)
         await self.staticipaddress_repository.delete_by_id(id)
@@ -83,6 +102,57 @@ class StaticIPAddressService(Service):
                 wait=False,
             )
 
+    async def update_many(
+        self, query: QuerySpec, resource: CreateOrUpdateResource
+    ) -> List[StaticIPAddress]:
+        ips = await self.staticipaddress_repository.update_many(
+            query, resource
+        )
+        static_ip_addr_ids = [
+            ip.id for ip in ips if ip.alloc_type != IpAddressType.DISCOVERED
+        ]
+        if static_ip_addr_ids:
+            self.temporal_service.register_or_update_workflow_call(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(static_ip_addr_ids=static_ip_addr_ids),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
+        return ips
+
+    async def delete_many(self, ips: Sequence[StaticIPAddress]) -> None:
+        if len(ips) == 0:
+            return
+        await self.staticipaddress_repository.delete(
+            QuerySpec(
+                where=StaticIPAddressClauseFactory.with_ids(
+                    [ip.id for ip in ips]
+                )
+            )
+        )
+
+        subnet_ids = sorted(
+            {
+                ip.subnet_id
+                for ip in ips
+                if ip.alloc_type != IpAddressType.DISCOVERED
+            }
+        )
+        if subnet_ids:
+            self.temporal_service.register_or_update_workflow_call(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(subnet_ids=subnet_ids),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
+
+    async def get_discovered_ips_for_interfaces(
+        self, interfaces: Sequence[Interface]
+    ) -> dict[int, List[StaticIPAddress]]:
+        return await self.staticipaddress_repository.get_discovered_ips_for_interfaces(
+            interfaces
+        )
+
     async def get_discovered_ips_in_family_for_interfaces(
         self,
         interfaces: list[Interface],
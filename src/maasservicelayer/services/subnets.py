@@ -1,6 +1,9 @@
 # Copyright 2024 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
+from typing import Sequence
+
 from pydantic import IPvAnyAddress
+from sqlalchemy import Row
 
 from maascommon.workflows.dhcp import (
     CONFIGURE_DHCP_WORKFLOW_NAME,
@@ -14,7 +17,7 @@ from maasservicelayer.db.repositories.subnets import (
     SubnetClauseFactory,
     SubnetsRepository,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.subnets import Subnet
 from maasservicelayer.services._base import Service
 from maasservicelayer.services.temporal import TemporalService
@@ -38,6 +41,17 @@ class SubnetsService(Service):
             token=token, size=size, query=query
         )
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        query: QuerySpec | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.subnets_repository.stream(
+            token=token, size=size, query=query, columns=columns
+        )
+
     async def get_by_id(
         self, fabric_id: int, vlan_id: int, id: int
     ) -> Subnet | None:
@@ -57,6 +71,11 @@ class SubnetsService(Service):
     ) -> Subnet | None:
         return await self.subnets_repository.find_best_subnet_for_ip(ip)
 
+    async def find_best_subnets_for_ips(
+        self, ips: Sequence[IPvAnyAddress]
+    ) -> dict[IPvAnyAddress, Subnet]:
+        return await self.subnets_repository.find_best_subnets_for_ips(ips)
+
     async def create(self, resource: CreateOrUpdateResource) -> Subnet:
         subnet = await self.subnets_repository.create(resource)
         self.temporal_service.register_or_update_workflow_call(
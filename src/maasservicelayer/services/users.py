@@ -1,6 +1,10 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from typing import Sequence
+
+from sqlalchemy import Row
+
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.base import CreateOrUpdateResource
@@ -8,7 +12,7 @@ from maasservicelayer.db.repositories.users import (
     UserProfileResourceBuilder,
     UsersRepository,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.users import User, UserProfile
 from maasservicelayer.services._base import Service
 
@@ -59,6 +63,17 @@ class UsersService(Service):
             token=token, size=size, query=query
         )
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        query: QuerySpec | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.users_repository.stream(
+            token=token, size=size, query=query, columns=columns
+        )
+
     async def update_by_id(
         self, user_id: int, resource: CreateOrUpdateResource
     ) -> User:
@@ -1,7 +1,9 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Optional
+from typing import Optional, Sequence
+
+from sqlalchemy import Row
 
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
@@ -14,7 +16,7 @@ from maasservicelayer.exceptions.catalog import (
 from maasservicelayer.exceptions.constants import (
     CANNOT_DELETE_DEFAULT_ZONE_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.zones import Zone
 from maasservicelayer.services._base import Service
 from maasservicelayer.services.nodes import NodesService
@@ -47,6 +49,17 @@ class ZonesService(Service):
             token=token, size=size, query=query
         )
 
+    async def list_stream(
+        self,
+        token: str | None,
+        size: int,
+        query: QuerySpec,
+        columns: Sequence[str] | None = None,
+    ) -> StreamedListResult[Row]:
+        return await self.zones_repository.stream(
+            token=token, size=size, query=query, columns=columns
+        )
+
     async def update_by_id(
         self, id: int, resource: CreateOrUpdateResource
     ) -> Zone:
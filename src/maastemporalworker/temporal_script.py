@@ -47,6 +47,7 @@ from maastemporalworker.workflow.power import (
 )
 from maastemporalworker.workflow.tag_evaluation import (
     TagEvaluationActivity,
+    TagEvaluationManyWorkflow,
     TagEvaluationWorkflow,
 )
 from provisioningserver.utils.env import MAAS_ID
@@ -118,6 +119,7 @@ async def main() -> None:
                 PowerManyWorkflow,
                 # Tag Evaluation workflows
                 TagEvaluationWorkflow,
+                TagEvaluationManyWorkflow,
             ],
             activities=[
                 # Configuration activities
@@ -133,6 +135,7 @@ async def main() -> None:
                 # DNS activities
                 dns_activity.get_changes_since_current_serial,
                 dns_activity.get_region_controllers,
+                dns_activity.set_published_serial,
                 # MSM connector activities,
                 msm_activity.check_enrol,
                 msm_activity.get_enrol,
@@ -144,6 +147,7 @@ async def main() -> None:
                 msm_activity.verify_token,
                 # Tag evaluation activities
                 tag_evaluation_activity.evaluate_tag,
+                tag_evaluation_activity.evaluate_tags,
             ],
         ),
         # Individual region controller worker
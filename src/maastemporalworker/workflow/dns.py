@@ -1,22 +1,53 @@
 # Copyright 2024 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from dataclasses import dataclass
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, replace
 from datetime import timedelta
 
-from temporalio import activity, workflow
+from netaddr import IPNetwork
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+import structlog
+from temporalio import workflow
 
+from maascommon.enums.dns import DnsUpdateAction
+from maascommon.enums.node import NodeTypeEnum
+from maascommon.enums.subnet import RdnsMode
 from maascommon.workflows.dns import (
     CONFIGURE_DNS_WORKFLOW_NAME,
     ConfigureDNSParam,
 )
+from maasservicelayer.db.filters import QuerySpec
+from maasservicelayer.db.repositories.dnsresources import (
+    DNSResourceClauseFactory,
+)
+from maasservicelayer.db.repositories.domains import DomainsClauseFactory
+from maasservicelayer.db.tables import (
+    ConfigTable,
+    DNSPublicationTable,
+    NodeTable,
+)
+from maasservicelayer.services import ServiceCollectionV3
 from maastemporalworker.workflow.activity import ActivityBase
+from maastemporalworker.workflow.utils import (
+    activity_defn_with_context,
+    workflow_run_with_context,
+)
+from provisioningserver.dns.actions import NSUpdateCommand
+from provisioningserver.dns.config import DynamicDNSUpdate
+from provisioningserver.dns.zoneconfig import DNSReverseZoneConfig
+from provisioningserver.utils.shell import ExternalProcessError
+
+logger = structlog.getLogger()
 
 GET_CHANGES_SINCE_CURRENT_SERIAL_TIMEOUT = timedelta(minutes=5)
 GET_REGION_CONTROLLERS_TIMEOUT = timedelta(minutes=5)
 FULL_RELOAD_DNS_CONFIGURATION_TIMEOUT = timedelta(minutes=5)
 DYNAMIC_UPDATE_DNS_CONFIGURATION_TIMEOUT = timedelta(minutes=5)
 CHECK_SERIAL_UPDATE_TIMEOUT = timedelta(minutes=5)
+SET_PUBLISHED_SERIAL_TIMEOUT = timedelta(minutes=5)
 DNS_RETRY_TIMEOUT = timedelta(minutes=5)
 
 
@@ -26,6 +57,17 @@ GET_REGION_CONTROLLERS_NAME = "get-region-controllers"
 FULL_RELOAD_DNS_CONFIGURATION_NAME = "full-reload-dns-configuration"
 DYNAMIC_UPDATE_DNS_CONFIGURATION_NAME = "dynamic-update-dns-configuration"
 CHECK_SERIAL_UPDATE_NAME = "check-serial-update"
+SET_PUBLISHED_SERIAL_NAME = "set-published-serial"
+
+# Name of the configuration holding the serial of the last DNSPublication
+# applied to all the region controllers.
+DNS_PUBLISHED_SERIAL_CONFIG = "dns_published_serial"
+
+DEFAULT_DNS_TTL = 30
+
+
+class DNSReloadRequired(Exception):
+    """A publication can't be applied as a dynamic update."""
 
 
 @dataclass
@@ -61,47 +103,313 @@ class CheckSerialUpdateParam:
     serial: int
 
 
+@dataclass
+class SetPublishedSerialParam:
+    serial: int
+
+
 def get_task_queue_for_update(system_id: str) -> str:
     return f"region:{system_id}"
 
 
+def parse_publication_update(
+    update: str,
+) -> tuple[str, str, str, str, int | None, str | None]:
+    """Split the `update` of a DNSPublication in its parts.
+
+    Updates have the form `ACTION ZONE LABEL RTYPE [TTL] [ANSWER]`, as
+    written by `DNSPublicationsService.create_for_config_update` and by the
+    database triggers.
+    """
+    action, zone, label, rtype, *extra = update.split(" ")
+    ttl = None
+    if extra and extra[0].isdigit():
+        ttl = int(extra.pop(0))
+    answer = " ".join(extra) or None
+    return action, zone, label, rtype, ttl, answer
+
+
 class DNSConfigActivity(ActivityBase):
+    async def _get_resource_updates(
+        self,
+        services: ServiceCollectionV3,
+        zone: str,
+        label: str,
+        ttl: int | None,
+    ) -> list[DynamicDNSUpdate]:
+        """Replace the address records of a DNS resource."""
+        name = f"{label}.{zone}"
+        updates = [
+            DynamicDNSUpdate(
+                operation="DELETE", zone=zone, name=name, rectype=rectype
+            )
+            for rectype in ("A", "AAAA")
+        ]
+        domain = await services.domains.get_one(
+            QuerySpec(where=DomainsClauseFactory.with_name(zone))
+        )
+        if domain is None:
+            raise DNSReloadRequired(f"Unknown zone {zone}")
+        dnsresource = await services.dnsresources.get_one(
+            QuerySpec(
+                where=DNSResourceClauseFactory.and_clauses(
+                    [
+                        DNSResourceClauseFactory.with_name(label),
+                        DNSResourceClauseFactory.with_domain_id(domain.id),
+                    ]
+                )
+            )
+        )
+        if dnsresource is None:
+            return updates
+        if ttl is None:
+            ttl = dnsresource.address_ttl or domain.ttl
+        for ip in await services.dnsresources.get_ips_for_dnsresource(
+            dnsresource
+        ):
+            if ip.ip is None:
+                continue
+            updates.append(
+                DynamicDNSUpdate.create_from_trigger(
+                    operation="INSERT",
+                    zone=zone,
+                    name=name,
+                    rectype="A",
+                    ttl=ttl,
+                    answer=str(ip.ip),
+                )
+            )
+        return updates
+
+    async def _get_reverse_updates(
+        self, services: ServiceCollectionV3, updates: list[DynamicDNSUpdate]
+    ) -> list[DynamicDNSUpdate]:
+        """Return the PTR updates matching the address updates."""
+        ips = {update.answer for update in updates if update.answer_is_ip}
+        subnets = await services.subnets.find_best_subnets_for_ips(list(ips))
+        reverse_updates = []
+        for update in updates:
+            subnet = subnets.get(update.answer)
+            if subnet is None or subnet.rdns_mode == RdnsMode.DISABLED:
+                continue
+            network = IPNetwork(str(subnet.cidr))
+            rev_zone = DNSReverseZoneConfig.compose_zone_info(network)[
+                0
+            ].zone_name
+            reverse_updates.append(
+                DynamicDNSUpdate.as_reverse_record_update(
+                    replace(update, rev_zone=rev_zone), network
+                )
+            )
+        return reverse_updates
+
+    async def _get_dynamic_updates(
+        self, services: ServiceCollectionV3, publications: list[DNSPublication]
+    ) -> list[DynamicDNSUpdate]:
+        """Turn publications into the nsupdate operations to apply them.
+
+        Raises `DNSReloadRequired` for publications that can only be applied
+        by regenerating the zones.
+        """
+        updates = []
+        for publication in publications:
+            action, zone, label, rtype, ttl, answer = parse_publication_update(
+                publication.update
+            )
+            name = f"{label}.{zone}"
+            match action:
+                case DnsUpdateAction.INSERT | DnsUpdateAction.UPDATE if answer:
+                    if action == DnsUpdateAction.UPDATE:
+                        updates.append(
+                            DynamicDNSUpdate.create_from_trigger(
+                                operation="DELETE",
+                                zone=zone,
+                                name=name,
+                                rectype=rtype,
+                                answer=answer,
+                            )
+                        )
+                    updates.append(
+                        DynamicDNSUpdate.create_from_trigger(
+                            operation="INSERT",
+                            zone=zone,
+                            name=name,
+                            rectype=rtype,
+                            ttl=ttl,
+                            answer=answer,
+                        )
+                    )
+                case DnsUpdateAction.DELETE if answer:
+                    updates.append(
+                        DynamicDNSUpdate.create_from_trigger(
+                            operation="DELETE",
+                            zone=zone,
+                            name=name,
+                            rectype=rtype,
+                            answer=answer,
+                        )
+                    )
+                case DnsUpdateAction.DELETE:
+                    # The resource is gone, so are all its addresses.
+                    rtypes = ("A", "AAAA") if rtype == "A" else (rtype,)
+                    updates.extend(
+                        DynamicDNSUpdate(
+                            operation="DELETE",
+                            zone=zone,
+                            name=name,
+                            rectype=rectype,
+                        )
+                        for rectype in rtypes
+                    )
+                case DnsUpdateAction.UPDATE | DnsUpdateAction.DELETE_IP:
+                    # The addresses of the resource changed, rewrite them.
+                    updates.extend(
+                        await self._get_resource_updates(
+                            services, zone, label, ttl
+                        )
+                    )
+                case DnsUpdateAction.INSERT_NAME:
+                    # A new resource has no address records yet.
+                    pass
+                case _:
+                    raise DNSReloadRequired(publication.update)
+        updates.extend(await self._get_reverse_updates(services, updates))
+        return updates
+
+    async def _get_published_serial(self) -> int | None:
+        async with self._start_transaction() as tx:
+            stmt = select(ConfigTable.c.value).filter(
+                ConfigTable.c.name == DNS_PUBLISHED_SERIAL_CONFIG
+            )
+            return (await tx.execute(stmt)).scalar_one_or_none()
+
+    async def _full_reload(self) -> DNSUpdateResult:
+        # The zone files are generated by regiond, which rebuilds all of
+        # them when notified on the `sys_dns` channel.
+        async with self._start_transaction() as tx:
+            await tx.execute(select(func.pg_notify("sys_dns", "")))
+            serial = (
+                await tx.execute(
+                    select(func.max(DNSPublicationTable.c.serial))
+                )
+            ).scalar_one()
+        return DNSUpdateResult(serial=serial or 0)
 
-    @activity.defn(name=GET_CHANGES_SINCE_CURRENT_SERIAL_NAME)
+    @activity_defn_with_context(name=GET_CHANGES_SINCE_CURRENT_SERIAL_NAME)
     async def get_changes_since_current_serial(
         self,
     ) -> SerialChangesResult | None:
-        # TODO determine current serial and fetch DNSPublications from there up to latest
-        return None
+        # Not read through the ConfigurationsService, as its cached value
+        # could be outdated.
+        current_serial = await self._get_published_serial()
+        if current_serial is None:
+            # Nothing was published yet, a full reload is needed.
+            return None
+        async with self.start_transaction() as services:
+            publications = (
+                await services.dnspublications.get_publications_since_serial(
+                    current_serial
+                )
+            )
+        return SerialChangesResult(
+            updates=[
+                DNSPublication(
+                    serial=publication.serial,
+                    source=publication.source,
+                    update=publication.update,
+                )
+                for publication in publications
+            ]
+        )
 
-    @activity.defn(name=GET_REGION_CONTROLLERS_NAME)
+    @activity_defn_with_context(name=GET_REGION_CONTROLLERS_NAME)
     async def get_region_controllers(self) -> RegionControllersResult:
-        # TODO fetch all region controllers for DNS updates
-        return RegionControllersResult(RegionControllers=[])
+        async with self._start_transaction() as tx:
+            stmt = select(NodeTable.c.system_id).filter(
+                NodeTable.c.node_type.in_(
+                    [
+                        NodeTypeEnum.REGION_CONTROLLER,
+                        NodeTypeEnum.REGION_AND_RACK_CONTROLLER,
+                    ]
+                )
+            )
+            result = await tx.execute(stmt)
+            return RegionControllersResult(
+                region_controller_system_ids=[r[0] for r in result.all()]
+            )
 
-    @activity.defn(name=FULL_RELOAD_DNS_CONFIGURATION_NAME)
+    @activity_defn_with_context(name=FULL_RELOAD_DNS_CONFIGURATION_NAME)
     async def full_reload_dns_configuration(self) -> DNSUpdateResult:
-        # TODO fetch all DNS objects and apply to DNS configuration
-        return DNSUpdateResult(serial=1)
+        return await self._full_reload()
 
-    @activity.defn(name=DYNAMIC_UPDATE_DNS_CONFIGURATION_NAME)
+    @activity_defn_with_context(name=DYNAMIC_UPDATE_DNS_CONFIGURATION_NAME)
     async def dynamic_update_dns_configuration(
         self, updates: DynamicUpdateParam
     ) -> DNSUpdateResult:
-        # TODO apply dynamic updates
-        return DNSUpdateResult(serial=1)
+        async with self.start_transaction() as services:
+            try:
+                dns_updates = await self._get_dynamic_updates(
+                    services, updates.updates
+                )
+            except DNSReloadRequired as e:
+                logger.info(f"Full DNS reload required by update '{e}'")
+                dns_updates = None
+            ttl = (
+                await services.configurations.get("default_dns_ttl")
+                or DEFAULT_DNS_TTL
+            )
+        if dns_updates is None:
+            return await self._full_reload()
+
+        # Each zone gets a single nsupdate batch, which also sets the serial.
+        zones = defaultdict(list)
+        for update in dns_updates:
+            zones[update.zone].append(update)
+        try:
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        NSUpdateCommand(
+                            zone,
+                            zone_updates,
+                            serial=updates.new_serial,
+                            ttl=ttl,
+                        ).update
+                    )
+                    for zone, zone_updates in zones.items()
+                )
+            )
+        except ExternalProcessError:
+            logger.warning("Dynamic DNS update failed, reloading all zones")
+            return await self._full_reload()
+        return DNSUpdateResult(serial=updates.new_serial)
 
-    @activity.defn(name=CHECK_SERIAL_UPDATE_NAME)
+    @activity_defn_with_context(name=CHECK_SERIAL_UPDATE_NAME)
     async def check_serial_update(
         self, serial: CheckSerialUpdateParam
     ) -> None:
         pass
 
+    @activity_defn_with_context(name=SET_PUBLISHED_SERIAL_NAME)
+    async def set_published_serial(
+        self, param: SetPublishedSerialParam
+    ) -> None:
+        async with self._start_transaction() as tx:
+            stmt = (
+                insert(ConfigTable)
+                .values(name=DNS_PUBLISHED_SERIAL_CONFIG, value=param.serial)
+                .on_conflict_do_update(
+                    index_elements=[ConfigTable.c.name],
+                    set_={"value": param.serial},
+                )
+            )
+            await tx.execute(stmt)
+
 
 @workflow.defn(name=CONFIGURE_DNS_WORKFLOW_NAME, sandboxed=False)
 class ConfigureDNSWorkflow:
 
-    @workflow.run
+    @workflow_run_with_context
     async def run(self, param: ConfigureDNSParam) -> None:
         updates = None
         need_full_reload = param.need_full_reload
@@ -112,15 +420,22 @@ class ConfigureDNSWorkflow:
                 start_to_close_timeout=GET_CHANGES_SINCE_CURRENT_SERIAL_TIMEOUT,
             )
 
-            for publication in updates["updates"]:
-                if publication["update"] == "RELOAD":
-                    need_full_reload = True
+            if updates is None:
+                need_full_reload = True
+            elif not updates["updates"]:
+                # Everything has already been published.
+                return
+            else:
+                for publication in updates["updates"]:
+                    if publication["update"] == "RELOAD":
+                        need_full_reload = True
 
         region_controllers = await workflow.execute_activity(
             GET_REGION_CONTROLLERS_NAME,
             start_to_close_timeout=GET_REGION_CONTROLLERS_TIMEOUT,
         )
 
+        published_serial = None
         for region_controller_system_id in region_controllers[
             "region_controller_system_ids"
         ]:
@@ -153,3 +468,14 @@ class ConfigureDNSWorkflow:
                     region_controller_system_id
                 ),
             )
+            if published_serial is None:
+                published_serial = new_serial["serial"]
+            else:
+                published_serial = min(published_serial, new_serial["serial"])
+
+        if published_serial is not None:
+            await workflow.execute_activity(
+                SET_PUBLISHED_SERIAL_NAME,
+                SetPublishedSerialParam(serial=published_serial),
+                start_to_close_timeout=SET_PUBLISHED_SERIAL_TIMEOUT,
+            )
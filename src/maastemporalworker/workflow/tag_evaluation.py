@@ -21,21 +21,43 @@ The evaluation consists in matching the tag definition against the output of
 some scripts that run during the node commissioning phase. The output of those
 scripts is expected to be in XML format, and the tag definition to be a XPath
 expression.
+
+Several tags can be evaluated at once with the multi-tag evaluation workflow.
+Each batch of nodes is then fetched and parsed once for all the tags, instead
+of once per tag.
 """
 
+import asyncio
+from base64 import b64decode
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import timedelta
-from functools import reduce
+from functools import lru_cache, reduce
+from multiprocessing import get_context
+import os
 
-from sqlalchemy import text
+from lxml import etree
+from sqlalchemy import delete, insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection
 import structlog
 from temporalio import workflow
 from temporalio.common import RetryPolicy
 
 from maascommon.workflows.tag import (
+    TAG_EVALUATION_MANY_SIGNAL_NAME,
+    TAG_EVALUATION_MANY_WORKFLOW_NAME,
     TAG_EVALUATION_WORKFLOW_NAME,
+    TagEvaluationManyParam,
     TagEvaluationParam,
 )
+from maasservicelayer.db.tables import (
+    NodeTable,
+    NodeTagTable,
+    ScriptResultTable,
+    ScriptSetTable,
+    TagTable,
+)
 from maastemporalworker.workflow.activity import ActivityBase
 from maastemporalworker.workflow.utils import (
     activity_defn_with_context,
@@ -46,14 +68,21 @@ from provisioningserver.refresh.node_info_scripts import (
     LLDP_OUTPUT_NAME,
     LSHW_OUTPUT_NAME,
 )
+from provisioningserver.utils.xpath import try_match_xpath
 
 logger = structlog.getLogger()
 
 
 TAG_EVALUATION_ACTIVITY_TIMEOUT = timedelta(minutes=10)
+TAG_EVALUATION_MANY_ACTIVITY_TIMEOUT = timedelta(minutes=30)
+
+# Batches with fewer nodes are evaluated in a thread rather than being split
+# across a process pool.
+PARALLEL_EVALUATION_MIN_NODES = 100
 
 # Activities names
 EVALUATE_TAG_ACTIVITY_NAME = "evaluate-tag"
+EVALUATE_TAGS_ACTIVITY_NAME = "evaluate-tags"
 
 
 # Activities parameters
@@ -81,6 +110,89 @@ class TagEvaluationWorkflow:
         )
 
 
+@workflow.defn(name=TAG_EVALUATION_MANY_WORKFLOW_NAME, sandboxed=False)
+class TagEvaluationManyWorkflow:
+    """Temporal workflow for the evaluation of several tags at once.
+
+    Tags signalled while an evaluation is running are evaluated together in a
+    following round, so a burst of tag changes is handled by one workflow.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, TagEvaluationParam] = {}
+
+    @workflow.signal(name=TAG_EVALUATION_MANY_SIGNAL_NAME)
+    async def evaluate_tags(self, param: TagEvaluationManyParam) -> None:
+        # Only the latest definition of a tag needs to be evaluated.
+        for tag in param.tags:
+            self._pending[tag.tag_id] = tag
+
+    @workflow_run_with_context
+    async def run(self, param: TagEvaluationManyParam) -> None:
+        await self.evaluate_tags(param)
+        while self._pending:
+            tags = list(self._pending.values())
+            self._pending.clear()
+            tag_ids = [tag.tag_id for tag in tags]
+            logger.info(f"Tags (ids={tag_ids}) evaluation starts.")
+            result: TagEvaluationResult = await workflow.execute_activity(
+                TagEvaluationActivity.evaluate_tags,
+                arg=TagEvaluationManyParam(tags, param.batch_size),
+                retry_policy=RetryPolicy(maximum_attempts=3),
+                start_to_close_timeout=TAG_EVALUATION_MANY_ACTIVITY_TIMEOUT,
+            )
+            logger.info(
+                f"Tags (ids={tag_ids}) evaluation ends: {result.inserted} node-tag pairs were added and {result.deleted} were removed"
+            )
+
+
+@lru_cache(maxsize=256)
+def _compile_tag_definition(definition: str) -> etree.XPath:
+    return etree.XPath(definition)
+
+
+def evaluate_tag_definitions(
+    definitions: list[tuple[int, str]],
+    outputs: list[tuple[int, list[str]]],
+) -> list[tuple[int, list[int]]]:
+    """Evaluate tag definitions against the commissioning output of nodes.
+
+    Every output is parsed once and all the definitions are evaluated against
+    it. A tag matches a node if it matches any of its outputs. Nodes without a
+    well formed output are left out, so their tags are kept as they are.
+
+    This runs in the workers of a process pool, so it must stay picklable.
+
+    :param definitions: `(tag_id, definition)` tuples.
+    :param outputs: `(node_id, [base64 encoded output, ...])` tuples.
+    :return: `(node_id, [matching tag_id, ...])` tuples.
+    """
+    xpaths = [
+        (tag_id, _compile_tag_definition(definition))
+        for tag_id, definition in definitions
+    ]
+    matches = []
+    for node_id, node_outputs in outputs:
+        docs = []
+        for output in node_outputs:
+            try:
+                docs.append(etree.fromstring(b64decode(output)))
+            except (etree.XMLSyntaxError, ValueError):
+                continue
+        if docs:
+            matches.append(
+                (
+                    node_id,
+                    [
+                        tag_id
+                        for tag_id, xpath in xpaths
+                        if any(try_match_xpath(xpath, doc) for doc in docs)
+                    ],
+                )
+            )
+    return matches
+
+
 class TagEvaluationActivity(ActivityBase):
     """Temporal activity for tag evaluation."""
 
@@ -254,3 +366,180 @@ SELECT 'pointer', max(id) FROM batch_nodes_cte
         )
 
         return result
+
+    @activity_defn_with_context(name=EVALUATE_TAGS_ACTIVITY_NAME)
+    async def evaluate_tags(
+        self, param: TagEvaluationManyParam
+    ) -> TagEvaluationResult:
+        """
+        Run the evaluation of several tags as Temporal activity.
+
+        Unlike `evaluate_tag`, the XPath expressions are not evaluated by the
+        database. Each batch of nodes is fetched once, and the outputs of the
+        LSHW_OUTPUT_NAME and LLDP_OUTPUT_NAME scripts are parsed once for all
+        the tags, across a process pool for large batches. The node-tag
+        relations of the batch are then inserted and deleted in bulk.
+
+        The database transactions are kept short in the same way as for
+        `evaluate_tag`: no transaction is open while the tags are evaluated.
+        """
+        definitions = [(tag.tag_id, tag.tag_definition) for tag in param.tags]
+        tag_ids = [tag_id for tag_id, _ in definitions]
+        inserted = deleted = 0
+        pointer = -1
+        processed_nodes = param.batch_size
+        workers = os.cpu_count() or 1
+        pool = None
+        try:
+            while definitions and 0 < param.batch_size == processed_nodes:
+                async with self._start_transaction() as tx:
+                    node_ids, outputs = await self._get_tag_evaluation_batch(
+                        tx, pointer, param.batch_size
+                    )
+                processed_nodes = len(node_ids)
+                if not node_ids:
+                    break
+                pointer = node_ids[-1]
+
+                if len(outputs) < PARALLEL_EVALUATION_MIN_NODES:
+                    matches = await asyncio.to_thread(
+                        evaluate_tag_definitions, definitions, outputs
+                    )
+                else:
+                    if pool is None:
+                        # The Temporal worker is threaded, so use fresh
+                        # processes rather than forking.
+                        pool = ProcessPoolExecutor(
+                            max_workers=workers,
+                            mp_context=get_context("spawn"),
+                        )
+                    matches = await self._evaluate_in_pool(
+                        pool, workers, definitions, outputs
+                    )
+
+                async with self._start_transaction() as tx:
+                    batch_inserted, batch_deleted = await self._apply_matches(
+                        tx, tag_ids, matches
+                    )
+                inserted += batch_inserted
+                deleted += batch_deleted
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return TagEvaluationResult(inserted=inserted, deleted=deleted)
+
+    async def _get_tag_evaluation_batch(
+        self, tx: AsyncConnection, pointer: int, batch_size: int
+    ) -> tuple[list[int], list[tuple[int, list[str]]]]:
+        """Return the IDs of the next batch of nodes and their outputs.
+
+        Only the outputs of the LSHW_OUTPUT_NAME and LLDP_OUTPUT_NAME scripts
+        that passed in the last commissioning script set of the nodes are
+        returned.
+        """
+        stmt = (
+            select(NodeTable.c.id)
+            .where(NodeTable.c.id > pointer)
+            .order_by(NodeTable.c.id)
+            .limit(batch_size)
+        )
+        node_ids = (await tx.execute(stmt)).scalars().all()
+        if not node_ids:
+            return [], []
+        stmt = (
+            select(NodeTable.c.id, ScriptResultTable.c.stdout)
+            .select_from(NodeTable)
+            .join(
+                ScriptSetTable,
+                (
+                    ScriptSetTable.c.id
+                    == NodeTable.c.current_commissioning_script_set_id
+                )
+                & (ScriptSetTable.c.node_id == NodeTable.c.id),
+            )
+            .join(
+                ScriptResultTable,
+                ScriptResultTable.c.script_set_id == ScriptSetTable.c.id,
+            )
+            .where(
+                NodeTable.c.id.in_(node_ids),
+                ScriptResultTable.c.status == SCRIPT_STATUS.PASSED,
+                ScriptResultTable.c.script_name.in_(
+                    [LSHW_OUTPUT_NAME, LLDP_OUTPUT_NAME]
+                ),
+            )
+        )
+        outputs = defaultdict(list)
+        for node_id, stdout in (await tx.execute(stmt)).all():
+            outputs[node_id].append(stdout)
+        return list(node_ids), list(outputs.items())
+
+    async def _evaluate_in_pool(
+        self,
+        pool: ProcessPoolExecutor,
+        workers: int,
+        definitions: list[tuple[int, str]],
+        outputs: list[tuple[int, list[str]]],
+    ) -> list[tuple[int, list[int]]]:
+        loop = asyncio.get_running_loop()
+        chunk_size = max(1, len(outputs) // (workers * 4))
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool,
+                    evaluate_tag_definitions,
+                    definitions,
+                    outputs[start : start + chunk_size],
+                )
+                for start in range(0, len(outputs), chunk_size)
+            )
+        )
+        return [match for result in results for match in result]
+
+    async def _apply_matches(
+        self,
+        tx: AsyncConnection,
+        tag_ids: list[int],
+        matches: list[tuple[int, list[int]]],
+    ) -> tuple[int, int]:
+        """Insert and delete the node-tag relations of evaluated nodes.
+
+        :return: The number of inserted and deleted relations.
+        """
+        if not matches:
+            return 0, 0
+        # Tags deleted since the evaluation started are skipped.
+        stmt = select(TagTable.c.id).where(TagTable.c.id.in_(tag_ids))
+        tag_ids = set((await tx.execute(stmt)).scalars().all())
+        node_ids = [node_id for node_id, _ in matches]
+        stmt = select(NodeTagTable.c.node_id, NodeTagTable.c.tag_id).where(
+            NodeTagTable.c.node_id.in_(node_ids),
+            NodeTagTable.c.tag_id.in_(tag_ids),
+        )
+        existing = {tuple(row) for row in (await tx.execute(stmt)).all()}
+        matched = {
+            (node_id, tag_id)
+            for node_id, matched_tag_ids in matches
+            for tag_id in matched_tag_ids
+            if tag_id in tag_ids
+        }
+        to_insert = sorted(matched - existing)
+        to_delete = sorted(existing - matched)
+        if to_delete:
+            await tx.execute(
+                delete(NodeTagTable).where(
+                    tuple_(NodeTagTable.c.node_id, NodeTagTable.c.tag_id).in_(
+                        to_delete
+                    )
+                )
+            )
+        if to_insert:
+            await tx.execute(
+                insert(NodeTagTable),
+                [
+                    {"node_id": node_id, "tag_id": tag_id}
+                    for node_id, tag_id in to_insert
+                ],
+            )
+        return len(to_insert), len(to_delete)
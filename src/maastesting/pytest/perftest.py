@@ -62,6 +62,12 @@ def pytest_addoption(parser):
         default=["timing", "queries"],
         help="Performance features to enable.",
     )
+    parser.addoption(
+        "--perf-concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent clients used by load performance tests.",
+    )
 
 
 @pytest.fixture(scope="session")
@@ -279,7 +285,13 @@ class PerfTester:
 
     @contextmanager
     def record(self, name):
+        """Record performance measurements for the enclosed block.
+
+        The context yields a dict that the test can fill with extra results,
+        which are reported along with the ones from the tracers.
+        """
         tracers = []
+        extra = {}
         # Collect all the garbage before tracers begin, so that collection of
         # unrelated garbage won't affect measurements.
         gc.collect()
@@ -287,7 +299,7 @@ class PerfTester:
             for tracer in self.tracers:
                 tracer_class = PERF_TRACERS[tracer]
                 tracers.append(stack.enter_context(tracer_class(name)))
-            yield
+            yield extra
             # Collect the garbage that was created by the code that is being
             # profiled, so that we get a more consistent measurements.
             # Otherwise, a small change to the code under test could cause a
@@ -302,6 +314,7 @@ class PerfTester:
             results.update(tracer.results())
             if self.outdir:
                 tracer.dump_results(self.outdir / tracer.dump_file_name)
+        results.update(extra)
         self.results["tests"][name] = results
 
     def write_results(self):
@@ -16,14 +16,15 @@ __all__ = [
 ]
 
 import base64
+from collections import OrderedDict
 from datetime import datetime, timezone
 from functools import partial
 import http.client
-from io import BytesIO
 import json
 from operator import itemgetter
 import os
 import tarfile
+import threading
 import time
 
 from django.conf import settings
@@ -113,6 +114,9 @@ log = LegacyLogger()
 # ../ is added to keep config outside of the scripts directory.
 NETPLAN_TAR_PATH = "../config/netplan.yaml"
 
+# Number of tar members and archives of scripts kept in memory.
+SCRIPTS_TAR_CACHE_SIZE = 1024
+
 
 class UnknownMetadataVersion(MAASAPINotFound):
     """Not a known metadata version."""
@@ -197,10 +201,13 @@ def check_version(version):
         raise UnknownMetadataVersion("Unknown metadata version: %s" % version)
 
 
-def add_event_to_node_event_log(
+def make_node_event_log_events(
     node, origin, action, description, event_type, result=None, created=None
 ):
-    """Add an entry to the node's event log."""
+    """Return the unsaved entries to add to the node's event log.
+
+    See `add_event_to_node_event_log`.
+    """
     if node.status == NODE_STATUS.COMMISSIONING:
         if result in ["SUCCESS", None]:
             type_name = EVENT_TYPES.NODE_COMMISSIONING_EVENT
@@ -226,28 +233,46 @@ def add_event_to_node_event_log(
     else:
         type_name = EVENT_TYPES.NODE_STATUS_EVENT
 
+    events = []
     # Create an extra event for the machine status messages.
     if action in EVENT_STATUS_MESSAGES and event_type == "start":
-        Event.objects.register_event_and_event_type(
-            EVENT_STATUS_MESSAGES[action],
-            type_level=EVENT_DETAILS[EVENT_STATUS_MESSAGES[action]].level,
-            type_description=EVENT_DETAILS[
-                EVENT_STATUS_MESSAGES[action]
-            ].description,
+        events.append(
+            Event.objects.make_event_and_event_type(
+                EVENT_STATUS_MESSAGES[action],
+                type_level=EVENT_DETAILS[EVENT_STATUS_MESSAGES[action]].level,
+                type_description=EVENT_DETAILS[
+                    EVENT_STATUS_MESSAGES[action]
+                ].description,
+                event_action=action,
+                system_id=node,
+                created=created,
+            )
+        )
+
+    events.append(
+        Event.objects.make_event_and_event_type(
+            type_name,
+            type_level=EVENT_DETAILS[type_name].level,
+            type_description=EVENT_DETAILS[type_name].description,
             event_action=action,
-            system_id=node.system_id,
+            event_description=f"'{origin}' {description}",
+            system_id=node,
             created=created,
         )
+    )
+    return events
+
 
-    return Event.objects.register_event_and_event_type(
-        type_name,
-        type_level=EVENT_DETAILS[type_name].level,
-        type_description=EVENT_DETAILS[type_name].description,
-        event_action=action,
-        event_description=f"'{origin}' {description}",
-        system_id=node.system_id,
-        created=created,
+def add_event_to_node_event_log(
+    node, origin, action, description, event_type, result=None, created=None
+):
+    """Add an entry to the node's event log."""
+    events = make_node_event_log_events(
+        node, origin, action, description, event_type, result, created
     )
+    for event in events:
+        event.save(force_insert=True)
+    return events[-1]
 
 
 _EXT_TO_KEY = {".out": "stdout", ".err": "stderr", ".yaml": "result"}
@@ -1172,8 +1197,8 @@ class CurtinUserDataHandler(MetadataViewHandler):
         return HttpResponse(user_data, content_type="application/octet-stream")
 
 
-def add_file_to_tar(tar, path, content, mtime, permission=0o755):
-    """Add a script to a tar."""
+def make_tar_member(path, content, mtime, permission=0o755):
+    """Return a file encoded as a tar member, padded to the block size."""
     assert isinstance(content, bytes), "Script content must be binary."
     tarinfo = tarfile.TarInfo(name=path)
     tarinfo.size = len(content)
@@ -1181,7 +1206,90 @@ def add_file_to_tar(tar, path, content, mtime, permission=0o755):
     # Modification time defaults to Epoch, which elicits annoying
     # warnings when decompressing.
     tarinfo.mtime = mtime
-    tar.addfile(tarinfo, BytesIO(content))
+    header = tarinfo.tobuf(
+        tarfile.DEFAULT_FORMAT, tarfile.ENCODING, "surrogateescape"
+    )
+    remainder = len(content) % tarfile.BLOCKSIZE
+    padding = b"\0" * (tarfile.BLOCKSIZE - remainder) if remainder else b""
+    return header + content + padding
+
+
+class TarArchive:
+    """An uncompressed tar archive made of encoded members.
+
+    Members are made with `make_tar_member`, so the members of scripts can
+    be cached and shared between archives instead of being encoded again
+    for every request.
+    """
+
+    def __init__(self):
+        self.members = []
+        self.names = set()
+
+    def add_member(self, path, member):
+        self.members.append(member)
+        self.names.add(path)
+
+    def getvalue(self):
+        """Return the archive, ended and padded as `tarfile` does."""
+        end = b"\0" * (tarfile.BLOCKSIZE * 2)
+        size = sum(len(member) for member in self.members) + len(end)
+        remainder = size % tarfile.RECORDSIZE
+        if remainder:
+            end += b"\0" * (tarfile.RECORDSIZE - remainder)
+        return b"".join(self.members + [end])
+
+
+def add_file_to_tar(tar, path, content, mtime, permission=0o755):
+    """Add a script to a tar."""
+    tar.add_member(path, make_tar_member(path, content, mtime, permission))
+
+
+class ScriptsTarCache:
+    """Cache of the tar members and archives made of scripts.
+
+    The content of a script is versioned and never modified in place, so
+    entries are keyed on the script versions they contain. Changing a
+    script creates a new version and so a new key, which is what
+    invalidates the entries. The least recently used entries are evicted
+    beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries=SCRIPTS_TAR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the entry for `key`, calling `build` to make it if needed."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+scripts_tar_cache = ScriptsTarCache()
+
+
+def add_script_to_tar(tar, path, script_version, mtime):
+    """Add the content of `script_version` to a tar, reusing its member."""
+    tar.add_member(
+        path,
+        scripts_tar_cache.get(
+            ("member", path, script_version.id),
+            lambda: make_tar_member(path, script_version.data.encode(), mtime),
+        ),
+    )
 
 
 class CommissioningScriptsHandler(MetadataViewHandler):
@@ -1202,18 +1310,28 @@ class CommissioningScriptsHandler(MetadataViewHandler):
                 content = script.script.data.encode()
             yield script.name, content
 
+    def _build_archive(self):
+        tar = TarArchive()
+        scripts = sorted(self._iter_scripts())
+        add_script = partial(add_file_to_tar, tar, mtime=time.time())
+        for name, content in scripts:
+            add_script(os.path.join("commissioning.d", name), content)
+        return tar.getvalue()
+
     def _get_archive(self):
         """Produce a tar archive of all commissionig scripts.
 
-        Each of the scripts will be in the `ARCHIVE_PREFIX` directory.
+        Each of the scripts will be in the `ARCHIVE_PREFIX` directory. The
+        archive is cached until a commissioning script is added, removed or
+        changed.
         """
-        binary = BytesIO()
-        scripts = sorted(self._iter_scripts())
-        with tarfile.open(mode="w", fileobj=binary) as tarball:
-            add_script = partial(add_file_to_tar, tarball, mtime=time.time())
-            for name, content in scripts:
-                add_script(os.path.join("commissioning.d", name), content)
-        return binary.getvalue()
+        versions = Script.objects.filter(
+            script_type=SCRIPT_TYPE.COMMISSIONING
+        ).values_list("name", "script_id")
+        return scripts_tar_cache.get(
+            ("commissioning.d", tuple(sorted(versions))),
+            self._build_archive,
+        )
 
     def read(self, request, version, mac=None):
         check_version(version)
@@ -1234,9 +1352,6 @@ class AnonMAASScriptsHandler(AnonymousOperationsHandler):
 
     def read(self, request, version, mac=None):
         # Administrator has turned off commissioning during enlistment.
-        binary = BytesIO()
-        mtime = time.time()
-        tar_meta_data = {"commissioning_scripts": []}
         qs = Script.objects.filter(
             script_type=SCRIPT_TYPE.COMMISSIONING
         ).exclude(
@@ -1250,56 +1365,68 @@ class AnonMAASScriptsHandler(AnonymousOperationsHandler):
             qs = qs.filter(Q(default=True) | Q(tags__overlap=["enlisting"]))
         else:
             qs = qs.filter(tags__overlap=["bmc-config"])
-        qs = qs.order_by("name").select_related("script")
+        qs = qs.order_by("name")
+        # The archive is the same for all the enlisting machines, so it's
+        # cached until one of its scripts changes.
+        key = (
+            "enlistment",
+            tuple(qs.values_list("id", "updated", "script_id")),
+        )
+        return HttpResponse(
+            scripts_tar_cache.get(key, partial(self._build_archive, qs)),
+            content_type="application/x-tar",
+        )
+
+    def _build_archive(self, qs):
+        tar = TarArchive()
+        mtime = time.time()
+        tar_meta_data = {"commissioning_scripts": []}
         # Responses are currently gzip compressed using
         # django.middleware.gzip.GZipMiddleware.
-        with tarfile.open(mode="w", fileobj=binary) as tar:
-            for script in qs:
-                # Return the default parameter fields for any commissioning
-                # script. An empty Node() is passed so the form knows its
-                # validating input and returning defaults. The form only
-                # uses the Node object to fill in storage or interface
-                # parameters. When none are found "all" is used which is
-                # handled elsewhere.
-                form = ParametersForm(data={}, script=script, node=Node())
-                # The form isn't valid if there is a required field with no
-                # default value.
-                if not form.is_valid():
-                    logger.error(
-                        "Unable to send commissioning script to enlisting "
-                        f"machine - {form.errors}"
-                    )
-                    continue
-                path = os.path.join("commissioning", script.name)
-                content = script.script.data.encode()
-                add_file_to_tar(tar, path, content, mtime)
-                for parameters in form.cleaned_data["input"]:
-                    tar_meta_data["commissioning_scripts"].append(
-                        {
-                            "name": script.name,
-                            "path": path,
-                            "script_version_id": script.script.id,
-                            "timeout_seconds": script.timeout.total_seconds(),
-                            "parallel": script.parallel,
-                            "hardware_type": script.hardware_type,
-                            "parameters": parameters,
-                            "packages": script.packages,
-                            "for_hardware": script.for_hardware,
-                            "apply_configured_networking": (
-                                script.apply_configured_networking
-                            ),
-                        }
-                    )
-            add_file_to_tar(
-                tar,
-                "index.json",
-                json.dumps({"1.0": tar_meta_data}).encode(),
-                mtime,
-                0o644,
-            )
-        return HttpResponse(
-            binary.getvalue(), content_type="application/x-tar"
+        for script in qs.select_related("script"):
+            # Return the default parameter fields for any commissioning
+            # script. An empty Node() is passed so the form knows its
+            # validating input and returning defaults. The form only
+            # uses the Node object to fill in storage or interface
+            # parameters. When none are found "all" is used which is
+            # handled elsewhere.
+            form = ParametersForm(data={}, script=script, node=Node())
+            # The form isn't valid if there is a required field with no
+            # default value.
+            if not form.is_valid():
+                logger.error(
+                    "Unable to send commissioning script to enlisting "
+                    f"machine - {form.errors}"
+                )
+                continue
+            path = os.path.join("commissioning", script.name)
+            content = script.script.data.encode()
+            add_file_to_tar(tar, path, content, mtime)
+            for parameters in form.cleaned_data["input"]:
+                tar_meta_data["commissioning_scripts"].append(
+                    {
+                        "name": script.name,
+                        "path": path,
+                        "script_version_id": script.script.id,
+                        "timeout_seconds": script.timeout.total_seconds(),
+                        "parallel": script.parallel,
+                        "hardware_type": script.hardware_type,
+                        "parameters": parameters,
+                        "packages": script.packages,
+                        "for_hardware": script.for_hardware,
+                        "apply_configured_networking": (
+                            script.apply_configured_networking
+                        ),
+                    }
+                )
+        add_file_to_tar(
+            tar,
+            "index.json",
+            json.dumps({"1.0": tar_meta_data}).encode(),
+            mtime,
+            0o644,
         )
+        return tar.getvalue()
 
 
 def get_script_result_properties(script_result):
@@ -1350,8 +1477,7 @@ class MAASScriptsHandler(OperationsHandler):
                 # commissioning script. Don't expect a result.
                 script_result.delete()
                 continue
-            content = script_result.script.script.data.encode()
-            add_file_to_tar(tar, path, content, mtime)
+            add_script_to_tar(tar, path, script_result.script.script, mtime)
             md_item = get_script_result_properties(script_result)
             md_item["path"] = path
             if md_item["has_started"]:
@@ -1376,7 +1502,7 @@ class MAASScriptsHandler(OperationsHandler):
             # it and it hasn't already been added.
             if (
                 md_item["apply_configured_networking"]
-                and NETPLAN_TAR_PATH not in tar.getnames()
+                and NETPLAN_TAR_PATH not in tar.names
             ):
                 node = script_result.script_set.node
                 # Testing is always done in the commissioning environment.
@@ -1418,99 +1544,96 @@ class MAASScriptsHandler(OperationsHandler):
         will be returned.
         """
         node = get_queried_node(request)
-        binary = BytesIO()
+        tar = TarArchive()
         mtime = time.time()
         tar_meta_data = {}
         # Responses are currently gzip compressed using
         # django.middleware.gzip.GZipMiddleware.
-        with tarfile.open(mode="w", fileobj=binary) as tar:
-            # Commissioning scripts should only be run during commissioning or
-            # in rescue mode.
-            if (
-                node.status
-                in (
-                    NODE_STATUS.COMMISSIONING,
-                    NODE_STATUS.DEPLOYED,
-                    NODE_STATUS.ENTERING_RESCUE_MODE,
-                    NODE_STATUS.RESCUE_MODE,
+        # Commissioning scripts should only be run during commissioning or
+        # in rescue mode.
+        if (
+            node.status
+            in (
+                NODE_STATUS.COMMISSIONING,
+                NODE_STATUS.DEPLOYED,
+                NODE_STATUS.ENTERING_RESCUE_MODE,
+                NODE_STATUS.RESCUE_MODE,
+            )
+            and node.current_commissioning_script_set is not None
+        ):
+            script_set = node.current_commissioning_script_set
+            # Prefetch all the data we need.
+            qs = script_set.scriptresult_set.select_related(
+                "script", "script__script"
+            )
+            # After the script runner finishes sending all commissioning
+            # results it redownloads the script tar. It does this in-case
+            # a commissioning script discovers hardware associated with
+            # hardware identified in the for_hardware field of a script.
+            # select_for_hardware_scripts() processes the output of the
+            # builtin commissioning scripts and adds any associated script.
+            # This does not need to happen the first time the script runner
+            # downloads the tar as the region has not yet received new
+            # data.
+            for script_result in qs:
+                if script_result.status != SCRIPT_STATUS.PENDING:
+                    script_set.select_for_hardware_scripts()
+                    break
+            meta_data = self._add_script_set_to_tar(
+                node.current_commissioning_script_set,
+                tar,
+                "commissioning",
+                mtime,
+                include_finished=node.status == NODE_STATUS.DEPLOYED,
+            )
+            if meta_data:
+                tar_meta_data["commissioning_scripts"] = sorted(
+                    meta_data, key=itemgetter("name", "script_result_id")
                 )
-                and node.current_commissioning_script_set is not None
-            ):
-                script_set = node.current_commissioning_script_set
-                # Prefetch all the data we need.
-                qs = script_set.scriptresult_set.select_related(
-                    "script", "script__script"
+
+        if (
+            node.status == NODE_STATUS.RELEASING
+            or node.status == NODE_STATUS.DISK_ERASING
+        ):
+            meta_data = self._add_script_set_to_tar(
+                node.current_release_script_set,
+                tar,
+                "release",
+                mtime,
+            )
+            if meta_data:
+                tar_meta_data["release_scripts"] = sorted(
+                    meta_data, key=itemgetter("name", "script_result_id")
                 )
-                # After the script runner finishes sending all commissioning
-                # results it redownloads the script tar. It does this in-case
-                # a commissioning script discovers hardware associated with
-                # hardware identified in the for_hardware field of a script.
-                # select_for_hardware_scripts() processes the output of the
-                # builtin commissioning scripts and adds any associated script.
-                # This does not need to happen the first time the script runner
-                # downloads the tar as the region has not yet received new
-                # data.
-                for script_result in qs:
-                    if script_result.status != SCRIPT_STATUS.PENDING:
-                        script_set.select_for_hardware_scripts()
-                        break
-                meta_data = self._add_script_set_to_tar(
-                    node.current_commissioning_script_set,
-                    tar,
-                    "commissioning",
-                    mtime,
-                    include_finished=node.status == NODE_STATUS.DEPLOYED,
+        else:
+            # Always send testing scripts.
+            if node.current_testing_script_set is not None:
+                # prefetch all the data we need
+                qs = node.current_testing_script_set.scriptresult_set.select_related(
+                    "script", "script__script"
                 )
-                if meta_data:
-                    tar_meta_data["commissioning_scripts"] = sorted(
-                        meta_data, key=itemgetter("name", "script_result_id")
-                    )
-
-            if (
-                node.status == NODE_STATUS.RELEASING
-                or node.status == NODE_STATUS.DISK_ERASING
-            ):
                 meta_data = self._add_script_set_to_tar(
-                    node.current_release_script_set,
-                    tar,
-                    "release",
-                    mtime,
+                    qs, tar, "testing", mtime
                 )
                 if meta_data:
-                    tar_meta_data["release_scripts"] = sorted(
-                        meta_data, key=itemgetter("name", "script_result_id")
-                    )
-            else:
-                # Always send testing scripts.
-                if node.current_testing_script_set is not None:
-                    # prefetch all the data we need
-                    qs = node.current_testing_script_set.scriptresult_set.select_related(
-                        "script", "script__script"
-                    )
-                    meta_data = self._add_script_set_to_tar(
-                        qs, tar, "testing", mtime
+                    tar_meta_data["testing_scripts"] = sorted(
+                        meta_data,
+                        key=itemgetter("name", "script_result_id"),
                     )
-                    if meta_data:
-                        tar_meta_data["testing_scripts"] = sorted(
-                            meta_data,
-                            key=itemgetter("name", "script_result_id"),
-                        )
 
-            if not tar_meta_data:
-                return HttpResponse(status=int(http.client.NO_CONTENT))
+        if not tar_meta_data:
+            return HttpResponse(status=int(http.client.NO_CONTENT))
 
-            add_file_to_tar(
-                tar,
-                "index.json",
-                json.dumps({"1.0": tar_meta_data}).encode(),
-                mtime,
-                0o644,
-            )
-
-        return HttpResponse(
-            binary.getvalue(), content_type="application/x-tar"
+        add_file_to_tar(
+            tar,
+            "index.json",
+            json.dumps({"1.0": tar_meta_data}).encode(),
+            mtime,
+            0o644,
         )
 
+        return HttpResponse(tar.getvalue(), content_type="application/x-tar")
+
 
 class AnonMetaDataHandler(VersionIndexHandler):
     """Anonymous metadata."""
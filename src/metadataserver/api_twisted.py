@@ -12,17 +12,19 @@ import json
 from django.db.utils import DatabaseError
 from twisted.application.internet import TimerService
 from twisted.internet import reactor
+from twisted.internet.defer import maybeDeferred
 from twisted.web.resource import Resource
 from twisted.web.server import NOT_DONE_YET
 
 from maasserver.api.utils import extract_oauth_key_from_auth_header
 from maasserver.enum import NODE_STATUS, NODE_TYPE
 from maasserver.forms.pods import PodForm
-from maasserver.models import Interface, Node, NodeKey
+from maasserver.models import Event, Interface, Node, NodeKey
 from maasserver.preseed import CURTIN_INSTALL_LOG
 from maasserver.secrets import SecretManager
 from maasserver.utils.orm import (
     in_transaction,
+    post_commit_do,
     transactional,
     TransactionManagementError,
 )
@@ -30,7 +32,7 @@ from maasserver.utils.threads import deferToDatabase
 from maasserver.vmhost import discover_and_sync_vmhost
 from maasserver.workflow import signal_workflow
 from metadataserver import logger
-from metadataserver.api import add_event_to_node_event_log, process_file
+from metadataserver.api import make_node_event_log_events, process_file
 from metadataserver.enum import SCRIPT_STATUS
 from metadataserver.vendor_data import (
     DEPLOY_SECRETS_LXD_KEY,
@@ -39,6 +41,7 @@ from metadataserver.vendor_data import (
 from provisioningserver.certificates import Certificate
 from provisioningserver.events import EVENT_STATUS_MESSAGES
 from provisioningserver.logger import LegacyLogger
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.utils.twisted import deferred
 
 log = LegacyLogger()
@@ -270,6 +273,19 @@ def _create_vmhost_for_deployment(node):
     node.update_status(NODE_STATUS.DEPLOYED)
 
 
+def _signal_netboot_finished(system_id):
+    d = maybeDeferred(
+        signal_workflow, f"deploy:{system_id}", "netboot-finished"
+    )
+    # Post-commit hooks failing would make the (committed) messages be
+    # processed again, so errors are only logged.
+    d.addErrback(
+        log.err,
+        "Failed to signal the deployment workflow of node: %s" % system_id,
+    )
+    return d
+
+
 def _get_ip_address_for_vmhost(node):
     boot_interface = node.get_boot_interface()
     interface_ids = {boot_interface.id}
@@ -292,6 +308,58 @@ def _get_ip_address_for_vmhost(node):
     return ip
 
 
+class StatusMessageBatch:
+    """Changes from a batch of status messages, written together.
+
+    Events are inserted in bulk, and the updates to each script result are
+    coalesced so only its last state is written.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.results = {}
+        self.statuses = {}
+
+    def add_events(self, events):
+        self.events.extend(events)
+
+    def add_results(self, results):
+        """Add the arguments for `ScriptResult.store_result`."""
+        for script_result, args in results.items():
+            # Each message loads its own copy of the script result, so keep
+            # the first one and apply later changes to it.
+            script_result, pending_args = self.results.get(
+                script_result.id, (script_result, {})
+            )
+            status = self.statuses.pop(script_result, None)
+            if status is not None:
+                script_result.status = status
+            self.results[script_result.id] = (
+                script_result,
+                {**pending_args, **args},
+            )
+
+    def set_status(self, script_result, status):
+        self.statuses[script_result] = status
+
+    def write_script_results(self):
+        """Write the pending script results."""
+        for script_result, args in self.results.values():
+            script_result.store_result(**args)
+        for script_result, status in self.statuses.items():
+            script_result.status = status
+            script_result.save(update_fields=["status"])
+        self.results.clear()
+        self.statuses.clear()
+
+    def write(self):
+        """Write all the pending changes."""
+        if self.events:
+            Event.objects.bulk_create_events(self.events)
+            self.events.clear()
+        self.write_script_results()
+
+
 class StatusWorkerService(TimerService):
     """Service to update nodes from received status messages."""
 
@@ -322,7 +390,15 @@ class StatusWorkerService(TimerService):
         keys = NodeKey.objects.filter(
             token__key__in=list(queue.keys())
         ).select_related("node", "token")
-        return [(key.node, queue[key.token.key]) for key in keys]
+        tasks = [(key.node, queue[key.token.key]) for key in keys]
+        # Messages for unknown keys are dropped.
+        dropped = sum(len(messages) for messages in queue.values()) - sum(
+            len(messages) for _, messages in tasks
+        )
+        PROMETHEUS_METRICS.update(
+            "maas_status_worker_queue_length", "dec", value=dropped
+        )
+        return tasks
 
     def _processMessagesLater(self, tasks):
         # Move all messages on the queue off onto the database tasks queue.
@@ -343,28 +419,80 @@ class StatusWorkerService(TimerService):
             )
         else:
             # Here we're in a database thread, with a database connection.
-            for idx, message in enumerate(messages):
-                try:
-                    exists = self._processMessage(node, message)
-                    if not exists:
-                        # Node has been deleted no reason to continue saving
-                        # the events for this node.
-                        break
-                except Exception:
-                    log.err(
-                        None,
-                        "Failed to process message "
-                        "for node: %s" % node.hostname,
-                    )
+            # All the messages are applied in a single transaction; when that
+            # fails they are applied one by one so that a single bad message
+            # doesn't lose the others.
+            try:
+                self._processMessageBatch(node, messages)
+            except Exception:
+                log.err(
+                    None,
+                    "Failed to process messages in a batch "
+                    "for node: %s" % node.hostname,
+                )
+                self._processMessagesOneByOne(node, messages)
+            finally:
+                self._recordProcessed(messages)
+
+    def _processMessagesOneByOne(self, node, messages):
+        for message in messages:
+            try:
+                exists = self._processMessage(node, message)
+                if not exists:
+                    # Node has been deleted no reason to continue saving
+                    # the events for this node.
+                    break
+            except Exception:
+                log.err(
+                    None,
+                    "Failed to process message "
+                    "for node: %s" % node.hostname,
+                )
+
+    def _recordProcessed(self, messages):
+        PROMETHEUS_METRICS.update(
+            "maas_status_worker_queue_length", "dec", value=len(messages)
+        )
+        now = datetime.now(timezone.utc)
+        for message in messages:
+            PROMETHEUS_METRICS.update(
+                "maas_status_worker_message_lag",
+                "observe",
+                value=(now - message["timestamp"]).total_seconds(),
+            )
+
+    @transactional
+    def _processMessageBatch(self, node, messages):
+        return self._applyMessages(node, messages)
 
     @transactional
     def _processMessage(self, node, message):
+        return self._applyMessages(node, [message])
+
+    def _applyMessages(self, node, messages):
         # Validate that the node still exists since this is a new transaction.
         try:
             node = Node.objects.get(id=node.id)
         except Node.DoesNotExist:
             return False
 
+        batch = StatusMessageBatch()
+        save_node = False
+        for message in messages:
+            if self._applyMessage(node, message, batch):
+                save_node = True
+        batch.write()
+        if save_node:
+            node.save()
+        return True
+
+    def _applyMessage(self, node, message, batch):
+        """Apply `message` to `node`.
+
+        Events and script results are added to `batch` to be written later.
+
+        :return: Whether `node` needs to be saved.
+        """
         event_type = message["event_type"]
         origin = message["origin"]
         activity_name = message["name"]
@@ -378,14 +506,16 @@ class StatusWorkerService(TimerService):
 
         # Add this event to the node event log if 'start' or a 'failure'.
         if event_type == "start" or failed:
-            add_event_to_node_event_log(
-                node,
-                origin,
-                activity_name,
-                description,
-                event_type,
-                result,
-                message["timestamp"],
+            batch.add_events(
+                make_node_event_log_events(
+                    node,
+                    origin,
+                    activity_name,
+                    description,
+                    event_type,
+                    result,
+                    message["timestamp"],
+                )
             )
 
         # Group files together with the ScriptResult they belong.
@@ -438,13 +568,13 @@ class StatusWorkerService(TimerService):
                     default_exit_status,
                 )
 
-        # Commit results to the database.
-        for script_result, args in results.items():
-            script_result.store_result(**args)
+        batch.add_results(results)
 
         # At the end of a top-level event, we change the node status.
         save_node = False
         if self._is_top_level(activity_name) and event_type == "finish":
+            # The node status depends on the script results.
+            batch.write_script_results()
             if node.status == NODE_STATUS.COMMISSIONING:
                 # cloud-init may send a failure message if a script reboots
                 # the system. If a script is running which may_reboot ignore
@@ -500,9 +630,9 @@ class StatusWorkerService(TimerService):
                     _create_vmhost_for_deployment(node)
 
                 if not failed and activity_name == "modules-final":
-                    signal_workflow(
-                        f"deploy:{node.system_id}", "netboot-finished"
-                    )
+                    # The messages are applied again one by one if the batch
+                    # fails, so only signal once the transaction commits.
+                    post_commit_do(_signal_netboot_finished, node.system_id)
 
             elif node.status == NODE_STATUS.DISK_ERASING:
                 if failed:
@@ -535,8 +665,7 @@ class StatusWorkerService(TimerService):
                 script_result = script_set.find_script_result(
                     script_name=CURTIN_INSTALL_LOG
                 )
-                script_result.status = SCRIPT_STATUS.RUNNING
-                script_result.save(update_fields=["status"])
+                batch.set_status(script_result, SCRIPT_STATUS.RUNNING)
 
         # Reset status_expires when Curtin signals its starting or finishing
         # early commands. This allows users to define early or late commands
@@ -554,9 +683,7 @@ class StatusWorkerService(TimerService):
             node.reset_status_expires()
             save_node = True
 
-        if save_node:
-            node.save()
-        return True
+        return save_node
 
     def _retrieve_content(self, compression, encoding, content):
         """Extract the content of the sent file."""
@@ -656,3 +783,4 @@ class StatusWorkerService(TimerService):
             return d
         else:
             self.queue[authorization].append(message)
+            PROMETHEUS_METRICS.update("maas_status_worker_queue_length", "inc")
@@ -53,21 +53,26 @@ from maasserver.testing.factory import factory
 from maasserver.testing.testcase import MAASServerTestCase
 from maasserver.testing.testclient import MAASSensibleOAuthClient
 from maasserver.utils.orm import reload_object
+from maastesting.testcase import MAASTestCase
 from maastesting.utils import sample_binary_data
 from metadataserver import api
 from metadataserver.api import (
     add_event_to_node_event_log,
     check_version,
+    CommissioningScriptsHandler,
     get_node_for_mac,
     get_node_for_request,
     get_queried_node,
     get_script_result_properties,
     make_list_response,
+    make_tar_member,
     make_text_response,
     MetaDataHandler,
     NETPLAN_TAR_PATH,
     process_file,
+    ScriptsTarCache,
     store_node_power_parameters,
+    TarArchive,
     UnknownMetadataVersion,
 )
 from metadataserver.builtin_scripts import load_builtin_scripts
@@ -2594,6 +2599,70 @@ class TestMAASScriptsProperties(MAASServerTestCase):
         self.assertEqual(["storage"], notags_properties["tags"])
 
 
+class TestScriptsTar(MAASTestCase):
+    def test_tar_archive_matches_tarfile(self):
+        files = [
+            (factory.make_name("script"), factory.make_bytes(size=size))
+            for size in (0, 1, tarfile.BLOCKSIZE, 3000)
+        ]
+        tar = TarArchive()
+        for path, content in files:
+            tar.add_member(path, make_tar_member(path, content, 1000))
+        expected = BytesIO()
+        with tarfile.open(mode="w", fileobj=expected) as expected_tar:
+            for path, content in files:
+                tarinfo = tarfile.TarInfo(name=path)
+                tarinfo.size = len(content)
+                tarinfo.mode = 0o755
+                tarinfo.mtime = 1000
+                expected_tar.addfile(tarinfo, BytesIO(content))
+        self.assertEqual(expected.getvalue(), tar.getvalue())
+        self.assertEqual({path for path, _ in files}, tar.names)
+
+    def test_cache_builds_entry_once(self):
+        cache = ScriptsTarCache()
+        build = Mock(return_value=b"archive")
+        cache.get("key", build)
+        self.assertEqual(b"archive", cache.get("key", build))
+        build.assert_called_once_with()
+
+    def test_cache_evicts_least_recently_used_entries(self):
+        cache = ScriptsTarCache(max_entries=2)
+        cache.get("first", lambda: b"1")
+        cache.get("second", lambda: b"2")
+        cache.get("first", Mock())
+        cache.get("third", lambda: b"3")
+        build = Mock(return_value=b"2")
+        cache.get("second", build)
+        build.assert_called_once_with()
+
+
+class TestScriptsTarCaching(MAASServerTestCase):
+    def test_commissioning_archive_is_cached(self):
+        factory.make_Script(script_type=SCRIPT_TYPE.COMMISSIONING)
+        handler = CommissioningScriptsHandler()
+        build_archive = self.patch(handler, "_build_archive")
+        build_archive.return_value = b"archive"
+        handler._get_archive()
+        self.assertEqual(b"archive", handler._get_archive())
+        build_archive.assert_called_once_with()
+
+    def test_commissioning_archive_is_rebuilt_when_script_changes(self):
+        script = factory.make_Script(script_type=SCRIPT_TYPE.COMMISSIONING)
+        handler = CommissioningScriptsHandler()
+        archive = tarfile.open(fileobj=BytesIO(handler._get_archive()))
+        path = os.path.join("commissioning.d", script.name)
+        self.assertEqual(
+            script.script.data.encode(), archive.extractfile(path).read()
+        )
+        script.script = script.script.update(factory.make_string())
+        script.save()
+        archive = tarfile.open(fileobj=BytesIO(handler._get_archive()))
+        self.assertEqual(
+            script.script.data.encode(), archive.extractfile(path).read()
+        )
+
+
 class TestCommissioningAPI(MAASServerTestCase):
     def setUp(self):
         super().setUp()
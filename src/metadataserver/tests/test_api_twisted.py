@@ -30,6 +30,7 @@ from maasserver.testing.testcase import (
     MAASTransactionServerTestCase,
 )
 from maasserver.utils.orm import (
+    post_commit_hooks,
     reload_object,
     transactional,
     TransactionManagementError,
@@ -43,6 +44,7 @@ from metadataserver.api_twisted import (
     _create_vmhost_for_deployment,
     POD_CREATION_ERROR,
     StatusHandlerResource,
+    StatusMessageBatch,
     StatusWorkerService,
 )
 from metadataserver.enum import RESULT_TYPE, SCRIPT_STATUS
@@ -172,6 +174,11 @@ class TestStatusWorkerServiceTransactional(MAASTransactionServerTestCase):
             "timestamp": datetime.now(timezone.utc).timestamp(),
         }
 
+    def make_queued_message(self):
+        message = self.make_message()
+        message["timestamp"] = datetime.now(timezone.utc)
+        return message
+
     def test_init__(self):
         worker = StatusWorkerService(sentinel.dbtasks, clock=sentinel.reactor)
         self.assertEqual(sentinel.dbtasks, worker.dbtasks)
@@ -226,36 +233,90 @@ class TestStatusWorkerServiceTransactional(MAASTransactionServerTestCase):
                 sentinel.message,
             )
 
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_processMessages_processes_messages_in_a_batch(self):
+        worker = StatusWorkerService(sentinel.dbtasks)
+        mock_processMessageBatch = self.patch(worker, "_processMessageBatch")
+        mock_processMessage = self.patch(worker, "_processMessage")
+        messages = [self.make_queued_message(), self.make_queued_message()]
+        yield deferToDatabase(worker._processMessages, sentinel.node, messages)
+        mock_processMessageBatch.assert_called_once_with(
+            sentinel.node, messages
+        )
+        mock_processMessage.assert_not_called()
+
+    @transactional
+    def make_deploying_node(self):
+        return factory.make_Node(interface=True, status=NODE_STATUS.DEPLOYING)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_processMessages_signals_workflow_once_when_batch_fails(self):
+        signal_workflow = self.patch(api_twisted_module, "signal_workflow")
+        node = yield deferToDatabase(self.make_deploying_node)
+        message = self.make_queued_message()
+        message.update(
+            {
+                "event_type": "finish",
+                "result": "OK",
+                "origin": "cloud-init",
+                "name": "modules-final",
+            }
+        )
+        worker = StatusWorkerService(sentinel.dbtasks)
+        applyMessages = worker._applyMessages
+        batches = []
+
+        def fail_first_batch(node, messages):
+            # The workflow signal is registered before the batch fails.
+            result = applyMessages(node, messages)
+            batches.append(messages)
+            if len(batches) == 1:
+                raise Exception("batch failed")
+            return result
+
+        self.patch(worker, "_applyMessages").side_effect = fail_first_batch
+        yield deferToDatabase(worker._processMessages, node, [message])
+        self.assertEqual([[message], [message]], batches)
+        signal_workflow.assert_called_once_with(
+            f"deploy:{node.system_id}", "netboot-finished"
+        )
+
     @wait_for_reactor
     @inlineCallbacks
     def test_processMessages_doesnt_call_when_node_deleted(self):
         worker = StatusWorkerService(sentinel.dbtasks)
+        self.patch(worker, "_processMessageBatch").side_effect = Exception()
         mock_processMessage = self.patch(worker, "_processMessage")
         mock_processMessage.return_value = False
-        yield deferToDatabase(
-            worker._processMessages,
-            sentinel.node,
-            [sentinel.message1, sentinel.message2],
+        message1, message2 = (
+            self.make_queued_message(),
+            self.make_queued_message(),
         )
-        mock_processMessage.assert_called_once_with(
-            sentinel.node, sentinel.message1
+        yield deferToDatabase(
+            worker._processMessages, sentinel.node, [message1, message2]
         )
+        mock_processMessage.assert_called_once_with(sentinel.node, message1)
 
     @wait_for_reactor
     @inlineCallbacks
-    def test_processMessages_calls_processMessage(self):
+    def test_processMessages_calls_processMessage_when_batch_fails(self):
         worker = StatusWorkerService(sentinel.dbtasks)
+        self.patch(worker, "_processMessageBatch").side_effect = Exception()
         mock_processMessage = self.patch(worker, "_processMessage")
         mock_processMessage.return_value = True
+        message1, message2 = (
+            self.make_queued_message(),
+            self.make_queued_message(),
+        )
         yield deferToDatabase(
-            worker._processMessages,
-            sentinel.node,
-            [sentinel.message1, sentinel.message2],
+            worker._processMessages, sentinel.node, [message1, message2]
         )
         mock_processMessage.assert_has_calls(
             [
-                call(sentinel.node, sentinel.message1),
-                call(sentinel.node, sentinel.message2),
+                call(sentinel.node, message1),
+                call(sentinel.node, message2),
             ]
         )
 
@@ -363,6 +424,37 @@ class TestStatusWorkerService(MAASServerTestCase):
             CURTIN_INSTALL_LOG + " changed status from 'Pending' to 'Running'",
         )
 
+    def test_process_message_batch_inserts_events_together(self):
+        node = factory.make_Node(status=NODE_STATUS.COMMISSIONING)
+        messages = [
+            {
+                "event_type": "start",
+                "origin": "cloud-init",
+                "name": factory.make_name("init-network/config"),
+                "description": factory.make_name("description"),
+                "timestamp": datetime.now(timezone.utc),
+            }
+            for _ in range(3)
+        ]
+        worker = StatusWorkerService(sentinel.dbtasks)
+        bulk_create_events = self.patch(
+            Event.objects,
+            "bulk_create_events",
+            Mock(wraps=Event.objects.bulk_create_events),
+        )
+        self.assertTrue(worker._processMessageBatch(node, messages))
+        bulk_create_events.assert_called_once()
+        self.assertCountEqual(
+            [message["name"] for message in messages],
+            Event.objects.filter(node=node).values_list("action", flat=True),
+        )
+
+    def test_process_message_batch_returns_false_when_node_deleted(self):
+        node = factory.make_Node(status=NODE_STATUS.DEPLOYING)
+        node.delete()
+        worker = StatusWorkerService(sentinel.dbtasks)
+        self.assertFalse(worker._processMessageBatch(node, []))
+
     def test_process_message_returns_false_when_node_deleted(self):
         node1 = factory.make_Node(status=NODE_STATUS.DEPLOYING)
         node1.delete()
@@ -585,6 +677,23 @@ class TestStatusWorkerService(MAASServerTestCase):
             Event.objects.filter(node=node).last().description,
         )
 
+    def test_status_ok_for_modules_final_signals_workflow_after_commit(self):
+        node = factory.make_Node(interface=True, status=NODE_STATUS.DEPLOYING)
+        payload = {
+            "event_type": "finish",
+            "result": "OK",
+            "origin": "cloud-init",
+            "name": "modules-final",
+            "description": "America for Make Benefit Glorious Nation",
+            "timestamp": datetime.now(timezone.utc),
+        }
+        with post_commit_hooks:
+            self.processMessage(node, payload)
+            api_twisted_module.signal_workflow.assert_not_called()
+        api_twisted_module.signal_workflow.assert_called_once_with(
+            f"deploy:{node.system_id}", "netboot-finished"
+        )
+
     def test_status_ok_for_modules_final_triggers_kvm_install(self):
         node = factory.make_Node(
             interface=True,
@@ -605,6 +714,7 @@ class TestStatusWorkerService(MAASServerTestCase):
         )
         self.processMessage(node, payload)
         mock_create_vmhost.assert_called_once_with(node)
+        post_commit_hooks.reset()  # Ignore the workflow signal.
 
     def test_status_ok_for_modules_final_triggers_register_vmhost(self):
         node = factory.make_Node(
@@ -626,6 +736,7 @@ class TestStatusWorkerService(MAASServerTestCase):
         )
         self.processMessage(node, payload)
         mock_create_vmhost.assert_called_once_with(node)
+        post_commit_hooks.reset()  # Ignore the workflow signal.
 
     def test_status_installation_fail_leaves_node_failed(self):
         node = factory.make_Node(interface=True, status=NODE_STATUS.DEPLOYING)
@@ -1094,6 +1205,60 @@ class TestStatusWorkerService(MAASServerTestCase):
         )
 
 
+class TestStatusMessageBatch(MAASServerTestCase):
+    def make_script_result(self, status=SCRIPT_STATUS.RUNNING):
+        node = factory.make_Node(status=NODE_STATUS.DEPLOYING)
+        script_set = factory.make_ScriptSet(
+            node=node, result_type=RESULT_TYPE.INSTALLATION
+        )
+        return factory.make_ScriptResult(script_set=script_set, status=status)
+
+    def test_add_results_coalesces_results(self):
+        script_result = self.make_script_result()
+        batch = StatusMessageBatch()
+        batch.add_results({script_result: {"exit_status": 1, "stdout": b"a"}})
+        batch.add_results(
+            {reload_object(script_result): {"exit_status": 0, "stderr": b"b"}}
+        )
+        store_result = self.patch(script_result, "store_result")
+        batch.write()
+        store_result.assert_called_once_with(
+            exit_status=0, stdout=b"a", stderr=b"b"
+        )
+
+    def test_add_results_applies_pending_status(self):
+        script_result = self.make_script_result(status=SCRIPT_STATUS.PENDING)
+        batch = StatusMessageBatch()
+        batch.set_status(script_result, SCRIPT_STATUS.RUNNING)
+        batch.add_results({script_result: {"stdout": b"a"}})
+        batch.write()
+        script_result = reload_object(script_result)
+        self.assertEqual(SCRIPT_STATUS.RUNNING, script_result.status)
+        self.assertEqual(b"a", script_result.stdout)
+
+    def test_add_results_applies_status_set_between_results(self):
+        script_result = self.make_script_result(status=SCRIPT_STATUS.PENDING)
+        batch = StatusMessageBatch()
+        batch.add_results({script_result: {"stdout": b"a"}})
+        batch.set_status(reload_object(script_result), SCRIPT_STATUS.RUNNING)
+        batch.add_results({reload_object(script_result): {"stderr": b"b"}})
+        batch.write()
+        script_result = reload_object(script_result)
+        self.assertEqual(SCRIPT_STATUS.RUNNING, script_result.status)
+        self.assertEqual(b"a", script_result.stdout)
+        self.assertEqual(b"b", script_result.stderr)
+
+    def test_set_status_writes_last_status(self):
+        script_result = self.make_script_result(status=SCRIPT_STATUS.PENDING)
+        batch = StatusMessageBatch()
+        batch.set_status(script_result, SCRIPT_STATUS.INSTALLING)
+        batch.set_status(script_result, SCRIPT_STATUS.RUNNING)
+        batch.write()
+        self.assertEqual(
+            SCRIPT_STATUS.RUNNING, reload_object(script_result).status
+        )
+
+
 class TestCreateVMHostForDeployment(MAASServerTestCase):
     def setUp(self):
         super().setUp()
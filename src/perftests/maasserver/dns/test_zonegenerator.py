@@ -0,0 +1,64 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from netaddr import IPAddress, IPNetwork
+import pytest
+
+from maasserver.dns.zonegenerator import ZoneGenerator
+from maasserver.enum import IPADDRESS_TYPE
+from maasserver.models import DNSResource, StaticIPAddress
+from provisioningserver.dns.actions import bind_write_zones
+
+HOSTS = 50000
+
+
+def make_hosts(domain, subnet, count):
+    network = IPNetwork(subnet.cidr)
+    ips = StaticIPAddress.objects.bulk_create(
+        (
+            StaticIPAddress(
+                ip=str(IPAddress(network.first + 256 + i)),
+                alloc_type=IPADDRESS_TYPE.USER_RESERVED,
+                subnet=subnet,
+            )
+            for i in range(count)
+        ),
+        batch_size=1000,
+    )
+    resources = DNSResource.objects.bulk_create(
+        (DNSResource(name=f"host-{i}", domain=domain) for i in range(count)),
+        batch_size=1000,
+    )
+    DNSResource.ip_addresses.through.objects.bulk_create(
+        (
+            DNSResource.ip_addresses.through(
+                dnsresource_id=resource.id, staticipaddress_id=ip.id
+            )
+            for resource, ip in zip(resources, ips)
+        ),
+        batch_size=1000,
+    )
+
+
+@pytest.mark.usefixtures("maasdb")
+def test_perf_generate_large_reverse_zones(
+    perf, dns_config_path, zone_file_config_path, factory
+):
+    domain = factory.make_Domain()
+    subnet = factory.make_Subnet(cidr="10.0.0.0/16")
+    make_hosts(domain, subnet, HOSTS)
+
+    with perf.record("test_perf_generate_large_reverse_zones.generate"):
+        zones = ZoneGenerator([domain], [subnet], serial=1).as_list()
+
+    with perf.record("test_perf_generate_large_reverse_zones.zonefile_write"):
+        bind_write_zones(zones)
+
+    zones = ZoneGenerator(
+        [domain], [subnet], serial=2, force_config_write=True
+    ).as_list()
+    # Nothing changed, so no zone file is rendered or written again.
+    with perf.record(
+        "test_perf_generate_large_reverse_zones.unchanged_zonefile_write"
+    ):
+        bind_write_zones(zones)
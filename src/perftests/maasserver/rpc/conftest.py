@@ -0,0 +1,101 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from queue import Empty, SimpleQueue
+from statistics import mean, quantiles
+import threading
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from maasserver.utils.orm import enable_all_database_connections
+
+
+@pytest.fixture
+def perf_concurrency(pytestconfig):
+    return pytestconfig.getoption("--perf-concurrency")
+
+
+class RackLoad:
+    """Drive a region RPC handler with calls from concurrent rack clients.
+
+    Each client runs in its own thread with its own database connection,
+    like the threads used by the region to answer RPC calls.
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+
+    def run(self, handler, calls):
+        """Call `handler` once for each set of arguments in `calls`.
+
+        Returns a dict with latency percentiles and query counts, suitable for
+        adding to the results of `PerfTester.record`.
+        """
+        pending = SimpleQueue()
+        for args in calls:
+            pending.put(args)
+        # list.append() is atomic, so workers can share these lists.
+        measurements = []
+        errors = []
+
+        def client():
+            enable_all_database_connections()
+            try:
+                while True:
+                    try:
+                        args = pending.get_nowait()
+                    except Empty:
+                        break
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        handler(*args)
+                        latency = time.perf_counter() - start
+                    measurements.append(
+                        (
+                            latency,
+                            len(queries),
+                            sum(float(query["time"]) for query in queries),
+                        )
+                    )
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        clients = [
+            threading.Thread(target=client) for _ in range(self.concurrency)
+        ]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return self.summarize(measurements)
+
+    def summarize(self, measurements):
+        latencies = sorted(latency for latency, _, _ in measurements)
+        query_counts = [count for _, count, _ in measurements]
+        if len(latencies) > 1:
+            percentiles = quantiles(latencies, n=100, method="inclusive")
+        else:
+            percentiles = latencies * 99
+        return {
+            "calls": len(measurements),
+            "concurrency": self.concurrency,
+            "latency_p50": percentiles[49],
+            "latency_p90": percentiles[89],
+            "latency_p99": percentiles[98],
+            "latency_max": latencies[-1],
+            "query_count": sum(query_counts),
+            "query_time": sum(query_time for _, _, query_time in measurements),
+            "queries_per_call": mean(query_counts),
+        }
+
+
+@pytest.fixture
+def rack_load(perf_concurrency):
+    return RackLoad(perf_concurrency)
@@ -0,0 +1,161 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Performance tests for the region RPC handlers under rack load.
+
+Each test simulates several rack controllers calling a handler at the same
+time, through the same functions that the region's RPC responders defer to
+the database threads.
+"""
+
+import time
+
+from django.db import transaction
+import pytest
+
+from maasserver.enum import IPRANGE_TYPE, NODE_STATUS
+from maasserver.rpc.boot import get_config
+from maasserver.rpc.events import send_event
+from maasserver.rpc.leases import update_lease
+from maasserver.rpc.nodes import list_cluster_nodes_power_parameters
+from maasserver.rpc.rackcontrollers import report_neighbours
+
+RACKS = 4
+MACHINES_PER_RACK = 50
+
+
+@pytest.mark.allow_transactions
+def test_perf_update_leases(perf, factory, rack_load):
+    subnet = factory.make_Subnet(cidr="10.0.0.0/16")
+    factory.make_IPRange(
+        subnet=subnet,
+        start_ip="10.0.1.1",
+        end_ip="10.0.4.254",
+        alloc_type=IPRANGE_TYPE.DYNAMIC,
+    )
+    machines = [
+        factory.make_Machine_with_Interface_on_Subnet(
+            subnet=subnet, with_dhcp_rack_primary=False
+        )
+        for _ in range(RACKS * MACHINES_PER_RACK)
+    ]
+    transaction.commit()
+
+    timestamp = int(time.time())
+    calls = [
+        (
+            "commit",
+            machine.boot_interface.mac_address,
+            "ipv4",
+            f"10.0.{1 + index // 250}.{1 + index % 250}",
+            timestamp,
+            600,
+            machine.hostname,
+        )
+        for index, machine in enumerate(machines)
+    ]
+    with perf.record("test_perf_update_leases") as results:
+        results.update(rack_load.run(update_lease, calls))
+
+
+@pytest.mark.allow_transactions
+def test_perf_get_boot_config(perf, factory, rack_load):
+    factory.make_default_ubuntu_release_bootable("amd64/generic")
+    subnet = factory.make_Subnet(cidr="10.0.0.0/16")
+    racks = [factory.make_RackController(subnet=subnet) for _ in range(RACKS)]
+    calls = []
+    for rack in racks:
+        for _ in range(MACHINES_PER_RACK):
+            machine = factory.make_Machine_with_Interface_on_Subnet(
+                subnet=subnet,
+                with_dhcp_rack_primary=False,
+                status=NODE_STATUS.COMMISSIONING,
+                architecture="amd64/generic",
+            )
+            calls.append(
+                (
+                    rack.system_id,
+                    factory.pick_ip_in_Subnet(subnet),
+                    None,
+                    "amd64",
+                    "generic",
+                    machine.boot_interface.mac_address,
+                )
+            )
+    transaction.commit()
+
+    with perf.record("test_perf_get_boot_config") as results:
+        results.update(rack_load.run(get_config, calls))
+
+
+@pytest.mark.allow_transactions
+def test_perf_list_node_power_parameters(perf, factory, rack_load):
+    racks = [factory.make_RackController() for _ in range(RACKS)]
+    for rack in racks:
+        for _ in range(MACHINES_PER_RACK):
+            factory.make_Machine(bmc_connected_to=rack)
+    transaction.commit()
+
+    # Each rack pages through its machines, as NodePowerMonitorService does.
+    pages = MACHINES_PER_RACK // 10
+    calls = [(rack.system_id,) for rack in racks for _ in range(pages)]
+    with perf.record("test_perf_list_node_power_parameters") as results:
+        results.update(
+            rack_load.run(list_cluster_nodes_power_parameters, calls)
+        )
+
+
+@pytest.mark.allow_transactions
+def test_perf_send_event(perf, factory, rack_load):
+    event_types = [factory.make_EventType() for _ in range(5)]
+    machines = [
+        factory.make_Machine() for _ in range(RACKS * MACHINES_PER_RACK)
+    ]
+    transaction.commit()
+
+    timestamp = time.time()
+    calls = [
+        (
+            machine.system_id,
+            event_types[index % len(event_types)].name,
+            factory.make_name("description"),
+            timestamp,
+        )
+        for index, machine in enumerate(machines)
+    ]
+    with perf.record("test_perf_send_event") as results:
+        results.update(rack_load.run(send_event, calls))
+
+
+@pytest.mark.allow_transactions
+def test_perf_report_neighbours(perf, factory, rack_load):
+    subnet = factory.make_Subnet(cidr="10.0.0.0/16")
+    racks = []
+    for _ in range(RACKS):
+        rack = factory.make_RackController(subnet=subnet, ifname="eth0")
+        rack.current_config.interface_set.filter(name="eth0").update(
+            neighbour_discovery_state=True
+        )
+        racks.append(rack)
+    transaction.commit()
+
+    timestamp = int(time.time())
+    calls = [
+        (
+            rack.system_id,
+            [
+                {
+                    "interface": "eth0",
+                    "ip": factory.pick_ip_in_Subnet(subnet),
+                    "mac": factory.make_mac_address(),
+                    "time": timestamp,
+                    "vid": None,
+                }
+                for _ in range(10)
+            ],
+        )
+        for rack in racks
+        for _ in range(MACHINES_PER_RACK)
+    ]
+    with perf.record("test_perf_report_neighbours") as results:
+        results.update(rack_load.run(report_neighbours, calls))
@@ -1,15 +1,22 @@
 import base64
 import secrets
+import struct
 
 from pypureomapi import (
     Omapi,
     OMAPI_OP_STATUS,
     OMAPI_OP_UPDATE,
     OmapiError,
+    OmapiErrorNotFound,
     OmapiMessage,
     pack_ip,
+    pack_mac,
 )
 
+# Maximum number of requests sent to the server before waiting for their
+# responses when updating hosts in bulk.
+MAX_OUTSTANDING_REQUESTS = 32
+
 
 def generate_omapi_key() -> str:
     """Generate a base64-encoded key to use for OMAPI access."""
@@ -17,15 +24,31 @@ def generate_omapi_key() -> str:
 
 
 class OmapiClient:
-    """Client for the DHCP OMAPI."""
+    """Client for the DHCP OMAPI.
+
+    Besides single host operations, hosts can be updated in bulk. The bulk
+    operations pipeline their requests over the one authenticated
+    connection, and report failures per host instead of stopping at the
+    first one.
+    """
 
-    def __init__(self, omapi_key: str, ipv6: bool = False):
+    def __init__(
+        self,
+        omapi_key: str,
+        ipv6: bool = False,
+        max_outstanding: int = MAX_OUTSTANDING_REQUESTS,
+    ):
         self._omapi = Omapi(
             "127.0.0.1",
             7912 if ipv6 else 7911,
             b"omapi_key",
             omapi_key.encode("ascii"),
         )
+        self._max_outstanding = max_outstanding
+
+    def close(self):
+        """Close the connection to the server."""
+        self._omapi.close()
 
     def add_host(self, mac: str, ip: str):
         """Add a host mapping for a MAC."""
@@ -38,19 +61,138 @@ class OmapiClient:
 
     def update_host(self, mac: str, ip: str):
         """Update a host mapping for a MAC."""
+        self._run(self._update_host(mac, ip))
+
+    def add_hosts(self, hosts: list[tuple[str, str]]) -> dict[str, Exception]:
+        """Add host mappings for `(mac, ip)` pairs.
+
+        :return: A dict mapping the MACs that failed to their error.
+        """
+        return self._pipeline(
+            (mac, self._add_host(mac, ip)) for mac, ip in hosts
+        )
+
+    def del_hosts(self, macs: list[str]) -> dict[str, Exception]:
+        """Remove the host mappings for MACs.
+
+        :return: A dict mapping the MACs that failed to their error.
+        """
+        return self._pipeline((mac, self._del_host(mac)) for mac in macs)
+
+    def update_hosts(
+        self, hosts: list[tuple[str, str]]
+    ) -> dict[str, Exception]:
+        """Update the host mappings for `(mac, ip)` pairs.
+
+        :return: A dict mapping the MACs that failed to their error.
+        """
+        return self._pipeline(
+            (mac, self._update_host(mac, ip)) for mac, ip in hosts
+        )
+
+    def _add_host(self, mac: str, ip: str):
+        # Same request as `Omapi.add_host_supersede`.
+        msg = OmapiMessage.open(b"host")
+        msg.message.append((b"create", struct.pack("!I", 1)))
+        msg.obj.append((b"name", self._name_from_mac(mac)))
+        msg.obj.append((b"hardware-address", pack_mac(mac)))
+        msg.obj.append((b"hardware-type", struct.pack("!I", 1)))
+        msg.obj.append((b"ip-address", pack_ip(ip)))
+        resp = yield msg
+        if resp.opcode != OMAPI_OP_UPDATE:
+            raise OmapiError("add failed")
+
+    def _del_host(self, mac: str):
+        # Same requests as `Omapi.del_host`.
+        msg = OmapiMessage.open(b"host")
+        msg.obj.append((b"hardware-address", pack_mac(mac)))
+        msg.obj.append((b"hardware-type", struct.pack("!I", 1)))
+        resp = yield msg
+        if resp.opcode != OMAPI_OP_UPDATE:
+            raise OmapiErrorNotFound(f"Host not found: {mac}")
+        if resp.handle == 0:
+            raise OmapiError("received invalid handle from server")
+        resp = yield OmapiMessage.delete(resp.handle)
+        if resp.opcode != OMAPI_OP_STATUS:
+            raise OmapiError("delete failed")
+
+    def _update_host(self, mac: str, ip: str):
         name = self._name_from_mac(mac)
         msg = OmapiMessage.open(b"host")
         msg.update_object({b"name": name})
-        resp = self._omapi.query_server(msg)
+        resp = yield msg
         if resp.opcode != OMAPI_OP_UPDATE:
             raise OmapiError(f"Host not found: {name.decode('ascii')}")
         msg = OmapiMessage.update(resp.handle)
         msg.update_object({b"ip-address": pack_ip(ip)})
-        resp = self._omapi.query_server(msg)
+        resp = yield msg
         if resp.opcode != OMAPI_OP_STATUS:
             raise OmapiError(
                 f"Updating IP for host {name.decode('ascii')} to {ip} failed"
             )
 
+    def _run(self, operation):
+        """Run a single operation, one request at a time."""
+        try:
+            msg = next(operation)
+            while True:
+                msg = operation.send(self._omapi.query_server(msg))
+        except StopIteration:
+            pass
+
+    def _pipeline(self, operations) -> dict[str, Exception]:
+        """Run operations concurrently over the connection.
+
+        Each operation is a generator yielding the requests to send and
+        receiving their responses. At most `max_outstanding` requests are
+        sent without a response. An `OmapiError` only fails the operation
+        raising it; connection errors propagate.
+
+        :param operations: An iterable of `(key, operation)` tuples.
+        :return: A dict mapping the keys of failed operations to their error.
+        """
+        operations = iter(operations)
+        failures = {}
+        in_flight = {}
+
+        def send(key, operation, response=None):
+            try:
+                if response is None:
+                    msg = next(operation)
+                else:
+                    msg = operation.send(response)
+            except StopIteration:
+                return
+            except OmapiError as error:
+                failures[key] = error
+                return
+            self._omapi.send_message(msg)
+            in_flight[msg.tid] = (key, operation)
+
+        def fill():
+            while len(in_flight) < self._max_outstanding:
+                try:
+                    key, operation = next(operations)
+                except StopIteration:
+                    return
+                send(key, operation)
+
+        fill()
+        while in_flight:
+            response = self._omapi.receive_message()
+            try:
+                key, operation = in_flight.pop(response.rid)
+            except KeyError:
+                raise OmapiError(
+                    "received message is not the desired response"
+                )
+            if response.authid != self._omapi.protocol.defauth:
+                raise OmapiError(
+                    "received message is signed with wrong authenticator"
+                )
+            send(key, operation, response)
+            fill()
+        return failures
+
     def _name_from_mac(self, mac: str) -> bytes:
         return mac.replace(":", "-").encode("ascii")
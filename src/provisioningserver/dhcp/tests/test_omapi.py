@@ -1,5 +1,7 @@
 import base64
-from unittest.mock import Mock
+from unittest.mock import Mock, sentinel
+
+from pypureomapi import OMAPI_OP_DELETE, OMAPI_OP_OPEN
 
 from maastesting.testcase import MAASTestCase
 from provisioningserver.dhcp import omapi
@@ -101,3 +103,91 @@ class TestOmapiClient(MAASTestCase):
             str(err),
             "Updating IP for host aa-bb-cc-dd-ee-ff to 1.2.3.4 failed",
         )
+
+
+class FakeOmapi:
+    """Answer OMAPI requests in order, tracking how many are in flight."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.pending = []
+        self.sent = []
+        self.max_in_flight = 0
+        self.protocol = Mock(defauth=0)
+
+    def send_message(self, msg):
+        self.sent.append(msg)
+        self.pending.append(msg)
+        self.max_in_flight = max(self.max_in_flight, len(self.pending))
+
+    def receive_message(self):
+        msg = self.pending.pop(0)
+        opcode, handle = self.respond(msg)
+        return OmapiMessage(opcode=opcode, handle=handle, rid=msg.tid)
+
+
+def respond_ok(msg):
+    if msg.opcode == OMAPI_OP_OPEN:
+        return OMAPI_OP_UPDATE, 1
+    return OMAPI_OP_STATUS, 0
+
+
+class TestOmapiClientBulk(MAASTestCase):
+    def make_client(self, respond=respond_ok, max_outstanding=4):
+        fake = FakeOmapi(respond)
+        self.patch(omapi, "Omapi").return_value = fake
+        return OmapiClient("shared-key", max_outstanding=max_outstanding), fake
+
+    def make_hosts(self, count):
+        return [
+            (f"aa:bb:cc:dd:ee:{i:02x}", f"10.0.0.{i + 1}")
+            for i in range(count)
+        ]
+
+    def test_add_hosts_pipelines_requests(self):
+        cli, fake = self.make_client()
+        hosts = self.make_hosts(10)
+        self.assertEqual({}, cli.add_hosts(hosts))
+        self.assertEqual(10, len(fake.sent))
+        self.assertEqual(4, fake.max_in_flight)
+        self.assertEqual(
+            [(b"name", b"aa-bb-cc-dd-ee-00")], fake.sent[0].obj[:1]
+        )
+
+    def test_del_hosts_sends_open_then_delete(self):
+        cli, fake = self.make_client()
+        self.assertEqual(
+            {}, cli.del_hosts([mac for mac, _ in self.make_hosts(3)])
+        )
+        self.assertEqual(
+            [OMAPI_OP_OPEN] * 3 + [OMAPI_OP_DELETE] * 3,
+            sorted(msg.opcode for msg in fake.sent),
+        )
+
+    def test_update_hosts_reports_failures_per_host(self):
+        hosts = self.make_hosts(5)
+
+        def respond(msg):
+            # The host for the third MAC doesn't exist.
+            if msg.opcode == OMAPI_OP_OPEN and msg.obj == [
+                (b"name", b"aa-bb-cc-dd-ee-02")
+            ]:
+                return OMAPI_OP_STATUS, 0
+            return respond_ok(msg)
+
+        cli, fake = self.make_client(respond)
+        failures = cli.update_hosts(hosts)
+        self.assertEqual(["aa:bb:cc:dd:ee:02"], list(failures))
+        self.assertEqual(
+            "Host not found: aa-bb-cc-dd-ee-02",
+            str(failures["aa:bb:cc:dd:ee:02"]),
+        )
+        # The other hosts were updated.
+        self.assertEqual(
+            4, len([msg for msg in fake.sent if msg.opcode == OMAPI_OP_UPDATE])
+        )
+
+    def test_unexpected_response_aborts(self):
+        cli, fake = self.make_client()
+        fake.receive_message = lambda: OmapiMessage(rid=sentinel.unknown)
+        self.assertRaises(OmapiError, cli.add_hosts, self.make_hosts(1))
@@ -12,6 +12,7 @@ from provisioningserver.dns.config import (
     DNSConfig,
     execute_rndc_command,
     get_nsupdate_key_path,
+    render_dns_templates,
     set_up_options_conf,
 )
 from provisioningserver.logger import get_maas_logger
@@ -189,11 +190,27 @@ def bind_write_options(upstream_dns, dnssec_validation):
 def bind_write_zones(zones):
     """Write out DNS zones.
 
+    Zones are dynamically updated or skipped where possible. The zone files
+    that do need writing are rendered together, so that large numbers of
+    them can be rendered in parallel.
+
     :param zones: Those zones to write.
     :type zones: Sequence of :py:class:`DomainData`.
     """
-    for zone in zones:
-        zone.write_config()
+    pending = [
+        zone_file
+        for zone in zones
+        for zone_file in zone.get_pending_zone_files()
+    ]
+    contents = render_dns_templates(
+        [
+            (zone_file.template_file_name, zone_file.parameters)
+            for zone_file in pending
+        ],
+        records=sum(zone_file.records for zone_file in pending),
+    )
+    for zone_file, content in zip(pending, contents):
+        zone_file.write(content)
 
 
 class NSUpdateCommand:
@@ -5,12 +5,14 @@
 
 
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 import errno
 from functools import cached_property
 import grp
+from multiprocessing import get_context
 import os
 import os.path
 from pathlib import Path
@@ -36,6 +38,11 @@ MAAS_NSUPDATE_KEY_NAME = "keys.conf.maas"
 MAAS_ZONE_FILE_DIR = "/var/lib/bind/maas"
 MAAS_ZONE_FILE_GROUP = "bind"
 
+# Templates are only rendered in worker processes when there are at least
+# this many records in total; below that, starting the pool costs more than
+# it saves.
+PARALLEL_RENDER_MIN_RECORDS = 20000
+
 
 @dataclass
 class DynamicDNSUpdate:
@@ -392,6 +399,35 @@ def render_dns_template(template_name, *parameters):
         raise DNSConfigFail(*error.args)
 
 
+def render_dns_templates(templates, records=0):
+    """Render several DNS templates, in parallel if there are many records.
+
+    :param templates: A sequence of `(template_name, parameters)` tuples.
+    :param records: The total number of records in the templates.
+    :return: A list with the rendered contents, in the same order as
+        `templates`.
+    """
+    if len(templates) < 2 or records < PARALLEL_RENDER_MIN_RECORDS:
+        return [
+            render_dns_template(template_name, parameters)
+            for template_name, parameters in templates
+        ]
+    template_names, parameters = zip(*templates)
+    workers = min(len(templates), os.cpu_count() or 1)
+    # The region is threaded, so use fresh processes rather than forking.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context("spawn")
+    ) as pool:
+        return list(
+            pool.map(
+                render_dns_template,
+                template_names,
+                parameters,
+                chunksize=max(1, len(templates) // (workers * 4)),
+            )
+        )
+
+
 @contextmanager
 def report_missing_config_dir():
     """Report missing DNS config dir as `DNSConfigDirectoryMissing`.
@@ -35,6 +35,7 @@ from provisioningserver.dns.config import (
     MAAS_RNDC_CONF_NAME,
     NAMED_CONF_OPTIONS,
     render_dns_template,
+    render_dns_templates,
     report_missing_config_dir,
     set_up_options_conf,
     set_up_rndc,
@@ -461,6 +462,38 @@ class TestRenderDNSTemplate(MAASTestCase):
         self.assertIn("'x' is not defined", str(e))
 
 
+class TestRenderDNSTemplates(MAASTestCase):
+    """Tests for `render_dns_templates`."""
+
+    def make_templates(self):
+        template = self.make_file(contents="{{name}} {{value}}")
+        return [
+            (template, {"name": factory.make_name("name"), "value": value})
+            for value in range(3)
+        ]
+
+    def test_renders_in_process_when_few_records(self):
+        executor = self.patch(config, "ProcessPoolExecutor")
+        templates = self.make_templates()
+        self.assertEqual(
+            [
+                f"{parameters['name']} {i}"
+                for i, (_, parameters) in enumerate(templates)
+            ],
+            render_dns_templates(templates, records=1),
+        )
+        executor.assert_not_called()
+
+    def test_renders_in_worker_processes_when_many_records(self):
+        templates = self.make_templates()
+        self.assertEqual(
+            [render_dns_template(*template) for template in templates],
+            render_dns_templates(
+                templates, records=config.PARALLEL_RENDER_MIN_RECORDS
+            ),
+        )
+
+
 class TestReportMissingConfigDir(MAASTestCase):
     """Tests for the `report_missing_config_dir` context manager."""
 
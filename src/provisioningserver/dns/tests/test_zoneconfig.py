@@ -28,6 +28,7 @@ from provisioningserver.dns.zoneconfig import (
     DNSReverseZoneConfig,
     DomainConfigBase,
     DomainInfo,
+    SOA_SERIAL_RE,
 )
 
 
@@ -91,6 +92,37 @@ class TestDomainConfigBase(MAASTestCase):
             gid=os.getgid(),
         )
 
+    def test_compute_fingerprint_ignores_serial_and_record_order(self):
+        records = [
+            ("host1", 30, "10.0.0.1"),
+            ("host2", 30, "10.0.0.2"),
+        ]
+        parameters = {
+            "serial": 1,
+            "modified": "now",
+            "mappings": {"A": records},
+        }
+        self.assertEqual(
+            DomainConfigBase.compute_fingerprint(parameters),
+            DomainConfigBase.compute_fingerprint(
+                {
+                    "serial": 2,
+                    "modified": "later",
+                    "mappings": {"A": list(reversed(records))},
+                }
+            ),
+        )
+        self.assertNotEqual(
+            DomainConfigBase.compute_fingerprint(parameters),
+            DomainConfigBase.compute_fingerprint(
+                {
+                    "serial": 1,
+                    "modified": "now",
+                    "mappings": {"A": records[:1]},
+                }
+            ),
+        )
+
 
 class TestDNSForwardZoneConfig(MAASTestCase):
     """Tests for DNSForwardZoneConfig."""
@@ -495,6 +527,7 @@ class TestDNSForwardZoneConfig(MAASTestCase):
         self.patch(actions, "run_command")
         dns_zone_config.write_config()
         dns_zone_config.force_config_write = True
+        dns_zone_config.default_ttl += 1
         dns_zone_config.write_config()
         self.assertCountEqual(
             execute_rndc_command.call_args_list,
@@ -504,6 +537,85 @@ class TestDNSForwardZoneConfig(MAASTestCase):
             ],
         )
 
+    def make_unchanged_zone_configs(self, serial_increment):
+        domain = factory.make_string()
+        mapping = {
+            factory.make_name("host"): HostnameIPMapping(
+                None, 30, {factory.make_ipv4_address()}
+            ),
+        }
+        dns_zone_config = DNSForwardZoneConfig(
+            domain, serial=random.randint(1, 100), mapping=mapping
+        )
+        dns_zone_config.write_config()
+        new_dns_zone_config = DNSForwardZoneConfig(
+            domain,
+            serial=dns_zone_config.serial + serial_increment,
+            mapping=mapping,
+            force_config_write=True,
+        )
+        return dns_zone_config, new_dns_zone_config
+
+    def test_full_reload_skips_unchanged_zone(self):
+        patch_zone_file_config_path(self)
+        execute_rndc_command = self.patch(actions, "execute_rndc_command")
+        _, new_dns_zone_config = self.make_unchanged_zone_configs(0)
+        new_dns_zone_config.write_config()
+        execute_rndc_command.assert_not_called()
+        self.assertFalse(new_dns_zone_config.requires_reload)
+        self.assertEqual([], new_dns_zone_config.get_pending_zone_files())
+
+    def test_full_reload_updates_serial_of_unchanged_zone(self):
+        patch_zone_file_config_path(self)
+        self.patch(actions, "execute_rndc_command")
+        dns_zone_config, new_dns_zone_config = (
+            self.make_unchanged_zone_configs(1)
+        )
+        zone_info = dns_zone_config.zone_info[0]
+        with open(zone_info.target_path) as fh:
+            old_content = fh.read()
+        render_dns_template = self.patch(
+            provisioningserver.dns.zoneconfig, "render_dns_template"
+        )
+        self.assertEqual([], new_dns_zone_config.get_pending_zone_files())
+        render_dns_template.assert_not_called()
+        self.assertTrue(new_dns_zone_config.requires_reload)
+        with open(zone_info.target_path) as fh:
+            content = fh.read()
+        serial = SOA_SERIAL_RE.search(content).group(2)
+        self.assertEqual(str(new_dns_zone_config.serial), serial)
+        self.assertEqual(
+            old_content.replace(
+                f" {dns_zone_config.serial} ; serial",
+                f" {new_dns_zone_config.serial} ; serial",
+            ),
+            content,
+        )
+
+    def test_dynamic_update_forgets_fingerprint(self):
+        patch_zone_file_config_path(self)
+        self.patch(actions, "run_command")
+        domain = factory.make_string()
+        dns_zone_config = DNSForwardZoneConfig(
+            domain, serial=random.randint(1, 100)
+        )
+        dns_zone_config.write_config()
+        zone_info = dns_zone_config.zone_info[0]
+        self.assertIsNotNone(zone_info.read_fingerprint())
+        update = DynamicDNSUpdate.create_from_trigger(
+            operation="INSERT",
+            zone=domain,
+            name=f"{factory.make_name()}.{domain}",
+            rectype="A",
+            answer=factory.make_ipv4_address(),
+        )
+        DNSForwardZoneConfig(
+            domain,
+            serial=dns_zone_config.serial + 1,
+            dynamic_updates=[update],
+        ).write_config()
+        self.assertIsNone(zone_info.read_fingerprint())
+
 
 class TestDNSReverseZoneConfig(MAASTestCase):
     """Tests for DNSReverseZoneConfig."""
@@ -1062,6 +1174,7 @@ class TestDNSReverseZoneConfig(MAASTestCase):
         self.patch(actions, "run_command")
         zone.write_config()
         zone.force_config_write = True
+        zone.default_ttl += 1
         zone.write_config()
         self.assertCountEqual(
             execute_rndc_command.call_args_list,
@@ -4,9 +4,12 @@
 """Classes for generating BIND zone config files."""
 
 
+from dataclasses import dataclass
 from datetime import datetime
+import hashlib
 from itertools import chain
 import os
+import re
 
 from netaddr import IPAddress, IPNetwork, spanning_cidr
 from netaddr.core import AddrFormatError
@@ -19,12 +22,15 @@ from provisioningserver.dns.config import (
     report_missing_config_dir,
 )
 from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
-from provisioningserver.utils.fs import incremental_write
+from provisioningserver.utils.fs import atomic_write, incremental_write
 from provisioningserver.utils.network import (
     intersect_iprange,
     ip_range_within_network,
 )
 
+# Matches the serial of the SOA record rendered from `zone.template`.
+SOA_SERIAL_RE = re.compile(r"^(\s*)(\S+)( ; serial)$", re.MULTILINE)
+
 
 def get_fqdn_or_ip_address(target):
     """Returns the ip address is target is a valid ip address, otherwise
@@ -117,6 +123,17 @@ def record_for_network(update: DynamicDNSUpdate, network: IPNetwork) -> bool:
     return IPAddress(update.ip) in network
 
 
+def _canonical_parameters(value):
+    """Return `value` in a form that does not depend on record order."""
+    if isinstance(value, dict):
+        return sorted(
+            (key, _canonical_parameters(item)) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return sorted(repr(item) for item in value)
+    return repr(value)
+
+
 class DomainInfo:
     """Information about a DNS zone"""
 
@@ -136,6 +153,68 @@ class DomainInfo:
         else:
             self.target_path = target_path
 
+    @property
+    def fingerprint_path(self):
+        """Path of the file recording the fingerprint of the zone file."""
+        return self.target_path + ".fingerprint"
+
+    def read_fingerprint(self):
+        """Return the fingerprint of the zone file as last written.
+
+        :return: The fingerprint, or None if it is not known.
+        """
+        try:
+            with open(self.fingerprint_path) as fh:
+                return fh.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def write_fingerprint(self, fingerprint):
+        atomic_write(
+            fingerprint.encode("ascii"), self.fingerprint_path, mode=0o644
+        )
+
+    def forget_fingerprint(self):
+        """Forget the fingerprint, e.g. once the zone was changed by BIND."""
+        try:
+            os.remove(self.fingerprint_path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class PendingZoneFile:
+    """A zone file whose content changed and that needs to be written.
+
+    `parameters` only holds plain data, so it can be rendered in another
+    process with `render_dns_template`.
+    """
+
+    config: "DomainConfigBase"
+    zone_info: DomainInfo
+    parameters: dict
+    fingerprint: str
+
+    @property
+    def template_file_name(self):
+        return self.config.template_file_name
+
+    @property
+    def records(self):
+        """The number of records in the zone."""
+        return sum(
+            len(mapping) for mapping in self.parameters["mappings"].values()
+        ) + len(self.parameters["other_mapping"])
+
+    def render(self):
+        return render_dns_template(self.template_file_name, self.parameters)
+
+    def write(self, content):
+        """Write the rendered `content` of the zone file."""
+        self.config.write_zone_content(
+            self.zone_info, content, self.fingerprint
+        )
+
 
 class DomainConfigBase:
     """Base class for zone writers."""
@@ -184,26 +263,135 @@ class DomainConfigBase:
             return True
 
     def dynamic_update(self, zone_info, network=None):
+        updates = [
+            update
+            for update in self._dynamic_updates
+            if update.zone == zone_info.zone_name
+            or (
+                networks_overlap(IPNetwork(update.subnet), network)
+                and record_for_network(update, network)
+                if network
+                else networks_overlap(
+                    IPNetwork(update.subnet), zone_info.subnetwork
+                )
+                and record_for_network(update, zone_info.subnetwork)
+            )
+        ]
         nsupdate = NSUpdateCommand(
             zone_info.zone_name,
-            [
-                update
-                for update in self._dynamic_updates
-                if update.zone == zone_info.zone_name
-                or (
-                    networks_overlap(IPNetwork(update.subnet), network)
-                    and record_for_network(update, network)
-                    if network
-                    else networks_overlap(
-                        IPNetwork(update.subnet), zone_info.subnetwork
-                    )
-                    and record_for_network(update, zone_info.subnetwork)
-                )
-            ],
+            updates,
             serial=self.serial,
             ttl=self.default_ttl,
         )
         nsupdate.update()
+        if updates:
+            # BIND now serves content that is not in the zone file, so the
+            # next full write must not be skipped.
+            zone_info.forget_fingerprint()
+
+    def get_zone_parameters(self, zone_info):
+        """Return the records of the zone as template parameters.
+
+        All the records are materialised in lists, so that the parameters
+        can be fingerprinted and rendered in another process.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def compute_fingerprint(parameters):
+        """Return a digest of the content of a zone.
+
+        The serial and modification time are left out, as is the order of
+        the records, so the digest only changes when the records do.
+        """
+        content = {
+            key: value
+            for key, value in parameters.items()
+            if key not in ("serial", "modified")
+        }
+        return hashlib.sha256(
+            repr(_canonical_parameters(content)).encode("utf-8")
+        ).hexdigest()
+
+    def get_pending_zone_files(self):
+        """Update existing zones and return the zone files to write.
+
+        Zones that can be dynamically updated are updated straight away.
+        Zones whose content has not changed since their file was last
+        written are not rendered again, only their serial is updated.
+
+        :return: A list of `PendingZoneFile`.
+        """
+        pending = []
+        for zi in self.zone_info:
+            if not self.force_config_write and self.zone_file_exists(zi):
+                self.dynamic_update(zi, network=zi.subnetwork)
+                PROMETHEUS_METRICS.update(
+                    "maas_dns_dynamic_update_count",
+                    "inc",
+                    labels={"zone": self.domain},
+                )
+                continue
+            parameters = self.make_parameters()
+            parameters.update(self.get_zone_parameters(zi))
+            fingerprint = self.compute_fingerprint(parameters)
+            if (
+                self.zone_file_exists(zi)
+                and zi.read_fingerprint() == fingerprint
+                and self.write_zone_serial(zi, fingerprint)
+            ):
+                continue
+            pending.append(PendingZoneFile(self, zi, parameters, fingerprint))
+        return pending
+
+    def write_config(self):
+        """Write the zone files."""
+        for zone_file in self.get_pending_zone_files():
+            zone_file.write(zone_file.render())
+
+    def write_zone_serial(self, zone_info, fingerprint):
+        """Set the serial of the unchanged zone file of `zone_info`.
+
+        The region waits for every zone to be served with the serial of the
+        last write, so it has to be updated even if the records are not.
+
+        :return: False if the zone file needs to be rendered again instead.
+        """
+        with open(zone_info.target_path, encoding="utf-8") as fh:
+            content = fh.read()
+        match = SOA_SERIAL_RE.search(content)
+        if match is None:
+            return False
+        if match.group(2) != str(self.serial):
+            content = "".join(
+                (
+                    content[: match.start(2)],
+                    str(self.serial),
+                    content[match.end(2) :],
+                )
+            )
+            self.write_zone_content(zone_info, content, fingerprint)
+        return True
+
+    def write_zone_content(self, zone_info, content, fingerprint):
+        """Write the rendered `content` for the zone in `zone_info`."""
+        self.requires_reload = True
+        needs_freeze_thaw = self.zone_file_exists(zone_info)
+        with freeze_thaw_zone(needs_freeze_thaw, zone=zone_info.zone_name):
+            with report_missing_config_dir():
+                incremental_write(
+                    content.encode("utf-8"),
+                    zone_info.target_path,
+                    mode=0o644,
+                    uid=os.getuid(),
+                    gid=os.getgid(),
+                )
+        zone_info.write_fingerprint(fingerprint)
+        PROMETHEUS_METRICS.update(
+            "maas_dns_full_zonefile_write_count",
+            "inc",
+            labels={"zone": self.domain},
+        )
 
     @classmethod
     def write_zone_file(cls, output_file, *parameters):
@@ -336,51 +524,27 @@ class DNSForwardZoneConfig(DomainConfigBase):
 
         return sorted(generate_directives, key=lambda directive: directive[2])
 
-    def write_config(self):
-        """Write the zone file."""
+    def get_zone_parameters(self, zone_info):
         # Create GENERATE directives for IPv4 ranges.
-        for zi in self.zone_info:
-            generate_directives = list(
-                chain.from_iterable(
-                    self.get_GENERATE_directives(dynamic_range)
-                    for dynamic_range in self._dynamic_ranges
-                    if dynamic_range.version == 4
-                )
+        generate_directives = list(
+            chain.from_iterable(
+                self.get_GENERATE_directives(dynamic_range)
+                for dynamic_range in self._dynamic_ranges
+                if dynamic_range.version == 4
             )
-            if not self.force_config_write and self.zone_file_exists(zi):
-                self.dynamic_update(zi)
-                PROMETHEUS_METRICS.update(
-                    "maas_dns_dynamic_update_count",
-                    "inc",
-                    labels={"zone": self.domain},
-                )
-            else:
-                self.requires_reload = True
-                needs_freeze_thaw = self.zone_file_exists(zi)
-                with freeze_thaw_zone(needs_freeze_thaw, zone=zi.zone_name):
-                    self.write_zone_file(
-                        zi.target_path,
-                        self.make_parameters(),
-                        {
-                            "mappings": {
-                                "A": self.get_A_mapping(
-                                    self._mapping, self._ipv4_ttl
-                                ),
-                                "AAAA": self.get_AAAA_mapping(
-                                    self._mapping, self._ipv6_ttl
-                                ),
-                            },
-                            "other_mapping": enumerate_rrset_mapping(
-                                self._other_mapping
-                            ),
-                            "generate_directives": {"A": generate_directives},
-                        },
-                    )
-                PROMETHEUS_METRICS.update(
-                    "maas_dns_full_zonefile_write_count",
-                    "inc",
-                    labels={"zone": self.domain},
-                )
+        )
+        return {
+            "mappings": {
+                "A": list(self.get_A_mapping(self._mapping, self._ipv4_ttl)),
+                "AAAA": list(
+                    self.get_AAAA_mapping(self._mapping, self._ipv6_ttl)
+                ),
+            },
+            "other_mapping": list(
+                enumerate_rrset_mapping(self._other_mapping)
+            ),
+            "generate_directives": {"A": generate_directives},
+        }
 
 
 class DNSReverseZoneConfig(DomainConfigBase):
@@ -596,52 +760,30 @@ class DNSReverseZoneConfig(DomainConfigBase):
                 generate_directives.add((iterator, "${0,1,x}", hostname))
         return sorted(generate_directives)
 
-    def write_config(self):
-        """Write the zone file."""
+    def get_zone_parameters(self, zone_info):
         # Create GENERATE directives for IPv4 ranges.
-        for zi in self.zone_info:
-            generate_directives = list(
-                chain.from_iterable(
-                    self.get_GENERATE_directives(
-                        dynamic_range, self.domain, zi
-                    )
-                    for dynamic_range in self._dynamic_ranges
-                    if dynamic_range.version == 4
+        generate_directives = list(
+            chain.from_iterable(
+                self.get_GENERATE_directives(
+                    dynamic_range, self.domain, zone_info
                 )
+                for dynamic_range in self._dynamic_ranges
+                if dynamic_range.version == 4
             )
-            if not self.force_config_write and self.zone_file_exists(zi):
-                self.dynamic_update(zi, network=zi.subnetwork)
-                PROMETHEUS_METRICS.update(
-                    "maas_dns_dynamic_update_count",
-                    "inc",
-                    labels={"zone": self.domain},
-                )
-            else:
-                self.requires_reload = True
-                needs_freeze_thaw = self.zone_file_exists(zi)
-                with freeze_thaw_zone(needs_freeze_thaw, zone=zi.zone_name):
-                    self.write_zone_file(
-                        zi.target_path,
-                        self.make_parameters(),
-                        {
-                            "mappings": {
-                                "PTR": self.get_PTR_mapping(
-                                    self._mapping, zi.subnetwork
-                                )
-                            },
-                            "other_mapping": [],
-                            "generate_directives": {
-                                "PTR": generate_directives,
-                                "CNAME": self.get_rfc2317_GENERATE_directives(
-                                    zi.subnetwork,
-                                    self._rfc2317_ranges,
-                                    self.domain,
-                                ),
-                            },
-                        },
-                    )
-                PROMETHEUS_METRICS.update(
-                    "maas_dns_full_zonefile_write_count",
-                    "inc",
-                    labels={"zone": self.domain},
+        )
+        return {
+            "mappings": {
+                "PTR": list(
+                    self.get_PTR_mapping(self._mapping, zone_info.subnetwork)
                 )
+            },
+            "other_mapping": [],
+            "generate_directives": {
+                "PTR": generate_directives,
+                "CNAME": self.get_rfc2317_GENERATE_directives(
+                    zone_info.subnetwork,
+                    self._rfc2317_ranges,
+                    self.domain,
+                ),
+            },
+        }
@@ -3,19 +3,29 @@
 
 """Event catalog."""
 
-from collections import namedtuple
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+from itertools import chain
 from logging import DEBUG, ERROR, INFO, WARN
 
-from twisted.internet.defer import maybeDeferred, succeed
+from twisted.internet import reactor
+from twisted.internet.defer import inlineCallbacks, maybeDeferred, succeed
+from twisted.internet.error import ConnectionClosed
+from twisted.protocols.amp import MAX_VALUE_LENGTH, UnhandledCommand
 
 from provisioningserver.logger import get_maas_logger, LegacyLogger
 from provisioningserver.rpc import getRegionClient
-from provisioningserver.rpc.exceptions import NoSuchEventType, NoSuchNode
+from provisioningserver.rpc.exceptions import (
+    NoConnectionsAvailable,
+    NoSuchEventType,
+    NoSuchNode,
+)
 from provisioningserver.rpc.region import (
     RegisterEventType,
     SendEvent,
     SendEventIPAddress,
     SendEventMACAddress,
+    SendEvents,
 )
 from provisioningserver.utils.env import MAAS_ID
 from provisioningserver.utils.twisted import (
@@ -448,12 +458,34 @@ class NodeEventHub:
 
     This automatically ensures that the event type is registered before
     sending logs to the region.
+
+    Events can either be sent straight away, with the `logBy*` methods, or
+    be buffered with the `queueBy*` methods and sent to the region in
+    batches. A batch is sent once `batch_size` events are buffered, or
+    `flush_interval` seconds after the first one was, and it is kept under
+    the size AMP allows for a value. Batches that can't be delivered while
+    the rack is reconnecting to the region are kept and retried; at most
+    `max_buffered` events are kept, dropping the oldest ones first. Events
+    the region rejects are logged and dropped.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        batch_size=100,
+        flush_interval=1.0,
+        max_buffered=10000,
+        clock=reactor,
+    ):
         super().__init__()
         self._types_registering = dict()
         self._types_registered = set()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._buffer = deque(maxlen=max_buffered)
+        self._dropped = 0
+        self._flush_call = None
+        self._flushing = False
 
     @asynchronous
     def registerEventType(self, event_type):
@@ -627,6 +659,233 @@ class NodeEventHub:
 
         return d
 
+    @asynchronous
+    def queueByID(self, event_type, system_id, description=""):
+        """Buffer the given node event to be sent to the region.
+
+        The node is specified by its ID.
+
+        :param event_type: The type of the event.
+        :type event_type: unicode
+        :param system_id: The system ID of the node.
+        :type system_id: unicode
+        :param description: An optional description of the event.
+        :type description: unicode
+        """
+        self._queue(event_type, description, system_id=system_id)
+
+    @asynchronous
+    def queueByMAC(self, event_type, mac_address, description=""):
+        """Buffer the given node event to be sent to the region.
+
+        The node is specified by its MAC address.
+
+        :param event_type: The type of the event.
+        :type event_type: unicode
+        :param mac_address: The MAC address of the node.
+        :type mac_address: unicode
+        :param description: An optional description of the event.
+        :type description: unicode
+        """
+        self._queue(event_type, description, mac_address=mac_address)
+
+    @asynchronous
+    def queueByIP(self, event_type, ip_address, description=""):
+        """Buffer the given node event to be sent to the region.
+
+        The node is specified by its IP address.
+
+        :param event_type: The type of the event.
+        :type event_type: unicode
+        :param ip_address: The IP address of the node.
+        :type ip_address: unicode
+        :param description: An optional description of the event.
+        :type description: unicode
+        """
+        self._queue(event_type, description, ip_address=ip_address)
+
+    def _queue(self, event_type, description, **node):
+        if len(self._buffer) == self._buffer.maxlen:
+            self._dropped += 1
+        self._buffer.append(
+            dict(
+                type_name=event_type,
+                description=description,
+                timestamp=datetime.now(timezone.utc),
+                **node,
+            )
+        )
+        self._scheduleFlush()
+
+    def _scheduleFlush(self, delay=None):
+        """Arrange for the buffered events to be sent.
+
+        Without an explicit `delay`, a full batch is sent straight away and a
+        partial one after `flush_interval` seconds.
+        """
+        if self._flushing:
+            # The buffer is checked again once the current batch is done.
+            return
+        if delay is None:
+            if len(self._buffer) >= self.batch_size:
+                delay = 0
+            else:
+                delay = self.flush_interval
+        if self._flush_call is None:
+            self._flush_call = self.clock.callLater(delay, self.flush)
+        elif delay == 0:
+            self._flush_call.reset(0)
+
+    @asynchronous
+    def flush(self):
+        """Send a batch of buffered events to the region.
+
+        If the region can't be reached, the events are put back into the
+        buffer to be retried later. Batches the region rejects are split, so
+        that only the events it rejects are dropped.
+
+        :return: :class:`Deferred` that fires once the batch is handled.
+        """
+        if self._flush_call is not None:
+            if self._flush_call.active():
+                self._flush_call.cancel()
+            self._flush_call = None
+        if self._flushing or len(self._buffer) == 0:
+            return succeed(None)
+
+        events = [self._buffer.popleft()]
+        size = get_encoded_event_size(events[0])
+        while len(events) < self.batch_size and len(self._buffer) > 0:
+            size += get_encoded_event_size(self._buffer[0])
+            if size > MAX_VALUE_LENGTH:
+                break
+            events.append(self._buffer.popleft())
+        self._flushing = True
+        d = self._sendBatch(events)
+        d.addCallbacks(
+            callback=self._eventsSent,
+            errback=self._eventsNotSent,
+            errbackArgs=(events,),
+        )
+        return d
+
+    @inlineCallbacks
+    def _sendBatch(self, events):
+        """Send `events`, splitting the batch if the region rejects it.
+
+        :return: The events to retry, because the region couldn't be
+            reached.
+        """
+        try:
+            yield self._sendEvents(events)
+        except NoConnectionsAvailable:
+            return events
+        except ConnectionClosed:
+            log.err(None, "Failure sending node events to the region.")
+            return events
+        except Exception:
+            if len(events) == 1:
+                log.err(
+                    None,
+                    "Node event of type '%s' was rejected by the region; "
+                    "dropping it." % events[0]["type_name"],
+                )
+                return []
+        else:
+            return []
+        half = len(events) // 2
+        retry = yield self._sendBatch(events[:half])
+        if len(retry) > 0:
+            return retry + events[half:]
+        retry = yield self._sendBatch(events[half:])
+        return retry
+
+    @inlineCallbacks
+    def _sendEvents(self, events):
+        for type_name in {event["type_name"] for event in events}:
+            yield self.ensureEventTypeRegistered(type_name)
+        client = getRegionClient()
+        try:
+            yield client(SendEvents, events=events)
+        except UnhandledCommand:
+            # Regions older than 3.6 can only take events one at a time.
+            for event in events:
+                yield self._sendEvent(client, event)
+
+    def _sendEvent(self, client, event):
+        kwargs = {
+            "type_name": event["type_name"],
+            "description": event["description"],
+        }
+        if event.get("system_id"):
+            command = SendEvent
+            kwargs["system_id"] = event["system_id"]
+        elif event.get("mac_address"):
+            command = SendEventMACAddress
+            kwargs["mac_address"] = event["mac_address"]
+        else:
+            command = SendEventIPAddress
+            kwargs["ip_address"] = event["ip_address"]
+        d = client(command, **kwargs)
+        d.addErrback(self._checkEventTypeRegistered, event["type_name"])
+        d.addErrback(suppress, NoSuchNode)
+        return d
+
+    def _eventsSent(self, retry):
+        self._flushing = False
+        if len(retry) > 0:
+            self._requeue(retry)
+            self._scheduleFlush(self.flush_interval)
+            return
+        if self._dropped > 0:
+            maaslog.warning(
+                "%d node events were dropped while the region could "
+                "not be reached." % self._dropped
+            )
+            self._dropped = 0
+        if len(self._buffer) > 0:
+            self._scheduleFlush()
+
+    def _eventsNotSent(self, failure, events):
+        self._flushing = False
+        log.err(
+            failure,
+            "Failure sending node events to the region; dropped %d events."
+            % len(events),
+        )
+        if len(self._buffer) > 0:
+            self._scheduleFlush()
+
+    def _requeue(self, events):
+        """Put `events` back in front of the buffer.
+
+        The most recent events are kept if the buffer overflows.
+        """
+        buffered = len(events) + len(self._buffer)
+        self._dropped += max(0, buffered - self._buffer.maxlen)
+        self._buffer = deque(
+            chain(events, self._buffer), maxlen=self._buffer.maxlen
+        )
+
+
+def get_encoded_event_size(event):
+    """Return the size of `event` once encoded in a `SendEvents` AmpList.
+
+    Each field takes two bytes for the length of its name and two for the
+    length of its value, and each event ends with two empty bytes.
+    """
+    size = 2
+    for name, value in event.items():
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            # The AMP DateTime format, e.g. 2026-01-02T03:04:05.000000+00:00
+            value_size = 32
+        else:
+            value_size = len(value.encode("utf-8"))
+        size += 4 + len(name) + value_size
+    return size
+
 
 # Singleton.
 nodeEventHub = NodeEventHub()
@@ -658,7 +917,7 @@ def send_node_event_mac_address(event_type, mac_address, description=""):
     :param description: An optional description of the event.
     :type description: unicode
     """
-    return nodeEventHub.logByMAC(event_type, mac_address, description)
+    return nodeEventHub.queueByMAC(event_type, mac_address, description)
 
 
 @asynchronous
@@ -672,7 +931,7 @@ def send_node_event_ip_address(event_type, ip_address, description=""):
     :param description: An optional description of the event.
     :type description: unicode
     """
-    return nodeEventHub.logByIP(event_type, ip_address, description)
+    return nodeEventHub.queueByIP(event_type, ip_address, description)
 
 
 @asynchronous
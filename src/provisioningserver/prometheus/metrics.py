@@ -26,7 +26,69 @@ METRICS_DEFINITIONS = [
         "Latency of TFTP file downloads",
         ["filename"],
     ),
+    MetricDefinition(
+        "Counter",
+        "maas_tftp_cache_requests",
+        "Requests for files from the image cache, by TFTP cache result",
+        ["result"],
+    ),
+    MetricDefinition(
+        "Counter",
+        "maas_tftp_file_bytes_served",
+        "Bytes of files from the image cache served over TFTP",
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_tftp_cache_size",
+        "Bytes of files kept in the TFTP cache",
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_rack_power_query_sweep_duration",
+        "Time to query the power state of all the nodes of the rack",
+        buckets=[1, 5, 15, 30, 60, 120, 300, 600],
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_rack_power_query_queue_depth",
+        "Number of power queries waiting to be run",
+        ["power_type"],
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_rack_lease_notification_queue_length",
+        "Number of DHCP lease notifications waiting to be sent to the region",
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_rack_lease_notification_latency",
+        "Time between a DHCP lease event and its processing by the region",
+        buckets=[0.1, 0.5, 1, 2, 5, 10, 30, 60, 300],
+    ),
     # regiond metrics
+    MetricDefinition(
+        "Gauge",
+        "maas_status_worker_queue_length",
+        "Number of node status messages waiting to be processed",
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_status_worker_message_lag",
+        "Time between a node status message and its processing",
+        buckets=[0.5, 1, 5, 10, 30, 60, 120, 300, 600],
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_listener_notification_queue_length",
+        "Number of database notifications waiting to be handled",
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_listener_notification_latency",
+        "Time between a database notification and its handling",
+        ["channel"],
+        buckets=[0.1, 0.5, 1, 2, 5, 10, 30, 60],
+    ),
     MetricDefinition(
         "Histogram",
         "maas_http_request_latency",
@@ -462,9 +462,26 @@ class RackExternalService(TimerService):
     # DNS requests.
     INTERVAL_HIGH = timedelta(seconds=30).total_seconds()
 
+    # Once the region pushes configuration changes, polling is only a
+    # consistency check for the changes that are not pushed.
+    INTERVAL_CONSISTENCY = timedelta(minutes=5).total_seconds()
+
     _rpc_service = None
     _services = None
 
+    # The version of the configuration last announced by the region, and
+    # whether the region announces versions at all.
+    _version = None
+    _pushed = False
+
+    # The event-loops connected when the configuration was last fetched.
+    _eventloops = None
+
+    # Set while an update triggered by the region is in progress, and
+    # whether another one has been requested meanwhile.
+    _updating = None
+    _updateAgain = False
+
     def __init__(
         self,
         rpc_service: ClusterClientService,
@@ -484,10 +501,65 @@ class RackExternalService(TimerService):
                 ("agent", RackAgent()),
             ]
 
+    def startService(self):
+        events = self._rpc_service.events
+        events.connected.registerHandler(self._connectionsChanged)
+        events.disconnected.registerHandler(self._connectionsChanged)
+        events.configurationChanged.registerHandler(self._configurationChanged)
+        super().startService()
+
+    def stopService(self):
+        events = self._rpc_service.events
+        events.connected.unregisterHandler(self._connectionsChanged)
+        events.disconnected.unregisterHandler(self._connectionsChanged)
+        events.configurationChanged.unregisterHandler(
+            self._configurationChanged
+        )
+        return super().stopService()
+
+    def _configurationChanged(self, version):
+        """Called when the region announces a configuration version."""
+        self._pushed = True
+        if version != self._version:
+            self._version = version
+            self._updateNow()
+
+    def _connectionsChanged(self, eventloop):
+        """Called when a connection to a region is added or removed.
+
+        The configuration of the services depends on the region controllers
+        connected to, so it's updated when the set of event-loops changes.
+        """
+        if set(self._rpc_service.connections.keys()) != self._eventloops:
+            self._updateNow()
+
+    def _updateNow(self):
+        """Update the services now, rather than at the next interval.
+
+        Requests made while an update is in progress are coalesced into a
+        single update, made once the current one is done.
+        """
+        if self._updating is not None:
+            self._updateAgain = True
+            return self._updating
+
+        def _done(result):
+            self._updating = None
+            if self._updateAgain:
+                self._updateAgain = False
+                return self._updateNow()
+            return result
+
+        self._updating = self._tryUpdate()
+        self._updating.addBoth(_done)
+        return self._updating
+
     def _update_interval(self, config):
         """Change the update interval."""
         if config is None or len(config.connections) == 0:
             self._loop.interval = self.step = self.INTERVAL_LOW
+        elif self._pushed:
+            self._loop.interval = self.step = self.INTERVAL_CONSISTENCY
         else:
             self._loop.interval = self.step = self.INTERVAL_HIGH
 
@@ -521,20 +593,22 @@ class RackExternalService(TimerService):
     @inlineCallbacks
     def _tryUpdate(self):
         """Update the services running on this host."""
+        eventloops = set(self._rpc_service.connections.keys())
         try:
             config = yield self._getConfiguration()
         except exceptions.NoSuchNode:
             # This node is not yet recognised by the region.
-            self._update_interval(None)
+            self._updateFailed()
             return
         except exceptions.NoConnectionsAvailable:
             # The region is not yet available.
-            self._update_interval(None)
+            self._updateFailed()
             return
         except Exception:
             log.err(None, "Failed to get external services configurations.")
-            self._update_interval(None)
+            self._updateFailed()
             return
+        self._eventloops = eventloops
 
         defers = []
         for name, service in self._services:
@@ -544,6 +618,12 @@ class RackExternalService(TimerService):
         yield DeferredList(defers)
         self._update_interval(config)
 
+    def _updateFailed(self):
+        # Forget the announced version, so that the next announcement is
+        # applied even if it is the same.
+        self._version = None
+        self._update_interval(None)
+
 
 @attr.s
 class _Configuration:
@@ -69,13 +69,19 @@ class RackHTTPService(TimerService):
 
     # Once at least one region controller is set on the proxy_pass then
     # the inverval is higher as at least one controller is handling the
-    # requests for metadata.
-    INTERVAL_HIGH = timedelta(seconds=30).total_seconds()
+    # requests for metadata. Changes to the connected region controllers
+    # are applied as they happen, so this is only a consistency check.
+    INTERVAL_HIGH = timedelta(minutes=5).total_seconds()
 
     _configuration = None
     _resource_root = None
     _rpc_service = None
 
+    # Set while an update triggered by a connection change is in progress,
+    # and whether another one has been requested meanwhile.
+    _updating = None
+    _updateAgain = False
+
     def __init__(self, resource_root, rpc_service, reactor):
         super().__init__(self.INTERVAL_LOW, self._tryUpdate)
         self._resource_root = resource_root
@@ -85,6 +91,44 @@ class RackHTTPService(TimerService):
         self._rpc_service = rpc_service
         self.clock = reactor
 
+    def startService(self):
+        events = self._rpc_service.events
+        events.connected.registerHandler(self._connectionsChanged)
+        events.disconnected.registerHandler(self._connectionsChanged)
+        super().startService()
+
+    def stopService(self):
+        events = self._rpc_service.events
+        events.connected.unregisterHandler(self._connectionsChanged)
+        events.disconnected.unregisterHandler(self._connectionsChanged)
+        return super().stopService()
+
+    def _connectionsChanged(self, eventloop):
+        """Called when a connection to a region is added or removed."""
+        return self._updateNow()
+
+    def _updateNow(self):
+        """Update the HTTP server now, rather than at the next interval.
+
+        Requests made while an update is in progress are coalesced into a
+        single update, made once the current one is done, so that updates
+        are applied in order and the last one sees the latest connections.
+        """
+        if self._updating is not None:
+            self._updateAgain = True
+            return self._updating
+
+        def _done(result):
+            self._updating = None
+            if self._updateAgain:
+                self._updateAgain = False
+                return self._updateNow()
+            return result
+
+        self._updating = self._tryUpdate()
+        self._updating.addBoth(_done)
+        return self._updating
+
     def _update_interval(self, num_region_ips):
         """Change the update interval."""
         if num_region_ips <= 0:
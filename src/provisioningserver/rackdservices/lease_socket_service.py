@@ -10,18 +10,30 @@ import os
 
 from twisted.application.service import Service
 from twisted.internet import reactor, task
-from twisted.internet.defer import inlineCallbacks, succeed
+from twisted.internet.defer import DeferredList, inlineCallbacks, succeed
 from twisted.internet.protocol import DatagramProtocol
 
-from provisioningserver.logger import get_maas_logger
+from provisioningserver.logger import get_maas_logger, LegacyLogger
 from provisioningserver.path import get_maas_data_path
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.rpc.exceptions import NoConnectionsAvailable
 from provisioningserver.rpc.region import UpdateLeases
+from provisioningserver.utils.fs import atomic_write
 from provisioningserver.utils.twisted import pause, retries
 
 maaslog = get_maas_logger("lease_socket_service")
+log = LegacyLogger()
 
+# Maximum number of notifications (distinct IPs) sent in one batch.
 MAX_LEASE_NOTIFICATION = 16
+# Maximum number of batches being processed by the region at the same time.
+MAX_BATCHES_IN_FLIGHT = 4
+# Number of queued notifications looked at when building a batch. Within
+# this window, only the last notification for each IP is sent.
+COALESCE_WINDOW = 256
+# Maximum number of notifications queued in memory. Further notifications
+# are spooled to disk until the queue drains.
+MAX_QUEUED_NOTIFICATIONS = 10000
 
 
 def get_socket_path():
@@ -29,6 +41,11 @@ def get_socket_path():
     return get_maas_data_path("dhcpd.sock")
 
 
+def get_spool_path():
+    """Return path to the file holding lease notifications not yet sent."""
+    return get_maas_data_path("dhcpd-leases.spool")
+
+
 class LeaseSocketService(Service, DatagramProtocol):
     """Service for receiving lease information over MAAS dhcpd.sock."""
 
@@ -39,7 +56,16 @@ class LeaseSocketService(Service, DatagramProtocol):
         self.client_service = client_service
         self.reactor = reactor
         self.address = get_socket_path()
+        self.spool_path = get_spool_path()
         self.notifications = deque()
+        # Number of notifications in the spool file that haven't been read
+        # back yet, and the offset in the file of the first of them.
+        self.spooled = 0
+        self.spool_offset = 0
+        # UpdateLeases calls being processed by the region, and the IPs
+        # they are updating.
+        self.in_flight = set()
+        self.in_flight_ips = set()
         self.processor = task.LoopingCall(
             self.processNotifications, clock=self.reactor
         )
@@ -47,6 +73,9 @@ class LeaseSocketService(Service, DatagramProtocol):
     def startService(self):
         """Start the service."""
         super().startService()
+        # Pick up the notifications left over by the previous run.
+        self.loadSpool()
+
         # Listen for packets from the `dhcpd.sock`.
         self.port = self.reactor.listenUNIXDatagram(self.address, self)
 
@@ -63,9 +92,12 @@ class LeaseSocketService(Service, DatagramProtocol):
         # Remove the socket on the filesystem.
         os.remove(self.address)
 
-        # Stop the processor once it has flushed all data.
+        # Stop the processor, wait for the batches being sent, then save the
+        # notifications that are left so they're sent after a restart.
         done, self.done = self.done, None
         self.processor.stop()
+        done.addCallback(lambda _: DeferredList(list(self.in_flight)))
+        done.addCallback(lambda _: self.saveSpool())
         return done
 
     def datagramReceived(self, data, conn):
@@ -82,8 +114,114 @@ class LeaseSocketService(Service, DatagramProtocol):
         # Place the notification into the list of notifications and the looping
         # call will handle sending the notification to the region. This ensures
         # that even if the connection is lost to the region that the queued
-        # notifications will still be sent.
-        self.notifications.append(notification)
+        # notifications will still be sent. Once the queue is full,
+        # notifications go to the spool file, and keep going there until it
+        # has been read back, so that they stay in order.
+        if self.spooled or len(self.notifications) >= MAX_QUEUED_NOTIFICATIONS:
+            self.spool([notification])
+        else:
+            self.notifications.append(notification)
+        self.updateQueueLength()
+
+    def spool(self, notifications):
+        """Append `notifications` to the spool file."""
+        data = b"".join(
+            json.dumps(notification).encode("utf-8") + b"\n"
+            for notification in notifications
+        )
+        try:
+            with open(self.spool_path, "ab") as spool:
+                spool.write(data)
+        except OSError as error:
+            maaslog.error(
+                "Unable to spool DHCP lease information to %s: %s"
+                % (self.spool_path, error)
+            )
+            self.notifications.extend(notifications)
+        else:
+            self.spooled += len(notifications)
+
+    def unspool(self):
+        """Move notifications from the spool file to the in-memory queue."""
+        room = MAX_QUEUED_NOTIFICATIONS - len(self.notifications)
+        if self.spooled == 0 or room <= 0:
+            return
+        try:
+            with open(self.spool_path, "rb") as spool:
+                spool.seek(self.spool_offset)
+                for _ in range(min(room, self.spooled)):
+                    line = spool.readline()
+                    if not line:
+                        self.spooled = 0
+                        break
+                    if line.strip():
+                        self.notifications.append(json.loads(line))
+                        self.spooled -= 1
+                self.spool_offset = spool.tell()
+        except OSError as error:
+            maaslog.error(
+                "Unable to read spooled DHCP lease information from %s: %s"
+                % (self.spool_path, error)
+            )
+            self.spooled = 0
+        if self.spooled == 0:
+            self.removeSpool()
+
+    def loadSpool(self):
+        """Count the notifications left in the spool file."""
+        try:
+            with open(self.spool_path, "rb") as spool:
+                self.spooled = sum(1 for line in spool if line.strip())
+        except FileNotFoundError:
+            self.spooled = 0
+        self.spool_offset = 0
+        self.updateQueueLength()
+
+    def saveSpool(self):
+        """Write the notifications not sent yet to the spool file.
+
+        The in-memory notifications are older than the spooled ones, so they
+        go first. Notifications already read back from the spool file are
+        dropped from it.
+        """
+        if not self.notifications and self.spool_offset == 0:
+            return
+        data = b"".join(
+            json.dumps(notification).encode("utf-8") + b"\n"
+            for notification in self.notifications
+        )
+        try:
+            if self.spooled:
+                with open(self.spool_path, "rb") as spool:
+                    spool.seek(self.spool_offset)
+                    data += spool.read()
+            if data:
+                atomic_write(data, self.spool_path)
+            else:
+                self.removeSpool()
+        except OSError as error:
+            maaslog.error(
+                "Unable to save DHCP lease information to %s: %s"
+                % (self.spool_path, error)
+            )
+            return
+        self.spooled += len(self.notifications)
+        self.spool_offset = 0
+        self.notifications.clear()
+
+    def removeSpool(self):
+        self.spool_offset = 0
+        try:
+            os.remove(self.spool_path)
+        except FileNotFoundError:
+            pass
+
+    def updateQueueLength(self):
+        PROMETHEUS_METRICS.update(
+            "maas_rack_lease_notification_queue_length",
+            "set",
+            value=len(self.notifications) + self.spooled,
+        )
 
     def processNotifications(self, clock=reactor):
         """Process all notifications.
@@ -91,26 +229,67 @@ class LeaseSocketService(Service, DatagramProtocol):
         In order to guarantee the correct final state, we must preserve the
         ordering of updates of the same IP address. As the Region doesn't give
         us this guarantee, we cannot allow two updates to the same IP to be
-        flying at the same time.
+        flying at the same time. Batches for different IPs are sent
+        concurrently, up to `MAX_BATCHES_IN_FLIGHT`.
         """
-        payload = []
-        ips_seem = set()
-        budget = min(len(self.notifications), MAX_LEASE_NOTIFICATION)
-        for _ in range(budget):
-            ntfy = self.notifications[0]
-            if ntfy["ip"] in ips_seem:
+        self.unspool()
+        while len(self.in_flight) < MAX_BATCHES_IN_FLIGHT:
+            payload = self.takeBatch()
+            # There is nothing to send
+            if not payload:
                 break
-            ips_seem.add(ntfy["ip"])
-            payload.append(self.notifications.popleft())
+            self.sendBatch(payload, clock=clock)
+        self.updateQueueLength()
+        return succeed(True)
+
+    def takeBatch(self):
+        """Take the next batch of notifications from the queue.
+
+        Only the last notification for an IP within `COALESCE_WINDOW` is
+        kept, since it supersedes the previous ones. Notifications for IPs
+        that are in flight are left in the queue, in order.
+        """
+        batch = {}
+        skipped = []
+        for _ in range(min(len(self.notifications), COALESCE_WINDOW)):
+            ntfy = self.notifications.popleft()
+            ip = ntfy["ip"]
+            if ip in batch:
+                batch[ip] = ntfy
+            elif (
+                ip in self.in_flight_ips
+                or len(batch) >= MAX_LEASE_NOTIFICATION
+            ):
+                skipped.append(ntfy)
+            else:
+                batch[ip] = ntfy
+        self.notifications.extendleft(reversed(skipped))
+        return list(batch.values())
+
+    def sendBatch(self, payload, clock=reactor):
+        """Send a batch of notifications, tracking it while it's in flight."""
+        ips = {ntfy["ip"] for ntfy in payload}
+        self.in_flight_ips.update(ips)
+
+        def observe_latency(_):
+            now = clock.seconds()
+            for ntfy in payload:
+                PROMETHEUS_METRICS.update(
+                    "maas_rack_lease_notification_latency",
+                    "observe",
+                    value=max(0, now - ntfy["timestamp"]),
+                )
 
-        # There is nothing to send
-        if not payload:
-            return succeed(True)
+        def done(_):
+            self.in_flight.discard(d)
+            self.in_flight_ips.difference_update(ips)
 
-        notification = {
-            "updates": payload,
-        }
-        return self.processNotification(notification, clock=clock)
+        d = self.processNotification({"updates": payload}, clock=clock)
+        self.in_flight.add(d)
+        d.addCallback(observe_latency)
+        d.addErrback(log.err, "Failed to send DHCP lease information.")
+        d.addBoth(done)
+        return d
 
     @inlineCallbacks
     def processNotification(self, notification, clock=reactor):
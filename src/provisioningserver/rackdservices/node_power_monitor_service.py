@@ -7,16 +7,17 @@
 from datetime import timedelta
 
 from twisted.application.internet import TimerService
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import DeferredList, inlineCallbacks
 from twisted.internet.error import ConnectionDone
 
 from provisioningserver.logger import get_maas_logger, LegacyLogger
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.rpc import getRegionClient
 from provisioningserver.rpc.exceptions import (
     NoConnectionsAvailable,
     NoSuchCluster,
 )
-from provisioningserver.rpc.power import query_all_nodes
+from provisioningserver.rpc.power import PowerQueryScheduler
 from provisioningserver.rpc.region import ListNodePowerParameters
 
 maaslog = get_maas_logger("power_monitor_service")
@@ -27,12 +28,12 @@ class NodePowerMonitorService(TimerService):
     """Service to monitor the power status of all nodes in this cluster."""
 
     check_interval = timedelta(seconds=15).total_seconds()
-    max_nodes_at_once = 5
 
     def __init__(self, clock=None):
         # Call self.query_nodes() every self.check_interval.
         super().__init__(self.check_interval, self.try_query_nodes)
         self.clock = clock
+        self.scheduler = PowerQueryScheduler(clock=clock)
 
     def try_query_nodes(self):
         """Attempt to query nodes' power states.
@@ -54,20 +55,30 @@ class NodePowerMonitorService(TimerService):
     @inlineCallbacks
     def query_nodes(self, client):
         # Get the nodes' power parameters from the region. Keep getting more
-        # power parameters until the region returns an empty list.
-        while True:
-            response = yield client(
-                ListNodePowerParameters, uuid=client.localIdent
-            )
-            power_parameters = response["nodes"]
-            if len(power_parameters) > 0:
-                yield query_all_nodes(
-                    power_parameters,
-                    max_concurrency=self.max_nodes_at_once,
-                    clock=self.clock,
+        # power parameters until the region returns an empty list. Queries
+        # are scheduled as soon as a page is received; the scheduler limits
+        # how many of them run at the same time.
+        start = self.scheduler.clock.seconds()
+        queries = []
+        try:
+            while True:
+                response = yield client(
+                    ListNodePowerParameters, uuid=client.localIdent
                 )
-            else:
-                break
+                power_parameters = response["nodes"]
+                if len(power_parameters) > 0:
+                    queries.append(
+                        self.scheduler.query_nodes(power_parameters)
+                    )
+                else:
+                    break
+        finally:
+            yield DeferredList(queries)
+        PROMETHEUS_METRICS.update(
+            "maas_rack_power_query_sweep_duration",
+            "observe",
+            value=self.scheduler.clock.seconds() - start,
+        )
 
     def query_nodes_failed(self, failure, localIdent):
         if failure.check(NoSuchCluster):
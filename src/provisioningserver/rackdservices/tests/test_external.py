@@ -9,7 +9,7 @@ from unittest.mock import Mock
 
 import attr
 from twisted.internet import reactor
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import Deferred, inlineCallbacks, succeed
 
 from maastesting import get_testing_timeout
 from maastesting.factory import factory
@@ -22,6 +22,7 @@ from provisioningserver.rpc import clusterservice, common, exceptions, region
 from provisioningserver.rpc.testing import MockLiveClusterToRegionRPCFixture
 from provisioningserver.service_monitor import service_monitor
 from provisioningserver.testing.config import ClusterConfigurationFixture
+from provisioningserver.utils.events import EventGroup
 from provisioningserver.utils.service_monitor import SERVICE_STATE
 from provisioningserver.utils.testing import MAASIDFixture, MAASUUIDFixture
 
@@ -113,6 +114,13 @@ def make_startable_RackExternalService(test, *args, **kwargs):
 class StubClusterClientService:
     """A stub `ClusterClientService` service that's never connected."""
 
+    connections = attr.ib(factory=dict)
+    events = attr.ib(
+        factory=lambda: EventGroup(
+            "connected", "disconnected", "configurationChanged"
+        )
+    )
+
     def getClientNow(self):
         raise exceptions.NoConnectionsAvailable()
 
@@ -155,6 +163,79 @@ class TestRackExternalService(MAASTestCase):
         self.assertEqual(service.INTERVAL_HIGH, service.step)
         self.assertEqual(service.INTERVAL_HIGH, service._loop.interval)
 
+    @inlineCallbacks
+    def test_getConfiguration_updates_interval_to_consistency_when_pushed(
+        self,
+    ):
+        rpc_service, protocol = yield prepareRegion(self)
+        service = make_startable_RackExternalService(
+            self, rpc_service, reactor, []
+        )
+        service._tryUpdate.side_effect = lambda: succeed(None)
+
+        yield service.startService()
+        self.addCleanup((yield service.stopService))
+
+        rpc_service.events.configurationChanged.fire(1)
+        yield service._orig_tryUpdate()
+
+        self.assertEqual(service.INTERVAL_CONSISTENCY, service.step)
+        self.assertEqual(service.INTERVAL_CONSISTENCY, service._loop.interval)
+
+    def test_configurationChanged_updates_when_version_changes(self):
+        service = make_startable_RackExternalService(
+            self, StubClusterClientService(), reactor, []
+        )
+        service._tryUpdate.side_effect = lambda: succeed(None)
+
+        service._configurationChanged(1)
+        service._configurationChanged(1)
+        self.assertEqual(1, service._tryUpdate.call_count)
+        service._configurationChanged(2)
+        self.assertEqual(2, service._tryUpdate.call_count)
+
+    def test_configurationChanged_coalesces_updates_in_progress(self):
+        service = make_startable_RackExternalService(
+            self, StubClusterClientService(), reactor, []
+        )
+        updates = [Deferred(), Deferred()]
+        service._tryUpdate.side_effect = updates
+
+        service._configurationChanged(1)
+        service._configurationChanged(2)
+        service._configurationChanged(3)
+        self.assertEqual(1, service._tryUpdate.call_count)
+        updates[0].callback(None)
+        self.assertEqual(2, service._tryUpdate.call_count)
+        updates[1].callback(None)
+        self.assertIsNone(service._updating)
+
+    def test_connectionsChanged_updates_when_eventloops_change(self):
+        rpc_service = StubClusterClientService()
+        service = make_startable_RackExternalService(
+            self, rpc_service, reactor, []
+        )
+        service._tryUpdate.side_effect = lambda: succeed(None)
+        service._eventloops = set()
+
+        service._connectionsChanged("eventloop")
+        service._tryUpdate.assert_not_called()
+        rpc_service.connections["eventloop"] = {Mock()}
+        service._connectionsChanged("eventloop")
+        service._tryUpdate.assert_called_once_with()
+
+    @inlineCallbacks
+    def test_failed_update_forgets_announced_version(self):
+        self.patch(common.log, "debug")
+        service = make_startable_RackExternalService(
+            self, StubClusterClientService(), reactor, []
+        )
+        service._version = 1
+
+        yield service._orig_tryUpdate()
+
+        self.assertIsNone(service._version)
+
     @inlineCallbacks
     def test_is_silent_and_does_nothing_when_region_is_not_available(self):
         # Patch the logger in the clusterservice so no log messages are printed
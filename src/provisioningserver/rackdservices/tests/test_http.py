@@ -11,7 +11,7 @@ import attr
 from tftp.errors import AccessViolation, FileNotFound
 from twisted.application.service import Service
 from twisted.internet import reactor
-from twisted.internet.defer import fail, inlineCallbacks, succeed
+from twisted.internet.defer import Deferred, fail, inlineCallbacks, succeed
 from twisted.web.http_headers import Headers
 from twisted.web.server import NOT_DONE_YET, Request
 from twisted.web.test.test_web import DummyChannel, DummyRequest
@@ -179,6 +179,43 @@ class TestRackHTTPService(MAASTestCase):
         self.assertEqual(service.INTERVAL_HIGH, service.step)
         self.assertEqual(service.INTERVAL_HIGH, service._loop.interval)
 
+    @inlineCallbacks
+    def test_connection_changes_update_configuration(self):
+        rpc_service, protocol = yield prepareRegion(self)
+        service = http.RackHTTPService(self.make_dir(), rpc_service, reactor)
+        tryUpdate = self.patch(service, "_tryUpdate")
+        tryUpdate.return_value = succeed(None)
+        yield service.startService()
+        self.addCleanup((yield service.stopService))
+        tryUpdate.reset_mock()
+
+        rpc_service.events.connected.fire("eventloop")
+        rpc_service.events.disconnected.fire("eventloop")
+
+        self.assertEqual(2, tryUpdate.call_count)
+
+    @inlineCallbacks
+    def test_connection_changes_coalesce_updates_in_progress(self):
+        rpc_service, protocol = yield prepareRegion(self)
+        service = http.RackHTTPService(self.make_dir(), rpc_service, reactor)
+        tryUpdate = self.patch(service, "_tryUpdate")
+        tryUpdate.return_value = succeed(None)
+        yield service.startService()
+        self.addCleanup((yield service.stopService))
+        tryUpdate.reset_mock()
+        updates = [Deferred(), Deferred()]
+        tryUpdate.side_effect = updates
+
+        rpc_service.events.connected.fire("eventloop-1")
+        rpc_service.events.connected.fire("eventloop-2")
+        rpc_service.events.disconnected.fire("eventloop-1")
+        self.assertEqual(1, tryUpdate.call_count)
+        updates[0].callback(None)
+        self.assertEqual(2, tryUpdate.call_count)
+        updates[1].callback(None)
+        self.assertEqual(2, tryUpdate.call_count)
+        self.assertIsNone(service._updating)
+
     def test_genRegionIps_groups_by_region(self):
         mock_rpc = Mock()
         mock_rpc.connections = {}
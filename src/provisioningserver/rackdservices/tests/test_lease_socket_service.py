@@ -9,15 +9,17 @@ import json
 import os
 import socket
 import time
-from unittest.mock import MagicMock, sentinel
+from unittest.mock import ANY, MagicMock, sentinel
 
 from twisted.application.service import Service
 from twisted.internet import defer, reactor
 from twisted.internet.protocol import DatagramProtocol
+from twisted.internet.task import Clock
 
 from maastesting import get_testing_timeout
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
+from maastesting.twisted import TwistedLoggerFixture
 from provisioningserver.rackdservices import lease_socket_service
 from provisioningserver.rackdservices.lease_socket_service import (
     LeaseSocketService,
@@ -47,6 +49,9 @@ class TestLeaseSocketService(MAASTestCase):
         self.patch(lease_socket_service, "get_socket_path").return_value = (
             socket_path
         )
+        self.patch(lease_socket_service, "get_spool_path").return_value = (
+            os.path.join(path, "dhcpd-leases.spool")
+        )
         return socket_path
 
     def patch_rpc_UpdateLeases(self):
@@ -71,6 +76,9 @@ class TestLeaseSocketService(MAASTestCase):
             "hostname": factory.make_name("host"),
         }
 
+    def send_datagram(self, service, payload):
+        service.datagramReceived(json.dumps(payload).encode("utf-8"), None)
+
     def test_init(self):
         socket_path = self.patch_socket_path()
         service = LeaseSocketService(sentinel.service, sentinel.reactor)
@@ -191,3 +199,159 @@ class TestLeaseSocketService(MAASTestCase):
 
         yield service.processNotifications(clock=reactor)
         service.processNotification.assert_not_called()
+
+    def test_takeBatch_coalesces_notifications_for_same_ip(self):
+        self.patch_socket_path()
+        service = LeaseSocketService(sentinel.service, reactor)
+        ip = factory.make_ipv4_address()
+        packet1 = self.create_lease_notification(ip=ip)
+        packet2 = self.create_lease_notification()
+        packet3 = self.create_lease_notification(ip=ip)
+        service.notifications.extend([packet1, packet2, packet3])
+
+        self.assertEqual([packet3, packet2], service.takeBatch())
+        self.assertEqual([], list(service.notifications))
+
+    def test_takeBatch_leaves_in_flight_ips_queued_in_order(self):
+        self.patch_socket_path()
+        service = LeaseSocketService(sentinel.service, reactor)
+        ip = factory.make_ipv4_address()
+        packet1 = self.create_lease_notification(ip=ip)
+        packet2 = self.create_lease_notification()
+        packet3 = self.create_lease_notification(ip=ip)
+        service.notifications.extend([packet1, packet2, packet3])
+        service.in_flight_ips.add(ip)
+
+        self.assertEqual([packet2], service.takeBatch())
+        self.assertEqual([packet1, packet3], list(service.notifications))
+
+    def test_processNotifications_sends_concurrent_batches(self):
+        self.patch_socket_path()
+        self.patch(lease_socket_service, "MAX_LEASE_NOTIFICATION", 1)
+        service = LeaseSocketService(sentinel.service, reactor)
+        calls = []
+
+        def processNotification(notification, clock):
+            d = defer.Deferred()
+            calls.append((notification, d))
+            return d
+
+        service.processNotification = processNotification
+        packets = [
+            self.create_lease_notification()
+            for _ in range(lease_socket_service.MAX_BATCHES_IN_FLIGHT + 1)
+        ]
+        service.notifications.extend(packets)
+
+        service.processNotifications(clock=Clock())
+        self.assertEqual(
+            [{"updates": [packet]} for packet in packets[:-1]],
+            [notification for notification, _ in calls],
+        )
+        self.assertEqual(packets[-1:], list(service.notifications))
+
+        calls[0][1].callback(None)
+        service.processNotifications(clock=Clock())
+        self.assertEqual({"updates": packets[-1:]}, calls[-1][0])
+        self.assertEqual(
+            lease_socket_service.MAX_BATCHES_IN_FLIGHT, len(service.in_flight)
+        )
+
+    def test_processNotifications_waits_for_previous_update_of_ip(self):
+        self.patch_socket_path()
+        service = LeaseSocketService(sentinel.service, reactor)
+        pending = defer.Deferred()
+        service.processNotification = MagicMock(return_value=pending)
+        ip = factory.make_ipv4_address()
+        packet1 = self.create_lease_notification(ip=ip)
+        packet2 = self.create_lease_notification(ip=ip)
+
+        service.notifications.append(packet1)
+        service.processNotifications(clock=Clock())
+        service.notifications.append(packet2)
+        service.processNotifications(clock=Clock())
+        service.processNotification.assert_called_once_with(
+            {"updates": [packet1]}, clock=ANY
+        )
+
+        service.processNotification.return_value = defer.succeed(None)
+        pending.callback(None)
+        service.processNotifications(clock=Clock())
+        service.processNotification.assert_called_with(
+            {"updates": [packet2]}, clock=ANY
+        )
+        self.assertEqual(set(), service.in_flight_ips)
+
+    def test_processNotifications_logs_failed_batches(self):
+        self.patch_socket_path()
+        service = LeaseSocketService(sentinel.service, reactor)
+        service.processNotification = MagicMock(
+            return_value=defer.fail(ZeroDivisionError())
+        )
+        service.notifications.append(self.create_lease_notification())
+
+        with TwistedLoggerFixture() as logger:
+            service.processNotifications(clock=Clock())
+
+        self.assertIn("Failed to send DHCP lease information.", logger.output)
+        self.assertEqual(set(), service.in_flight)
+
+    def test_datagramReceived_spools_when_queue_is_full(self):
+        self.patch_socket_path()
+        self.patch(lease_socket_service, "MAX_QUEUED_NOTIFICATIONS", 2)
+        service = LeaseSocketService(sentinel.service, reactor)
+        packets = [self.create_lease_notification() for _ in range(4)]
+        for packet in packets:
+            self.send_datagram(service, packet)
+
+        self.assertEqual(packets[:2], list(service.notifications))
+        self.assertEqual(2, service.spooled)
+        self.assertTrue(os.path.exists(service.spool_path))
+
+        service.notifications.popleft()
+        service.unspool()
+        self.assertEqual(packets[1:3], list(service.notifications))
+        self.assertEqual(1, service.spooled)
+
+        service.notifications.clear()
+        service.unspool()
+        self.assertEqual(packets[3:], list(service.notifications))
+        self.assertEqual(0, service.spooled)
+        self.assertFalse(os.path.exists(service.spool_path))
+
+    def test_saveSpool_keeps_notifications_across_restarts(self):
+        self.patch_socket_path()
+        self.patch(lease_socket_service, "MAX_QUEUED_NOTIFICATIONS", 2)
+        service = LeaseSocketService(sentinel.service, reactor)
+        packets = [self.create_lease_notification() for _ in range(5)]
+        for packet in packets:
+            self.send_datagram(service, packet)
+        service.notifications.popleft()
+        service.unspool()
+        service.saveSpool()
+        self.assertEqual([], list(service.notifications))
+
+        restarted = LeaseSocketService(sentinel.service, reactor)
+        restarted.loadSpool()
+        self.assertEqual(4, restarted.spooled)
+        restarted.unspool()
+        restarted.notifications.clear()
+        restarted.unspool()
+        restarted.unspool()
+        self.assertEqual(packets[3:], list(restarted.notifications))
+
+    @defer.inlineCallbacks
+    def test_stopService_saves_pending_notifications(self):
+        self.patch_socket_path()
+        service = LeaseSocketService(sentinel.service, reactor)
+        service.startService()
+        packet = self.create_lease_notification()
+        service.notifications.append(packet)
+        service.processor.stop()
+        service.processor = MagicMock()
+        yield service.stopService()
+
+        with open(service.spool_path, "rb") as spool:
+            self.assertEqual(
+                [packet], [json.loads(line) for line in spool.readlines()]
+            )
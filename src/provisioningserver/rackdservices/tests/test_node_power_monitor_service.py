@@ -5,10 +5,10 @@
 :py:module:`~provisioningserver.rackdservices.node_power_monitor_service`."""
 
 
-from unittest.mock import ANY, Mock, sentinel
+from unittest.mock import ANY, call, Mock, sentinel
 
 from fixtures import FakeLogger
-from twisted.internet.defer import fail, succeed
+from twisted.internet.defer import Deferred, fail, succeed
 from twisted.internet.error import ConnectionDone
 from twisted.internet.task import Clock
 
@@ -67,10 +67,42 @@ class TestNodePowerMonitorService(MAASTestCase):
             ANY, uuid=client.localIdent
         )
 
-    def test_query_nodes_calls_query_all_nodes(self):
+    def test_query_nodes_calls_the_scheduler(self):
         service = self.make_monitor_service()
-        service.max_nodes_at_once = sentinel.max_nodes_at_once
 
+        def make_power_parameters():
+            return {
+                "system_id": factory.make_UUID(),
+                "hostname": factory.make_hostname(),
+                "power_state": factory.make_name("power_state"),
+                "power_type": factory.make_name("power_type"),
+                "context": {},
+            }
+
+        page1 = [make_power_parameters()]
+        page2 = [make_power_parameters()]
+
+        rpc_fixture = self.useFixture(MockClusterToRegionRPCFixture())
+        proto_region, io = rpc_fixture.makeEventLoop(
+            region.ListNodePowerParameters
+        )
+        proto_region.ListNodePowerParameters.side_effect = [
+            succeed({"nodes": page1}),
+            succeed({"nodes": page2}),
+            succeed({"nodes": []}),
+        ]
+
+        query_nodes = self.patch(service.scheduler, "query_nodes")
+        query_nodes.return_value = succeed(None)
+
+        d = service.query_nodes(getRegionClient())
+        io.flush()
+
+        self.assertIsNone(extract_result(d))
+        query_nodes.assert_has_calls([call(page1), call(page2)])
+
+    def test_query_nodes_waits_for_all_pages_to_be_queried(self):
+        service = self.make_monitor_service()
         example_power_parameters = {
             "system_id": factory.make_UUID(),
             "hostname": factory.make_hostname(),
@@ -88,17 +120,15 @@ class TestNodePowerMonitorService(MAASTestCase):
             succeed({"nodes": []}),
         ]
 
-        query_all_nodes = self.patch(npms, "query_all_nodes")
+        query = Deferred()
+        self.patch(service.scheduler, "query_nodes").return_value = query
 
         d = service.query_nodes(getRegionClient())
         io.flush()
 
+        self.assertFalse(d.called)
+        query.callback(None)
         self.assertIsNone(extract_result(d))
-        query_all_nodes.assert_called_once_with(
-            [example_power_parameters],
-            max_concurrency=sentinel.max_nodes_at_once,
-            clock=service.clock,
-        )
 
     def test_query_nodes_copes_with_NoSuchCluster(self):
         service = self.make_monitor_service()
@@ -25,7 +25,7 @@ from twisted.application import internet
 from twisted.application.service import MultiService
 from twisted.internet import reactor
 from twisted.internet.address import IPv4Address, IPv6Address
-from twisted.internet.defer import fail, inlineCallbacks, succeed
+from twisted.internet.defer import Deferred, fail, inlineCallbacks, succeed
 from twisted.internet.protocol import Protocol
 from twisted.internet.task import Clock
 from twisted.python import context
@@ -34,7 +34,7 @@ from zope.interface.verify import verifyObject
 from maastesting import get_testing_timeout
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
-from maastesting.twisted import TwistedLoggerFixture
+from maastesting.twisted import extract_result, TwistedLoggerFixture
 from provisioningserver import boot
 from provisioningserver.boot import BytesReader
 from provisioningserver.boot.pxe import PXEBootMethod
@@ -47,6 +47,7 @@ from provisioningserver.rackdservices.tftp import (
     log_request,
     Port,
     TFTPBackend,
+    TFTPFileCache,
     TFTPService,
     track_tftp_latency,
     TransferTimeTrackingTFTP,
@@ -706,6 +707,107 @@ class TestTFTPBackend(MAASTestCase):
         result = yield backend.get_cache_reader(f"/grub/{filename}")
         self.assertEqual(result.read(0), b"")
 
+    @inlineCallbacks
+    def test_get_cache_reader_serves_repeated_requests_from_memory(self):
+        backend = TFTPBackend(self.make_dir(), Mock())
+        backend._cache_proxy = Mock()
+        backend._cache_proxy.request.return_value = Mock(code=200)
+        self.patch(tftp_module, "readBody").return_value = succeed(b"grub")
+
+        yield backend.get_cache_reader("/grub/grubx64.efi")
+        reader = yield backend.get_cache_reader("/grub/grubx64.efi")
+
+        self.assertEqual(b"grub", reader.read(10))
+        backend._cache_proxy.request.assert_called_once()
+
+
+class TestTFTPFileCache(MAASTestCase):
+    def setUp(self):
+        super().setUp()
+        self.clock = Clock()
+        self.prometheus_metrics = create_metrics(
+            METRICS_DEFINITIONS, registry=prometheus_client.CollectorRegistry()
+        )
+
+    def make_cache(self, **kwargs):
+        return TFTPFileCache(
+            clock=self.clock,
+            prometheus_metrics=self.prometheus_metrics,
+            **kwargs,
+        )
+
+    def test_get_fetches_file_once(self):
+        cache = self.make_cache()
+        fetch = Mock(return_value=b"data")
+        cache.get(b"file", fetch)
+        d = cache.get(b"file", fetch)
+        self.assertEqual(b"data", extract_result(d))
+        fetch.assert_called_once_with()
+
+    def test_get_shares_pending_fetch(self):
+        cache = self.make_cache()
+        fetched = Deferred()
+        fetch = Mock(return_value=fetched)
+        d1 = cache.get(b"file", fetch)
+        d2 = cache.get(b"file", fetch)
+        fetched.callback(b"data")
+        self.assertEqual(b"data", extract_result(d1))
+        self.assertEqual(b"data", extract_result(d2))
+        fetch.assert_called_once_with()
+
+    def test_get_propagates_failure_without_caching(self):
+        cache = self.make_cache()
+        fetched = Deferred()
+        d1 = cache.get(b"file", lambda: fetched)
+        d2 = cache.get(b"file", Mock())
+        fetched.errback(FileNotFound(b"file"))
+        self.assertRaises(FileNotFound, extract_result, d1)
+        self.assertRaises(FileNotFound, extract_result, d2)
+        self.assertEqual(
+            b"data", extract_result(cache.get(b"file", lambda: b"data"))
+        )
+
+    def test_get_doesnt_keep_large_files(self):
+        cache = self.make_cache(max_file_size=3)
+        fetch = Mock(return_value=b"data")
+        cache.get(b"file", fetch)
+        cache.get(b"file", fetch)
+        self.assertEqual(2, fetch.call_count)
+        self.assertEqual(0, cache.size)
+
+    def test_get_evicts_least_recently_used_files(self):
+        cache = self.make_cache(max_size=8)
+        cache.get(b"first", lambda: b"1111")
+        cache.get(b"second", lambda: b"2222")
+        cache.get(b"first", Mock())
+        cache.get(b"third", lambda: b"3333")
+        fetch = Mock(return_value=b"2222")
+        cache.get(b"second", fetch)
+        fetch.assert_called_once_with()
+        self.assertEqual(8, cache.size)
+
+    def test_get_fetches_expired_files_again(self):
+        cache = self.make_cache(ttl=10)
+        cache.get(b"file", lambda: b"old")
+        self.clock.advance(10)
+        d = cache.get(b"file", lambda: b"new")
+        self.assertEqual(b"new", extract_result(d))
+        self.assertEqual(3, cache.size)
+
+    def test_get_records_metrics(self):
+        cache = self.make_cache()
+        cache.get(b"file", lambda: b"data")
+        cache.get(b"file", Mock())
+        metrics = self.prometheus_metrics.generate_latest().decode("ascii")
+        self.assertIn(
+            'maas_tftp_cache_requests_total{result="hit"} 1.0', metrics
+        )
+        self.assertIn(
+            'maas_tftp_cache_requests_total{result="miss"} 1.0', metrics
+        )
+        self.assertIn("maas_tftp_file_bytes_served_total 8.0", metrics)
+        self.assertIn("maas_tftp_cache_size 4.0", metrics)
+
 
 class TestTFTPService(MAASTestCase):
     def test_tftp_service(self):
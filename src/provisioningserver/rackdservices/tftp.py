@@ -4,6 +4,7 @@
 """Twisted Application Plugin for the MAAS TFTP server."""
 
 
+from collections import OrderedDict
 from functools import partial
 from socket import AF_INET, AF_INET6
 from time import time
@@ -18,12 +19,14 @@ from twisted.internet import reactor, udp
 from twisted.internet.abstract import isIPv6Address
 from twisted.internet.address import IPv4Address, IPv6Address
 from twisted.internet.defer import (
+    Deferred,
     inlineCallbacks,
     maybeDeferred,
     returnValue,
     succeed,
 )
 from twisted.internet.task import deferLater
+from twisted.python.failure import Failure
 from twisted.python.filepath import FilePath
 from twisted.web.client import Agent, readBody
 
@@ -44,6 +47,13 @@ from provisioningserver.utils.twisted import deferred, RPCFetcher
 maaslog = get_maas_logger("tftp")
 log = LegacyLogger()
 
+# Files fetched from the image cache up to this size are kept in memory.
+TFTP_CACHE_MAX_FILE_SIZE = 8 * 1024 * 1024
+# Total size of the files kept in memory.
+TFTP_CACHE_MAX_SIZE = 64 * 1024 * 1024
+# Seconds a file is kept in memory, so updated boot resources are picked up.
+TFTP_CACHE_TTL = 60
+
 
 def log_request(file_name, clock=reactor):
     """Log a TFTP request.
@@ -75,6 +85,100 @@ def log_request(file_name, clock=reactor):
     d.addErrback(log.err, "Logging TFTP request failed.")
 
 
+class TFTPFileCache:
+    """Size-bounded in-memory cache of files fetched from the image cache.
+
+    When many machines boot at once they all request the same bootloader
+    files. Concurrent requests for a file share a single fetch, and files
+    up to `max_file_size` are kept for `ttl` seconds, evicting the least
+    recently used ones beyond `max_size`. All the clients are served from
+    the same immutable copy of the content.
+    """
+
+    def __init__(
+        self,
+        max_size=TFTP_CACHE_MAX_SIZE,
+        max_file_size=TFTP_CACHE_MAX_FILE_SIZE,
+        ttl=TFTP_CACHE_TTL,
+        clock=reactor,
+        prometheus_metrics=PROMETHEUS_METRICS,
+    ):
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.ttl = ttl
+        self.clock = clock
+        self.prometheus_metrics = prometheus_metrics
+        self.size = 0
+        self._files = OrderedDict()
+        self._pending = {}
+
+    def get(self, file_name: bytes, fetch):
+        """Return the content of `file_name`.
+
+        :param fetch: Callable returning the content of the file, or a
+            `Deferred` firing with it, called when it's not cached.
+        :return: A `Deferred` firing with the content of the file.
+        """
+        cached = self._files.get(file_name)
+        if cached is not None:
+            expires, data = cached
+            if expires > self.clock.seconds():
+                self._files.move_to_end(file_name)
+                return succeed(self._served(data, "hit"))
+            self._forget(file_name)
+
+        waiting = self._pending.get(file_name)
+        if waiting is not None:
+            d = Deferred()
+            waiting.append(d)
+            return d.addCallback(self._served, "hit")
+
+        waiting = self._pending[file_name] = []
+
+        def fetched(result):
+            del self._pending[file_name]
+            if isinstance(result, Failure):
+                for d in waiting:
+                    d.errback(result)
+            else:
+                self._store(file_name, result)
+                for d in waiting:
+                    d.callback(result)
+            return result
+
+        d = maybeDeferred(fetch)
+        d.addBoth(fetched)
+        return d.addCallback(self._served, "miss")
+
+    def _served(self, data: bytes, result: str) -> bytes:
+        self.prometheus_metrics.update(
+            "maas_tftp_cache_requests", "inc", labels={"result": result}
+        )
+        self.prometheus_metrics.update(
+            "maas_tftp_file_bytes_served", "inc", value=len(data)
+        )
+        return data
+
+    def _store(self, file_name: bytes, data: bytes):
+        if len(data) > self.max_file_size:
+            return
+        self._files[file_name] = (self.clock.seconds() + self.ttl, data)
+        self.size += len(data)
+        while self.size > self.max_size:
+            self._forget(next(iter(self._files)))
+        self._update_size_metric()
+
+    def _forget(self, file_name: bytes):
+        _, data = self._files.pop(file_name)
+        self.size -= len(data)
+        self._update_size_metric()
+
+    def _update_size_metric(self):
+        self.prometheus_metrics.update(
+            "maas_tftp_cache_size", "set", value=self.size
+        )
+
+
 class TFTPBackend(FilesystemSynchronousBackend):
     """A partially dynamic read-only TFTP server.
 
@@ -107,6 +211,7 @@ class TFTPBackend(FilesystemSynchronousBackend):
         self.client_to_remote = {}
         self.client_service = client_service
         self.fetcher = RPCFetcher()
+        self.file_cache = TFTPFileCache()
         self._cache_proxy = Agent(reactor)
 
     def _get_new_client_for_remote(self, remote_ip):
@@ -310,6 +415,13 @@ class TFTPBackend(FilesystemSynchronousBackend):
     def get_cache_reader(self, file_name: str | bytes):
         if isinstance(file_name, str):
             file_name = file_name.encode("utf-8")
+        body = yield self.file_cache.get(
+            file_name, partial(self._fetch_from_cache, file_name)
+        )
+        return BytesReader(body)
+
+    @inlineCallbacks
+    def _fetch_from_cache(self, file_name: bytes):
         url = b"/".join(
             [b"http://localhost:5248/images", file_name.strip(b"/")]
         )
@@ -324,10 +436,10 @@ class TFTPBackend(FilesystemSynchronousBackend):
             # - terminal.lst
             # Are expected to be 0-sized with no error.
             if ".lst" in str(file_name, encoding="utf-8"):
-                return BytesReader(bytes())
+                return b""
             raise FileNotFound(file_name)
         body = yield readBody(resp)
-        return BytesReader(body)
+        return body
 
     @staticmethod
     def no_response_errback(failure, file_name):
@@ -553,3 +553,19 @@ class CheckIPs(amp.Command):
         )
     ]
     errors = {}
+
+
+class ExternalServicesConfigurationChanged(amp.Command):
+    """Notify that the configuration of the external services changed.
+
+    Sent by the region controller managing the rack controller, so that it
+    fetches the configuration of its external services (NTP, DNS, proxy and
+    syslog) as soon as `version` differs from the one it last applied,
+    rather than waiting for its next periodic check.
+
+    :since: 3.6
+    """
+
+    arguments = [(b"version", amp.Integer())]
+    response = []
+    errors = {}
@@ -78,6 +78,7 @@ from provisioningserver.utils.env import (
     MAAS_SHARED_SECRET,
     MAAS_UUID,
 )
+from provisioningserver.utils.events import EventGroup
 from provisioningserver.utils.fs import get_maas_common_command, NamedLock
 from provisioningserver.utils.network import (
     convert_host_to_uri_str,
@@ -773,6 +774,16 @@ class ClusterClient(Cluster):
         """The ident of the remote event-loop."""
         return self.eventloop
 
+    @cluster.ExternalServicesConfigurationChanged.responder
+    def external_services_configuration_changed(self, version):
+        """external_services_configuration_changed()
+
+        Implementation of
+        :py:class:`~provisioningserver.rpc.cluster.ExternalServicesConfigurationChanged`.
+        """
+        self.service.events.configurationChanged.fire(version)
+        return {}
+
     @inlineCallbacks
     def authenticateRegion(self):
         """Authenticate the region."""
@@ -954,6 +965,9 @@ class ClusterClientService(TimerService):
         instances connected to it.
     :ivar time_started: Records the time that `startService` was last called,
         or `None` if it hasn't yet.
+    :ivar events: Fired when a connection to a region is added or removed,
+        and when a region announces a new version of the configuration of
+        the external services.
     """
 
     INTERVAL_LOW = 1  # seconds.
@@ -987,6 +1001,10 @@ class ClusterClientService(TimerService):
         self._updateInProgress = DeferredValue()
         self._updateInProgress.set(None)
 
+        self.events = EventGroup(
+            "connected", "disconnected", "configurationChanged"
+        )
+
     def startService(self):
         self.time_started = self.clock.seconds()
         super().startService()
@@ -1547,6 +1565,7 @@ class ClusterClientService(TimerService):
         """
         yield self.connections.add_connection(eventloop, connection)
         self._update_saved_rpc_info_state()
+        self.events.connected.fire(eventloop)
 
     def remove_connection(self, eventloop, connection):
         """Remove the connection from the tracked connections.
@@ -1555,6 +1574,7 @@ class ClusterClientService(TimerService):
         a regiond then dhcpd and dhcpd6 services will be turned off.
         """
         self.connections.remove_connection(eventloop, connection)
+        self.events.disconnected.fire(eventloop)
         # Disable DHCP when no connections to a region controller.
         if len(self.connections) == 0:
             stopping_services = []
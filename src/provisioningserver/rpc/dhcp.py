@@ -20,7 +20,7 @@ from twisted.internet.threads import deferToThread
 
 from provisioningserver.dhcp import DHCPv4Server, DHCPv6Server
 from provisioningserver.dhcp.config import get_config
-from provisioningserver.dhcp.omapi import OmapiClient, OmapiError
+from provisioningserver.dhcp.omapi import OmapiClient
 from provisioningserver.logger import get_maas_logger, LegacyLogger
 from provisioningserver.rpc.exceptions import (
     CannotConfigureDHCP,
@@ -201,23 +201,48 @@ def _delete_config(server):
 
 @synchronous
 def _update_hosts(server, remove, add, modify):
-    """Update the hosts using the OMAPI."""
+    """Update the hosts using the OMAPI.
+
+    Each kind of update is pipelined over a single OMAPI connection. A host
+    that fails to update does not stop the others; the failures are logged
+    and raised together once every host was processed.
+    """
     omapi_client = OmapiClient(server.omapi_key, server.ipv6)
     try:
-        for host in remove:
-            omapi_client.del_host(host["mac"])
-    except OmapiError as e:
-        raise CannotRemoveHostMap(str(e))
-    try:
-        for host in add:
-            omapi_client.add_host(host["mac"], host["ip"])
-    except OmapiError as e:
-        raise CannotCreateHostMap(str(e))
-    try:
-        for host in modify:
-            omapi_client.update_host(host["mac"], host["ip"])
-    except OmapiError as e:
-        raise CannotModifyHostMap(str(e))
+        results = [
+            (
+                "remove",
+                CannotRemoveHostMap,
+                omapi_client.del_hosts([host["mac"] for host in remove]),
+            ),
+            (
+                "create",
+                CannotCreateHostMap,
+                omapi_client.add_hosts(
+                    [(host["mac"], host["ip"]) for host in add]
+                ),
+            ),
+            (
+                "modify",
+                CannotModifyHostMap,
+                omapi_client.update_hosts(
+                    [(host["mac"], host["ip"]) for host in modify]
+                ),
+            ),
+        ]
+    finally:
+        omapi_client.close()
+    for action, _, failures in results:
+        for mac, error in failures.items():
+            maaslog.error(
+                "Failed to %s host map for %s on %s: %s"
+                % (action, mac, server.descriptive_name, error)
+            )
+    for _, exception, failures in results:
+        if failures:
+            raise exception(
+                "; ".join(f"{mac}: {error}" for mac, error in failures.items())
+            )
 
 
 @asynchronous
@@ -3,26 +3,33 @@
 
 """Power control."""
 
+from collections import defaultdict
 from functools import partial
+import json
 import sys
 
 from twisted.internet import reactor
 from twisted.internet.defer import (
+    Deferred,
     DeferredList,
     DeferredSemaphore,
+    fail,
     inlineCallbacks,
     returnValue,
     succeed,
 )
+from twisted.internet.error import ConnectError, TimeoutError
+from twisted.python.failure import Failure
 
-from provisioningserver.drivers.power import PowerError
+from provisioningserver.drivers.power import PowerConnError, PowerError
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
 from provisioningserver.events import EVENT_TYPES, send_node_event
 from provisioningserver.logger import get_maas_logger, LegacyLogger
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.rpc import getRegionClient
 from provisioningserver.rpc.exceptions import NoSuchNode, PowerActionFail
 from provisioningserver.rpc.region import UpdateNodePowerState
-from provisioningserver.utils.twisted import asynchronous
+from provisioningserver.utils.twisted import asynchronous, IAsynchronous
 
 maaslog = get_maas_logger("power")
 log = LegacyLogger()
@@ -184,10 +191,20 @@ def maaslog_report_failure(node, failure):
         # log.err(failure, "Failed to refresh power state.")
 
 
-def query_node(node, clock):
-    """Calls `get_power_state` on the given node.
+def report_node_power_state(d, node):
+    """Report and log the result of a power query for `node`."""
+    d = report_power_state(d, node["system_id"], node["hostname"])
+    d.addCallbacks(
+        partial(maaslog_report_success, node),
+        partial(maaslog_report_failure, node),
+    )
+    return d
 
-    Logs to maaslog as errors and power states change.
+
+def power_action_in_progress(node):
+    """Return whether a power action is in progress for `node`.
+
+    Logs that the node is skipped if that's the case.
     """
     if node["system_id"] in power_action_registry:
         log.debug(
@@ -195,6 +212,16 @@ def query_node(node, clock):
             "power action already in progress.",
             hostname=node["hostname"],
         )
+        return True
+    return False
+
+
+def query_node(node, clock):
+    """Calls `get_power_state` on the given node.
+
+    Logs to maaslog as errors and power states change.
+    """
+    if power_action_in_progress(node):
         return succeed(None)
     else:
         d = get_power_state(
@@ -204,12 +231,7 @@ def query_node(node, clock):
             node["context"],
             clock=clock,
         )
-        d = report_power_state(d, node["system_id"], node["hostname"])
-        d.addCallbacks(
-            partial(maaslog_report_success, node),
-            partial(maaslog_report_failure, node),
-        )
-        return d
+        return report_node_power_state(d, node)
 
 
 def query_all_nodes(nodes, max_concurrency=5, clock=reactor):
@@ -227,3 +249,203 @@ def query_all_nodes(nodes, max_concurrency=5, clock=reactor):
         if node["power_type"] in PowerDriverRegistry
     )
     return DeferredList(queries, consumeErrors=True)
+
+
+class PowerQueryScheduler:
+    """Schedule the power queries for the nodes of a rack controller.
+
+    The number of concurrent queries is limited per power type. Drivers that
+    query the BMC from a thread (e.g. IPMI, which spawns `ipmipower`) are
+    limited to `threaded_concurrency`, while asynchronous drivers (e.g.
+    Redfish, which talks HTTP) are limited to `asynchronous_concurrency`.
+
+    Nodes behind the same BMC (e.g. machines in a chassis or VM host) are
+    queried at most `bmc_concurrency` at a time, and nodes with identical
+    power parameters are queried only once, reporting the same state for all
+    of them. Nodes with a power action in progress when their query is about
+    to run are skipped.
+
+    A BMC that can't be reached is skipped for `backoff` seconds, doubling
+    after each consecutive failure up to `max_backoff` seconds.
+    """
+
+    threaded_concurrency = 10
+    asynchronous_concurrency = 50
+    bmc_concurrency = 4
+    backoff = 30
+    max_backoff = 15 * 60
+
+    def __init__(self, clock=None):
+        self.clock = reactor if clock is None else clock
+        self._semaphores = {}
+        # BMC key -> semaphore limiting the concurrent queries to the BMC.
+        self._bmc_semaphores = {}
+        # Number of queries waiting for a slot, per power type.
+        self._queued = defaultdict(int)
+        # BMC key -> (consecutive failures, time until which it's skipped).
+        self._backoffs = {}
+
+    def query_nodes(self, nodes):
+        """Query the power state of `nodes`, reporting it to the region.
+
+        :return: A `DeferredList`, which fires once all the nodes have been
+            queried, successfully or not.
+        """
+        bmcs = defaultdict(lambda: defaultdict(list))
+        for node in nodes:
+            if node["power_type"] not in PowerDriverRegistry:
+                continue
+            if power_action_in_progress(node):
+                continue
+            bmcs[self._get_bmc_key(node)][self._get_query_key(node)].append(
+                (node, Deferred())
+            )
+
+        results = []
+        for bmc_key, queries in bmcs.items():
+            for query in queries.values():
+                semaphore = self._get_bmc_semaphore(bmc_key)
+                d = semaphore.run(self._query_bmc, bmc_key, query)
+                d.addBoth(self._discard_bmc_semaphore, bmc_key, semaphore)
+                d.addErrback(log.err, "Querying the power state of a BMC.")
+                results.extend(d for _, d in query)
+        return DeferredList(results, consumeErrors=True)
+
+    def is_backing_off(self, bmc_key):
+        backoff = self._backoffs.get(bmc_key)
+        return backoff is not None and backoff[1] > self.clock.seconds()
+
+    def _get_bmc_key(self, node):
+        """Return a key identifying the BMC of `node`.
+
+        The address extracted by the driver's IP extractor is used. If the
+        driver doesn't define one, each set of power parameters is considered
+        a different BMC.
+        """
+        driver = PowerDriverRegistry[node["power_type"]]
+        ip_extractor = driver.ip_extractor
+        if ip_extractor:
+            address = node["context"].get(ip_extractor["field_name"])
+            if address:
+                return node["power_type"], address
+        return self._get_query_key(node)
+
+    def _get_query_key(self, node):
+        return node["power_type"], json.dumps(node["context"], sort_keys=True)
+
+    def _get_semaphore(self, power_type):
+        semaphore = self._semaphores.get(power_type)
+        if semaphore is None:
+            driver = PowerDriverRegistry[power_type]
+            if IAsynchronous.providedBy(driver.power_query):
+                tokens = self.asynchronous_concurrency
+            else:
+                tokens = self.threaded_concurrency
+            semaphore = self._semaphores[power_type] = DeferredSemaphore(
+                tokens
+            )
+        return semaphore
+
+    def _get_bmc_semaphore(self, bmc_key):
+        semaphore = self._bmc_semaphores.get(bmc_key)
+        if semaphore is None:
+            semaphore = self._bmc_semaphores[bmc_key] = DeferredSemaphore(
+                self.bmc_concurrency
+            )
+        return semaphore
+
+    def _discard_bmc_semaphore(self, result, bmc_key, semaphore):
+        """Forget the semaphore of an idle BMC, so they don't accumulate."""
+        if (
+            semaphore.tokens == semaphore.limit
+            and not semaphore.waiting
+            and self._bmc_semaphores.get(bmc_key) is semaphore
+        ):
+            del self._bmc_semaphores[bmc_key]
+        return result
+
+    def _update_queue_depth(self, power_type, delta):
+        self._queued[power_type] += delta
+        PROMETHEUS_METRICS.update(
+            "maas_rack_power_query_queue_depth",
+            "set",
+            value=self._queued[power_type],
+            labels={"power_type": power_type},
+        )
+
+    @inlineCallbacks
+    def _query_bmc(self, bmc_key, query):
+        """Run the `query` for the BMC.
+
+        The query is a list of (node, Deferred) tuples for the nodes sharing
+        the same power parameters. The Deferreds fire once the result has been
+        reported for the node, or once the node has been skipped.
+        """
+        if self._skip_if_backing_off(bmc_key, query):
+            return
+        node = query[0][0]
+        power_type = node["power_type"]
+        semaphore = self._get_semaphore(power_type)
+        self._update_queue_depth(power_type, 1)
+        yield semaphore.acquire()
+        self._update_queue_depth(power_type, -1)
+        try:
+            # Another query to the BMC may have failed, or a power action may
+            # have started, while the query was waiting.
+            if self._skip_if_backing_off(bmc_key, query):
+                return
+            pending = []
+            for node, d in query:
+                if power_action_in_progress(node):
+                    d.callback(None)
+                else:
+                    pending.append((node, d))
+            if len(pending) == 0:
+                return
+            node = pending[0][0]
+            try:
+                result = yield get_power_state(
+                    node["system_id"],
+                    node["hostname"],
+                    power_type,
+                    node["context"],
+                    clock=self.clock,
+                )
+            except Exception:
+                result = Failure()
+        finally:
+            semaphore.release()
+
+        self._record_result(bmc_key, result)
+        for node, d in pending:
+            if isinstance(result, Failure):
+                report = report_node_power_state(fail(result), node)
+            else:
+                report = report_node_power_state(succeed(result), node)
+            report.chainDeferred(d)
+
+    def _skip_if_backing_off(self, bmc_key, query):
+        """Skip the nodes of `query` if the BMC is backing off.
+
+        :return: Whether the nodes were skipped.
+        """
+        if not self.is_backing_off(bmc_key):
+            return False
+        for node, d in query:
+            log.debug(
+                "{hostname}: Skipping query power status, "
+                "BMC is not responding.",
+                hostname=node["hostname"],
+            )
+            d.callback(None)
+        return True
+
+    def _record_result(self, bmc_key, result):
+        if isinstance(result, Failure) and result.check(
+            PowerConnError, ConnectError, TimeoutError
+        ):
+            failures = self._backoffs.get(bmc_key, (0, 0))[0] + 1
+            delay = min(self.backoff * 2 ** (failures - 1), self.max_backoff)
+            self._backoffs[bmc_key] = (failures, self.clock.seconds() + delay)
+        else:
+            self._backoffs.pop(bmc_key, None)
@@ -26,6 +26,7 @@ __all__ = [
     "RequestNodeInfoByMACAddress",
     "SendEvent",
     "SendEventMACAddress",
+    "SendEvents",
     "UpdateControllerState",
     "UpdateNodePowerState",
 ]
@@ -289,6 +290,35 @@ class SendEventIPAddress(amp.Command):
     errors = {NoSuchNode: b"NoSuchNode", NoSuchEventType: b"NoSuchEventType"}
 
 
+class SendEvents(amp.Command):
+    """Send a batch of events.
+
+    Each event identifies its node by exactly one of `system_id`,
+    `mac_address` or `ip_address`, and carries the time at which it happened
+    on the rack, since events may be buffered before they are sent.
+
+    :since: 3.6
+    """
+
+    arguments = [
+        (
+            b"events",
+            AmpList(
+                [
+                    (b"type_name", amp.Unicode()),
+                    (b"description", amp.Unicode()),
+                    (b"timestamp", amp.DateTime()),
+                    (b"system_id", amp.Unicode(optional=True)),
+                    (b"mac_address", amp.Unicode(optional=True)),
+                    (b"ip_address", amp.Unicode(optional=True)),
+                ]
+            ),
+        ),
+    ]
+    response = []
+    errors = []
+
+
 class ReportForeignDHCPServer(amp.Command):
     """Report a foreign DHCP server on a rack controller's interface.
 
@@ -532,27 +532,34 @@ class TestUpdateHosts(MAASTestCase):
         dhcp._update_hosts(server, [], [], [])
         omapi_cli.assert_called_once_with(server.omapi_key, server.ipv6)
 
+    def make_omapi_client(self):
+        omapi_cli = Mock()
+        omapi_cli.del_hosts.return_value = {}
+        omapi_cli.add_hosts.return_value = {}
+        omapi_cli.update_hosts.return_value = {}
+        self.patch(dhcp, "OmapiClient").return_value = omapi_cli
+        return omapi_cli
+
     def test_performs_operations(self):
         remove_host = make_host()
         add_host = make_host()
         modify_host = make_host()
-        omapi_cli = Mock()
-        self.patch(dhcp, "OmapiClient").return_value = omapi_cli
+        omapi_cli = self.make_omapi_client()
         dhcp._update_hosts(Mock(), [remove_host], [add_host], [modify_host])
         self.assertEqual(
             omapi_cli.mock_calls,
             [
-                call.del_host(remove_host["mac"]),
-                call.add_host(add_host["mac"], add_host["ip"]),
-                call.update_host(modify_host["mac"], modify_host["ip"]),
+                call.del_hosts([remove_host["mac"]]),
+                call.add_hosts([(add_host["mac"], add_host["ip"])]),
+                call.update_hosts([(modify_host["mac"], modify_host["ip"])]),
+                call.close(),
             ],
         )
 
     def test_fail_remove(self):
         host = make_host()
-        omapi_cli = Mock()
-        omapi_cli.del_host.side_effect = OmapiError("Fail")
-        self.patch(dhcp, "OmapiClient").return_value = omapi_cli
+        omapi_cli = self.make_omapi_client()
+        omapi_cli.del_hosts.return_value = {host["mac"]: OmapiError("Fail")}
         err = self.assertRaises(
             exceptions.CannotRemoveHostMap,
             dhcp._update_hosts,
@@ -561,13 +568,12 @@ class TestUpdateHosts(MAASTestCase):
             [],
             [],
         )
-        self.assertEqual(str(err), "Fail")
+        self.assertEqual(str(err), f"{host['mac']}: Fail")
 
     def test_fail_create(self):
         host = make_host()
-        omapi_cli = Mock()
-        omapi_cli.add_host.side_effect = OmapiError("Fail")
-        self.patch(dhcp, "OmapiClient").return_value = omapi_cli
+        omapi_cli = self.make_omapi_client()
+        omapi_cli.add_hosts.return_value = {host["mac"]: OmapiError("Fail")}
         err = self.assertRaises(
             exceptions.CannotCreateHostMap,
             dhcp._update_hosts,
@@ -576,13 +582,12 @@ class TestUpdateHosts(MAASTestCase):
             [host],
             [],
         )
-        self.assertEqual(str(err), "Fail")
+        self.assertEqual(str(err), f"{host['mac']}: Fail")
 
     def test_fail_modify(self):
         host = make_host()
-        omapi_cli = Mock()
-        omapi_cli.update_host.side_effect = OmapiError("Fail")
-        self.patch(dhcp, "OmapiClient").return_value = omapi_cli
+        omapi_cli = self.make_omapi_client()
+        omapi_cli.update_hosts.return_value = {host["mac"]: OmapiError("Fail")}
         err = self.assertRaises(
             exceptions.CannotModifyHostMap,
             dhcp._update_hosts,
@@ -591,7 +596,27 @@ class TestUpdateHosts(MAASTestCase):
             [],
             [host],
         )
-        self.assertEqual(str(err), "Fail")
+        self.assertEqual(str(err), f"{host['mac']}: Fail")
+
+    def test_failure_does_not_stop_other_operations(self):
+        remove_host = make_host()
+        add_host = make_host()
+        omapi_cli = self.make_omapi_client()
+        omapi_cli.del_hosts.return_value = {
+            remove_host["mac"]: OmapiError("Fail")
+        }
+        self.assertRaises(
+            exceptions.CannotRemoveHostMap,
+            dhcp._update_hosts,
+            Mock(),
+            [remove_host],
+            [add_host],
+            [],
+        )
+        omapi_cli.add_hosts.assert_called_once_with(
+            [(add_host["mac"], add_host["ip"])]
+        )
+        omapi_cli.close.assert_called_once_with()
 
 
 class TestConfigureDHCP(MAASTestCase):
@@ -12,6 +12,7 @@ from unittest.mock import ANY, call, sentinel
 from fixtures import FakeLogger
 from twisted.internet import reactor
 from twisted.internet.defer import (
+    Deferred,
     fail,
     inlineCallbacks,
     maybeDeferred,
@@ -28,7 +29,11 @@ from maastesting.twisted import (
     extract_result,
     TwistedLoggerFixture,
 )
-from provisioningserver.drivers.power import DEFAULT_WAITING_POLICY, PowerError
+from provisioningserver.drivers.power import (
+    DEFAULT_WAITING_POLICY,
+    PowerConnError,
+    PowerError,
+)
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
 from provisioningserver.events import EVENT_TYPES
 from provisioningserver.rpc import clusterservice, exceptions, power, region
@@ -584,3 +589,155 @@ class TestPowerQueryAsync(MAASTestCase):
             [(True, node1["power_state"]), (True, node2["power_state"])],
             results,
         )
+
+
+class TestPowerQueryScheduler(MAASTestCase):
+    run_tests_with = MAASTwistedRunTest.make_factory(timeout=TIMEOUT)
+
+    def make_node(self, power_type="ipmi", **context):
+        context.setdefault("power_address", factory.make_ipv4_address())
+        context.setdefault("power_user", factory.make_name("user"))
+        return {
+            "context": context,
+            "hostname": factory.make_name("hostname"),
+            "power_state": "on",
+            "power_type": power_type,
+            "system_id": factory.make_name("system_id"),
+        }
+
+    def test_queries_nodes_with_same_parameters_once(self):
+        node1 = self.make_node()
+        node2 = self.make_node(**node1["context"])
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.return_value = succeed("off")
+        report_power_state = self.patch(power, "report_power_state")
+        report_power_state.side_effect = lambda d, sid, hn: d
+
+        scheduler = power.PowerQueryScheduler(clock=Clock())
+        results = extract_result(scheduler.query_nodes([node1, node2]))
+
+        self.assertEqual([(True, "off"), (True, "off")], results)
+        get_power_state.assert_called_once_with(
+            node1["system_id"],
+            node1["hostname"],
+            "ipmi",
+            node1["context"],
+            clock=scheduler.clock,
+        )
+        report_power_state.assert_has_calls(
+            [
+                call(ANY, node1["system_id"], node1["hostname"]),
+                call(ANY, node2["system_id"], node2["hostname"]),
+            ]
+        )
+
+    def test_limits_concurrency_per_bmc(self):
+        self.patch(power.PowerQueryScheduler, "bmc_concurrency", 1)
+        node1 = self.make_node()
+        node2 = self.make_node(power_address=node1["context"]["power_address"])
+        queries = [Deferred(), Deferred()]
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = queries
+        suppress_reporting(self)
+
+        scheduler = power.PowerQueryScheduler(clock=Clock())
+        d = scheduler.query_nodes([node1, node2])
+        self.assertEqual(1, get_power_state.call_count)
+        queries[0].callback("on")
+        self.assertEqual(2, get_power_state.call_count)
+        queries[1].callback("off")
+        self.assertEqual([(True, "on"), (True, "off")], extract_result(d))
+        self.assertEqual({}, scheduler._bmc_semaphores)
+
+    def test_queries_nodes_on_the_same_bmc_concurrently(self):
+        power_address = factory.make_ipv4_address()
+        nodes = [
+            self.make_node(power_address=power_address)
+            for _ in range(power.PowerQueryScheduler.bmc_concurrency + 1)
+        ]
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = lambda *args, **kwargs: Deferred()
+        suppress_reporting(self)
+
+        scheduler = power.PowerQueryScheduler(clock=Clock())
+        scheduler.query_nodes(nodes)
+        self.assertEqual(scheduler.bmc_concurrency, get_power_state.call_count)
+
+    def test_skips_nodes_with_power_action_started_while_waiting(self):
+        self.patch(power.PowerQueryScheduler, "bmc_concurrency", 1)
+        node1 = self.make_node()
+        node2 = self.make_node(power_address=node1["context"]["power_address"])
+        query = Deferred()
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.return_value = query
+        suppress_reporting(self)
+
+        scheduler = power.PowerQueryScheduler(clock=Clock())
+        d = scheduler.query_nodes([node1, node2])
+        power.power_action_registry[node2["system_id"]] = sentinel.action
+        self.addCleanup(power.power_action_registry.pop, node2["system_id"])
+        query.callback("on")
+        self.assertEqual([(True, "on"), (True, None)], extract_result(d))
+        get_power_state.assert_called_once()
+
+    def test_limits_concurrency_per_power_type(self):
+        self.patch(power.PowerQueryScheduler, "threaded_concurrency", 1)
+        self.patch(power.PowerQueryScheduler, "asynchronous_concurrency", 2)
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = lambda *args, **kwargs: Deferred()
+        suppress_reporting(self)
+
+        scheduler = power.PowerQueryScheduler(clock=Clock())
+        scheduler.query_nodes(
+            [self.make_node("ipmi") for _ in range(3)]
+            + [self.make_node("redfish") for _ in range(3)]
+        )
+        power_types = [args[2] for args, _ in get_power_state.call_args_list]
+        self.assertEqual(1, power_types.count("ipmi"))
+        self.assertEqual(2, power_types.count("redfish"))
+
+    def test_backs_off_unresponsive_bmc(self):
+        clock = Clock()
+        node = self.make_node()
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = lambda *args, **kwargs: fail(
+            PowerConnError("unreachable")
+        )
+        suppress_reporting(self)
+
+        scheduler = power.PowerQueryScheduler(clock=clock)
+        with FakeLogger("maas.power"):
+            extract_result(scheduler.query_nodes([node]))
+            self.assertEqual(1, get_power_state.call_count)
+            # The BMC is skipped until the backoff expires.
+            extract_result(scheduler.query_nodes([node]))
+            self.assertEqual(1, get_power_state.call_count)
+            clock.advance(scheduler.backoff)
+            extract_result(scheduler.query_nodes([node]))
+            self.assertEqual(2, get_power_state.call_count)
+            # The backoff doubles after each consecutive failure.
+            clock.advance(scheduler.backoff)
+            extract_result(scheduler.query_nodes([node]))
+            self.assertEqual(2, get_power_state.call_count)
+            clock.advance(scheduler.backoff)
+            extract_result(scheduler.query_nodes([node]))
+            self.assertEqual(3, get_power_state.call_count)
+
+    def test_resets_backoff_on_success(self):
+        clock = Clock()
+        node = self.make_node()
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = [
+            fail(PowerConnError("unreachable")),
+            succeed("on"),
+            succeed("on"),
+        ]
+        suppress_reporting(self)
+
+        scheduler = power.PowerQueryScheduler(clock=clock)
+        with FakeLogger("maas.power"):
+            extract_result(scheduler.query_nodes([node]))
+        clock.advance(scheduler.backoff)
+        extract_result(scheduler.query_nodes([node]))
+        extract_result(scheduler.query_nodes([node]))
+        self.assertEqual(3, get_power_state.call_count)
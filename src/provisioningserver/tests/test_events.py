@@ -5,17 +5,23 @@
 
 
 import random
-from unittest.mock import sentinel
+from unittest.mock import call, Mock, sentinel
 
 from twisted.internet.defer import fail, inlineCallbacks, succeed
+from twisted.internet.error import ConnectionDone
+from twisted.internet.task import Clock
+from twisted.protocols.amp import MAX_VALUE_LENGTH, UnhandledCommand
 
 from maastesting import get_testing_timeout
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
+from maastesting.twisted import TwistedLoggerFixture
+from provisioningserver import events
 from provisioningserver.events import (
     EVENT_DETAILS,
     EVENT_TYPES,
     EventDetail,
+    get_encoded_event_size,
     NodeEventHub,
     nodeEventHub,
     send_node_event,
@@ -24,7 +30,11 @@ from provisioningserver.events import (
     send_rack_event,
 )
 from provisioningserver.rpc import clusterservice, region
-from provisioningserver.rpc.exceptions import NoSuchEventType, NoSuchNode
+from provisioningserver.rpc.exceptions import (
+    NoConnectionsAvailable,
+    NoSuchEventType,
+    NoSuchNode,
+)
 from provisioningserver.rpc.testing import MockLiveClusterToRegionRPCFixture
 from provisioningserver.utils.enum import map_enum
 from provisioningserver.utils.testing import MAASIDFixture
@@ -60,13 +70,13 @@ class TestSendEventNode(MAASTestCase):
 class TestSendEventNodeMACAddress(MAASTestCase):
     """Tests for `send_node_event_mac_address`."""
 
-    def test_calls_singleton_hub_logByMAC_directly(self):
-        self.patch(nodeEventHub, "logByMAC").return_value = sentinel.d
+    def test_calls_singleton_hub_queueByMAC_directly(self):
+        self.patch(nodeEventHub, "queueByMAC").return_value = sentinel.d
         result = send_node_event_mac_address(
             sentinel.event_type, sentinel.mac_address, sentinel.description
         )
         self.assertIs(result, sentinel.d)
-        nodeEventHub.logByMAC.assert_called_once_with(
+        nodeEventHub.queueByMAC.assert_called_once_with(
             sentinel.event_type, sentinel.mac_address, sentinel.description
         )
 
@@ -74,13 +84,13 @@ class TestSendEventNodeMACAddress(MAASTestCase):
 class TestSendEventNodeIPAddress(MAASTestCase):
     """Tests for `send_node_event_mac_address`."""
 
-    def test_calls_singleton_hub_logByIP_directly(self):
-        self.patch(nodeEventHub, "logByIP").return_value = sentinel.d
+    def test_calls_singleton_hub_queueByIP_directly(self):
+        self.patch(nodeEventHub, "queueByIP").return_value = sentinel.d
         result = send_node_event_ip_address(
             sentinel.event_type, sentinel.ip_address, sentinel.description
         )
         self.assertIs(result, sentinel.d)
-        nodeEventHub.logByIP.assert_called_once_with(
+        nodeEventHub.queueByIP.assert_called_once_with(
             sentinel.event_type, sentinel.ip_address, sentinel.description
         )
 
@@ -426,3 +436,214 @@ class TestSendEventIPAddress(MAASTestCase):
             yield event_hub.logByIP(event_name, ip_address, description)
         # The event has been removed from the cache.
         self.assertEqual(event_hub._types_registered, set())
+
+
+class TestNodeEventHubQueue(MAASTestCase):
+    """Tests for the buffered `NodeEventHub.queueBy*` methods."""
+
+    run_tests_with = MAASTwistedRunTest.make_factory(timeout=TIMEOUT)
+
+    def setUp(self):
+        super().setUp()
+        self.patch(
+            clusterservice, "get_all_interfaces_definition"
+        ).return_value = {}
+
+    def make_hub(self, **kwargs):
+        hub = NodeEventHub(clock=Clock(), **kwargs)
+        hub._types_registered.update(EVENT_DETAILS)
+        return hub
+
+    def patch_region_client(self, send_events):
+        def call_region(command, **kwargs):
+            if command is region.SendEvents:
+                return send_events()
+            return succeed({})
+
+        client = Mock(side_effect=call_region)
+        self.patch(events, "getRegionClient").return_value = client
+        return client
+
+    @inlineCallbacks
+    def test_events_are_sent_to_region_in_one_batch(self):
+        fixture = self.useFixture(MockLiveClusterToRegionRPCFixture())
+        protocol, connecting = fixture.makeEventLoop(
+            region.SendEvents, region.RegisterEventType
+        )
+        self.addCleanup((yield connecting))
+
+        event_name = random.choice(list(map_enum(EVENT_TYPES)))
+        system_id = factory.make_name("system_id")
+        mac_address = factory.make_mac_address()
+        ip_address = factory.make_ip_address()
+        hub = NodeEventHub(clock=Clock())
+        hub.queueByID(event_name, system_id, "by-id")
+        hub.queueByMAC(event_name, mac_address, "by-mac")
+        hub.queueByIP(event_name, ip_address, "by-ip")
+        protocol.SendEvents.assert_not_called()
+
+        yield hub.flush()
+
+        protocol.RegisterEventType.assert_called_once()
+        protocol.SendEvents.assert_called_once()
+        sent = protocol.SendEvents.call_args.kwargs["events"]
+        self.assertEqual(
+            [
+                (event_name, "by-id", system_id, None, None),
+                (event_name, "by-mac", None, mac_address, None),
+                (event_name, "by-ip", None, None, ip_address),
+            ],
+            [
+                (
+                    event["type_name"],
+                    event["description"],
+                    event["system_id"],
+                    event["mac_address"],
+                    event["ip_address"],
+                )
+                for event in sent
+            ],
+        )
+        self.assertEqual(0, len(hub._buffer))
+
+    def test_flushes_after_interval(self):
+        hub = self.make_hub(flush_interval=2.0)
+        flush = self.patch(hub, "flush")
+        hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, "10.0.0.1")
+        hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, "10.0.0.2")
+        hub.clock.advance(1)
+        flush.assert_not_called()
+        hub.clock.advance(1)
+        flush.assert_called_once_with()
+
+    def test_flushes_full_batch_straight_away(self):
+        hub = self.make_hub(batch_size=2, flush_interval=2.0)
+        flush = self.patch(hub, "flush")
+        hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, "10.0.0.1")
+        hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, "10.0.0.2")
+        hub.clock.advance(0)
+        flush.assert_called_once_with()
+
+    def test_sends_at_most_batch_size_events(self):
+        hub = self.make_hub(batch_size=2)
+        client = self.patch_region_client(lambda: succeed({}))
+        for i in range(3):
+            hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, f"10.0.0.{i}")
+        hub.flush()
+        self.assertEqual(2, len(client.call_args.kwargs["events"]))
+        self.assertEqual(1, len(hub._buffer))
+        # The rest is sent with the next batch.
+        self.assertEqual(1, len(hub.clock.getDelayedCalls()))
+
+    def test_keeps_events_when_region_unavailable(self):
+        hub = self.make_hub(flush_interval=2.0)
+        self.patch(events, "getRegionClient").side_effect = (
+            NoConnectionsAvailable()
+        )
+        for i in range(3):
+            hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, f"10.0.0.{i}")
+        hub.flush()
+        self.assertEqual(
+            ["10.0.0.0", "10.0.0.1", "10.0.0.2"],
+            [event["ip_address"] for event in hub._buffer],
+        )
+        [retry] = hub.clock.getDelayedCalls()
+        self.assertEqual(2.0, retry.getTime())
+
+    def test_resends_events_after_failure(self):
+        hub = self.make_hub()
+        self.patch_region_client(lambda: fail(ConnectionDone()))
+        logger = self.useFixture(TwistedLoggerFixture())
+        hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, "10.0.0.1")
+        hub.flush()
+        self.assertIn(
+            "Failure sending node events to the region.", logger.output
+        )
+        client = self.patch_region_client(lambda: succeed({}))
+        hub.clock.advance(hub.flush_interval)
+        [event] = client.call_args.kwargs["events"]
+        self.assertEqual("10.0.0.1", event["ip_address"])
+        self.assertEqual(0, len(hub._buffer))
+
+    def test_keeps_batch_under_amp_value_limit(self):
+        hub = self.make_hub()
+        client = self.patch_region_client(lambda: succeed({}))
+        description = "x" * (MAX_VALUE_LENGTH // 3)
+        for i in range(3):
+            hub.queueByIP(
+                EVENT_TYPES.NODE_TFTP_REQUEST, f"10.0.0.{i}", description
+            )
+        hub.flush()
+        sent = client.call_args.kwargs["events"]
+        self.assertEqual(2, len(sent))
+        self.assertLessEqual(
+            sum(get_encoded_event_size(event) for event in sent),
+            MAX_VALUE_LENGTH,
+        )
+        self.assertEqual(1, len(hub._buffer))
+
+    def test_drops_only_events_rejected_by_region(self):
+        hub = self.make_hub()
+        sent = []
+
+        def call_region(command, events=None, **kwargs):
+            if command is region.SendEvents:
+                ip_addresses = [event["ip_address"] for event in events]
+                if "10.0.0.1" in ip_addresses:
+                    return fail(KeyError("unknown event type"))
+                sent.extend(ip_addresses)
+            return succeed({})
+
+        self.patch(events, "getRegionClient").return_value = Mock(
+            side_effect=call_region
+        )
+        logger = self.useFixture(TwistedLoggerFixture())
+        for i in range(4):
+            hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, f"10.0.0.{i}")
+        hub.flush()
+        self.assertEqual(["10.0.0.0", "10.0.0.2", "10.0.0.3"], sent)
+        self.assertEqual(0, len(hub._buffer))
+        self.assertEqual([], hub.clock.getDelayedCalls())
+        self.assertIn("was rejected by the region", logger.output)
+
+    def test_drops_oldest_events_when_full(self):
+        hub = self.make_hub(max_buffered=2)
+        self.patch(hub, "flush")
+        for i in range(3):
+            hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, f"10.0.0.{i}")
+        self.assertEqual(
+            ["10.0.0.1", "10.0.0.2"],
+            [event["ip_address"] for event in hub._buffer],
+        )
+
+    def test_falls_back_to_single_events_for_old_regions(self):
+        hub = self.make_hub()
+        client = self.patch_region_client(lambda: fail(UnhandledCommand()))
+        hub.queueByID(EVENT_TYPES.NODE_PXE_REQUEST, "abcdef", "pxe")
+        hub.queueByMAC(EVENT_TYPES.NODE_PXE_REQUEST, "00:11:22:33:44:55")
+        hub.queueByIP(EVENT_TYPES.NODE_TFTP_REQUEST, "10.0.0.1", "tftp")
+        hub.flush()
+        self.assertEqual(
+            [
+                call(
+                    region.SendEvent,
+                    type_name=EVENT_TYPES.NODE_PXE_REQUEST,
+                    description="pxe",
+                    system_id="abcdef",
+                ),
+                call(
+                    region.SendEventMACAddress,
+                    type_name=EVENT_TYPES.NODE_PXE_REQUEST,
+                    description="",
+                    mac_address="00:11:22:33:44:55",
+                ),
+                call(
+                    region.SendEventIPAddress,
+                    type_name=EVENT_TYPES.NODE_TFTP_REQUEST,
+                    description="tftp",
+                    ip_address="10.0.0.1",
+                ),
+            ],
+            client.call_args_list[1:],
+        )
+        self.assertEqual(0, len(hub._buffer))
@@ -6,7 +6,10 @@ import pytest
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from maasapiserver.common.middlewares.db import DatabaseMetricsMiddleware
+from maasapiserver.common.middlewares.db import (
+    DatabaseMetricsMiddleware,
+    TransactionMiddleware,
+)
 from maasapiserver.v3.middlewares.context import ContextMiddleware
 from maasservicelayer.db import Database
 
@@ -49,3 +52,51 @@ class TestDatabaseMetricsMiddleware:
         metrics = (await query_count_client.get(f"/{count}")).json()
         assert metrics["count"] == count
         assert metrics["latency"] > 0.0
+
+    async def test_pool_metrics(
+        self, query_count_app: FastAPI, query_count_client: AsyncClient
+    ) -> None:
+        recorded = []
+
+        @query_count_app.middleware("http")
+        async def record_metrics(request: Request, call_next):
+            response = await call_next(request)
+            recorded.append(request.state.query_metrics)
+            return response
+
+        metrics = (await query_count_client.get("/1")).json()
+        # The checkout time is only known once the handler has returned.
+        assert metrics["pool_checkout"] == 0.0
+        [metrics] = recorded
+        assert metrics["pool_wait"] >= 0.0
+        assert metrics["pool_checkout"] > 0.0
+
+
+@pytest.fixture
+def isolation_level_app(db: Database) -> Iterator[FastAPI]:
+    app = FastAPI()
+    app.add_middleware(TransactionMiddleware, db=db)
+    app.add_middleware(ContextMiddleware)
+
+    async def isolation_level(request: Request) -> Any:
+        conn = request.state.context.get_connection()
+        result = await conn.execute(text("SHOW transaction_isolation"))
+        return result.scalar()
+
+    app.add_api_route("/", isolation_level, methods=["GET", "POST"])
+    yield app
+
+
+class TestTransactionMiddleware:
+    @pytest.mark.parametrize(
+        "method,isolation_level",
+        [("GET", "read committed"), ("POST", "repeatable read")],
+    )
+    async def test_isolation_level(
+        self, isolation_level_app: FastAPI, method: str, isolation_level: str
+    ) -> None:
+        async with AsyncClient(
+            app=isolation_level_app, base_url="http://test"
+        ) as client:
+            response = await client.request(method, "/")
+        assert response.json() == isolation_level
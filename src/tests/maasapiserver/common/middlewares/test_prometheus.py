@@ -22,8 +22,8 @@ def app(
     transaction_middleware_class: type,
 ) -> Iterator[FastAPI]:
     app = FastAPI()
-    app.add_middleware(PrometheusMiddleware)
     app.add_middleware(DatabaseMetricsMiddleware, db=db)
+    app.add_middleware(PrometheusMiddleware)
     app.add_middleware(transaction_middleware_class, db=db)
     app.add_middleware(ContextMiddleware)
     APICommon.register(app.router)
@@ -42,7 +42,9 @@ def transaction_middleware_class(
 ) -> Iterator[type]:
     class ConnectionReusingTransactionMiddleware(TransactionMiddleware):
         @asynccontextmanager
-        async def get_connection(self) -> AsyncIterator[AsyncConnection]:
+        async def get_connection(
+            self, read_only: bool = False
+        ) -> AsyncIterator[AsyncConnection]:
             yield db_connection
 
     yield ConnectionReusingTransactionMiddleware
@@ -74,6 +74,24 @@ class TestGetDefaultDBConfig:
         assert config.password == "pass"
         assert config.port == 12345
 
+    @pytest.mark.asyncio
+    async def test_pool_options(self):
+        region_config = RegionConfiguration(
+            {
+                "database_pool_size": 10,
+                "database_pool_max_overflow": 5,
+                "database_pool_timeout": 2,
+                "database_pool_pre_ping": True,
+                "database_statement_cache_size": 0,
+            }
+        )
+        config = await _get_default_db_config(region_config)
+        assert config.pool_size == 10
+        assert config.pool_max_overflow == 5
+        assert config.pool_timeout == 2
+        assert config.pool_pre_ping is True
+        assert config.statement_cache_size == 0
+
     @pytest.mark.asyncio
     async def test_vault(self, mocker):
         MAAS_ID.set("asdf")
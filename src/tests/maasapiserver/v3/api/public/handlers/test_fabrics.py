@@ -25,7 +25,7 @@ from maasservicelayer.exceptions.catalog import (
 from maasservicelayer.exceptions.constants import (
     UNIQUE_CONSTRAINT_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import StreamedListResult
 from maasservicelayer.models.fabrics import Fabric
 from maasservicelayer.services import ServiceCollectionV3
 from maasservicelayer.services.fabrics import FabricsService
@@ -75,9 +75,9 @@ class TestFabricsApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.fabrics = Mock(FabricsService)
-        services_mock.fabrics.list.return_value = ListResult[Fabric](
-            items=[TEST_FABRIC], next_token=None
-        )
+        services_mock.fabrics.list_stream.return_value = StreamedListResult[
+            Fabric
+        ](items=[TEST_FABRIC], next_token=None)
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         fabrics_response = FabricsListResponse(**response.json())
@@ -90,9 +90,9 @@ class TestFabricsApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.fabrics = Mock(FabricsService)
-        services_mock.fabrics.list.return_value = ListResult[Fabric](
-            items=[TEST_FABRIC_2], next_token=str(TEST_FABRIC.id)
-        )
+        services_mock.fabrics.list_stream.return_value = StreamedListResult[
+            Fabric
+        ](items=[TEST_FABRIC_2], next_token=str(TEST_FABRIC.id))
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         fabrics_response = FabricsListResponse(**response.json())
@@ -27,7 +27,7 @@ from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.machines import MachineClauseFactory
 from maasservicelayer.enums.power_drivers import PowerTypeEnum
 from maasservicelayer.enums.rbac import RbacPermission
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import ListResult, StreamedListResult
 from maasservicelayer.models.bmc import Bmc
 from maasservicelayer.models.machines import Machine, PciDevice, UsbDevice
 from maasservicelayer.services import ServiceCollectionV3
@@ -174,9 +174,9 @@ class TestMachinesApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.machines = Mock(MachinesService)
-        services_mock.machines.list.return_value = ListResult[Machine](
-            items=[TEST_MACHINE_2], next_token=str(TEST_MACHINE.id)
-        )
+        services_mock.machines.list_stream.return_value = StreamedListResult[
+            Machine
+        ](items=[TEST_MACHINE_2], next_token=str(TEST_MACHINE.id))
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         machines_response = MachinesListResponse(**response.json())
@@ -192,9 +192,9 @@ class TestMachinesApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.machines = Mock(MachinesService)
-        services_mock.machines.list.return_value = ListResult[Machine](
-            items=[TEST_MACHINE_2, TEST_MACHINE], next_token=None
-        )
+        services_mock.machines.list_stream.return_value = StreamedListResult[
+            Machine
+        ](items=[TEST_MACHINE_2, TEST_MACHINE], next_token=None)
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=2")
         assert response.status_code == 200
         machines_response = MachinesListResponse(**response.json())
@@ -207,15 +207,15 @@ class TestMachinesApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.machines = Mock(MachinesService)
-        services_mock.machines.list.return_value = ListResult[Machine](
-            items=[TEST_MACHINE], next_token=None
-        )
+        services_mock.machines.list_stream.return_value = StreamedListResult[
+            Machine
+        ](items=[TEST_MACHINE], next_token=None)
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=2")
         assert response.status_code == 200
         machines_response = MachinesListResponse(**response.json())
         assert len(machines_response.items) == 1
         assert machines_response.next is None
-        services_mock.machines.list.assert_called_once_with(
+        services_mock.machines.list_stream.assert_called_once_with(
             token=None,
             size=2,
             query=QuerySpec(
@@ -234,9 +234,9 @@ class TestMachinesApi(ApiCommonTests):
         mocked_api_client_admin: AsyncClient,
     ) -> None:
         services_mock.machines = Mock(MachinesService)
-        services_mock.machines.list.return_value = ListResult[Machine](
-            items=[TEST_MACHINE_2], next_token=None
-        )
+        services_mock.machines.list_stream.return_value = StreamedListResult[
+            Machine
+        ](items=[TEST_MACHINE_2], next_token=None)
         response = await mocked_api_client_admin.get(
             f"{self.BASE_PATH}?size=2"
         )
@@ -244,7 +244,7 @@ class TestMachinesApi(ApiCommonTests):
         machines_response = MachinesListResponse(**response.json())
         assert len(machines_response.items) == 1
         assert machines_response.next is None
-        services_mock.machines.list.assert_called_once_with(
+        services_mock.machines.list_stream.assert_called_once_with(
             token=None, size=2, query=QuerySpec(where=None)
         )
 
@@ -272,9 +272,9 @@ class TestMachinesApi(ApiCommonTests):
             rbac_client_mock
         )
         services_mock.machines = Mock(MachinesService)
-        services_mock.machines.list.return_value = ListResult[Machine](
-            items=[TEST_MACHINE], next_token=None
-        )
+        services_mock.machines.list_stream.return_value = StreamedListResult[
+            Machine
+        ](items=[TEST_MACHINE], next_token=None)
         response = await mocked_api_client_user_rbac.get(self.BASE_PATH)
         assert response.status_code == 200
         machines_response = MachinesListResponse(**response.json())
@@ -288,7 +288,7 @@ class TestMachinesApi(ApiCommonTests):
                 RbacPermission.ADMIN_MACHINES,
             },
         )
-        services_mock.machines.list.assert_called_once_with(
+        services_mock.machines.list_stream.assert_called_once_with(
             token=None,
             size=20,
             query=QuerySpec(
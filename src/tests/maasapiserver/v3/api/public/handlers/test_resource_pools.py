@@ -38,7 +38,7 @@ from maasservicelayer.exceptions.catalog import (
 from maasservicelayer.exceptions.constants import (
     UNEXISTING_RESOURCE_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import StreamedListResult
 from maasservicelayer.models.resource_pools import ResourcePool
 from maasservicelayer.services import ExternalAuthService, ServiceCollectionV3
 from maasservicelayer.services.resource_pools import ResourcePoolsService
@@ -87,9 +87,11 @@ class TestResourcePoolApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.resource_pools = Mock(ResourcePoolsService)
-        services_mock.resource_pools.list.return_value = ListResult[
-            ResourcePool
-        ](items=[TEST_RESOURCE_POOL], next_token=None)
+        services_mock.resource_pools.list_stream.return_value = (
+            StreamedListResult[ResourcePool](
+                items=[TEST_RESOURCE_POOL], next_token=None
+            )
+        )
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         resource_pools_response = ResourcePoolsListResponse(**response.json())
@@ -102,11 +104,11 @@ class TestResourcePoolApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.resource_pools = Mock(ResourcePoolsService)
-        services_mock.resource_pools.list.return_value = ListResult[
-            ResourcePool
-        ](
-            items=[TEST_RESOURCE_POOL_2],
-            next_token=str(TEST_RESOURCE_POOL.id),
+        services_mock.resource_pools.list_stream.return_value = (
+            StreamedListResult[ResourcePool](
+                items=[TEST_RESOURCE_POOL_2],
+                next_token=str(TEST_RESOURCE_POOL.id),
+            )
         )
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
@@ -139,11 +141,11 @@ class TestResourcePoolApi(ApiCommonTests):
         )
 
         services_mock.resource_pools = Mock(ResourcePoolsService)
-        services_mock.resource_pools.list.return_value = ListResult[
-            ResourcePool
-        ](
-            items=[TEST_RESOURCE_POOL, TEST_RESOURCE_POOL_2],
-            next_token=None,
+        services_mock.resource_pools.list_stream.return_value = (
+            StreamedListResult[ResourcePool](
+                items=[TEST_RESOURCE_POOL, TEST_RESOURCE_POOL_2],
+                next_token=None,
+            )
         )
         response = await mocked_api_client_user_rbac.get(f"{self.BASE_PATH}")
         assert response.status_code == 200
@@ -154,7 +156,7 @@ class TestResourcePoolApi(ApiCommonTests):
             user="username",
             permissions={RbacPermission.VIEW, RbacPermission.VIEW_ALL},
         )
-        services_mock.resource_pools.list.assert_called_once_with(
+        services_mock.resource_pools.list_stream.assert_called_once_with(
             token=None,
             size=20,
             query=QuerySpec(where=ResourcePoolClauseFactory.with_ids([1, 2])),
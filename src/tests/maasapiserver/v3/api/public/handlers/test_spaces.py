@@ -15,7 +15,7 @@ from maasapiserver.v3.api.public.models.responses.spaces import (
     SpacesListResponse,
 )
 from maasapiserver.v3.constants import V3_API_PREFIX
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import StreamedListResult
 from maasservicelayer.models.spaces import Space
 from maasservicelayer.services import ServiceCollectionV3
 from maasservicelayer.services.spaces import SpacesService
@@ -62,9 +62,9 @@ class TestSpaceApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.spaces = Mock(SpacesService)
-        services_mock.spaces.list.return_value = ListResult[Space](
-            items=[TEST_SPACE], next_token=None
-        )
+        services_mock.spaces.list_stream.return_value = StreamedListResult[
+            Space
+        ](items=[TEST_SPACE], next_token=None)
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         spaces_response = SpacesListResponse(**response.json())
@@ -77,9 +77,9 @@ class TestSpaceApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.spaces = Mock(SpacesService)
-        services_mock.spaces.list.return_value = ListResult[Space](
-            items=[TEST_SPACE_2], next_token=str(TEST_SPACE.id)
-        )
+        services_mock.spaces.list_stream.return_value = StreamedListResult[
+            Space
+        ](items=[TEST_SPACE_2], next_token=str(TEST_SPACE.id))
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         spaces_response = SpacesListResponse(**response.json())
@@ -16,7 +16,7 @@ from maasapiserver.v3.api.public.models.responses.subnets import (
 )
 from maasapiserver.v3.constants import V3_API_PREFIX
 from maascommon.enums.subnet import RdnsMode
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import StreamedListResult
 from maasservicelayer.models.subnets import Subnet
 from maasservicelayer.services import ServiceCollectionV3
 from maasservicelayer.services.subnets import SubnetsService
@@ -83,9 +83,9 @@ class TestSubnetApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.subnets = Mock(SubnetsService)
-        services_mock.subnets.list.return_value = ListResult[Subnet](
-            items=[TEST_SUBNET], next_token=None
-        )
+        services_mock.subnets.list_stream.return_value = StreamedListResult[
+            Subnet
+        ](items=[TEST_SUBNET], next_token=None)
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         subnets_response = SubnetsListResponse(**response.json())
@@ -98,9 +98,9 @@ class TestSubnetApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.subnets = Mock(SubnetsService)
-        services_mock.subnets.list.return_value = ListResult[Subnet](
-            items=[TEST_SUBNET_2], next_token=str(TEST_SUBNET.id)
-        )
+        services_mock.subnets.list_stream.return_value = StreamedListResult[
+            Subnet
+        ](items=[TEST_SUBNET_2], next_token=str(TEST_SUBNET.id))
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         subnets_response = SubnetsListResponse(**response.json())
@@ -30,7 +30,7 @@ from maasservicelayer.exceptions.catalog import (
 from maasservicelayer.exceptions.constants import (
     UNIQUE_CONSTRAINT_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import StreamedListResult
 from maasservicelayer.models.users import User
 from maasservicelayer.services import ServiceCollectionV3
 from maasservicelayer.services.external_auth import ExternalAuthService
@@ -189,9 +189,9 @@ class TestUsersApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.users = Mock(UsersService)
-        services_mock.users.list.return_value = ListResult[User](
-            items=[USER_1], next_token=str(USER_2.id)
-        )
+        services_mock.users.list_stream.return_value = StreamedListResult[
+            User
+        ](items=[USER_1], next_token=str(USER_2.id))
         response = await mocked_api_client_user.get(
             f"{self.BASE_PATH}?size=1",
         )
@@ -210,9 +210,9 @@ class TestUsersApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.users = Mock(UsersService)
-        services_mock.users.list.return_value = ListResult[User](
-            items=[USER_1, USER_2], next_token=None
-        )
+        services_mock.users.list_stream.return_value = StreamedListResult[
+            User
+        ](items=[USER_1, USER_2], next_token=None)
         response = await mocked_api_client_user.get(
             f"{self.BASE_PATH}?size=2",
         )
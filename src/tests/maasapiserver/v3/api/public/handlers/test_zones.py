@@ -30,7 +30,7 @@ from maasservicelayer.exceptions.constants import (
     ETAG_PRECONDITION_VIOLATION_TYPE,
     UNIQUE_CONSTRAINT_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import StreamedListResult
 from maasservicelayer.models.zones import Zone
 from maasservicelayer.services import ServiceCollectionV3
 from maasservicelayer.services.zones import ZonesService
@@ -81,9 +81,33 @@ class TestZonesApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.zones = Mock(ZonesService)
-        services_mock.zones.list.return_value = ListResult[Zone](
-            items=[TEST_ZONE], next_token=str(DEFAULT_ZONE.id)
+        services_mock.zones.list_stream.return_value = StreamedListResult[
+            Zone
+        ](items=[TEST_ZONE], next_token=str(DEFAULT_ZONE.id))
+        response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
+        assert response.status_code == 200
+        zones_response = ZonesListResponse(**response.json())
+        assert len(zones_response.items) == 1
+        assert (
+            zones_response.next
+            == f"{self.BASE_PATH}?{TokenPaginationParams.to_href_format(token=str(DEFAULT_ZONE.id), size='1')}"
         )
+
+    async def test_list_streamed_next_token(
+        self,
+        services_mock: ServiceCollectionV3,
+        mocked_api_client_user: AsyncClient,
+    ) -> None:
+        result = StreamedListResult[Zone](items=())
+
+        async def zones():
+            yield TEST_ZONE
+            # Like a server-side cursor, the token is only known at the end.
+            result.next_token = str(DEFAULT_ZONE.id)
+
+        result.items = zones()
+        services_mock.zones = Mock(ZonesService)
+        services_mock.zones.list_stream.return_value = result
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         zones_response = ZonesListResponse(**response.json())
@@ -92,6 +116,12 @@ class TestZonesApi(ApiCommonTests):
             zones_response.next
             == f"{self.BASE_PATH}?{TokenPaginationParams.to_href_format(token=str(DEFAULT_ZONE.id), size='1')}"
         )
+        services_mock.zones.list_stream.assert_called_once()
+        assert services_mock.zones.list_stream.call_args.kwargs["columns"] == [
+            "id",
+            "name",
+            "description",
+        ]
 
     async def test_list_no_other_page(
         self,
@@ -99,9 +129,9 @@ class TestZonesApi(ApiCommonTests):
         mocked_api_client_user: AsyncClient,
     ) -> None:
         services_mock.zones = Mock(ZonesService)
-        services_mock.zones.list.return_value = ListResult[Zone](
-            items=[DEFAULT_ZONE, TEST_ZONE], next_token=None
-        )
+        services_mock.zones.list_stream.return_value = StreamedListResult[
+            Zone
+        ](items=[DEFAULT_ZONE, TEST_ZONE], next_token=None)
         response = await mocked_api_client_user.get(f"{self.BASE_PATH}?size=1")
         assert response.status_code == 200
         zones_response = ZonesListResponse(**response.json())
@@ -116,9 +146,9 @@ class TestZonesApi(ApiCommonTests):
     ) -> None:
 
         services_mock.zones = Mock(ZonesService)
-        services_mock.zones.list.return_value = ListResult[Zone](
-            items=[TEST_ZONE], next_token=str(DEFAULT_ZONE.id)
-        )
+        services_mock.zones.list_stream.return_value = StreamedListResult[
+            Zone
+        ](items=[TEST_ZONE], next_token=str(DEFAULT_ZONE.id))
 
         # Get also the default zone
         response = await mocked_api_client_user.get(
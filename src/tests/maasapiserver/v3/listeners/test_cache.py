@@ -0,0 +1,50 @@
+#  Copyright 2024 Canonical Ltd.  This software is licensed under the
+#  GNU Affero General Public License version 3 (see the file LICENSE).
+
+from maasapiserver.v3.listeners.cache import ServiceCacheInvalidationListener
+from maasservicelayer.services import CacheForServices, ConfigurationsService
+from maasservicelayer.services._base import make_cache_key
+
+
+class TestServiceCacheInvalidationListener:
+    def _make_listener(
+        self, services_cache: CacheForServices
+    ) -> ServiceCacheInvalidationListener:
+        return ServiceCacheInvalidationListener(
+            "config_update",
+            services_cache,
+            ConfigurationsService.__name__,
+            "configurations",
+        )
+
+    def test_invalidates_entry_for_payload(self):
+        services_cache = CacheForServices()
+        cache = services_cache.get(
+            ConfigurationsService.__name__,
+            ConfigurationsService.build_cache_object,
+        )
+        cache.configurations.set(make_cache_key("maas_name"), "old")
+        cache.configurations.set(make_cache_key("other"), "value")
+
+        listener = self._make_listener(services_cache)
+        listener.handler(None, 0, listener.channel, "maas_name")  # type: ignore
+
+        assert cache.configurations.get(make_cache_key("maas_name")) is None
+        assert cache.configurations.get(make_cache_key("other")) == "value"
+
+    def test_clears_cache_without_payload(self):
+        services_cache = CacheForServices()
+        cache = services_cache.get(
+            ConfigurationsService.__name__,
+            ConfigurationsService.build_cache_object,
+        )
+        cache.configurations.set(make_cache_key("maas_name"), "old")
+
+        listener = self._make_listener(services_cache)
+        listener.handler(None, 0, listener.channel, "")  # type: ignore
+
+        assert len(cache.configurations) == 0
+
+    def test_ignores_services_without_cache(self):
+        listener = self._make_listener(CacheForServices())
+        listener.handler(None, 0, listener.channel, "maas_name")  # type: ignore
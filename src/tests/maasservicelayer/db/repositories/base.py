@@ -96,6 +96,31 @@ class RepositoryCommonTests(abc.ABC, Generic[T]):
                     assert created_objects.pop() in objects_results.items
             current_token = objects_results.next_token
 
+    @pytest.mark.parametrize("num_objects", [10])
+    @pytest.mark.parametrize("page_size", [1, 3, 10, 11])
+    async def test_stream(
+        self,
+        page_size: int,
+        repository_instance: BaseRepository,
+        _setup_test_list: Sequence[T],
+        num_objects: int,
+    ):
+        streamed_ids = []
+        current_token = None
+        while True:
+            result = await repository_instance.stream(
+                token=current_token, size=page_size
+            )
+            page = [row.id async for row in result]
+            assert len(page) <= page_size
+            streamed_ids.extend(page)
+            current_token = result.next_token
+            if current_token is None:
+                break
+        # Pages don't overlap and follow each other in `id DESC` order.
+        assert streamed_ids == sorted(set(streamed_ids), reverse=True)
+        assert {obj.id for obj in _setup_test_list} <= set(streamed_ids)
+
     async def test_create(
         self,
         repository_instance: BaseRepository,
@@ -15,7 +15,12 @@ from sqlalchemy.ext.asyncio import AsyncConnection
 
 from maasservicelayer.context import Context
 from maasservicelayer.db import Database
-from maasservicelayer.db.filters import Clause, ClauseFactory, QuerySpec
+from maasservicelayer.db.filters import (
+    Clause,
+    ClauseFactory,
+    OrderByClause,
+    QuerySpec,
+)
 from maasservicelayer.db.repositories.base import (
     BaseRepository,
     ResourceBuilder,
@@ -189,3 +194,65 @@ class TestMyRepository:
         await repo.delete(query=query)
         deleted_obj = await repo.delete(query=query)
         assert deleted_obj is None
+
+    async def test_stream_keyset_multiple_columns(
+        self, db_connection: AsyncConnection
+    ) -> None:
+        await db_connection.execute(
+            A.insert(),
+            [
+                {"id": 2, "data": "bar", "b_id": 2},
+                {"id": 3, "data": "bar", "b_id": 3},
+                {"id": 4, "data": "baz", "b_id": 1},
+            ],
+        )
+        repo = MyRepository(Context(connection=db_connection))
+        order_by = [OrderByClause(column=A.c.data, descending=False)]
+        pages = []
+        token = None
+        while True:
+            result = await repo.stream(
+                token=token, size=2, columns=["data"], order_by=order_by
+            )
+            pages.append([(row.data, row.id) async for row in result])
+            token = result.next_token
+            if token is None:
+                break
+        assert pages == [
+            [("bar", 2), ("bar", 3)],
+            [("baz", 4), ("foo", 1)],
+        ]
+
+    async def test_stream_projects_columns(
+        self, db_connection: AsyncConnection
+    ) -> None:
+        repo = MyRepository(Context(connection=db_connection))
+        result = await repo.stream(token=None, size=10, columns=["data"])
+        rows = [row async for row in result]
+        assert [row._asdict() for row in rows] == [{"id": 1, "data": "foo"}]
+        assert result.next_token is None
+
+    async def test_stream_pages_through_table(
+        self, db_connection: AsyncConnection
+    ) -> None:
+        await db_connection.execute(
+            A.insert(),
+            [
+                {"id": 2, "data": "bar", "b_id": 2},
+                {"id": 3, "data": "baz", "b_id": 3},
+            ],
+        )
+        repo = MyRepository(Context(connection=db_connection))
+        pages = []
+        tokens = []
+        token = None
+        while True:
+            result = await repo.stream(token=token, size=2, columns=["data"])
+            pages.append([(row.id, row.data) async for row in result])
+            token = result.next_token
+            tokens.append(token)
+            if token is None:
+                break
+        assert pages == [[(3, "baz"), (2, "bar")], [(1, "foo")]]
+        # Single-column keysets use the same tokens as `list`.
+        assert tokens == ["1", None]
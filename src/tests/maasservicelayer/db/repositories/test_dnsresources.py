@@ -114,6 +114,43 @@ class TestDNSResourceRepository(RepositoryCommonTests[DNSResource]):
             dnsresource.id for dnsresource in result
         }
 
+    async def test_get_dnsresources_in_domain_for_ips(
+        self, repository_instance: DNSResourceRepository, fixture: Fixture
+    ) -> None:
+        subnet = await create_test_subnet_entry(fixture)
+        domain = await create_test_domain_entry(fixture)
+        other_domain = await create_test_domain_entry(fixture)
+        [sip1] = await create_test_staticipaddress_entry(
+            fixture, subnet=subnet
+        )
+        [sip2] = await create_test_staticipaddress_entry(
+            fixture, subnet=subnet
+        )
+        [sip3] = await create_test_staticipaddress_entry(
+            fixture, subnet=subnet
+        )
+        sip1_resources = [
+            await create_test_dnsresource_entry(fixture, domain, sip1)
+            for _ in range(2)
+        ]
+        sip2_resource = await create_test_dnsresource_entry(
+            fixture, domain, sip2
+        )
+        await create_test_dnsresource_entry(fixture, other_domain, sip2)
+
+        result = await repository_instance.get_dnsresources_in_domain_for_ips(
+            domain,
+            [StaticIPAddress(**sip) for sip in (sip1, sip2, sip3)],
+        )
+
+        assert {
+            ip_id: [dnsresource.id for dnsresource in dnsresources]
+            for ip_id, dnsresources in result.items()
+        } == {
+            sip1["id"]: [dnsresource.id for dnsresource in sip1_resources],
+            sip2["id"]: [sip2_resource.id],
+        }
+
     async def test_link_ip(
         self, repository_instance: DNSResourceRepository, fixture: Fixture
     ) -> None:
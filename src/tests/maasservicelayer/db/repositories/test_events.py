@@ -1,6 +1,8 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
+from datetime import datetime, timezone
+
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncConnection
@@ -50,6 +52,30 @@ class TestEventsClauseFactory:
             "system_id_1": ["1", "2", "3"],
         }
 
+    def test_with_created_bounds(self):
+        after = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        before = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        clause = EventsClauseFactory.and_clauses(
+            [
+                EventsClauseFactory.with_created_after(after),
+                EventsClauseFactory.with_created_before(before),
+            ]
+        )
+
+        stmt = (
+            select(EventTable.c.id)
+            .select_from(EventTable)
+            .where(clause.condition)
+        )
+        assert (
+            str(CompiledQuery(stmt).sql)
+            == "SELECT maasserver_event.id \nFROM maasserver_event \nWHERE maasserver_event.created >= :created_1 AND maasserver_event.created < :created_2"
+        )
+        assert CompiledQuery(stmt).params == {
+            "created_1": after,
+            "created_2": before,
+        }
+
 
 class TestEventsRepository(RepositoryCommonTests[Event]):
     @pytest.fixture
@@ -5,19 +5,23 @@ import copy
 from math import ceil
 
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from maascommon.enums.ipaddress import IpAddressType
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.interfaces import InterfaceRepository
+from maasservicelayer.db.tables import InterfaceIPAddressTable
 from maasservicelayer.models.base import ListResult
 from maasservicelayer.models.interfaces import Interface
+from maasservicelayer.models.staticipaddress import StaticIPAddress
 from tests.fixtures.factories.bmc import create_test_bmc
 from tests.fixtures.factories.interface import (
     create_test_interface,
     create_test_interface_entry,
 )
 from tests.fixtures.factories.machines import create_test_machine
+from tests.fixtures.factories.node import create_test_machine_entry
 from tests.fixtures.factories.node_config import create_test_node_config_entry
 from tests.fixtures.factories.staticipaddress import (
     create_test_staticipaddress_entry,
@@ -325,3 +329,81 @@ class TestInterfaceRepository:
 
         for interface in created_interfaces:
             _assert_interface_in_list(interface, interfaces_result)
+
+    async def test_get_interfaces_for_macs(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        machine = await create_test_machine_entry(fixture)
+        other_machine = await create_test_machine_entry(fixture)
+        interface = await create_test_interface_entry(
+            fixture, node=machine, mac_address="00:11:22:33:44:55"
+        )
+        shared = [
+            await create_test_interface_entry(
+                fixture, node=node, mac_address="00:11:22:33:44:66"
+            )
+            for node in (machine, other_machine)
+        ]
+        await create_test_interface_entry(
+            fixture, node=other_machine, mac_address="00:11:22:33:44:77"
+        )
+        interfaces_repository = InterfaceRepository(
+            Context(connection=db_connection)
+        )
+
+        result = await interfaces_repository.get_interfaces_for_macs(
+            ["00:11:22:33:44:55", "00:11:22:33:44:66", "00:11:22:33:44:88"]
+        )
+
+        assert {
+            mac: sorted(iface.id for iface in ifaces)
+            for mac, ifaces in result.items()
+        } == {
+            "00:11:22:33:44:55": [interface.id],
+            "00:11:22:33:44:66": sorted(iface.id for iface in shared),
+        }
+
+    async def test_add_ips(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        subnet = await create_test_subnet_entry(fixture)
+        [ip1] = await create_test_staticipaddress_entry(
+            fixture, subnet=subnet, alloc_type=IpAddressType.DISCOVERED
+        )
+        [ip2] = await create_test_staticipaddress_entry(
+            fixture, subnet=subnet, alloc_type=IpAddressType.DISCOVERED
+        )
+        interface1 = await create_test_interface_entry(fixture, ips=[ip1])
+        interface2 = await create_test_interface_entry(fixture)
+        interfaces_repository = InterfaceRepository(
+            Context(connection=db_connection)
+        )
+
+        # The existing link is kept as it is.
+        await interfaces_repository.add_ips(
+            [
+                (interface1, StaticIPAddress(**ip1)),
+                (interface1, StaticIPAddress(**ip2)),
+                (interface2, StaticIPAddress(**ip2)),
+            ]
+        )
+
+        links = (
+            await db_connection.execute(
+                select(
+                    InterfaceIPAddressTable.c.interface_id,
+                    InterfaceIPAddressTable.c.staticipaddress_id,
+                ).where(
+                    InterfaceIPAddressTable.c.interface_id.in_(
+                        [interface1.id, interface2.id]
+                    )
+                )
+            )
+        ).all()
+        assert sorted(tuple(link) for link in links) == sorted(
+            [
+                (interface1.id, ip1["id"]),
+                (interface1.id, ip2["id"]),
+                (interface2.id, ip2["id"]),
+            ]
+        )
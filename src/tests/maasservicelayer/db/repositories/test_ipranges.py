@@ -116,3 +116,38 @@ class TestIPRangesRepository(RepositoryCommonTests[IPRange]):
         result = await ipranges_repository.get_dynamic_range_for_ip(subnet, ip)
 
         assert result.id == dynamic_range["id"]
+
+    async def test_get_ipranges_for_subnets(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ):
+        subnet1 = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        subnet2 = await create_test_subnet_entry(fixture, cidr="10.0.1.0/24")
+        other_subnet = await create_test_subnet_entry(
+            fixture, cidr="10.0.2.0/24"
+        )
+        ranges = [
+            await create_test_ip_range_entry(
+                fixture, subnet=subnet1, offset=1, size=5, type="dynamic"
+            ),
+            await create_test_ip_range_entry(
+                fixture, subnet=subnet1, offset=10, size=5
+            ),
+            await create_test_ip_range_entry(
+                fixture, subnet=subnet2, offset=1, size=5, type="dynamic"
+            ),
+        ]
+        await create_test_ip_range_entry(
+            fixture, subnet=other_subnet, offset=1, size=5, type="dynamic"
+        )
+
+        ipranges_repository = IPRangesRepository(
+            Context(connection=db_connection)
+        )
+
+        result = await ipranges_repository.get_ipranges_for_subnets(
+            [subnet1["id"], subnet2["id"]]
+        )
+
+        assert {iprange.id for iprange in result} == {
+            iprange["id"] for iprange in ranges
+        }
@@ -71,6 +71,18 @@ class TestNodesRepository:
         assert updated_node_a["zone_id"] == default_zone.id
         assert updated_node_b["zone_id"] == default_zone.id
 
+    async def test_get_existing_hostnames(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        await create_test_machine_entry(fixture, hostname="foo")
+        await create_test_machine_entry(fixture, hostname="bar")
+        nodes_repository = NodesRepository(Context(connection=db_connection))
+
+        result = await nodes_repository.get_existing_hostnames(
+            ["foo", "bar", "baz"]
+        )
+        assert result == {"foo", "bar"}
+
     async def test_move_bmcs_to_zone(
         self, db_connection: AsyncConnection, fixture: Fixture
     ) -> None:
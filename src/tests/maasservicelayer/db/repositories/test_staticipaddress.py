@@ -35,6 +35,11 @@ class TestStaticIPAddressClauseFactory:
             clause.condition.compile(compile_kwargs={"literal_binds": True})
         ) == ("maasserver_node.node_type = 2")
 
+        clause = StaticIPAddressClauseFactory.with_ids([1, 2])
+        assert str(
+            clause.condition.compile(compile_kwargs={"literal_binds": True})
+        ) == ("maasserver_staticipaddress.id IN (1, 2)")
+
 
 @pytest.mark.asyncio
 class TestStaticIPAddressRepository(RepositoryCommonTests[StaticIPAddress]):
@@ -120,6 +125,121 @@ class TestStaticIPAddressRepository(RepositoryCommonTests[StaticIPAddress]):
         assert result is not None
         assert result.lease_time == 30
 
+    async def test_create_or_update_many(
+        self, repository_instance: StaticIPAddressRepository, fixture: Fixture
+    ) -> None:
+        subnet = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        sip = (
+            await create_test_staticipaddress_entry(
+                fixture,
+                subnet=subnet,
+                alloc_type=IpAddressType.DISCOVERED.value,
+            )
+        )[0]
+        new_ip = IPv4Address("10.0.0.200")
+
+        now = utcnow()
+        resources = [
+            StaticIPAddressResourceBuilder()
+            .with_ip(ip)
+            .with_subnet_id(subnet["id"])
+            .with_alloc_type(IpAddressType.DISCOVERED)
+            .with_lease_time(30)
+            .with_created(now)
+            .with_updated(now)
+            .build()
+            for ip in [sip["ip"], new_ip]
+        ]
+
+        result = await repository_instance.create_or_update_many(resources)
+
+        assert [ip.ip for ip in result] == [sip["ip"], new_ip]
+        assert result[0].id == sip["id"]
+        assert all(ip.lease_time == 30 for ip in result)
+        updated = await repository_instance.get_by_id(sip["id"])
+        assert updated is not None
+        assert updated.lease_time == 30
+
+    async def test_create_or_update_many_empty(
+        self, repository_instance: StaticIPAddressRepository
+    ) -> None:
+        assert await repository_instance.create_or_update_many([]) == []
+
+    async def test_update_many(
+        self, repository_instance: StaticIPAddressRepository, fixture: Fixture
+    ) -> None:
+        subnet = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        sips = [
+            (
+                await create_test_staticipaddress_entry(
+                    fixture,
+                    subnet=subnet,
+                    alloc_type=IpAddressType.DISCOVERED.value,
+                )
+            )[0]
+            for _ in range(3)
+        ]
+
+        result = await repository_instance.update_many(
+            QuerySpec(
+                where=StaticIPAddressClauseFactory.with_ids(
+                    [sip["id"] for sip in sips[:2]]
+                )
+            ),
+            StaticIPAddressResourceBuilder().with_lease_time(30).build(),
+        )
+
+        assert sorted(ip.id for ip in result) == [
+            sip["id"] for sip in sips[:2]
+        ]
+        assert all(ip.lease_time == 30 for ip in result)
+        untouched = await repository_instance.get_by_id(sips[2]["id"])
+        assert untouched is not None
+        assert untouched.lease_time == 600
+
+    async def test_get_discovered_ips_for_interfaces(
+        self, repository_instance: StaticIPAddressRepository, fixture: Fixture
+    ) -> None:
+        v4_subnet = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        v6_subnet = await create_test_subnet_entry(
+            fixture, cidr="fd42:be3f:b08a:3d6c::/64"
+        )
+        [v4_addr] = await create_test_staticipaddress_entry(
+            fixture,
+            subnet=v4_subnet,
+            alloc_type=IpAddressType.DISCOVERED.value,
+        )
+        [v6_addr] = await create_test_staticipaddress_entry(
+            fixture,
+            subnet=v6_subnet,
+            alloc_type=IpAddressType.DISCOVERED.value,
+        )
+        [no_addr] = await create_test_staticipaddress_entry(
+            fixture,
+            subnet_id=v4_subnet["id"],
+            alloc_type=IpAddressType.DISCOVERED.value,
+        )
+        [auto_addr] = await create_test_staticipaddress_entry(
+            fixture, subnet=v4_subnet, alloc_type=IpAddressType.AUTO.value
+        )
+        interface1 = await create_test_interface_entry(
+            fixture, ips=[v4_addr, v6_addr, auto_addr]
+        )
+        interface2 = await create_test_interface_entry(fixture, ips=[no_addr])
+        interface3 = await create_test_interface_entry(fixture, ips=[])
+
+        result = await repository_instance.get_discovered_ips_for_interfaces(
+            [interface1, interface2, interface3]
+        )
+
+        assert {
+            interface_id: [ip.id for ip in ips]
+            for interface_id, ips in result.items()
+        } == {
+            interface1.id: [v4_addr["id"], v6_addr["id"]],
+            interface2.id: [no_addr["id"]],
+        }
+
     async def test_get_discovered_ips_in_family_for_interfaces(
         self, repository_instance: StaticIPAddressRepository, fixture: Fixture
     ) -> None:
@@ -124,3 +124,29 @@ class TestSubnetsRepositoryMethods:
         result = await subnets.find_best_subnet_for_ip(str(ip[0]["ip"]))
         assert result is not None
         assert result.id == subnet2["id"]
+
+    async def test_find_best_subnets_for_ips(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        subnet1 = await create_test_subnet_entry(fixture, cidr="10.0.0.0/16")
+        subnet2 = await create_test_subnet_entry(fixture, cidr="10.0.1.0/24")
+
+        in_subnet1 = IPv4Address("10.0.2.3")
+        in_subnet2 = IPv4Address("10.0.1.2")
+        no_subnet = IPv4Address("192.168.0.1")
+
+        subnets = SubnetsRepository(Context(connection=db_connection))
+
+        result = await subnets.find_best_subnets_for_ips(
+            [in_subnet1, in_subnet2, no_subnet]
+        )
+        assert {ip: subnet.id for ip, subnet in result.items()} == {
+            in_subnet1: subnet1["id"],
+            in_subnet2: subnet2["id"],
+        }
+
+    async def test_find_best_subnets_for_ips_empty(
+        self, db_connection: AsyncConnection
+    ) -> None:
+        subnets = SubnetsRepository(Context(connection=db_connection))
+        assert await subnets.find_best_subnets_for_ips([]) == {}
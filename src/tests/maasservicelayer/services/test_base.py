@@ -0,0 +1,128 @@
+#  Copyright 2024 Canonical Ltd.  This software is licensed under the
+#  GNU Affero General Public License version 3 (see the file LICENSE).
+
+from dataclasses import dataclass, field
+from unittest.mock import AsyncMock
+
+import pytest
+
+from maasservicelayer.context import Context
+from maasservicelayer.services._base import (
+    make_cache_key,
+    Service,
+    ServiceCache,
+    TTLCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_get_missing(self):
+        cache = TTLCache()
+        assert cache.get("key") is None
+        assert cache.get("key", "default") == "default"
+        assert cache.misses == 2
+        assert cache.hits == 0
+
+    def test_set_and_get(self):
+        cache = TTLCache()
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.set("key", "value")
+        clock.now = 9.9
+        assert cache.get("key") == "value"
+        clock.now = 10
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+
+class TestMakeCacheKey:
+    def test_freezes_mutable_arguments(self):
+        key = make_cache_key("user", {"b", "a"}, [1, 2], {"x": [1]})
+        hash(key)
+        assert key == make_cache_key("user", {"a", "b"}, (1, 2), {"x": (1,)})
+
+
+@dataclass(slots=True)
+class DummyServiceCache(ServiceCache):
+    values: TTLCache = field(default_factory=TTLCache)
+    client: object | None = None
+
+
+class DummyService(Service):
+    def __init__(self, fetch: AsyncMock, cache: DummyServiceCache | None):
+        super().__init__(Context(), cache)
+        self.fetch = fetch
+
+    @Service.from_ttl_cache_or_execute(attr="values")
+    async def get(self, name: str, default: str | None = None) -> str | None:
+        return await self.fetch(name, default)
+
+
+@pytest.mark.asyncio
+class TestFromTTLCacheOrExecute:
+    async def test_caches_per_arguments(self):
+        fetch = AsyncMock(side_effect=lambda name, default: name)
+        service = DummyService(fetch, DummyServiceCache())
+        assert await service.get("a") == "a"
+        assert await service.get("a") == "a"
+        assert await service.get(name="a", default=None) == "a"
+        assert await service.get("b") == "b"
+        assert fetch.await_count == 2
+
+    async def test_caches_none(self):
+        fetch = AsyncMock(return_value=None)
+        service = DummyService(fetch, DummyServiceCache())
+        assert await service.get("a") is None
+        assert await service.get("a") is None
+        fetch.assert_awaited_once()
+
+    async def test_no_cache(self):
+        fetch = AsyncMock(return_value="value")
+        service = DummyService(fetch, None)
+        await service.get("a")
+        await service.get("a")
+        assert fetch.await_count == 2
+
+    async def test_clear(self):
+        fetch = AsyncMock(return_value="value")
+        cache = DummyServiceCache(client=object())
+        service = DummyService(fetch, cache)
+        await service.get("a")
+        cache.clear()
+        assert cache.client is None
+        assert isinstance(cache.values, TTLCache)
+        await service.get("a")
+        assert fetch.await_count == 2
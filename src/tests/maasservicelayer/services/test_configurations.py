@@ -12,6 +12,7 @@ from maasservicelayer.db.repositories.configurations import (
 )
 from maasservicelayer.models.configurations import Configuration
 from maasservicelayer.services import ConfigurationsService
+from maasservicelayer.services._base import make_cache_key
 
 
 @pytest.mark.asyncio
@@ -39,3 +40,23 @@ class TestConfigurationsService:
             configurations_repository=configurations_repository_mock,
         )
         assert await configurations_service.get("test") is None
+
+    async def test_get_is_cached(self) -> None:
+        configurations_repository_mock = Mock(ConfigurationsRepository)
+        configurations_repository_mock.get.return_value = Configuration(
+            id=1, name="test", value="value"
+        )
+        configurations_service = ConfigurationsService(
+            context=Context(),
+            configurations_repository=configurations_repository_mock,
+            cache=ConfigurationsService.build_cache_object(),
+        )
+        assert await configurations_service.get("test") == "value"
+        assert await configurations_service.get("test") == "value"
+        configurations_repository_mock.get.assert_called_once_with("test")
+
+        configurations_service.cache.configurations.invalidate(
+            make_cache_key("test")
+        )
+        assert await configurations_service.get("test") == "value"
+        assert configurations_repository_mock.get.call_count == 2
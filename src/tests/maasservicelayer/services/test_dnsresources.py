@@ -47,6 +47,32 @@ class TestDNSResourcesService:
             query=QuerySpec(where=None)
         )
 
+    async def test_get_ips_for_dnsresource(self) -> None:
+        mock_dnsresource_repository = Mock(DNSResourceRepository)
+        mock_dnsresource_repository.get_ips_for_dnsresource.return_value = []
+
+        dnsresources_service = DNSResourcesService(
+            Context(),
+            domains_service=Mock(DomainsService),
+            dnspublications_service=Mock(DNSPublicationsService),
+            dnsresource_repository=mock_dnsresource_repository,
+        )
+        dnsresource = DNSResource(
+            id=1,
+            name="example",
+            domain_id=0,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+
+        assert (
+            await dnsresources_service.get_ips_for_dnsresource(dnsresource)
+            == []
+        )
+        mock_dnsresource_repository.get_ips_for_dnsresource.assert_called_once_with(
+            dnsresource
+        )
+
     async def test_create(self) -> None:
         mock_domains_service = Mock(DomainsService)
         mock_dnspublications_service = Mock(DNSPublicationsService)
@@ -427,3 +453,126 @@ class TestDNSResourcesService:
             zone=domain.name,
             answer="10.0.0.1",
         )
+
+    async def test_release_dynamic_hostnames(self) -> None:
+        mock_domains_service = Mock(DomainsService)
+        mock_dnspublications_service = Mock(DNSPublicationsService)
+        domain = Domain(
+            id=0,
+            name="test_domain",
+            authoritative=True,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        mock_domains_service.get_default_domain.return_value = domain
+
+        dnsresource = DNSResource(
+            id=1,
+            name="test_name",
+            domain_id=0,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        sip1, sip2, sticky_sip = [
+            StaticIPAddress(
+                id=id,
+                ip=f"10.0.0.{id}",
+                alloc_type=alloc_type,
+                lease_time=600,
+                subnet_id=2,
+                created=utcnow(),
+                updated=utcnow(),
+            )
+            for id, alloc_type in [
+                (1, IpAddressType.DISCOVERED),
+                (2, IpAddressType.DISCOVERED),
+                (3, IpAddressType.STICKY),
+            ]
+        ]
+
+        mock_dnsresource_repository = Mock(DNSResourceRepository)
+        mock_dnsresource_repository.get_dnsresources_in_domain_for_ips.return_value = {
+            sip1.id: [dnsresource]
+        }
+        mock_dnsresource_repository.get_ips_for_dnsresource.side_effect = [
+            [sip1],
+            [sip2],
+        ]
+
+        dnsresources_service = DNSResourcesService(
+            context=Context(),
+            domains_service=mock_domains_service,
+            dnspublications_service=mock_dnspublications_service,
+            dnsresource_repository=mock_dnsresource_repository,
+        )
+
+        await dnsresources_service.release_dynamic_hostnames(
+            [sip1, sip2, sticky_sip]
+        )
+
+        mock_dnsresource_repository.get_dnsresources_in_domain_for_ips.assert_called_once_with(
+            domain, [sip1, sip2]
+        )
+        mock_dnsresource_repository.remove_ip_relation.assert_called_once_with(
+            dnsresource, sip1
+        )
+        mock_dnsresource_repository.delete_by_id.assert_not_called()
+
+    async def test_update_dynamic_hostnames(self) -> None:
+        mock_domains_service = Mock(DomainsService)
+        mock_dnspublications_service = Mock(DNSPublicationsService)
+        domain = Domain(
+            id=0,
+            name="test_domain",
+            authoritative=True,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        mock_domains_service.get_default_domain.return_value = domain
+
+        sip1, sip2 = [
+            StaticIPAddress(
+                id=id,
+                ip=f"10.0.0.{id}",
+                alloc_type=IpAddressType.DISCOVERED,
+                lease_time=600,
+                subnet_id=2,
+                created=utcnow(),
+                updated=utcnow(),
+            )
+            for id in (1, 2)
+        ]
+        dnsresource = DNSResource(
+            id=1,
+            name="test_name",
+            domain_id=0,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+
+        mock_dnsresource_repository = Mock(DNSResourceRepository)
+        mock_dnsresource_repository.get.return_value = [dnsresource]
+        mock_dnsresource_repository.get_dnsresources_in_domain_for_ips.return_value = (
+            {}
+        )
+        mock_dnsresource_repository.get_ips_for_dnsresource.return_value = []
+
+        dnsresources_service = DNSResourcesService(
+            context=Context(),
+            domains_service=mock_domains_service,
+            dnspublications_service=mock_dnspublications_service,
+            dnsresource_repository=mock_dnsresource_repository,
+        )
+
+        await dnsresources_service.update_dynamic_hostnames(
+            [(sip1, "test_name"), (sip2, "test_name")]
+        )
+
+        mock_dnsresource_repository.get_dnsresources_in_domain_for_ips.assert_called_once_with(
+            domain, [sip1, sip2]
+        )
+        mock_dnsresource_repository.get.assert_called_once()
+        assert mock_dnsresource_repository.link_ip.call_args_list == [
+            call(dnsresource, sip1),
+            call(dnsresource, sip2),
+        ]
@@ -17,6 +17,10 @@ from maasservicelayer.auth.macaroons.checker import (
     AsyncChecker,
 )
 from maasservicelayer.auth.macaroons.locator import AsyncThirdPartyLocator
+from maasservicelayer.auth.macaroons.macaroon_client import RbacAsyncClient
+from maasservicelayer.auth.macaroons.models.responses import (
+    PermissionResourcesMapping,
+)
 from maasservicelayer.auth.macaroons.oven import AsyncOven
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.external_auth import (
@@ -26,6 +30,7 @@ from maasservicelayer.db.repositories.users import (
     UserProfileResourceBuilder,
     UserResourceBuilder,
 )
+from maasservicelayer.enums.rbac import RbacPermission
 from maasservicelayer.exceptions.catalog import (
     DischargeRequiredException,
     UnauthorizedException,
@@ -795,3 +800,36 @@ class TestExternalAuthService:
             ]
         )
         external_auth_service.cache.clear()
+
+    async def test_get_rbac_resource_pool_ids_is_cached(self):
+        secrets_service_mock = Mock(SecretsService)
+        secrets_service_mock.get_composite_secret.return_value = (
+            TEST_CONFIG_RBAC
+        )
+        external_auth_service = ExternalAuthService(
+            context=Context(),
+            secrets_service=secrets_service_mock,
+            users_service=Mock(UsersService),
+            cache=ExternalAuthService.build_cache_object(),
+            external_auth_repository=Mock(ExternalAuthRepository),
+        )
+        pools = [
+            PermissionResourcesMapping(
+                permission=RbacPermission.VIEW, resources=[1]
+            )
+        ]
+        with patch.object(
+            RbacAsyncClient, "get_resource_pool_ids", return_value=pools
+        ) as get_resource_pool_ids_mock:
+            for _ in range(2):
+                assert (
+                    await external_auth_service.get_rbac_resource_pool_ids(
+                        "admin", {RbacPermission.VIEW}
+                    )
+                    == pools
+                )
+            await external_auth_service.get_rbac_resource_pool_ids(
+                "admin", {RbacPermission.VIEW, RbacPermission.EDIT}
+            )
+        assert get_resource_pool_ids_mock.await_count == 2
+        await external_auth_service.cache.close()
@@ -16,6 +16,7 @@ from maascommon.enums.ipaddress import (
 )
 from maasservicelayer.context import Context
 from maasservicelayer.models.interfaces import Interface
+from maasservicelayer.models.ipranges import IPRange
 from maasservicelayer.models.leases import Lease
 from maasservicelayer.models.staticipaddress import StaticIPAddress
 from maasservicelayer.models.subnets import Subnet
@@ -404,3 +405,247 @@ class TestLeasesService:
         mock_interfaces_service.bulk_link_ip.assert_called_once_with(
             sip, [interface]
         )
+
+    async def test_store_leases_info_commits_in_bulk(self) -> None:
+        subnet = Subnet(
+            id=1,
+            cidr="10.0.0.0/24",
+            created=utcnow(),
+            updated=utcnow(),
+            rdns_mode=1,
+            allow_dns=True,
+            allow_proxy=True,
+            active_discovery=True,
+            managed=True,
+            vlan_id=1,
+            disabled_boot_architectures=[],
+        )
+        iprange = IPRange(
+            id=4,
+            type="dynamic",
+            start_ip="10.0.0.2",
+            end_ip="10.0.0.20",
+            subnet_id=subnet.id,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        interface = Interface(
+            id=2,
+            mac_address="00:11:22:33:44:55",
+            type=InterfaceType.PHYSICAL,
+            name="eth0",
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        sip = StaticIPAddress(
+            id=3,
+            ip="10.0.0.3",
+            alloc_type=IpAddressType.DISCOVERED,
+            lease_time=600,
+            subnet_id=subnet.id,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+
+        mock_static_ip_address_service = Mock(StaticIPAddressService)
+        mock_subnets_service = Mock(SubnetsService)
+        mock_interfaces_service = Mock(InterfacesService)
+        mock_ip_ranges_service = Mock(IPRangesService)
+        mock_nodes_service = Mock(NodesService)
+        mock_dnsresources_service = Mock(DNSResourcesService)
+        leases_service = LeasesService(
+            context=Context(),
+            dnsresource_service=mock_dnsresources_service,
+            node_service=mock_nodes_service,
+            staticipaddress_service=mock_static_ip_address_service,
+            subnet_service=mock_subnets_service,
+            interface_service=mock_interfaces_service,
+            iprange_service=mock_ip_ranges_service,
+        )
+        in_range_ip = IPv4Address("10.0.0.3")
+        out_of_range_ip = IPv4Address("10.0.0.100")
+        no_subnet_ip = IPv4Address("192.168.0.1")
+        mock_subnets_service.find_best_subnets_for_ips.return_value = {
+            in_range_ip: subnet,
+            out_of_range_ip: subnet,
+        }
+        mock_ip_ranges_service.get_ipranges_for_subnets.return_value = [
+            iprange
+        ]
+        mock_interfaces_service.get_interfaces_for_macs.return_value = {
+            interface.mac_address: [interface]
+        }
+        mock_static_ip_address_service.get_discovered_ips_for_interfaces.return_value = (
+            {}
+        )
+        mock_static_ip_address_service.create_or_update_many.return_value = [
+            sip
+        ]
+        mock_nodes_service.get_existing_hostnames.return_value = set()
+
+        def make_lease(ip, hostname="hostname"):
+            return Lease(
+                action=LeaseAction.COMMIT,
+                ip_family=IpAddressFamily.IPV4,
+                hostname=hostname,
+                mac=interface.mac_address,
+                ip=ip,
+                timestamp_epoch=int(time.time()),
+                lease_time_seconds=30,
+            )
+
+        await leases_service.store_leases_info(
+            [
+                make_lease(in_range_ip, hostname="old"),
+                make_lease(out_of_range_ip),
+                make_lease(no_subnet_ip),
+                make_lease(in_range_ip),
+            ]
+        )
+
+        mock_subnets_service.find_best_subnets_for_ips.assert_called_once_with(
+            [out_of_range_ip, no_subnet_ip, in_range_ip]
+        )
+        mock_ip_ranges_service.get_ipranges_for_subnets.assert_called_once_with(
+            [subnet.id]
+        )
+        mock_interfaces_service.get_interfaces_for_macs.assert_called_once_with(
+            [interface.mac_address]
+        )
+        # Only the last lease for the IP in the dynamic range is committed.
+        resources = mock_static_ip_address_service.create_or_update_many.call_args.args[
+            0
+        ]
+        assert [resource["ip"] for resource in resources] == [in_range_ip]
+        mock_interfaces_service.add_ips.assert_called_once_with(
+            [(interface, sip)]
+        )
+        mock_static_ip_address_service.get_discovered_ips_for_interfaces.assert_called_once_with(
+            [interface]
+        )
+        mock_static_ip_address_service.delete_many.assert_called_once_with([])
+        mock_nodes_service.get_existing_hostnames.assert_called_once_with(
+            ["hostname"]
+        )
+        mock_dnsresources_service.update_dynamic_hostnames.assert_called_once_with(
+            [(sip, "hostname")]
+        )
+
+    async def test_store_leases_info_same_mac_different_ips(self) -> None:
+        subnet = Subnet(
+            id=1,
+            cidr="10.0.0.0/24",
+            created=utcnow(),
+            updated=utcnow(),
+            rdns_mode=1,
+            allow_dns=True,
+            allow_proxy=True,
+            active_discovery=True,
+            managed=True,
+            vlan_id=1,
+            disabled_boot_architectures=[],
+        )
+        iprange = IPRange(
+            id=4,
+            type="dynamic",
+            start_ip="10.0.0.2",
+            end_ip="10.0.0.20",
+            subnet_id=subnet.id,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        interface = Interface(
+            id=2,
+            mac_address="00:11:22:33:44:55",
+            type=InterfaceType.PHYSICAL,
+            name="eth0",
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        old_ip = IPv4Address("10.0.0.3")
+        new_ip = IPv4Address("10.0.0.4")
+        old_sip = StaticIPAddress(
+            id=3,
+            ip=old_ip,
+            alloc_type=IpAddressType.DISCOVERED,
+            lease_time=600,
+            subnet_id=subnet.id,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        new_sip = StaticIPAddress(
+            id=5,
+            ip=new_ip,
+            alloc_type=IpAddressType.DISCOVERED,
+            lease_time=30,
+            subnet_id=subnet.id,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+
+        mock_static_ip_address_service = Mock(StaticIPAddressService)
+        mock_subnets_service = Mock(SubnetsService)
+        mock_interfaces_service = Mock(InterfacesService)
+        mock_ip_ranges_service = Mock(IPRangesService)
+        mock_nodes_service = Mock(NodesService)
+        mock_dnsresources_service = Mock(DNSResourcesService)
+        leases_service = LeasesService(
+            context=Context(),
+            dnsresource_service=mock_dnsresources_service,
+            node_service=mock_nodes_service,
+            staticipaddress_service=mock_static_ip_address_service,
+            subnet_service=mock_subnets_service,
+            interface_service=mock_interfaces_service,
+            iprange_service=mock_ip_ranges_service,
+        )
+        mock_subnets_service.find_best_subnets_for_ips.return_value = {
+            old_ip: subnet,
+            new_ip: subnet,
+        }
+        mock_ip_ranges_service.get_ipranges_for_subnets.return_value = [
+            iprange
+        ]
+        mock_interfaces_service.get_interfaces_for_macs.return_value = {
+            interface.mac_address: [interface]
+        }
+        mock_static_ip_address_service.get_discovered_ips_for_interfaces.return_value = {
+            interface.id: [old_sip]
+        }
+        mock_static_ip_address_service.create_or_update_many.return_value = [
+            new_sip
+        ]
+        mock_nodes_service.get_existing_hostnames.return_value = set()
+
+        await leases_service.store_leases_info(
+            [
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="hostname",
+                    mac=interface.mac_address,
+                    ip=ip,
+                    timestamp_epoch=int(time.time()),
+                    lease_time_seconds=30,
+                )
+                for ip in (old_ip, new_ip)
+            ]
+        )
+
+        # Committing the second IP releases the first one, as storing the
+        # leases one by one would.
+        mock_dnsresources_service.release_dynamic_hostnames.assert_any_call(
+            [old_sip]
+        )
+        mock_static_ip_address_service.delete_many.assert_called_once_with(
+            [old_sip]
+        )
+        resources = mock_static_ip_address_service.create_or_update_many.call_args.args[
+            0
+        ]
+        assert [resource["ip"] for resource in resources] == [new_ip]
+        mock_interfaces_service.add_ips.assert_called_once_with(
+            [(interface, new_sip)]
+        )
+        mock_dnsresources_service.update_dynamic_hostnames.assert_called_once_with(
+            [(new_sip, "hostname")]
+        )
@@ -160,6 +160,38 @@ class TestLocalSecretStorageService(SecretsServiceTestSuite):
         )
 
 
+class TestCachedLocalSecretStorageService(SecretsServiceTestSuite):
+    def get_vault_service(self) -> SecretsService:
+        connection = Mock(AsyncConnection)
+        context = Context(connection=connection)
+        return LocalSecretsStorageService(
+            context,
+            secrets_repository=SecretsRepositoryMock(context),
+            cache=SecretsService.build_cache_object(),
+        )
+
+    async def test_get_global_secret_is_cached(self) -> None:
+        vault_service = self.get_vault_service()
+        path = "global/mypath"
+        await vault_service.set_simple_secret(path, self.DEFAULT_SECRET)
+        await vault_service.get_simple_secret(path)
+        vault_service.secrets_repository.storage.clear()
+        retrieved_secret = await vault_service.get_simple_secret(path)
+        assert retrieved_secret == self.DEFAULT_SECRET
+
+    async def test_get_object_secret_is_not_cached(self) -> None:
+        vault_service = self.get_vault_service()
+        await vault_service.set_simple_secret(
+            self.DEFAULT_PATH, self.DEFAULT_SECRET
+        )
+        await vault_service.get_simple_secret(self.DEFAULT_PATH)
+        vault_service.secrets_repository.storage.clear()
+        retrieved_secret = await vault_service.get_simple_secret(
+            self.DEFAULT_PATH, default=None
+        )
+        assert retrieved_secret is None
+
+
 class AsyncVaultManagerMock(AsyncVaultManager):
     def __init__(self):
         super().__init__(
@@ -193,6 +225,18 @@ class TestVaultSecretService(SecretsServiceTestSuite):
         )
 
 
+@pytest.mark.asyncio
+class TestCachedVaultSecretService(SecretsServiceTestSuite):
+    def get_vault_service(self) -> SecretsService:
+        connection = Mock(AsyncConnection)
+        context = Context(connection=connection)
+        return VaultSecretsService(
+            context=context,
+            vault_manager=AsyncVaultManagerMock(),
+            cache=SecretsService.build_cache_object(),
+        )
+
+
 @pytest.mark.asyncio
 class TestSecretServiceFactory:
     async def test_with_default_settings(self) -> None:
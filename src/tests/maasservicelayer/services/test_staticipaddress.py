@@ -10,7 +10,9 @@ from maascommon.workflows.dhcp import (
     merge_configure_dhcp_param,
 )
 from maasservicelayer.context import Context
+from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.staticipaddress import (
+    StaticIPAddressClauseFactory,
     StaticIPAddressRepository,
     StaticIPAddressResourceBuilder,
 )
@@ -374,3 +376,47 @@ class TestStaticIPAddressService:
             parameter_merge_func=merge_configure_dhcp_param,
             wait=False,
         )
+
+    async def test_delete_many(self) -> None:
+        now = utcnow()
+        auto_sip, discovered_sip = [
+            StaticIPAddress(
+                id=id,
+                ip=f"10.0.0.{id}",
+                lease_time=30,
+                subnet_id=subnet_id,
+                alloc_type=alloc_type,
+                created=now,
+                updated=now,
+            )
+            for id, subnet_id, alloc_type in [
+                (2, 1, IpAddressType.AUTO),
+                (3, 4, IpAddressType.DISCOVERED),
+            ]
+        ]
+
+        mock_staticipaddress_repository = Mock(StaticIPAddressRepository)
+        mock_temporal = Mock(TemporalService)
+
+        staticipaddress_service = StaticIPAddressService(
+            context=Context(),
+            temporal_service=mock_temporal,
+            staticipaddress_repository=mock_staticipaddress_repository,
+        )
+
+        await staticipaddress_service.delete_many([auto_sip, discovered_sip])
+
+        mock_staticipaddress_repository.delete.assert_called_once_with(
+            QuerySpec(
+                where=StaticIPAddressClauseFactory.with_ids(
+                    [auto_sip.id, discovered_sip.id]
+                )
+            )
+        )
+        # Only the subnets of non-discovered IPs need to be reconfigured.
+        mock_temporal.register_or_update_workflow_call.assert_called_once_with(
+            CONFIGURE_DHCP_WORKFLOW_NAME,
+            ConfigureDHCPParam(subnet_ids=[auto_sip.subnet_id]),
+            parameter_merge_func=merge_configure_dhcp_param,
+            wait=False,
+        )
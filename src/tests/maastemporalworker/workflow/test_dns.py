@@ -1,19 +1,25 @@
 from collections import defaultdict
+from unittest.mock import call
 
 import pytest
 from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncConnection
 from temporalio import activity
-from temporalio.testing import WorkflowEnvironment
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
 from temporalio.worker import Worker
 
 from maascommon.workflows.dns import (
     CONFIGURE_DNS_WORKFLOW_NAME,
     ConfigureDNSParam,
 )
+from maasservicelayer.db import Database
+from maasservicelayer.services import CacheForServices
 from maastemporalworker.workflow.dns import (
     CHECK_SERIAL_UPDATE_NAME,
     CheckSerialUpdateParam,
     ConfigureDNSWorkflow,
+    DNS_PUBLISHED_SERIAL_CONFIG,
+    DNSConfigActivity,
     DNSPublication,
     DNSUpdateResult,
     DYNAMIC_UPDATE_DNS_CONFIGURATION_NAME,
@@ -21,9 +27,24 @@ from maastemporalworker.workflow.dns import (
     FULL_RELOAD_DNS_CONFIGURATION_NAME,
     GET_CHANGES_SINCE_CURRENT_SERIAL_NAME,
     GET_REGION_CONTROLLERS_NAME,
+    parse_publication_update,
     RegionControllersResult,
     SerialChangesResult,
+    SET_PUBLISHED_SERIAL_NAME,
+    SetPublishedSerialParam,
 )
+from provisioningserver.dns.config import DynamicDNSUpdate
+from tests.fixtures.factories.configuration import create_test_configuration
+from tests.fixtures.factories.dnspublication import (
+    create_test_dnspublication_entry,
+)
+from tests.fixtures.factories.dnsresource import create_test_dnsresource_entry
+from tests.fixtures.factories.domain import create_test_domain_entry
+from tests.fixtures.factories.staticipaddress import (
+    create_test_staticipaddress_entry,
+)
+from tests.fixtures.factories.subnet import create_test_subnet_entry
+from tests.maasapiserver.fixtures.db import Fixture
 
 
 @pytest.mark.asyncio
@@ -69,6 +90,10 @@ class TestDNSConfigWorkflow:
         async def check_serial_update(serial: CheckSerialUpdateParam) -> None:
             calls[CHECK_SERIAL_UPDATE_NAME].append(True)
 
+        @activity.defn(name=SET_PUBLISHED_SERIAL_NAME)
+        async def set_published_serial(param: SetPublishedSerialParam) -> None:
+            calls[SET_PUBLISHED_SERIAL_NAME].append(param.serial)
+
         async with await WorkflowEnvironment.start_time_skipping() as env:
             async with Worker(
                 env.client,
@@ -80,6 +105,7 @@ class TestDNSConfigWorkflow:
                     full_reload_dns_configuration,
                     dynamic_update_dns_configuration,
                     check_serial_update,
+                    set_published_serial,
                 ],
             ) as worker:
                 await env.client.execute_workflow(
@@ -94,6 +120,7 @@ class TestDNSConfigWorkflow:
                 assert len(calls[FULL_RELOAD_DNS_CONFIGURATION_NAME]) == 1
                 assert len(calls[DYNAMIC_UPDATE_DNS_CONFIGURATION_NAME]) == 0
                 assert len(calls[CHECK_SERIAL_UPDATE_NAME]) == 1
+                assert calls[SET_PUBLISHED_SERIAL_NAME] == [1]
 
     async def test_dns_config_workflow_dynamic_update(
         self, mocker: MockerFixture
@@ -138,6 +165,10 @@ class TestDNSConfigWorkflow:
         async def check_serial_update(serial: CheckSerialUpdateParam) -> None:
             calls[CHECK_SERIAL_UPDATE_NAME].append(True)
 
+        @activity.defn(name=SET_PUBLISHED_SERIAL_NAME)
+        async def set_published_serial(param: SetPublishedSerialParam) -> None:
+            calls[SET_PUBLISHED_SERIAL_NAME].append(param.serial)
+
         async with await WorkflowEnvironment.start_time_skipping() as env:
             async with Worker(
                 env.client,
@@ -149,6 +180,7 @@ class TestDNSConfigWorkflow:
                     full_reload_dns_configuration,
                     dynamic_update_dns_configuration,
                     check_serial_update,
+                    set_published_serial,
                 ],
             ) as worker:
                 await env.client.execute_workflow(
@@ -163,3 +195,272 @@ class TestDNSConfigWorkflow:
                 assert len(calls[FULL_RELOAD_DNS_CONFIGURATION_NAME]) == 0
                 assert len(calls[DYNAMIC_UPDATE_DNS_CONFIGURATION_NAME]) == 1
                 assert len(calls[CHECK_SERIAL_UPDATE_NAME]) == 1
+                assert calls[SET_PUBLISHED_SERIAL_NAME] == [1]
+
+    async def test_dns_config_workflow_nothing_to_publish(
+        self, mocker: MockerFixture
+    ):
+        calls = defaultdict(list)
+
+        @activity.defn(name=GET_CHANGES_SINCE_CURRENT_SERIAL_NAME)
+        async def get_changes_since_current_serial() -> (
+            SerialChangesResult | None
+        ):
+            calls[GET_CHANGES_SINCE_CURRENT_SERIAL_NAME].append(True)
+            return SerialChangesResult(updates=[])
+
+        @activity.defn(name=GET_REGION_CONTROLLERS_NAME)
+        async def get_region_controllers() -> RegionControllersResult:
+            calls[GET_REGION_CONTROLLERS_NAME].append(True)
+            return RegionControllersResult(
+                region_controller_system_ids=["abc"]
+            )
+
+        async with await WorkflowEnvironment.start_time_skipping() as env:
+            async with Worker(
+                env.client,
+                task_queue="region",
+                workflows=[ConfigureDNSWorkflow],
+                activities=[
+                    get_changes_since_current_serial,
+                    get_region_controllers,
+                ],
+            ) as worker:
+                await env.client.execute_workflow(
+                    CONFIGURE_DNS_WORKFLOW_NAME,
+                    ConfigureDNSParam(need_full_reload=False),
+                    id="configure-dns",
+                    task_queue=worker.task_queue,
+                )
+
+                assert len(calls[GET_CHANGES_SINCE_CURRENT_SERIAL_NAME]) == 1
+                assert len(calls[GET_REGION_CONTROLLERS_NAME]) == 0
+
+
+@pytest.mark.parametrize(
+    "update,expected",
+    [
+        (
+            "INSERT example.com www A 30 10.0.0.1",
+            ("INSERT", "example.com", "www", "A", 30, "10.0.0.1"),
+        ),
+        (
+            "DELETE example.com www A 10.0.0.1",
+            ("DELETE", "example.com", "www", "A", None, "10.0.0.1"),
+        ),
+        (
+            "UPDATE example.com www A 60",
+            ("UPDATE", "example.com", "www", "A", 60, None),
+        ),
+        (
+            "DELETE example.com www A",
+            ("DELETE", "example.com", "www", "A", None, None),
+        ),
+    ],
+)
+def test_parse_publication_update(update, expected):
+    assert parse_publication_update(update) == expected
+
+
+@pytest.mark.asyncio
+class TestDNSConfigActivity:
+    async def test_get_changes_since_current_serial_needs_published_serial(
+        self, fixture: Fixture, db_connection: AsyncConnection, db: Database
+    ) -> None:
+        await create_test_dnspublication_entry(fixture, serial=10)
+        activities = DNSConfigActivity(
+            db, CacheForServices(), connection=db_connection
+        )
+
+        env = ActivityEnvironment()
+        result = await env.run(activities.get_changes_since_current_serial)
+
+        assert result is None
+
+    async def test_get_changes_since_current_serial(
+        self, fixture: Fixture, db_connection: AsyncConnection, db: Database
+    ) -> None:
+        for serial in (12, 10, 11):
+            await create_test_dnspublication_entry(
+                fixture, serial=serial, update_str=f"update {serial}"
+            )
+        await create_test_configuration(
+            fixture, name=DNS_PUBLISHED_SERIAL_CONFIG, value=10
+        )
+        activities = DNSConfigActivity(
+            db, CacheForServices(), connection=db_connection
+        )
+
+        env = ActivityEnvironment()
+        result = await env.run(activities.get_changes_since_current_serial)
+
+        assert [update.serial for update in result.updates] == [11, 12]
+        assert result.updates[0].update == "update 11"
+
+    async def test_set_published_serial(
+        self, fixture: Fixture, db_connection: AsyncConnection, db: Database
+    ) -> None:
+        activities = DNSConfigActivity(
+            db, CacheForServices(), connection=db_connection
+        )
+
+        env = ActivityEnvironment()
+        await env.run(
+            activities.set_published_serial, SetPublishedSerialParam(serial=5)
+        )
+        await env.run(
+            activities.set_published_serial, SetPublishedSerialParam(serial=7)
+        )
+
+        assert await activities._get_published_serial() == 7
+
+    async def test_dynamic_update_sends_one_batch_per_zone(
+        self,
+        mocker: MockerFixture,
+        fixture: Fixture,
+        db_connection: AsyncConnection,
+        db: Database,
+    ) -> None:
+        nsupdate = mocker.patch(
+            "maastemporalworker.workflow.dns.NSUpdateCommand"
+        )
+        await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        activities = DNSConfigActivity(
+            db, CacheForServices(), connection=db_connection
+        )
+        publications = [
+            DNSPublication(
+                serial=2,
+                source="",
+                update="INSERT example.com www A 30 10.0.0.1",
+            ),
+            DNSPublication(
+                serial=3,
+                source="",
+                update="DELETE example.org old A 10.1.0.1",
+            ),
+        ]
+
+        env = ActivityEnvironment()
+        result = await env.run(
+            activities.dynamic_update_dns_configuration,
+            DynamicUpdateParam(new_serial=3, updates=publications),
+        )
+
+        assert result == DNSUpdateResult(serial=3)
+        zones = {args[0]: args[1] for args, _ in nsupdate.call_args_list}
+        assert zones.keys() == {
+            "example.com",
+            "example.org",
+            "0.0.10.in-addr.arpa",
+        }
+        assert zones["example.com"] == [
+            DynamicDNSUpdate(
+                operation="INSERT",
+                zone="example.com",
+                name="www.example.com",
+                rectype="A",
+                ttl=30,
+                answer="10.0.0.1",
+            )
+        ]
+        assert zones["0.0.10.in-addr.arpa"][0].rectype == "PTR"
+        assert zones["0.0.10.in-addr.arpa"][0].answer == "www.example.com"
+        for _, kwargs in nsupdate.call_args_list:
+            assert kwargs["serial"] == 3
+
+    async def test_dynamic_update_rewrites_resource_addresses(
+        self,
+        mocker: MockerFixture,
+        fixture: Fixture,
+        db_connection: AsyncConnection,
+        db: Database,
+    ) -> None:
+        nsupdate = mocker.patch(
+            "maastemporalworker.workflow.dns.NSUpdateCommand"
+        )
+        subnet = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        [ip] = await create_test_staticipaddress_entry(fixture, subnet=subnet)
+        domain = await create_test_domain_entry(fixture, name="example.com")
+        await create_test_dnsresource_entry(
+            fixture, domain, ip=ip, name="www", address_ttl=60
+        )
+        activities = DNSConfigActivity(
+            db, CacheForServices(), connection=db_connection
+        )
+
+        env = ActivityEnvironment()
+        await env.run(
+            activities.dynamic_update_dns_configuration,
+            DynamicUpdateParam(
+                new_serial=2,
+                updates=[
+                    DNSPublication(
+                        serial=2,
+                        source="",
+                        update="DELETE-IP example.com www A",
+                    )
+                ],
+            ),
+        )
+
+        forward = [
+            args[1]
+            for args, _ in nsupdate.call_args_list
+            if args[0] == "example.com"
+        ]
+        assert forward == [
+            [
+                DynamicDNSUpdate(
+                    operation="DELETE",
+                    zone="example.com",
+                    name="www.example.com",
+                    rectype="A",
+                ),
+                DynamicDNSUpdate(
+                    operation="DELETE",
+                    zone="example.com",
+                    name="www.example.com",
+                    rectype="AAAA",
+                ),
+                DynamicDNSUpdate(
+                    operation="INSERT",
+                    zone="example.com",
+                    name="www.example.com",
+                    rectype="A",
+                    ttl=60,
+                    answer=str(ip["ip"]),
+                ),
+            ]
+        ]
+
+    async def test_dynamic_update_falls_back_to_full_reload(
+        self,
+        mocker: MockerFixture,
+        fixture: Fixture,
+        db_connection: AsyncConnection,
+        db: Database,
+    ) -> None:
+        nsupdate = mocker.patch(
+            "maastemporalworker.workflow.dns.NSUpdateCommand"
+        )
+        activities = DNSConfigActivity(
+            db, CacheForServices(), connection=db_connection
+        )
+        full_reload = mocker.patch.object(activities, "_full_reload")
+        full_reload.return_value = DNSUpdateResult(serial=4)
+
+        env = ActivityEnvironment()
+        result = await env.run(
+            activities.dynamic_update_dns_configuration,
+            DynamicUpdateParam(
+                new_serial=3,
+                updates=[
+                    DNSPublication(serial=3, source="", update="INSERT-DATA 1")
+                ],
+            ),
+        )
+
+        assert result == DNSUpdateResult(serial=4)
+        nsupdate.assert_not_called()
+        assert full_reload.call_args_list == [call()]
@@ -18,9 +18,14 @@ from maasservicelayer.db.tables import NodeTagTable, TagTable
 from maasservicelayer.models.bmc import Bmc
 from maasservicelayer.models.users import User
 from maasservicelayer.services import CacheForServices
+from maastemporalworker.workflow import tag_evaluation
 from maastemporalworker.workflow.tag_evaluation import (
     EVALUATE_TAG_ACTIVITY_NAME,
+    evaluate_tag_definitions,
+    EVALUATE_TAGS_ACTIVITY_NAME,
     TagEvaluationActivity,
+    TagEvaluationManyParam,
+    TagEvaluationManyWorkflow,
     TagEvaluationParam,
     TagEvaluationResult,
     TagEvaluationWorkflow,
@@ -236,6 +241,66 @@ class TestTagEvaluationWorkflow:
         assert calls["evaluate-tag"] == activity_param
 
 
+@pytest.mark.asyncio
+class TestTagEvaluationManyWorkflow:
+    async def test_tag_evaluation_many_workflow(self):
+        calls = []
+        activity_param = TagEvaluationManyParam(
+            [
+                TagEvaluationParam(101, "//node"),
+                TagEvaluationParam(102, "//lldp"),
+            ],
+            batch_size=10,
+        )
+
+        @activity.defn(name=EVALUATE_TAGS_ACTIVITY_NAME)
+        async def mock_evaluate_tags(
+            param: TagEvaluationManyParam,
+        ) -> TagEvaluationResult:
+            calls.append(param)
+            return TagEvaluationResult(inserted=0, deleted=0)
+
+        async with await WorkflowEnvironment.start_time_skipping() as env:
+            async with Worker(
+                env.client,
+                task_queue="test::region",
+                workflows=[TagEvaluationManyWorkflow],
+                activities=[mock_evaluate_tags],
+            ) as worker:
+                await env.client.execute_workflow(
+                    workflow=TagEvaluationManyWorkflow.run,
+                    arg=activity_param,
+                    id=f"workflow-{uuid.uuid4()}",
+                    task_queue=worker.task_queue,
+                )
+
+        assert calls == [activity_param]
+
+
+class TestEvaluateTagDefinitions:
+    def _output(self, xml: str) -> str:
+        return b64encode(xml.encode("ascii")).decode("ascii")
+
+    def test_matches_any_output(self):
+        outputs = [
+            (1, [self._output("<node/>"), self._output("<lldp/>")]),
+            (2, [self._output("<lldp/>")]),
+        ]
+        matches = evaluate_tag_definitions(
+            [(10, "//node"), (11, "//lldp"), (12, "//machine")], outputs
+        )
+        assert matches == [(1, [10, 11]), (2, [11])]
+
+    def test_skips_nodes_without_well_formed_output(self):
+        outputs = [
+            (1, [self._output("")]),
+            (2, [self._output("malformed xml document")]),
+            (3, [self._output("malformed"), self._output("<node/>")]),
+        ]
+        matches = evaluate_tag_definitions([(10, "//node")], outputs)
+        assert matches == [(3, [10])]
+
+
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("maasdb")
 class TestTagEvaluationActivities:
@@ -419,3 +484,89 @@ class TestTagEvaluationActivities:
             (machine_1["id"], tag_02.id),
             (machine_5["id"], tag_03["id"]),
         }
+
+    @pytest.mark.parametrize("batch_size", [1000, 2, 1])
+    @pytest.mark.parametrize("parallel_min_nodes", [100, 1])
+    async def test_tags_evaluation_activity(
+        self,
+        db: Database,
+        db_connection: AsyncConnection,
+        fixture: Fixture,
+        _machine_entries_for_tag_evaluation_tests,
+        batch_size,
+        parallel_min_nodes,
+        monkeypatch,
+    ):
+        """
+        Test the multi-tag evaluation activity.
+
+        The tags are evaluated together against the database entries defined
+        by the fixture `_machine_entries_for_tag_evaluation_tests`, both in a
+        thread and in a process pool.
+        """
+        monkeypatch.setattr(
+            tag_evaluation,
+            "PARALLEL_EVALUATION_MIN_NODES",
+            parallel_min_nodes,
+        )
+
+        async def _retrieve_node_tag_entries():
+            nodetag_query = select(
+                NodeTagTable.c.node_id, NodeTagTable.c.tag_id
+            ).select_from(NodeTagTable)
+            cursor_result = await db_connection.execute(nodetag_query)
+            return set(cursor_result.all())
+
+        services_cache = CacheForServices()
+        tag_evaluation_activity = TagEvaluationActivity(
+            db, services_cache, connection=db_connection
+        )
+
+        machine_1, machine_2, _, _, machine_5 = (
+            _machine_entries_for_tag_evaluation_tests
+        )
+
+        tag_01 = await create_test_tag_entry(
+            fixture, name="tag_01", definition="//node"
+        )
+        tag_02 = await create_test_tag_entry(
+            fixture, name="tag_02", definition='//vendor[text()="Vendor X"]'
+        )
+        tag_03 = await create_test_tag_entry(
+            fixture, name="tag_03", definition="//lldp"
+        )
+        tag_04 = await create_test_tag_entry(
+            fixture, name="tag_04", definition="//machine"
+        )
+        param = TagEvaluationManyParam(
+            [
+                TagEvaluationParam(tag["id"], tag["definition"])
+                for tag in (tag_01, tag_02, tag_03, tag_04)
+            ],
+            batch_size=batch_size,
+        )
+        result = await tag_evaluation_activity.evaluate_tags(param)
+        assert result == TagEvaluationResult(inserted=4, deleted=0)
+        assert await _retrieve_node_tag_entries() == {
+            (machine_1["id"], tag_01["id"]),
+            (machine_2["id"], tag_01["id"]),
+            (machine_1["id"], tag_02["id"]),
+            (machine_5["id"], tag_03["id"]),
+        }
+
+        # The tags no longer matching are removed, the others are kept.
+        param = TagEvaluationManyParam(
+            [
+                TagEvaluationParam(
+                    tag_01["id"], '//vendor[text()="Vendor Y"]'
+                ),
+                TagEvaluationParam(tag_03["id"], "//machine"),
+            ],
+            batch_size=batch_size,
+        )
+        result = await tag_evaluation_activity.evaluate_tags(param)
+        assert result == TagEvaluationResult(inserted=0, deleted=2)
+        assert await _retrieve_node_tag_entries() == {
+            (machine_2["id"], tag_01["id"]),
+            (machine_1["id"], tag_02["id"]),
+        }